@@ -11,6 +11,7 @@ from strands import Agent
 from bedrock_agentcore import BedrockAgentCoreApp
 from uuid import uuid4
 from shared.config import get_agent_config
+from shared.database_prewarm import prewarm_database
 from healthcare_agent import create_healthcare_agent
 from shared.utils import get_logger
 from shared.schema_validator import validate_request, create_error_response, validate_response
@@ -33,6 +34,8 @@ healthcare_agents = {}
 def get_or_create_agent(session_id: str):
     """Get existing agent or create new one for session."""
     if session_id not in healthcare_agents:
+        # Wake a possibly auto-paused database while the agent is being created
+        prewarm_database(config)
         healthcare_agents[session_id] = create_healthcare_agent(session_id)
     return healthcare_agents[session_id]
 
@@ -47,6 +47,20 @@ class AgentConfig(BaseSettings):
     session_bucket: Optional[str] = Field(
         default=None, alias="SESSION_BUCKET", description="S3 bucket for processed session data")
 
+    # Aurora cluster woken up when a session opens (see shared.database_prewarm)
+    database_cluster_arn: Optional[str] = Field(
+        default=None, alias="DATABASE_CLUSTER_ARN", description="Aurora cluster ARN for pre-warming")
+    database_secret_arn: Optional[str] = Field(
+        default=None, alias="DATABASE_SECRET_ARN", description="Aurora secret ARN for pre-warming")
+    database_name: str = Field(
+        default="healthcare", alias="DATABASE_NAME", description="Database name")
+    database_resume_budget_seconds: float = Field(
+        default=20, alias="DATABASE_RESUME_BUDGET_SECONDS",
+        description="Time spent retrying while the cluster resumes (same variable as the Lambdas)")
+    database_metrics_namespace: str = Field(
+        default="Healthcare/Database", alias="DATABASE_METRICS_NAMESPACE",
+        description="CloudWatch namespace for the database resume metrics")
+
     class Config:
         env_file = ".env"  # Load from .env file for local development
         case_sensitive = False
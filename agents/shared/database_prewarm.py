@@ -0,0 +1,137 @@
+"""
+Aurora pre-warming for new chat sessions.
+
+The cluster auto-pauses after 10 minutes without connections, and the first
+statement after a pause waits for it to resume. When a session opens, a
+cheap statement is sent through the RDS Data API on a background thread, so
+the cluster is already resuming while the agent is created and the model
+decides on its first tool call.
+
+Resume waits are reported with the same EMF metrics as the Lambda
+DatabaseManager (ResumeWaitMs, ResumeRetries, ResumeFailures) under the
+Operation "prewarm", and the retry budget comes from
+DATABASE_RESUME_BUDGET_SECONDS like in the Lambdas.
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+# Same codes the Lambda DatabaseManager treats as "cluster resuming"
+RESUMING_ERROR_CODES = {"DatabaseResumingException", "DatabaseUnavailableException"}
+RESUME_RETRY_BASE_DELAY = 0.5
+RESUME_RETRY_MAX_DELAY = 4.0
+# The cluster stays up for 10 minutes after the last statement, so sessions
+# opened shortly after a prewarm skip it
+PREWARM_INTERVAL_SECONDS = 120
+
+_prewarm_lock = threading.Lock()
+_last_prewarm_at: Optional[float] = None
+
+
+def prewarm_database(config) -> Optional[threading.Thread]:
+    """
+    Start waking the database in the background.
+
+    Args:
+        config: AgentConfig with the database cluster and secret ARNs
+
+    Returns:
+        The background thread, or None when no database is configured or a
+        prewarm ran recently
+    """
+    global _last_prewarm_at
+
+    if not (config.database_cluster_arn and config.database_secret_arn):
+        return None
+
+    with _prewarm_lock:
+        now = time.monotonic()
+        if _last_prewarm_at is not None and now - _last_prewarm_at < PREWARM_INTERVAL_SECONDS:
+            return None
+        _last_prewarm_at = now
+
+    thread = threading.Thread(target=_run_prewarm, args=(config,), name="db-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def _run_prewarm(config) -> None:
+    """Send SELECT 1 until the cluster answers or the resume budget is spent."""
+    client = boto3.client("rds-data", region_name=config.aws_region)
+    started = time.monotonic()
+    retries = 0
+
+    while True:
+        try:
+            client.execute_statement(
+                resourceArn=config.database_cluster_arn,
+                secretArn=config.database_secret_arn,
+                database=config.database_name,
+                sql="SELECT 1"
+            )
+            break
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            waited = time.monotonic() - started
+            if error_code not in RESUMING_ERROR_CODES:
+                logger.warning(f"⚠️ Database prewarm failed | error_code={error_code} | wait_ms={waited * 1000:.0f}")
+                return
+            delay = min(RESUME_RETRY_MAX_DELAY, RESUME_RETRY_BASE_DELAY * (2 ** retries))
+            delay *= random.uniform(0.5, 1.0)
+            if waited + delay > config.database_resume_budget_seconds:
+                emit_resume_metrics(config, waited, retries, resumed=False)
+                logger.warning(f"⚠️ Database prewarm gave up | error_code={error_code} | wait_ms={waited * 1000:.0f}")
+                return
+            time.sleep(delay)
+            retries += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Database prewarm failed | error={str(e)}")
+            return
+
+    waited = time.monotonic() - started
+    if retries:
+        emit_resume_metrics(config, waited, retries, resumed=True)
+    logger.info(
+        f"🔥 Database prewarm completed | wait_ms={waited * 1000:.0f} | "
+        f"resumed={retries > 0} | retries={retries}"
+    )
+
+
+def emit_resume_metrics(config, wait_seconds: float, retries: int, resumed: bool) -> None:
+    """
+    Emit resume wait metrics in CloudWatch Embedded Metric Format.
+
+    Mirrors emit_resume_metrics in the Lambda shared database module so
+    prewarm waits land in the same namespace and metrics. The document is
+    printed rather than logged: CloudWatch only extracts metrics from log
+    lines that are a bare JSON object.
+    """
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": config.database_metrics_namespace,
+                "Dimensions": [["Operation"]],
+                "Metrics": [
+                    {"Name": "ResumeWaitMs", "Unit": "Milliseconds"},
+                    {"Name": "ResumeRetries", "Unit": "Count"},
+                    {"Name": "ResumeFailures", "Unit": "Count"},
+                ]
+            }]
+        },
+        "Operation": "prewarm",
+        "Backend": "data_api",
+        "ResumeWaitMs": round(wait_seconds * 1000, 2),
+        "ResumeRetries": retries,
+        "ResumeFailures": 0 if resumed else 1,
+    }), flush=True)
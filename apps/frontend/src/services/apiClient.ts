@@ -4,6 +4,7 @@
  */
 
 import { getApiConfig } from '../config/api';
+import type { PaginationParams } from '../types/api';
 
 
 export interface RequestOptions {
@@ -240,7 +241,7 @@ class ApiClient {
   /**
    * GET request
    */
-  async get<T>(endpoint: string, params?: Record<string, string | number> | { limit?: number; offset?: number }): Promise<T> {
+  async get<T>(endpoint: string, params?: Record<string, string | number | boolean> | PaginationParams): Promise<T> {
     const searchParams = params ? new URLSearchParams() : null;
     if (params && searchParams) {
       Object.entries(params).forEach(([key, value]) => {
@@ -7,13 +7,18 @@
 export interface PaginationParams {
   limit?: number;
   offset?: number;
+  cursor?: string;        // next_cursor of the previous page
+  include_total?: boolean;
 }
 
 export interface PaginationInfo {
   limit: number;
   offset: number;
-  total: number;
   count: number;
+  has_more: boolean;
+  next_cursor: string | null;
+  total?: number;            // only with include_total
+  estimated_total?: number | null;  // first unfiltered page
 }
 
 export interface ApiResponse<T> {
@@ -38,9 +38,22 @@ def get_patients_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionPrope
                     "type": "object",
                     "properties": {
                         "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
-                        "offset": {"type": "integer", "minimum": 0, "default": 0}
+                        "offset": {"type": "integer", "minimum": 0, "default": 0},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page; preferred over offset for later pages"},
+                        "include_total": {"type": "boolean", "default": False, "description": "Return the exact total count (costs an extra query)"}
                     },
                     "description": "Pagination parameters for list operations"
+                },
+                "view": {
+                    "type": "string",
+                    "enum": ["compact", "full"],
+                    "default": "compact",
+                    "description": "Response size for list and get: compact returns patient_id, full_name, email, phone, cedula and date_of_birth (no address, medical_history or lab_results); full returns every field"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["patient_id", "first_name", "last_name", "full_name", "email", "phone", "date_of_birth", "age", "gender", "document_type", "document_number", "address", "medical_history", "lab_results", "source_scan", "cedula", "created_at", "updated_at"]},
+                    "description": "Exact fields to return for list and get, overrides view. Always includes patient_id (and full_name for list)"
                 }
             },
             "required": ["action"]
@@ -84,8 +97,11 @@ def get_patients_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionPrope
                             "properties": {
                                 "limit": {"type": "integer"},
                                 "offset": {"type": "integer"},
-                                "total": {"type": "integer"},
-                                "count": {"type": "integer"}
+                                "count": {"type": "integer"},
+                                "has_more": {"type": "boolean"},
+                                "next_cursor": {"type": "string", "description": "Pass as pagination.cursor to get the next page; null on the last page"},
+                                "total": {"type": "integer", "description": "Exact count, only with include_total"},
+                                "estimated_total": {"type": "integer", "description": "Approximate table size, on the first unfiltered page without include_total"}
                             }
                         },
                         "message": {"type": "string", "description": "Success or error message"}
@@ -132,9 +148,22 @@ def get_medics_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionPropert
                     "type": "object",
                     "properties": {
                         "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
-                        "offset": {"type": "integer", "minimum": 0, "default": 0}
+                        "offset": {"type": "integer", "minimum": 0, "default": 0},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page; preferred over offset for later pages"},
+                        "include_total": {"type": "boolean", "default": False, "description": "Return the exact total count (costs an extra query)"}
                     },
                     "description": "Pagination parameters for list operations"
+                },
+                "view": {
+                    "type": "string",
+                    "enum": ["compact", "full"],
+                    "default": "compact",
+                    "description": "Response size for list and get: compact returns medic_id, full_name and specialty; full returns every field"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["medic_id", "full_name", "specialty", "license_number", "created_at", "updated_at"]},
+                    "description": "Exact fields to return for list and get, overrides view. Always includes medic_id (and full_name for list)"
                 }
             },
             "required": ["action"]
@@ -180,8 +209,11 @@ def get_medics_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionPropert
                             "properties": {
                                 "limit": {"type": "integer"},
                                 "offset": {"type": "integer"},
-                                "total": {"type": "integer"},
-                                "count": {"type": "integer"}
+                                "count": {"type": "integer"},
+                                "has_more": {"type": "boolean"},
+                                "next_cursor": {"type": "string", "description": "Pass as pagination.cursor to get the next page; null on the last page"},
+                                "total": {"type": "integer", "description": "Exact count, only with include_total"},
+                                "estimated_total": {"type": "integer", "description": "Approximate table size, on the first unfiltered page without include_total"}
                             }
                         },
                         "message": {"type": "string", "description": "Success or error message"}
@@ -228,9 +260,22 @@ def get_exams_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                     "type": "object",
                     "properties": {
                         "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
-                        "offset": {"type": "integer", "minimum": 0, "default": 0}
+                        "offset": {"type": "integer", "minimum": 0, "default": 0},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page; preferred over offset for later pages"},
+                        "include_total": {"type": "boolean", "default": False, "description": "Return the exact total count (costs an extra query)"}
                     },
                     "description": "Pagination parameters for list operations"
+                },
+                "view": {
+                    "type": "string",
+                    "enum": ["compact", "full"],
+                    "default": "compact",
+                    "description": "Response size for list and get: compact returns exam_id, exam_name, exam_type and duration_minutes (no description); full returns every field"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["exam_id", "exam_name", "exam_type", "description", "duration_minutes", "created_at", "updated_at"]},
+                    "description": "Exact fields to return for list and get, overrides view. Always includes exam_id (and exam_name for list)"
                 }
             },
             "required": ["action"]
@@ -276,8 +321,11 @@ def get_exams_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                             "properties": {
                                 "limit": {"type": "integer"},
                                 "offset": {"type": "integer"},
-                                "total": {"type": "integer"},
-                                "count": {"type": "integer"}
+                                "count": {"type": "integer"},
+                                "has_more": {"type": "boolean"},
+                                "next_cursor": {"type": "string", "description": "Pass as pagination.cursor to get the next page; null on the last page"},
+                                "total": {"type": "integer", "description": "Exact count, only with include_total"},
+                                "estimated_total": {"type": "integer", "description": "Approximate table size, on the first unfiltered page without include_total"}
                             }
                         },
                         "message": {"type": "string", "description": "Success or error message"}
@@ -292,13 +340,13 @@ def get_reservations_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionP
     """Create tool schema for reservations lambda function."""
     return agentcore.CfnGatewayTarget.ToolDefinitionProperty(
         name="reservations_api",
-        description="Manage medical appointments and reservations including scheduling, cancellation, and availability checks",
+        description="Manage medical appointments and reservations including scheduling, cancellation, availability checks, earliest free slots by specialization, and bulk cancellation or rescheduling of a medic's reservations",
         input_schema={
             "type": "object",
             "properties": {
                 "action": {
                     "type": "string",
-                    "enum": ["list", "get", "create", "update", "delete", "check_availability"],
+                    "enum": ["list", "get", "create", "update", "delete", "check_availability", "find_earliest_slots", "bulk_cancel", "bulk_reschedule"],
                     "description": "The action to perform on reservation records"
                 },
                 "reservation_id": {
@@ -311,11 +359,15 @@ def get_reservations_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionP
                 },
                 "medic_id": {
                     "type": "string",
-                    "description": "Medic ID filter for list operations or required for create/availability"
+                    "description": "Medic ID filter for list operations; required for create, bulk_cancel and bulk_reschedule; for check_availability give medic_id or specialization"
+                },
+                "specialization": {
+                    "type": "string",
+                    "description": "Specialization (partial, case-insensitive) whose medics are searched; required for find_earliest_slots, or used by check_availability when no medic_id is given"
                 },
                 "exam_id": {
                     "type": "string",
-                    "description": "Exam ID required for create operations"
+                    "description": "Exam ID required for create operations; for check_availability and find_earliest_slots it sets the slot length to the exam duration (default 30 minutes)"
                 },
                 "reservation_date": {
                     "type": "string",
@@ -325,12 +377,46 @@ def get_reservations_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionP
                 "date_from": {
                     "type": "string",
                     "format": "date",
-                    "description": "Start date filter for list operations"
+                    "description": "Start date filter for list operations, first day searched by check_availability and find_earliest_slots (default today), or first day affected by bulk_cancel and bulk_reschedule (required)"
                 },
                 "date_to": {
                     "type": "string",
                     "format": "date",
-                    "description": "End date filter for list operations"
+                    "description": "End date filter for list operations, or last day searched or affected by check_availability, find_earliest_slots, bulk_cancel and bulk_reschedule (at most 31 days after date_from; find_earliest_slots defaults to 14 days, bulk actions to date_from)"
+                },
+                "max_slots": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 500,
+                    "default": 50,
+                    "description": "Maximum number of free slots returned by check_availability"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 20,
+                    "default": 5,
+                    "description": "Number of medics returned by find_earliest_slots, each with its first free slot"
+                },
+                "time_from": {
+                    "type": "string",
+                    "description": "bulk_cancel/bulk_reschedule: only reservations starting at or after this time (HH:MM)"
+                },
+                "time_to": {
+                    "type": "string",
+                    "description": "bulk_cancel/bulk_reschedule: only reservations starting before this time (HH:MM)"
+                },
+                "reason": {
+                    "type": "string",
+                    "description": "bulk_cancel: note appended to every cancelled reservation"
+                },
+                "target_medic_id": {
+                    "type": "string",
+                    "description": "bulk_reschedule: medic who takes over the reservations at the same times"
+                },
+                "shift_days": {
+                    "type": "integer",
+                    "description": "bulk_reschedule: move the reservations this many days (negative: earlier); give target_medic_id, shift_days or both"
                 },
                 "status": {
                     "type": "string",
@@ -341,9 +427,22 @@ def get_reservations_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionP
                     "type": "object",
                     "properties": {
                         "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
-                        "offset": {"type": "integer", "minimum": 0, "default": 0}
+                        "offset": {"type": "integer", "minimum": 0, "default": 0},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page; preferred over offset for later pages"},
+                        "include_total": {"type": "boolean", "default": False, "description": "Return the exact total count (costs an extra query)"}
                     },
                     "description": "Pagination parameters for list operations"
+                },
+                "view": {
+                    "type": "string",
+                    "enum": ["compact", "full"],
+                    "default": "compact",
+                    "description": "Response size for list and get: compact returns ids, appointment_date, status and the patient, medic and exam names (no notes or timestamps); full returns every field"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["reservation_id", "patient_id", "medic_id", "exam_id", "appointment_date", "status", "notes", "created_at", "updated_at", "patient_name", "medic_name", "medic_specialty", "exam_name", "exam_type"]},
+                    "description": "Exact fields to return for list and get, overrides view. Always includes reservation_id (and appointment_date for list); medic_specialty and exam_type are only returned by get"
                 }
             },
             "required": ["action"]
@@ -391,19 +490,51 @@ def get_reservations_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionP
                             "items": {
                                 "type": "object",
                                 "properties": {
-                                    "start_time": {"type": "string"},
-                                    "end_time": {"type": "string"},
-                                    "available": {"type": "boolean"}
+                                    "medic_id": {"type": "string"},
+                                    "medic_name": {"type": "string"},
+                                    "specialization": {"type": "string"},
+                                    "date": {"type": "string", "description": "Slot date (YYYY-MM-DD)"},
+                                    "start_time": {"type": "string", "description": "Slot start (HH:MM, clinic local time)"},
+                                    "end_time": {"type": "string", "description": "Slot end (HH:MM, clinic local time)"}
                                 }
-                            }
+                            },
+                            "description": "Free slots found by check_availability, or the first free slot of each medic for find_earliest_slots, earliest first"
+                        },
+                        "results": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "reservation_id": {"type": "string"},
+                                    "patient_id": {"type": "string"},
+                                    "medic_id": {"type": "string"},
+                                    "reservation_date": {"type": "string"},
+                                    "reservation_time": {"type": "string"},
+                                    "new_medic_id": {"type": "string", "description": "bulk_reschedule only"},
+                                    "new_date": {"type": "string", "description": "bulk_reschedule only"},
+                                    "outcome": {
+                                        "type": "string",
+                                        "enum": ["cancelled", "rescheduled", "conflict", "not_working_day"],
+                                        "description": "conflict and not_working_day reservations were left unchanged"
+                                    }
+                                }
+                            },
+                            "description": "Per-reservation outcomes of bulk_cancel and bulk_reschedule"
+                        },
+                        "summary": {
+                            "type": "object",
+                            "description": "Number of reservations per outcome for bulk actions"
                         },
                         "pagination": {
                             "type": "object",
                             "properties": {
                                 "limit": {"type": "integer"},
                                 "offset": {"type": "integer"},
-                                "total": {"type": "integer"},
-                                "count": {"type": "integer"}
+                                "count": {"type": "integer"},
+                                "has_more": {"type": "boolean"},
+                                "next_cursor": {"type": "string", "description": "Pass as pagination.cursor to get the next page; null on the last page"},
+                                "total": {"type": "integer", "description": "Exact count, only with include_total"},
+                                "estimated_total": {"type": "integer", "description": "Approximate table size, on the first unfiltered page without include_total"}
                             }
                         },
                         "message": {"type": "string", "description": "Success or error message"}
@@ -437,7 +568,7 @@ def get_files_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                 },
                 "file_type": {
                     "type": "string",
-                    "description": "File type filter (e.g., lab_result, x_ray, prescription)"
+                    "description": "Document category filter for list operations (medical-history, exam-results, medical-images, identification, other, not-identified or all)"
                 },
 
                 "file_name": {
@@ -456,7 +587,8 @@ def get_files_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                     "type": "object",
                     "properties": {
                         "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
-                        "offset": {"type": "integer", "minimum": 0, "default": 0}
+                        "offset": {"type": "integer", "minimum": 0, "default": 0},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page; preferred over offset for later pages"}
                     },
                     "description": "Pagination parameters for list operations"
                 }
@@ -472,19 +604,25 @@ def get_files_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                     "properties": {
                         "files": {
                             "type": "array",
+                            "description": "Processed documents, newest first (list action)",
                             "items": {
                                 "type": "object",
                                 "properties": {
-                                    "file_id": {"type": "string"},
-                                    "filename": {"type": "string"},
-                                    "content_type": {"type": "string"},
-                                    "file_type": {"type": "string"},
-                                    "patient_id": {"type": "string"},
-                                    "file_size": {"type": "integer"},
-                                    "s3_key": {"type": "string"},
-                                    "classification": {"type": "object"},
-                                    "created_at": {"type": "string"},
-                                    "updated_at": {"type": "string"}
+                                    "id": {"type": "string", "description": "Document ID"},
+                                    "name": {"type": "string"},
+                                    "type": {"type": "string", "description": "Content type of the original file"},
+                                    "size": {"type": "integer", "description": "Original file size in bytes"},
+                                    "uploadDate": {"type": "string", "description": "Processing date"},
+                                    "category": {"type": "string"},
+                                    "autoClassified": {"type": "boolean"},
+                                    "classificationConfidence": {"type": "number"},
+                                    "originalClassification": {"type": "string"},
+                                    "patientId": {"type": "string"},
+                                    "s3Uri": {"type": "string"},
+                                    "hasDiagnoses": {"type": "boolean"},
+                                    "hasSymptoms": {"type": "boolean"},
+                                    "hasMedications": {"type": "boolean"},
+                                    "hasVitalSigns": {"type": "boolean"}
                                 }
                             }
                         },
@@ -517,8 +655,9 @@ def get_files_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitionProperty
                             "properties": {
                                 "limit": {"type": "integer"},
                                 "offset": {"type": "integer"},
-                                "total": {"type": "integer"},
-                                "count": {"type": "integer"}
+                                "count": {"type": "integer"},
+                                "has_more": {"type": "boolean"},
+                                "next_cursor": {"type": "string", "description": "Pass as pagination.cursor to get the next page; null on the last page"}
                             }
                         },
                         "message": {"type": "string", "description": "Success or error message"}
@@ -539,8 +678,8 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
             "properties": {
                 "action": {
                     "type": "string",
-                    "enum": ["search_patient", "list_recent_patients", "get_patient_by_id"],
-                    "description": "The action to perform - search_patient for multi-criteria search, list_recent_patients for recent patients, get_patient_by_id for exact ID lookup"
+                    "enum": ["search_patient", "search_patients_batch", "list_recent_patients", "get_patient_by_id", "patient_summary"],
+                    "description": "The action to perform - search_patient for multi-criteria search, search_patients_batch to resolve several patients in one call, list_recent_patients for recent patients, get_patient_by_id for exact ID lookup, patient_summary for the patient with their upcoming and recent reservations and processed documents in one call"
                 },
                 "search_criteria": {
                     "type": "object",
@@ -580,18 +719,88 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
                     "additionalProperties": False,
                     "description": "Search criteria for patient lookup - at least one criterion must be provided when action is search_patient"
                 },
+                "searches": {
+                    "type": "array",
+                    "minItems": 1,
+                    "maxItems": 20,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "minLength": 1,
+                                "maxLength": 255,
+                                "description": "Patient's full name for fuzzy matching; combined with any identifiers given, all of which must also match"
+                            },
+                            "email": {
+                                "type": "string",
+                                "format": "email",
+                                "maxLength": 255,
+                                "description": "Patient's email address for exact matching (case-insensitive)"
+                            },
+                            "phone": {
+                                "type": "string",
+                                "pattern": "^[+]?[0-9\\s\\-\\(\\)]{7,20}$",
+                                "description": "Patient's phone number for exact matching (supports various formats)"
+                            },
+                            "cedula": {
+                                "type": "string",
+                                "minLength": 5,
+                                "maxLength": 20,
+                                "pattern": "^[0-9A-Za-z\\-]{5,20}$",
+                                "description": "Patient's cedula (national ID number) for exact matching"
+                            },
+                            "patient_id": {
+                                "type": "string",
+                                "minLength": 1,
+                                "maxLength": 50,
+                                "description": "Patient ID for exact matching"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 10,
+                                "default": 3,
+                                "description": "Maximum number of results for this search (default: 3, max: 10)"
+                            }
+                        },
+                        "anyOf": [
+                            {"required": ["name"]},
+                            {"required": ["email"]},
+                            {"required": ["phone"]},
+                            {"required": ["cedula"]},
+                            {"required": ["patient_id"]}
+                        ],
+                        "additionalProperties": False
+                    },
+                    "description": "Independent searches for search_patients_batch (max 20). All criteria within one search must match, as in search_patient. Results are keyed by the search's position in this array"
+                },
                 "patient_id": {
                     "type": "string",
                     "minLength": 1,
                     "maxLength": 50,
-                    "description": "Patient ID for get_patient_by_id action"
+                    "description": "Patient ID for get_patient_by_id and patient_summary actions"
                 },
                 "limit": {
                     "type": "integer",
                     "minimum": 1,
                     "maximum": 10,
                     "default": 5,
-                    "description": "Maximum number of results for list_recent_patients action"
+                    "description": "Maximum number of results for list_recent_patients action, or of rows per section for patient_summary"
+                },
+                "view": {
+                    "type": "string",
+                    "enum": ["compact", "full"],
+                    "default": "compact",
+                    "description": "Patient fields to return: compact omits created_at and updated_at; full returns every field"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["patient_id", "full_name", "email", "phone", "cedula", "date_of_birth", "created_at", "updated_at"]
+                    },
+                    "description": "Exact patient fields to return, overrides view. patient_id and full_name are always included"
                 }
             },
             "required": ["action"],
@@ -622,6 +831,22 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
                     "then": {
                         "required": ["patient_id"]
                     }
+                },
+                {
+                    "if": {
+                        "properties": {"action": {"const": "search_patients_batch"}}
+                    },
+                    "then": {
+                        "required": ["searches"]
+                    }
+                },
+                {
+                    "if": {
+                        "properties": {"action": {"const": "patient_summary"}}
+                    },
+                    "then": {
+                        "required": ["patient_id"]
+                    }
                 }
             ]
         },
@@ -687,6 +912,101 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
                             },
                             "description": "Array of patient records matching the search criteria"
                         },
+                        "results": {
+                            "type": "object",
+                            "patternProperties": {
+                                "^[0-9]+$": {
+                                    "type": "object",
+                                    "properties": {
+                                        "success": {
+                                            "type": "boolean",
+                                            "description": "False when this search's criteria were invalid"
+                                        },
+                                        "patients": {
+                                            "type": "array",
+                                            "maxItems": 10,
+                                            "items": {"type": "object"},
+                                            "description": "Patient records matching this search, same fields as patients"
+                                        },
+                                        "criteria_used": {
+                                            "type": "array",
+                                            "items": {"type": "string"},
+                                            "description": "Criteria that determined the matches of this search"
+                                        },
+                                        "errors": {
+                                            "type": "array",
+                                            "items": {"type": "string"},
+                                            "description": "Validation errors (present only when success is false)"
+                                        }
+                                    },
+                                    "required": ["success", "patients"]
+                                }
+                            },
+                            "additionalProperties": False,
+                            "description": "Per-search results of search_patients_batch, keyed by the index of the search in the request"
+                        },
+                        "summary": {
+                            "type": "object",
+                            "properties": {
+                                "upcoming_reservations": {
+                                    "type": "array",
+                                    "maxItems": 10,
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "reservation_id": {"type": "string"},
+                                            "appointment_date": {
+                                                "type": "string",
+                                                "description": "Appointment date and time (YYYY-MM-DD HH:MM:SS)"
+                                            },
+                                            "status": {"type": "string"},
+                                            "medic_id": {"type": "string"},
+                                            "medic_name": {"type": "string"},
+                                            "specialization": {"type": "string"},
+                                            "exam_id": {"type": "string"},
+                                            "exam_name": {"type": "string"},
+                                            "notes": {
+                                                "type": "string",
+                                                "description": "Reservation notes, truncated to 200 characters"
+                                            }
+                                        },
+                                        "required": ["reservation_id", "appointment_date", "status"]
+                                    },
+                                    "description": "Scheduled or confirmed reservations from now on, soonest first"
+                                },
+                                "recent_reservations": {
+                                    "type": "array",
+                                    "maxItems": 10,
+                                    "items": {"type": "object"},
+                                    "description": "Past reservations of any status, latest first, same fields as upcoming_reservations"
+                                },
+                                "documents": {
+                                    "type": "array",
+                                    "maxItems": 10,
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "document_id": {"type": "string"},
+                                            "s3_uri": {"type": "string"},
+                                            "processing_date": {"type": "string", "format": "date-time"}
+                                        },
+                                        "required": ["document_id", "s3_uri"]
+                                    },
+                                    "description": "Processed document metadata, latest first (extracted data is not included)"
+                                },
+                                "counts": {
+                                    "type": "object",
+                                    "properties": {
+                                        "upcoming_reservations": {"type": "integer", "minimum": 0},
+                                        "recent_reservations": {"type": "integer", "minimum": 0},
+                                        "documents": {"type": "integer", "minimum": 0}
+                                    },
+                                    "description": "Total rows of every section before the limit was applied"
+                                }
+                            },
+                            "required": ["upcoming_reservations", "recent_reservations", "documents", "counts"],
+                            "description": "Reservations and documents of the patient returned by patient_summary (the patient itself is in patients)"
+                        },
                         "search_metadata": {
                             "type": "object",
                             "properties": {
@@ -733,6 +1053,9 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
                                 "NO_CRITERIA",
                                 "INVALID_ACTION",
                                 "MISSING_PATIENT_ID",
+                                "INVALID_BATCH",
+                                "BATCH_TOO_LARGE",
+                                "INVALID_FIELDS",
                                 "DATABASE_ERROR",
                                 "SEARCH_ERROR",
                                 "LIST_ERROR",
@@ -742,7 +1065,7 @@ def get_patient_lookup_tool_schema() -> agentcore.CfnGatewayTarget.ToolDefinitio
                             "description": "Machine-readable error code (present only when success is false)"
                         }
                     },
-                    "required": ["success", "patients", "message"],
+                    "required": ["success", "message"],
                     "additionalProperties": False
                 }
             },
@@ -145,6 +145,12 @@ class ApiStack(Stack):
             integration=reservations_integration
         )
 
+        self.api.add_routes(
+            path="/reservations/earliest",
+            methods=[apigwv2.HttpMethod.POST],
+            integration=reservations_integration
+        )
+
         # Files routes (custom routes for file operations)
         self.api.add_routes(
             path="/files",
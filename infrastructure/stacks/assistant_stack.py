@@ -710,6 +710,12 @@ class AssistantStack(Stack):
         if self.raw_bucket:
             env_vars["RAW_BUCKET_NAME"] = self.raw_bucket.bucket_name
 
+        # Database pre-warming when a session opens (the cluster auto-pauses)
+        if self.database_cluster:
+            env_vars["DATABASE_CLUSTER_ARN"] = self.database_cluster.cluster_arn
+            env_vars["DATABASE_SECRET_ARN"] = self.database_cluster.secret.secret_arn
+            env_vars["DATABASE_NAME"] = "healthcare"
+
         # Log environment variables being set for debugging
         logger.info("=== CDK ENVIRONMENT VARIABLES CONFIGURATION ===")
         for key, value in env_vars.items():
@@ -381,6 +381,7 @@ class BackendStack(Stack):
                     "rds-data:BatchExecuteStatement",
                     "rds-data:BeginTransaction",
                     "rds-data:CommitTransaction",
+                    "rds-data:RollbackTransaction",
                     "rds:DescribeDBClusters",
                     "rds:DescribeDBInstances"
                 ],
@@ -528,6 +529,7 @@ class BackendStack(Stack):
                     "rds-data:BatchExecuteStatement",
                     "rds-data:BeginTransaction",
                     "rds-data:CommitTransaction",
+                    "rds-data:RollbackTransaction",
                     "rds:DescribeDBClusters"
                 ],
                 resources=[self.db_cluster.cluster_arn]
@@ -662,7 +664,6 @@ class BackendStack(Stack):
         # Files Function
         files_environment = {
             "CLASSIFICATION_CONFIDENCE_THRESHOLD": "80",
-            "KNOWLEDGE_BASE_ID": "healthcare-kb",
             "ENABLE_DOCUMENT_CLASSIFICATION": "true"
         }
         
@@ -682,21 +683,6 @@ class BackendStack(Stack):
         self.files_function.add_to_role_policy(ssm_policy)
         self.files_function.add_to_role_policy(rds_policy)
         
-        # Add Bedrock Agent Runtime permissions for Knowledge Base queries
-        self.files_function.add_to_role_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:Retrieve",
-                    "bedrock:GetKnowledgeBase",
-                    "bedrock:ListKnowledgeBases"
-                ],
-                resources=[
-                    f"arn:aws:bedrock:{self.region}:{self.account}:knowledge-base/*"
-                ]
-            )
-        )
-        
         # Add S3 permissions for raw bucket access if bucket name is provided
         if self.raw_bucket_name:
             self.files_function.add_to_role_policy(
@@ -757,7 +743,11 @@ class BackendStack(Stack):
             memory_size=128,  # Optimized based on actual usage metrics
             environment={
                 'LOG_LEVEL': 'INFO',
-                'PATIENT_TABLE': 'patients'
+                'PATIENT_TABLE': 'patients',
+                'NAME_SEARCH_MODE': 'trigram',
+                # In-memory patient index; raise memory_size before enabling (~2 KB per patient)
+                'PATIENT_INDEX_ENABLED': 'false',
+                'PATIENT_INDEX_REFRESH_SECONDS': '30'
             }
         )
         self.patient_lookup_function.add_to_role_policy(ssm_policy)
@@ -184,18 +184,46 @@ class DocumentWorkflowStack(Stack):
             description="Raw data bucket name for document workflow",
         )
 
+        # Lock and idempotency store of the document workflow, keyed by
+        # (s3://bucket/key, etag); see lambdas/shared/processing_lock.py
+        self.processing_lock_table = dynamodb.Table(
+            self,
+            "ProcessingLockTable",
+            table_name="healthcare-document-processing-locks",
+            partition_key=dynamodb.Attribute(
+                name="object_id", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(
+                name="etag", type=dynamodb.AttributeType.STRING),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="ttl",
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        # Knowledge Base ingestion scheduler state, one item per data source;
+        # see lambdas/shared/ingestion_scheduler.py
+        self.ingestion_state_table = dynamodb.Table(
+            self,
+            "IngestionStateTable",
+            table_name="healthcare-kb-ingestion-state",
+            partition_key=dynamodb.Attribute(
+                name="data_source", type=dynamodb.AttributeType.STRING),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
         self.bda_trigger_lambda = aws_lambda.Function(
             self,
             "BDATriggerLambda",
             function_name="healthcare-bda-trigger",
             runtime=aws_lambda.Runtime.PYTHON_3_13,
-            handler="index.lambda_handler",
+            handler="document_workflow.bda_trigger.index.lambda_handler",
             code=aws_lambda.Code.from_asset(
-                "lambdas/document_workflow/bda_trigger"),
+                "lambdas", exclude=["**/__pycache__/**"]),
             timeout=Duration.minutes(2),
             memory_size=128,  # Optimized based on actual usage metrics (max 8.6MB observed)
             environment={
                 "PROCESSED_BUCKET_NAME": self.processed_bucket.bucket_name,
+                "PROCESSING_LOCK_TABLE_NAME": self.processing_lock_table.table_name,
                 "BDA_PROJECT_ARN": self.bda_project.attr_project_arn,
                 "BDA_PROFILE_ARN": self.bda_profile_arn,
                 "MEDICAL_RECORD_BLUEPRINT_ARN": self.data_automation.blueprints["document"].attr_blueprint_arn,
@@ -215,6 +243,7 @@ class DocumentWorkflowStack(Stack):
         # Grant permissions to BDA trigger lambda
         self.raw_bucket.grant_read(self.bda_trigger_lambda)
         self.processed_bucket.grant_write(self.bda_trigger_lambda)
+        self.processing_lock_table.grant_read_write_data(self.bda_trigger_lambda)
 
         # Grant Bedrock Data Automation permissions
         self.bda_trigger_lambda.add_to_role_policy(
@@ -282,6 +311,8 @@ class DocumentWorkflowStack(Stack):
             environment={
                 "SOURCE_BUCKET_NAME": self.raw_bucket.bucket_name,
                 "PROCESSED_BUCKET_NAME": self.processed_bucket.bucket_name,
+                "PROCESSING_LOCK_TABLE_NAME": self.processing_lock_table.table_name,
+                "INGESTION_STATE_TABLE_NAME": self.ingestion_state_table.table_name,
                 "CLASSIFICATION_CONFIDENCE_THRESHOLD": "80"
                 # Knowledge Base ID and database configuration will come from SSM parameters
             },
@@ -298,6 +329,8 @@ class DocumentWorkflowStack(Stack):
         # For updating original document metadata
         self.raw_bucket.grant_read_write(self.extraction_lambda)
         self.processed_bucket.grant_read_write(self.extraction_lambda)
+        self.processing_lock_table.grant_read_write_data(self.extraction_lambda)
+        self.ingestion_state_table.grant_read_write_data(self.extraction_lambda)
 
         # Grant permissions to delete from processed bucket for cleanup operations
         self.extraction_lambda.add_to_role_policy(
@@ -319,9 +352,11 @@ class DocumentWorkflowStack(Stack):
                 effect=iam.Effect.ALLOW,
                 actions=[
                     "ssm:GetParameter",
-                    "ssm:GetParameters"
+                    "ssm:GetParameters",
+                    "ssm:GetParametersByPath"
                 ],
                 resources=[
+                    f"arn:aws:ssm:{self.region}:{self.account}:parameter/healthcare/database",
                     f"arn:aws:ssm:{self.region}:{self.account}:parameter/healthcare/database/*",
                     f"arn:aws:ssm:{self.region}:{self.account}:parameter/healthcare/knowledge-base/*"
                 ]
@@ -395,6 +430,69 @@ class DocumentWorkflowStack(Stack):
             enabled=True
         )
 
+        # * Knowledge Base Ingestion Tick Lambda Function
+        # Starts debounced and follow-up ingestion jobs recorded by the extraction lambda
+        self.ingestion_tick_lambda = aws_lambda.Function(
+            self,
+            "IngestionTickLambda",
+            function_name="healthcare-kb-ingestion-tick",
+            runtime=aws_lambda.Runtime.PYTHON_3_13,
+            handler="document_workflow.ingestion.index.lambda_handler",
+            code=aws_lambda.Code.from_asset(
+                "lambdas", exclude=["**/__pycache__/**"]),
+            timeout=Duration.seconds(30),
+            memory_size=128,
+            environment={
+                "INGESTION_STATE_TABLE_NAME": self.ingestion_state_table.table_name
+            },
+            log_group=logs.LogGroup(
+                self,
+                "IngestionTickLambdaLogGroup",
+                log_group_name="/aws/lambda/healthcare-kb-ingestion-tick",
+                retention=logs.RetentionDays.ONE_WEEK,
+                removal_policy=RemovalPolicy.DESTROY,
+            ),
+        )
+
+        self.ingestion_state_table.grant_read_write_data(self.ingestion_tick_lambda)
+
+        self.ingestion_tick_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=[
+                    "ssm:GetParameter",
+                    "ssm:GetParameters"
+                ],
+                resources=[
+                    f"arn:aws:ssm:{self.region}:{self.account}:parameter/healthcare/knowledge-base/*"
+                ]
+            )
+        )
+
+        self.ingestion_tick_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=[
+                    "bedrock:StartIngestionJob",
+                    "bedrock:GetIngestionJob",
+                    "bedrock:ListIngestionJobs"
+                ],
+                resources=[
+                    f"arn:aws:bedrock:{self.region}:{self.account}:knowledge-base/*"
+                ]
+            )
+        )
+
+        self.ingestion_tick_rule = events.Rule(
+            self,
+            "IngestionTickRule",
+            rule_name="healthcare-kb-ingestion-tick",
+            description="Start debounced and follow-up Knowledge Base ingestion jobs",
+            schedule=events.Schedule.rate(Duration.minutes(1)),
+            targets=[targets.LambdaFunction(self.ingestion_tick_lambda, retry_attempts=0)],
+            enabled=True
+        )
+
         # * Data Cleanup Lambda Function
         self.cleanup_lambda = aws_lambda.Function(
             self,
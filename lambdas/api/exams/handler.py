@@ -12,12 +12,14 @@ Endpoints:
 
 import logging
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from shared.database import DatabaseManager, DatabaseError
+from shared.cache import ReferenceCache, query_key
 from shared.utils import (
     create_response, create_error_response, parse_event_body,
     extract_path_parameters, extract_query_parameters, validate_required_fields,
-    validate_pagination_params, handle_exceptions, generate_uuid, get_current_timestamp
+    validate_pagination_params, build_page_info, select_fields, mcp_projection_params,
+    handle_exceptions, generate_uuid, get_current_timestamp
 )
 
 logger = logging.getLogger()
@@ -26,6 +28,15 @@ logger.setLevel(logging.INFO)
 # Initialize database manager
 db_manager = DatabaseManager()
 
+# Exams change rarely; reads are served from this container's cache
+exams_cache = ReferenceCache('exams')
+
+# Fields returned by list and get, in response order
+EXAM_FIELDS = ['exam_id', 'exam_name', 'exam_type', 'description', 'duration_minutes', 'created_at', 'updated_at']
+
+# Compact view (default for MCP Gateway requests)
+EXAM_COMPACT_FIELDS = ['exam_id', 'exam_name', 'exam_type', 'duration_minutes']
+
 
 @handle_exceptions
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -59,7 +70,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     elif normalized_path.startswith('/exams/') and path_params and 'id' in path_params:
         exam_id = path_params['id']
         if http_method == 'GET':
-            return get_exam(exam_id)
+            return get_exam(exam_id, extract_query_parameters(event))
         elif http_method == 'PUT':
             return update_exam(exam_id, event)
         elif http_method == 'DELETE':
@@ -74,58 +85,72 @@ def list_exams(event: Dict[str, Any]) -> Dict[str, Any]:
     
     Query parameters:
     - limit: Number of exams to return (default: 50, max: 1000)
-    - offset: Number of exams to skip (default: 0)
+    - cursor: next_cursor of the previous page (optional)
+    - offset: Number of exams to skip (default: 0; use cursor for deep pages)
+    - include_total: Return the exact total count (default: false)
     - exam_type: Filter by exam type (optional)
+    - view: compact or full (default: full)
+    - fields: Comma-separated fields to return (optional, overrides view)
     
     Returns:
         List of exams with pagination info
     """
     try:
         query_params = extract_query_parameters(event)
-        pagination = validate_pagination_params(query_params)
+        try:
+            pagination = validate_pagination_params(query_params, cursor_keys=1)
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_PAGINATION")
+        try:
+            fields = select_fields(query_params, EXAM_FIELDS, EXAM_COMPACT_FIELDS, required=['exam_id', 'exam_name'])
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
         exam_type_filter = query_params.get('exam_type')
         
         # Build query with optional exam type filter
-        where_clause = ""
-        parameters = [
-            db_manager.create_parameter('limit', pagination['limit'], 'long'),
+        filter_conditions = []
+        filter_parameters = []
+        
+        if exam_type_filter:
+            filter_conditions.append("LOWER(exam_type) LIKE LOWER(:exam_type)")
+            filter_parameters.append(db_manager.create_parameter('exam_type', f'%{exam_type_filter}%', 'string'))
+        
+        page_conditions = list(filter_conditions)
+        parameters = filter_parameters + [
+            db_manager.create_parameter('limit', pagination['limit'] + 1, 'long'),
             db_manager.create_parameter('offset', pagination['offset'], 'long')
         ]
         
-        if exam_type_filter:
-            where_clause = "WHERE LOWER(exam_type) LIKE LOWER(:exam_type)"
-            parameters.append(db_manager.create_parameter('exam_type', f'%{exam_type_filter}%', 'string'))
+        if pagination['cursor']:
+            # exam_name is unique, so it is a complete sort key on its own
+            page_conditions.append("exam_name > :cursor_name")
+            parameters.append(db_manager.create_parameter('cursor_name', pagination['cursor'][0], 'string'))
+        
+        where_clause = "WHERE " + " AND ".join(page_conditions) if page_conditions else ""
         
         sql = f"""
-        SELECT exam_id, exam_name, exam_type, description, duration_minutes, created_at, updated_at
+        SELECT {', '.join(fields)}
         FROM exams
         {where_clause}
         ORDER BY exam_name
         LIMIT :limit OFFSET :offset
         """
         
-        response = db_manager.execute_sql(sql, parameters)
-        exams = db_manager.parse_records(
-            response.get('records', []),
-            response.get('columnMetadata', [])
-        )
+        exams = fetch_exams(sql, parameters)
+        page_info = build_page_info(exams, pagination, lambda row: [row['exam_name']])
         
-        # Get total count for pagination
-        count_sql = f"SELECT COUNT(*) as total FROM exams {where_clause}"
-        count_params = [p for p in parameters if p['name'] == 'exam_type'] if exam_type_filter else []
-        count_response = db_manager.execute_sql(count_sql, count_params)
-        total_count = 0
-        if count_response.get('records'):
-            total_count = count_response['records'][0][0].get('longValue', 0)
+        if pagination['include_total']:
+            count_where = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+            count_rows = fetch_exams(f"SELECT COUNT(*) as total FROM exams {count_where}", filter_parameters)
+            page_info['total'] = count_rows[0]['total'] if count_rows else 0
+        elif not filter_conditions and not pagination['cursor'] and not pagination['offset']:
+            page_info['estimated_total'] = exams_cache.get(
+                db_manager, 'estimated_total', lambda: db_manager.estimate_row_count('exams')
+            )
         
         return create_response(200, {
             'exams': exams,
-            'pagination': {
-                'limit': pagination['limit'],
-                'offset': pagination['offset'],
-                'total': total_count,
-                'count': len(exams)
-            },
+            'pagination': page_info,
             'filters': {
                 'exam_type': exam_type_filter
             } if exam_type_filter else {}
@@ -140,6 +165,27 @@ def list_exams(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
+def fetch_exams(sql: str, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run a read query on exams through the reference cache.
+    
+    Args:
+        sql: SELECT statement
+        parameters: Its parameters
+        
+    Returns:
+        Parsed rows
+    """
+    def load():
+        response = db_manager.execute_sql(sql, parameters)
+        return db_manager.parse_records(
+            response.get('records', []),
+            response.get('columnMetadata', [])
+        )
+    
+    return exams_cache.get(db_manager, query_key(sql, parameters), load)
+
+
 def create_exam(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle POST /exams - Create new exam.
@@ -190,6 +236,7 @@ def create_exam(event: Dict[str, Any]) -> Dict[str, Any]:
             response.get('columnMetadata', [])
         )[0]
         
+        exams_cache.invalidate()
         logger.info(f"Created exam: {exam_id}")
         
         return create_response(201, {
@@ -206,19 +253,25 @@ def create_exam(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def get_exam(exam_id: str) -> Dict[str, Any]:
+def get_exam(exam_id: str, query_params: Dict[str, str] = None) -> Dict[str, Any]:
     """
     Handle GET /exams/{id} - Get exam by ID.
     
     Args:
         exam_id: Exam ID
+        query_params: view and fields parameters (optional, default: full view)
         
     Returns:
         Exam data or 404 if not found
     """
     try:
-        sql = """
-        SELECT exam_id, exam_name, exam_type, description, duration_minutes, created_at, updated_at
+        try:
+            fields = select_fields(query_params or {}, EXAM_FIELDS, EXAM_COMPACT_FIELDS, required=['exam_id'])
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
+        
+        sql = f"""
+        SELECT {', '.join(fields)}
         FROM exams
         WHERE exam_id = :exam_id
         """
@@ -227,18 +280,12 @@ def get_exam(exam_id: str) -> Dict[str, Any]:
             db_manager.create_parameter('exam_id', exam_id, 'string')
         ]
         
-        response = db_manager.execute_sql(sql, parameters)
-        records = response.get('records', [])
+        exams = fetch_exams(sql, parameters)
         
-        if not records:
+        if not exams:
             return create_error_response(404, "Exam not found", "EXAM_NOT_FOUND")
         
-        exam = db_manager.parse_records(
-            records,
-            response.get('columnMetadata', [])
-        )[0]
-        
-        return create_response(200, {'exam': exam})
+        return create_response(200, {'exam': exams[0]})
         
     except DatabaseError as e:
         logger.error(f"Database error in get_exam: {str(e)}")
@@ -307,6 +354,7 @@ def update_exam(exam_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
             response.get('columnMetadata', [])
         )[0]
         
+        exams_cache.invalidate()
         logger.info(f"Updated exam: {exam_id}")
         
         return create_response(200, {
@@ -361,6 +409,7 @@ def delete_exam(exam_id: str) -> Dict[str, Any]:
         if not records:
             return create_error_response(404, "Exam not found", "EXAM_NOT_FOUND")
         
+        exams_cache.invalidate()
         logger.info(f"Deleted exam: {exam_id}")
         
         return create_response(200, {
@@ -403,8 +452,12 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
         },
         "pagination": {
             "limit": int,
-            "offset": int
-        }
+            "offset": int,
+            "cursor": "string (next_cursor of the previous page)",
+            "include_total": bool
+        },
+        "view": "compact|full (default: compact)",
+        "fields": ["optional", "field", "names"]
     }
     """
     try:
@@ -417,7 +470,8 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             if event.get('exam_type'):
                 query_params['exam_type'] = event['exam_type']
             if event.get('pagination'):
-                query_params.update(event['pagination'])
+                query_params.update({key: str(value) for key, value in event['pagination'].items()})
+            query_params.update(mcp_projection_params(event))
             
             mock_event = {
                 'queryStringParameters': query_params
@@ -428,7 +482,7 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             exam_id = event.get('exam_id')
             if not exam_id:
                 return create_error_response(400, "exam_id is required for get action")
-            return get_exam(exam_id)
+            return get_exam(exam_id, mcp_projection_params(event))
             
         elif action == 'create':
             exam_data = event.get('exam_data')
@@ -17,9 +17,11 @@ import sys
 sys.path.append('/opt/python')
 sys.path.append('/var/task')
 
+from shared.database import DatabaseManager, DatabaseError
 from shared.utils import (
     create_response, create_error_response, parse_event_body,
     extract_path_parameters, extract_query_parameters, validate_required_fields,
+    validate_pagination_params, build_page_info,
     handle_exceptions, generate_uuid, get_current_timestamp
 )
 
@@ -28,6 +30,14 @@ logger.setLevel(logging.INFO)
 
 # Initialize services
 s3_client = boto3.client('s3')
+db_manager = DatabaseManager()
+
+# processed_documents columns read by the listing (written by the extraction function)
+FILE_LIST_COLUMNS = [
+    'file_id', 'document_id', 'patient_id', 'file_name', 'content_type', 'size_bytes', 's3_uri',
+    'processing_date', 'category', 'original_classification', 'classification_confidence',
+    'auto_classified', 'has_diagnoses', 'has_symptoms', 'has_medications', 'has_vital_signs'
+]
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -85,7 +95,11 @@ def handle_action_request(body: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Processing AgentCore action: {action}")
     
     action_handlers = {
-        'list': lambda: handle_list_files(body.get('patient_id'), body.get('file_type')),
+        'list': lambda: handle_list_files(
+            body.get('patient_id'),
+            body.get('file_type') or body.get('category'),
+            {key: str(value) for key, value in (body.get('pagination') or {}).items() if value is not None}
+        ),
         'upload': lambda: handle_file_upload(body),
         'classify': lambda: handle_classification_update(body.get('file_id'), body.get('category')),
         'delete': lambda: handle_file_deletion(body.get('file_id'))
@@ -107,7 +121,7 @@ def handle_http_request(event: Dict[str, Any]) -> Dict[str, Any]:
     
     if method == 'GET' and '/files' in path:
         query_params = event.get('queryStringParameters') or {}
-        return handle_list_files(query_params.get('patient_id'), query_params.get('category'))
+        return handle_list_files(query_params.get('patient_id'), query_params.get('category'), query_params)
     elif method == 'POST' and '/files/upload' in path:
         body = parse_event_body(event)
         return handle_file_upload(body)
@@ -131,22 +145,95 @@ def extract_file_id_from_path(path: str) -> Optional[str]:
     return None
 
 
-def handle_list_files(patient_id: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Any]:
+def handle_list_files(
+    patient_id: Optional[str] = None,
+    category: Optional[str] = None,
+    pagination_params: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
-    Get files for a patient using Knowledge Base metadata queries.
+    List processed documents, newest first, from the processed_documents table.
     Unified handler for both HTTP and AgentCore Gateway requests.
+
+    Pages are read with a keyset condition on (processing_date, file_id),
+    which the patient/category indexes serve directly; pass next_cursor back
+    as cursor for the next page.
     """
     try:
-        # Query Knowledge Base using metadata filters
-        files = query_knowledge_base_documents(patient_id, category)
-        
-        return create_response(200, {'files': files})
-        
+        pagination = validate_pagination_params(pagination_params or {}, cursor_keys=2)
+    except ValueError as e:
+        return create_response(400, {'error': str(e), 'error_code': 'INVALID_PAGINATION'})
+
+    try:
+        conditions = []
+        parameters = [
+            db_manager.create_parameter('limit', pagination['limit'] + 1, 'long'),
+            db_manager.create_parameter('offset', pagination['offset'], 'long')
+        ]
+
+        if patient_id:
+            conditions.append("patient_id = :patient_id")
+            parameters.append(db_manager.create_parameter('patient_id', patient_id, 'string'))
+
+        if category and category != 'all':
+            conditions.append("category = :category")
+            parameters.append(db_manager.create_parameter('category', category, 'string'))
+
+        if pagination['cursor']:
+            conditions.append(
+                "(processing_date, file_id) < (CAST(:cursor_date AS timestamptz), :cursor_id)"
+            )
+            parameters.extend([
+                db_manager.create_parameter('cursor_date', pagination['cursor'][0], 'string'),
+                db_manager.create_parameter('cursor_id', pagination['cursor'][1], 'string')
+            ])
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+        SELECT {', '.join(FILE_LIST_COLUMNS)}
+        FROM processed_documents
+        {where_clause}
+        ORDER BY processing_date DESC, file_id DESC
+        LIMIT :limit OFFSET :offset
+        """
+
+        rows = db_manager.execute_query(sql, parameters, format='json')
+        page_info = build_page_info(rows, pagination, lambda row: [row['processing_date'], row['file_id']])
+
+        return create_response(200, {
+            'files': [format_file(row) for row in rows],
+            'pagination': page_info
+        })
+
+    except DatabaseError as e:
+        logger.error(f"Database error getting files: {str(e)}")
+        return create_response(500, {'error': 'Failed to get files', 'error_code': e.error_code})
     except Exception as e:
         logger.error(f"Error getting files: {str(e)}")
         return create_response(500, {'error': 'Failed to get files'})
 
 
+def format_file(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a processed_documents row as the file entry used by the frontend."""
+    return {
+        'id': row['file_id'],
+        'documentId': row['document_id'],
+        'name': row['file_name'] or f"{row['document_id']}.json",
+        'type': row['content_type'] or 'application/octet-stream',
+        'size': row['size_bytes'] or 0,
+        'uploadDate': row['processing_date'],
+        'category': row['category'],
+        'autoClassified': row['auto_classified'],
+        'classificationConfidence': float(row['classification_confidence'] or 0),
+        'originalClassification': row['original_classification'] or '',
+        'patientId': row['patient_id'] or '',
+        's3Uri': row['s3_uri'],
+        'hasDiagnoses': row['has_diagnoses'],
+        'hasSymptoms': row['has_symptoms'],
+        'hasMedications': row['has_medications'],
+        'hasVitalSigns': row['has_vital_signs']
+    }
+
+
 def handle_file_upload(body: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle file upload - files will be processed by BDA and stored in Knowledge Base.
@@ -244,23 +331,31 @@ def handle_classification_update(file_id: Optional[str], new_category: Optional[
 
 def handle_file_deletion(file_id: Optional[str]) -> Dict[str, Any]:
     """
-    Delete a document from Knowledge Base (not implemented - requires Knowledge Base management).
+    Remove a document from the file listing (its processed_documents row).
     Unified handler for both HTTP and AgentCore Gateway requests.
+
+    The Knowledge Base keeps the document until its data source is cleaned up.
     """
     try:
         if not file_id:
             return create_response(400, {'error': 'file_id is required'})
-        
-        # Note: Deleting documents from Knowledge Base requires more complex operations
-        # involving data source management and re-ingestion
-        # For now, we return a message indicating this is not implemented
-        
-        return create_response(501, {
-            'message': 'Document deletion from Knowledge Base not implemented',
+
+        deleted = db_manager.execute_query(
+            "DELETE FROM processed_documents WHERE file_id = :file_id RETURNING file_id",
+            [db_manager.create_parameter('file_id', file_id, 'string')]
+        )
+        if not deleted:
+            return create_response(404, {'error': 'File not found', 'error_code': 'FILE_NOT_FOUND'})
+
+        return create_response(200, {
+            'message': 'Document removed from the file listing',
             'file_id': file_id,
             'note': 'Knowledge Base document deletion requires data source management operations'
         })
-        
+
+    except DatabaseError as e:
+        logger.error(f"Database error deleting document {file_id}: {str(e)}")
+        return create_response(500, {'error': 'Failed to delete document', 'error_code': e.error_code})
     except Exception as e:
         logger.error(f"Error deleting document: {str(e)}")
         return create_response(500, {'error': 'Failed to delete document'})
@@ -396,92 +491,6 @@ def create_classification_fallback(reason: str) -> Dict[str, Any]:
         'fallback_applied': True
     }
 
-def query_knowledge_base_documents(patient_id: Optional[str] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
-    """
-    Query Knowledge Base for documents using metadata filters.
-    
-    Args:
-        patient_id: Optional patient ID filter
-        category: Optional document category filter
-        
-    Returns:
-        List of document metadata
-    """
-    try:
-        # Initialize Bedrock Agent Runtime client for Knowledge Base queries
-        bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
-        
-        # Build metadata filters
-        filters = []
-        
-        if patient_id:
-            filters.append({
-                'key': 'patientId',
-                'value': patient_id,
-                'operator': 'EQUALS'
-            })
-        
-        if category and category != 'all':
-            filters.append({
-                'key': 'documentCategory', 
-                'value': category,
-                'operator': 'EQUALS'
-            })
-        
-        # Query Knowledge Base with metadata filters
-        knowledge_base_id = os.environ.get('KNOWLEDGE_BASE_ID', '')
-        if not knowledge_base_id:
-            logger.warning("KNOWLEDGE_BASE_ID not configured")
-            return []
-        
-        # Use retrieve API to get documents with metadata
-        query_params = {
-            'knowledgeBaseId': knowledge_base_id,
-            'retrievalQuery': {
-                'text': '*'  # Get all documents
-            }
-        }
-        
-        if filters:
-            query_params['retrievalConfiguration'] = {
-                'vectorSearchConfiguration': {
-                    'filter': {
-                        'andAll': filters
-                    }
-                }
-            }
-        
-        response = bedrock_agent_runtime.retrieve(**query_params)
-        
-        # Format response for frontend
-        formatted_files = []
-        for result in response.get('retrievalResults', []):
-            metadata = result.get('metadata', {})
-            
-            formatted_files.append({
-                'id': metadata.get('documentId', ''),
-                'name': f"{metadata.get('documentId', 'unknown')}.json",
-                'type': 'application/json',
-                'size': len(result.get('content', {}).get('text', '')),
-                'uploadDate': metadata.get('processingDate', ''),
-                'category': metadata.get('documentCategory', 'other'),
-                'autoClassified': metadata.get('autoClassified', False),
-                'classificationConfidence': metadata.get('classificationConfidence', 0.0),
-                'originalClassification': metadata.get('originalClassification', ''),
-                'patientId': metadata.get('patientId', ''),
-                'hasDiagnoses': metadata.get('hasDiagnoses', False),
-                'hasSymptoms': metadata.get('hasSymptoms', False),
-                'hasMedications': metadata.get('hasMedications', False),
-                'hasVitalSigns': metadata.get('hasVitalSigns', False)
-            })
-        
-        return formatted_files
-        
-    except Exception as e:
-        logger.error(f"Error querying Knowledge Base: {str(e)}")
-        return []
-
-
 def is_classification_service_available() -> bool:
     """
     Check if classification service is available and enabled
@@ -4,10 +4,31 @@ Run with: python -m pytest lambdas/api/files/test_handler.py -v
 """
 
 import json
+import os
 import sys
 sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
 
+import pytest
+
+import api.files.handler as files_handler
 from api.files.handler import lambda_handler
+from shared.utils import encode_cursor
+
+
+def document_row(document_id, processing_date, category='exam-results'):
+    return {
+        'file_id': f'file-{document_id}', 'document_id': document_id, 'patient_id': 'test-patient-123', 'file_name': f'{document_id}.pdf',
+        'content_type': 'application/pdf', 'size_bytes': 2048, 's3_uri': f's3://processed/{document_id}',
+        'processing_date': processing_date, 'category': category, 'original_classification': category,
+        'classification_confidence': '91.50', 'auto_classified': True, 'has_diagnoses': True,
+        'has_symptoms': False, 'has_medications': True, 'has_vital_signs': False
+    }
+
+
+@pytest.fixture(autouse=True)
+def use_stub_database(monkeypatch, stub_database):
+    monkeypatch.setattr(files_handler, 'db_manager', stub_database)
 
 
 def test_agentcore_direct_event():
@@ -68,8 +89,56 @@ def test_invalid_request():
     print("✅ Invalid request handling works")
 
 
+def test_list_reads_processed_documents_with_cursor(stub_database):
+    """Listing filters processed_documents and pages on (processing_date, file_id)."""
+    stub_database.rows = [
+        document_row('doc-3', '2031-01-03 10:00:00'),
+        document_row('doc-2', '2031-01-02 10:00:00'),
+        document_row('doc-1', '2031-01-01 10:00:00'),
+    ]
+    event = {
+        "action": "list",
+        "patient_id": "test-patient-123",
+        "file_type": "exam-results",
+        "pagination": {"limit": 2}
+    }
+
+    body = json.loads(lambda_handler(event, None)['body'])
+
+    sql, params = stub_database.queries[0]
+    assert 'FROM processed_documents' in sql and 'patient_id = :patient_id' in sql
+    assert params['category'] == 'exam-results' and params['limit'] == 3
+    assert [file['id'] for file in body['files']] == ['file-doc-3', 'file-doc-2']
+    assert body['files'][0]['documentId'] == 'doc-3'
+    assert body['files'][0]['size'] == 2048 and body['files'][0]['classificationConfidence'] == 91.5
+    assert body['pagination']['next_cursor'] == encode_cursor(['2031-01-02 10:00:00', 'file-doc-2'])
+
+    event['pagination']['cursor'] = body['pagination']['next_cursor']
+    lambda_handler(event, None)
+    sql, params = stub_database.queries[1]
+    assert '(processing_date, file_id) < (CAST(:cursor_date AS timestamptz), :cursor_id)' in sql
+    assert (params['cursor_date'], params['cursor_id']) == ('2031-01-02 10:00:00', 'file-doc-2')
+
+
+def test_delete_removes_the_listing_row(stub_database):
+    """Deleting a file drops its processed_documents row; unknown IDs are 404."""
+    stub_database.rows = [{'file_id': 'file-doc-1'}]
+    result = lambda_handler({"action": "delete", "file_id": "file-doc-1"}, None)
+
+    assert result['statusCode'] == 200
+    sql, params = stub_database.queries[0]
+    assert sql.startswith('DELETE FROM processed_documents') and params == {'file_id': 'file-doc-1'}
+
+    stub_database.rows = []
+    result = lambda_handler({"action": "delete", "file_id": "missing"}, None)
+    assert result['statusCode'] == 404
+    assert json.loads(result['body'])['error_code'] == 'FILE_NOT_FOUND'
+
+
 if __name__ == "__main__":
     print("Testing files Lambda handler request formats...\n")
+    from conftest import StubDatabase
+    files_handler.db_manager = StubDatabase()
     
     try:
         test_agentcore_direct_event()
@@ -12,12 +12,15 @@ Endpoints:
 
 import logging
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from shared.database import DatabaseManager, DatabaseError
+from shared.cache import ReferenceCache, query_key
+from shared.schema import ensure_schema_version
 from shared.utils import (
     create_response, create_error_response, parse_event_body,
     extract_path_parameters, extract_query_parameters, validate_required_fields,
-    validate_pagination_params, handle_exceptions, generate_uuid, get_current_timestamp
+    validate_pagination_params, build_page_info, select_fields, mcp_projection_params,
+    handle_exceptions, generate_uuid, get_current_timestamp
 )
 
 logger = logging.getLogger()
@@ -26,6 +29,22 @@ logger.setLevel(logging.INFO)
 # Initialize database manager
 db_manager = DatabaseManager()
 
+# Medics change rarely; reads are served from this container's cache
+medics_cache = ReferenceCache('medics')
+
+# Fields returned by list and get, in response order, and the column each one selects
+MEDIC_FIELDS = {
+    'medic_id': 'medic_id',
+    'full_name': 'first_name as full_name',
+    'specialty': 'specialization as specialty',
+    'license_number': 'license_number',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+# Compact view (default for MCP Gateway requests)
+MEDIC_COMPACT_FIELDS = ['medic_id', 'full_name', 'specialty']
+
 
 @handle_exceptions
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -59,7 +78,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     elif normalized_path.startswith('/medics/') and path_params and 'id' in path_params:
         medic_id = path_params['id']
         if http_method == 'GET':
-            return get_medic(medic_id)
+            return get_medic(medic_id, extract_query_parameters(event))
         elif http_method == 'PUT':
             return update_medic(medic_id, event)
         elif http_method == 'DELETE':
@@ -90,7 +109,9 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
         "action": "list|get|create|update|delete",
         "medic_id": "optional-medic-id",
         "medic_data": {...},
-        "pagination": {...}
+        "pagination": {...},
+        "view": "compact|full (default: compact)",
+        "fields": ["optional", "field", "names"]
     }
     """
     try:
@@ -104,10 +125,14 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
                 pagination = event['pagination']
                 query_params['limit'] = str(pagination.get('limit', 50))
                 query_params['offset'] = str(pagination.get('offset', 0))
+                for param in ['cursor', 'include_total']:
+                    if pagination.get(param) is not None:
+                        query_params[param] = str(pagination[param])
             
             # Add filter parameters
             if 'specialty' in event:
                 query_params['specialty'] = str(event['specialty'])
+            query_params.update(mcp_projection_params(event))
             
             # Create mock API Gateway event
             mock_event = {
@@ -119,7 +144,7 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             medic_id = event.get('medic_id')
             if not medic_id:
                 return create_error_response(400, "medic_id required for get action")
-            return get_medic(medic_id)
+            return get_medic(medic_id, mcp_projection_params(event))
             
         elif action == 'create':
             medic_data = event.get('medic_data')
@@ -166,58 +191,76 @@ def list_medics(event: Dict[str, Any]) -> Dict[str, Any]:
     
     Query parameters:
     - limit: Number of medics to return (default: 50, max: 1000)
-    - offset: Number of medics to skip (default: 0)
+    - cursor: next_cursor of the previous page (optional)
+    - offset: Number of medics to skip (default: 0; use cursor for deep pages)
+    - include_total: Return the exact total count (default: false)
     - specialty: Filter by specialty (optional)
+    - view: compact or full (default: full)
+    - fields: Comma-separated fields to return (optional, overrides view)
     
     Returns:
         List of medics with pagination info
     """
     try:
         query_params = extract_query_parameters(event)
-        pagination = validate_pagination_params(query_params)
+        try:
+            pagination = validate_pagination_params(query_params, cursor_keys=2)
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_PAGINATION")
+        try:
+            fields = select_fields(
+                query_params, list(MEDIC_FIELDS), MEDIC_COMPACT_FIELDS, required=['medic_id', 'full_name']
+            )
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
         specialty_filter = query_params.get('specialty')
         
         # Build query with optional specialty filter
-        where_clause = ""
-        parameters = [
-            db_manager.create_parameter('limit', pagination['limit'], 'long'),
+        filter_conditions = []
+        filter_parameters = []
+        
+        if specialty_filter:
+            filter_conditions.append("LOWER(specialization) LIKE LOWER(:specialty)")
+            filter_parameters.append(db_manager.create_parameter('specialty', f'%{specialty_filter}%', 'string'))
+        
+        page_conditions = list(filter_conditions)
+        parameters = filter_parameters + [
+            db_manager.create_parameter('limit', pagination['limit'] + 1, 'long'),
             db_manager.create_parameter('offset', pagination['offset'], 'long')
         ]
         
-        if specialty_filter:
-            where_clause = "WHERE LOWER(specialization) LIKE LOWER(:specialty)"
-            parameters.append(db_manager.create_parameter('specialty', f'%{specialty_filter}%', 'string'))
+        if pagination['cursor']:
+            page_conditions.append("(first_name, medic_id) > (:cursor_name, :cursor_id)")
+            parameters.extend([
+                db_manager.create_parameter('cursor_name', pagination['cursor'][0], 'string'),
+                db_manager.create_parameter('cursor_id', pagination['cursor'][1], 'string')
+            ])
+        
+        where_clause = "WHERE " + " AND ".join(page_conditions) if page_conditions else ""
         
         sql = f"""
-        SELECT medic_id, first_name as full_name, specialization as specialty, license_number, created_at, updated_at
+        SELECT {', '.join(MEDIC_FIELDS[field] for field in fields)}
         FROM medics
         {where_clause}
-        ORDER BY first_name
+        ORDER BY first_name, medic_id
         LIMIT :limit OFFSET :offset
         """
         
-        response = db_manager.execute_sql(sql, parameters)
-        medics = db_manager.parse_records(
-            response.get('records', []),
-            response.get('columnMetadata', [])
-        )
+        medics = fetch_medics(sql, parameters)
+        page_info = build_page_info(medics, pagination, lambda row: [row['full_name'], row['medic_id']])
         
-        # Get total count for pagination
-        count_sql = f"SELECT COUNT(*) as total FROM medics {where_clause}"
-        count_params = [p for p in parameters if p['name'] == 'specialty'] if specialty_filter else []
-        count_response = db_manager.execute_sql(count_sql, count_params)
-        total_count = 0
-        if count_response.get('records'):
-            total_count = count_response['records'][0][0].get('longValue', 0)
+        if pagination['include_total']:
+            count_where = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+            count_rows = fetch_medics(f"SELECT COUNT(*) as total FROM medics {count_where}", filter_parameters)
+            page_info['total'] = count_rows[0]['total'] if count_rows else 0
+        elif not filter_conditions and not pagination['cursor'] and not pagination['offset']:
+            page_info['estimated_total'] = medics_cache.get(
+                db_manager, 'estimated_total', lambda: db_manager.estimate_row_count('medics')
+            )
         
         return create_response(200, {
             'medics': medics,
-            'pagination': {
-                'limit': pagination['limit'],
-                'offset': pagination['offset'],
-                'total': total_count,
-                'count': len(medics)
-            },
+            'pagination': page_info,
             'filters': {
                 'specialty': specialty_filter
             } if specialty_filter else {}
@@ -232,6 +275,27 @@ def list_medics(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
+def fetch_medics(sql: str, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run a read query on medics through the reference cache.
+    
+    Args:
+        sql: SELECT statement
+        parameters: Its parameters
+        
+    Returns:
+        Parsed rows
+    """
+    def load():
+        response = db_manager.execute_sql(sql, parameters)
+        return db_manager.parse_records(
+            response.get('records', []),
+            response.get('columnMetadata', [])
+        )
+    
+    return medics_cache.get(db_manager, query_key(sql, parameters), load)
+
+
 def create_medic(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle POST /medics - Create new medic.
@@ -245,10 +309,10 @@ def create_medic(event: Dict[str, Any]) -> Dict[str, Any]:
         Created medic data
     """
     try:
-        # Ensure medics table exists
-        ensure_table_exists('medics')
-        
         body = parse_event_body(event)
+
+        # Verify the schema version once per container
+        ensure_schema_version(db_manager)
         
         # Validate required fields
         validation_error = validate_required_fields(body, ['full_name', 'specialty', 'license_number'])
@@ -295,6 +359,7 @@ def create_medic(event: Dict[str, Any]) -> Dict[str, Any]:
             response.get('columnMetadata', [])
         )[0]
         
+        medics_cache.invalidate()
         logger.info(f"Created medic: {medic_id}")
         
         return create_response(201, {
@@ -312,19 +377,25 @@ def create_medic(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def get_medic(medic_id: str) -> Dict[str, Any]:
+def get_medic(medic_id: str, query_params: Dict[str, str] = None) -> Dict[str, Any]:
     """
     Handle GET /medics/{id} - Get medic by ID.
     
     Args:
         medic_id: Medic ID
+        query_params: view and fields parameters (optional, default: full view)
         
     Returns:
         Medic data or 404 if not found
     """
     try:
-        sql = """
-        SELECT medic_id, first_name as full_name, specialization as specialty, license_number, created_at, updated_at
+        try:
+            fields = select_fields(query_params or {}, list(MEDIC_FIELDS), MEDIC_COMPACT_FIELDS, required=['medic_id'])
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
+        
+        sql = f"""
+        SELECT {', '.join(MEDIC_FIELDS[field] for field in fields)}
         FROM medics
         WHERE medic_id = :medic_id
         """
@@ -333,18 +404,12 @@ def get_medic(medic_id: str) -> Dict[str, Any]:
             db_manager.create_parameter('medic_id', medic_id, 'string')
         ]
         
-        response = db_manager.execute_sql(sql, parameters)
-        records = response.get('records', [])
+        medics = fetch_medics(sql, parameters)
         
-        if not records:
+        if not medics:
             return create_error_response(404, "Medic not found", "MEDIC_NOT_FOUND")
         
-        medic = db_manager.parse_records(
-            records,
-            response.get('columnMetadata', [])
-        )[0]
-        
-        return create_response(200, {'medic': medic})
+        return create_response(200, {'medic': medics[0]})
         
     except DatabaseError as e:
         logger.error(f"Database error in get_medic: {str(e)}")
@@ -423,6 +488,7 @@ def update_medic(medic_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
             response.get('columnMetadata', [])
         )[0]
         
+        medics_cache.invalidate()
         logger.info(f"Updated medic: {medic_id}")
         
         return create_response(200, {
@@ -439,29 +505,6 @@ def update_medic(medic_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def ensure_table_exists(table_name: str) -> None:
-    """Ensure a table exists by creating it if necessary."""
-    try:
-        if table_name == 'medics':
-            sql = """
-            CREATE TABLE IF NOT EXISTS medics (
-                medic_id VARCHAR(255) PRIMARY KEY,
-                first_name VARCHAR(200) NOT NULL,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                specialization VARCHAR(100),
-                license_number VARCHAR(50) UNIQUE,
-                phone VARCHAR(20),
-                department VARCHAR(100),
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            db_manager.execute_sql(sql, [])
-            logger.info(f"Ensured {table_name} table exists")
-    except Exception as e:
-        logger.warning(f"Could not ensure {table_name} table exists: {e}")
-
-
 def delete_medic(medic_id: str) -> Dict[str, Any]:
     """
     Handle DELETE /medics/{id} - Delete medic.
@@ -500,6 +543,7 @@ def delete_medic(medic_id: str) -> Dict[str, Any]:
         if not records:
             return create_error_response(404, "Medic not found", "MEDIC_NOT_FOUND")
         
+        medics_cache.invalidate()
         logger.info(f"Deleted medic: {medic_id}")
         
         return create_response(200, {
@@ -14,10 +14,12 @@ import logging
 import json
 from typing import Dict, Any
 from shared.database import DatabaseManager, DatabaseError
+from shared.schema import ensure_schema_version
 from shared.utils import (
     create_response, create_error_response, parse_event_body,
     extract_path_parameters, extract_query_parameters, validate_required_fields,
-    validate_pagination_params, handle_exceptions, generate_uuid, get_current_timestamp
+    validate_pagination_params, build_page_info, select_fields, mcp_projection_params,
+    handle_exceptions, generate_uuid, get_current_timestamp
 )
 
 logger = logging.getLogger()
@@ -26,6 +28,19 @@ logger.setLevel(logging.INFO)
 # Initialize database manager
 db_manager = DatabaseManager()
 
+# Fields returned by list and get, in response order
+PATIENT_FIELDS = [
+    'patient_id', 'first_name', 'last_name', 'full_name', 'email', 'phone', 'date_of_birth',
+    'age', 'gender', 'document_type', 'document_number', 'address', 'medical_history',
+    'lab_results', 'source_scan', 'cedula', 'created_at', 'updated_at'
+]
+
+# Compact view (default for MCP Gateway requests): identification and contact
+# fields, without the JSONB documents
+PATIENT_COMPACT_FIELDS = ['patient_id', 'full_name', 'email', 'phone', 'cedula', 'date_of_birth']
+
+PATIENT_JSON_FIELDS = ['address', 'medical_history', 'lab_results']
+
 
 @handle_exceptions
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -62,7 +77,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     elif normalized_path.startswith('/patients/') and path_params and 'id' in path_params:
         patient_id = path_params['id']
         if http_method == 'GET':
-            return get_patient(patient_id)
+            return get_patient(patient_id, extract_query_parameters(event))
         elif http_method == 'PUT':
             return update_patient(patient_id, event)
         elif http_method == 'DELETE':
@@ -93,7 +108,9 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
         "action": "list|get|create|update|delete",
         "patient_id": "optional-patient-id",
         "patient_data": {...},
-        "pagination": {...}
+        "pagination": {...},
+        "view": "compact|full (default: compact)",
+        "fields": ["optional", "field", "names"]
     }
     """
     try:
@@ -107,6 +124,10 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
                 pagination = event['pagination']
                 query_params['limit'] = str(pagination.get('limit', 50))
                 query_params['offset'] = str(pagination.get('offset', 0))
+                for param in ['cursor', 'include_total']:
+                    if pagination.get(param) is not None:
+                        query_params[param] = str(pagination[param])
+            query_params.update(mcp_projection_params(event))
 
             # Create mock API Gateway event
             mock_event = {
@@ -118,7 +139,7 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             patient_id = event.get('patient_id')
             if not patient_id:
                 return create_error_response(400, "patient_id required for get action")
-            return get_patient(patient_id)
+            return get_patient(patient_id, mcp_projection_params(event))
 
         elif action == 'create':
             patient_data = event.get('patient_data')
@@ -165,50 +186,65 @@ def list_patients(event: Dict[str, Any]) -> Dict[str, Any]:
 
     Query parameters:
     - limit: Number of patients to return (default: 50, max: 1000)
-    - offset: Number of patients to skip (default: 0)
+    - cursor: next_cursor of the previous page (optional)
+    - offset: Number of patients to skip (default: 0; use cursor for deep pages)
+    - include_total: Return the exact total count (default: false)
+    - view: compact or full (default: full)
+    - fields: Comma-separated fields to return (optional, overrides view)
 
     Returns:
         List of patients with pagination info
     """
     try:
         query_params = extract_query_parameters(event)
-        pagination = validate_pagination_params(query_params)
+        try:
+            pagination = validate_pagination_params(query_params, cursor_keys=2)
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_PAGINATION")
+
+        try:
+            fields = select_fields(
+                query_params, PATIENT_FIELDS, PATIENT_COMPACT_FIELDS, required=['patient_id', 'full_name']
+            )
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
+
+        keyset_clause = ""
+        parameters = [
+            db_manager.create_parameter('limit', pagination['limit'] + 1, 'long'),
+            db_manager.create_parameter('offset', pagination['offset'], 'long')
+        ]
 
-        sql = """
-        SELECT patient_id, first_name, last_name, full_name, email, phone, date_of_birth, 
-               age, gender, document_type, document_number, address, medical_history, 
-               lab_results, source_scan, cedula, created_at, updated_at
+        if pagination['cursor']:
+            keyset_clause = "WHERE (full_name, patient_id) > (:cursor_name, :cursor_id)"
+            parameters.extend([
+                db_manager.create_parameter('cursor_name', pagination['cursor'][0], 'string'),
+                db_manager.create_parameter('cursor_id', pagination['cursor'][1], 'string')
+            ])
+
+        sql = f"""
+        SELECT {', '.join(fields)}
         FROM patients
-        ORDER BY full_name
+        {keyset_clause}
+        ORDER BY full_name, patient_id
         LIMIT :limit OFFSET :offset
         """
 
-        parameters = [
-            db_manager.create_parameter('limit', pagination['limit'], 'long'),
-            db_manager.create_parameter('offset', pagination['offset'], 'long')
-        ]
-
-        response = db_manager.execute_sql(sql, parameters)
-        patients = db_manager.parse_records(
-            response.get('records', []),
-            response.get('columnMetadata', [])
+        patients = db_manager.execute_query(
+            sql, parameters, format='json',
+            json_columns=[field for field in PATIENT_JSON_FIELDS if field in fields]
         )
+        page_info = build_page_info(patients, pagination, lambda row: [row['full_name'], row['patient_id']])
 
-        # Get total count for pagination
-        count_sql = "SELECT COUNT(*) as total FROM patients"
-        count_response = db_manager.execute_sql(count_sql)
-        total_count = 0
-        if count_response.get('records'):
-            total_count = count_response['records'][0][0].get('longValue', 0)
+        if pagination['include_total']:
+            count_rows = db_manager.execute_query("SELECT COUNT(*) as total FROM patients")
+            page_info['total'] = count_rows[0]['total'] if count_rows else 0
+        elif not pagination['cursor'] and not pagination['offset']:
+            page_info['estimated_total'] = db_manager.estimate_row_count('patients')
 
         return create_response(200, {
             'patients': patients,
-            'pagination': {
-                'limit': pagination['limit'],
-                'offset': pagination['offset'],
-                'total': total_count,
-                'count': len(patients)
-            }
+            'pagination': page_info
         })
 
     except DatabaseError as e:
@@ -232,11 +268,11 @@ def create_patient(event: Dict[str, Any]) -> Dict[str, Any]:
         Created patient data
     """
     try:
-        # Ensure patients table exists
-        ensure_patients_table_exists()
-
         body = parse_event_body(event)
 
+        # Verify the schema version once per container
+        ensure_schema_version(db_manager)
+
         # Validate required fields
         validation_error = validate_required_fields(
             body, ['full_name', 'date_of_birth'])
@@ -295,21 +331,27 @@ def create_patient(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def get_patient(patient_id: str) -> Dict[str, Any]:
+def get_patient(patient_id: str, query_params: Dict[str, str] = None) -> Dict[str, Any]:
     """
     Handle GET /patients/{id} - Get patient by ID.
 
     Args:
         patient_id: Patient ID
+        query_params: view and fields parameters (optional, default: full view)
 
     Returns:
         Patient data or 404 if not found
     """
     try:
-        sql = """
-        SELECT patient_id, first_name, last_name, full_name, email, phone, date_of_birth, 
-               age, gender, document_type, document_number, address, medical_history, 
-               lab_results, source_scan, cedula, created_at, updated_at
+        try:
+            fields = select_fields(
+                query_params or {}, PATIENT_FIELDS, PATIENT_COMPACT_FIELDS, required=['patient_id']
+            )
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
+
+        sql = f"""
+        SELECT {', '.join(fields)}
         FROM patients
         WHERE patient_id = :patient_id
         """
@@ -421,26 +463,6 @@ def update_patient(patient_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def ensure_patients_table_exists() -> None:
-    """Ensure patients table exists by creating it if necessary."""
-    try:
-        sql = """
-        CREATE TABLE IF NOT EXISTS patients (
-            patient_id VARCHAR(255) PRIMARY KEY,
-            full_name VARCHAR(200) NOT NULL,
-            email VARCHAR(255) UNIQUE NOT NULL,
-            date_of_birth DATE,
-            phone VARCHAR(20),
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-        db_manager.execute_sql(sql, [])
-        logger.info("Ensured patients table exists")
-    except Exception as e:
-        logger.warning(f"Could not ensure patients table exists: {e}")
-
-
 def delete_patient(patient_id: str) -> Dict[str, Any]:
     """
     Handle DELETE /patients/{id} - Delete patient.
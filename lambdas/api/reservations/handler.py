@@ -9,17 +9,25 @@ Endpoints:
 - PUT /reservations/{id} - Update reservation
 - DELETE /reservations/{id} - Cancel reservation
 - POST /reservations/availability - Check availability
+- POST /reservations/earliest - Earliest free slot per medic of a specialization
+- POST /reservations/bulk-cancel - Cancel a medic's reservations in a date range
+- POST /reservations/bulk-reschedule - Move a medic's reservations to another medic or day
 """
 
 import logging
 import json
-from typing import Dict, Any
-from datetime import datetime, timedelta
+import os
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
 from shared.database import DatabaseManager, DatabaseError
+from shared.cache import ReferenceCache
+from shared.schema import ensure_schema_version
 from shared.utils import (
     create_response, create_error_response, parse_event_body,
     extract_path_parameters, extract_query_parameters, validate_required_fields,
-    validate_pagination_params, handle_exceptions, generate_uuid, get_current_timestamp
+    validate_pagination_params, build_page_info, select_fields, mcp_projection_params,
+    handle_exceptions, generate_uuid, get_current_timestamp
 )
 
 logger = logging.getLogger()
@@ -28,6 +36,98 @@ logger.setLevel(logging.INFO)
 # Initialize database manager
 db_manager = DatabaseManager()
 
+# Exam durations for availability searches; exams change rarely
+exams_cache = ReferenceCache('exams')
+
+# Exclusion constraint keeping a medic's active reservations from overlapping (migration 0005)
+MEDIC_OVERLAP_CONSTRAINT = 'reservations_medic_no_overlap'
+
+# Working schedule used to compute free slots, in the clinic's local time
+WORKING_HOURS_START = os.environ.get('WORKING_HOURS_START', '08:00')
+WORKING_HOURS_END = os.environ.get('WORKING_HOURS_END', '17:00')
+WORKING_DAYS = os.environ.get('WORKING_DAYS', '1,2,3,4,5')  # ISO weekdays, Monday = 1
+CLINIC_TIMEZONE = os.environ.get('CLINIC_TIMEZONE', 'America/Bogota')
+SLOT_STEP_MINUTES = int(os.environ.get('SLOT_STEP_MINUTES', '15'))
+
+DEFAULT_SLOT_MINUTES = 30  # used when no exam is given
+MAX_AVAILABILITY_DAYS = 31
+DEFAULT_MAX_SLOTS = 50
+MAX_SLOTS = 500
+EARLIEST_SLOTS_DEFAULT_DAYS = 14
+DEFAULT_EARLIEST_SLOTS = 5
+MAX_EARLIEST_SLOTS = 20
+MAX_BULK_DAYS = 31
+
+# Fields returned by get, in response order, and the expression selecting each
+# one from reservations r joined with patients p, medics m and exams e. Joins
+# whose fields are not selected are removed by the planner.
+RESERVATION_FIELDS = {
+    'reservation_id': 'r.reservation_id',
+    'patient_id': 'r.patient_id',
+    'medic_id': 'r.medic_id',
+    'exam_id': 'r.exam_id',
+    'appointment_date': "(r.reservation_date || ' ' || r.reservation_time::text) as appointment_date",
+    'status': 'r.status',
+    'notes': 'r.notes',
+    'created_at': 'r.created_at',
+    'updated_at': 'r.updated_at',
+    'patient_name': 'p.full_name as patient_name',
+    'medic_name': 'm.first_name as medic_name',
+    'medic_specialty': 'm.specialization as medic_specialty',
+    'exam_name': 'e.exam_name',
+    'exam_type': 'e.exam_type',
+}
+
+# List returns the same fields without the medic specialty and exam type
+RESERVATION_LIST_FIELDS = [
+    field for field in RESERVATION_FIELDS if field not in ('medic_specialty', 'exam_type')
+]
+
+# Compact view (default for MCP Gateway requests)
+RESERVATION_COMPACT_FIELDS = [
+    'reservation_id', 'patient_id', 'medic_id', 'exam_id', 'appointment_date', 'status',
+    'patient_name', 'medic_name', 'exam_name'
+]
+
+# Inserts a reservation only if patient, medic and exam exist and the medic's
+# schedule is free, in one round trip. The exclusion constraint is the arbiter,
+# so a concurrent booking of an overlapping slot inserts nothing instead of
+# failing. Always returns one row reporting what was found.
+CREATE_RESERVATION_SQL = f"""
+WITH patient AS (
+    SELECT patient_id FROM patients WHERE patient_id = :patient_id
+),
+medic AS (
+    SELECT medic_id FROM medics WHERE medic_id = :medic_id
+),
+exam AS (
+    SELECT exam_id, COALESCE(duration_minutes, 30) AS duration_minutes FROM exams WHERE exam_id = :exam_id
+),
+inserted AS (
+    INSERT INTO reservations (
+        reservation_id, patient_id, medic_id, exam_id,
+        reservation_date, reservation_time, duration_minutes, status, notes, created_at, updated_at
+    )
+    SELECT
+        :reservation_id, patient.patient_id, medic.medic_id, exam.exam_id,
+        :reservation_date::date, :reservation_time::time, exam.duration_minutes, 'scheduled', :notes,
+        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM patient, medic, exam
+    ON CONFLICT ON CONSTRAINT {MEDIC_OVERLAP_CONSTRAINT} DO NOTHING
+    RETURNING
+        reservation_id, patient_id, medic_id, exam_id,
+        (reservation_date || ' ' || COALESCE(reservation_time::text, '00:00:00')) as appointment_date,
+        duration_minutes, status, notes, created_at, updated_at
+)
+SELECT
+    EXISTS (SELECT 1 FROM patient) AS patient_found,
+    EXISTS (SELECT 1 FROM medic) AS medic_found,
+    EXISTS (SELECT 1 FROM exam) AS exam_found,
+    inserted.*
+FROM (VALUES (1)) AS outcome (row_count)
+LEFT JOIN inserted ON TRUE
+"""
+
 
 @handle_exceptions
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -61,10 +161,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     elif normalized_path == '/reservations/availability':
         if http_method == 'POST':
             return check_availability(event)
+    elif normalized_path == '/reservations/earliest':
+        if http_method == 'POST':
+            return find_earliest_slots(event)
+    elif normalized_path == '/reservations/bulk-cancel':
+        if http_method == 'POST':
+            return bulk_cancel_reservations(event)
+    elif normalized_path == '/reservations/bulk-reschedule':
+        if http_method == 'POST':
+            return bulk_reschedule_reservations(event)
     elif normalized_path.startswith('/reservations/') and path_params and 'id' in path_params:
         reservation_id = path_params['id']
         if http_method == 'GET':
-            return get_reservation(reservation_id)
+            return get_reservation(reservation_id, extract_query_parameters(event))
         elif http_method == 'PUT':
             return update_reservation(reservation_id, event)
         elif http_method == 'DELETE':
@@ -90,16 +199,21 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
     
     Expected event structure:
     {
-        "action": "list|get|create|update|delete|check_availability",
+        "action": "list|get|create|update|delete|check_availability|find_earliest_slots|bulk_cancel|bulk_reschedule",
         "reservation_id": "optional-reservation-id",
         "patient_id": "optional-patient-id",
         "medic_id": "optional-medic-id",
+        "specialization": "optional-specialization",
         "exam_id": "optional-exam-id",
         "reservation_date": "optional-date",
         "date_from": "optional-start-date",
         "date_to": "optional-end-date",
         "status": "optional-status",
-        "pagination": {...}
+        "target_medic_id": "optional-medic-id (bulk_reschedule)",
+        "shift_days": "optional-integer (bulk_reschedule)",
+        "pagination": {...},
+        "view": "compact|full (list and get, default: compact)",
+        "fields": ["optional", "field", "names"]
     }
     """
     try:
@@ -113,11 +227,15 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
                 pagination = event['pagination']
                 query_params['limit'] = str(pagination.get('limit', 50))
                 query_params['offset'] = str(pagination.get('offset', 0))
+                for param in ['cursor', 'include_total']:
+                    if pagination.get(param) is not None:
+                        query_params[param] = str(pagination[param])
             
             # Add filter parameters
             for param in ['patient_id', 'medic_id', 'status', 'date_from', 'date_to']:
                 if param in event:
                     query_params[param] = str(event[param])
+            query_params.update(mcp_projection_params(event))
             
             mock_event = {'queryStringParameters': query_params}
             return list_reservations(mock_event)
@@ -126,7 +244,7 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             reservation_id = event.get('reservation_id')
             if not reservation_id:
                 return create_error_response(400, "reservation_id required for get action")
-            return get_reservation(reservation_id)
+            return get_reservation(reservation_id, mcp_projection_params(event))
             
         elif action == 'create':
             # Build reservation data from MCP parameters
@@ -174,21 +292,52 @@ def handle_mcp_gateway_request(event: Dict[str, Any]) -> Dict[str, Any]:
             
         elif action == 'check_availability':
             # Build availability check data
-            availability_data = {}
-            required_fields = ['medic_id', 'reservation_date']
+            if 'medic_id' not in event and 'specialization' not in event:
+                return create_error_response(400, "medic_id or specialization required for check_availability action")
+            if 'reservation_date' not in event and 'date_from' not in event:
+                return create_error_response(400, "reservation_date or date_from required for check_availability action")
             
-            for field in required_fields:
-                if field not in event:
-                    return create_error_response(400, f"{field} required for check_availability action")
-                if field == 'reservation_date':
-                    # Convert reservation_date to date format expected by check_availability
-                    availability_data['date'] = event[field]
-                else:
-                    availability_data[field] = event[field]
+            availability_data = {
+                field: event[field]
+                for field in ['medic_id', 'specialization', 'exam_id', 'date_from', 'date_to', 'max_slots']
+                if field in event
+            }
+            if 'reservation_date' in event:
+                # A single day, in the date format expected by check_availability
+                availability_data['date'] = event['reservation_date']
             
             mock_event = {'body': json.dumps(availability_data)}
             return check_availability(mock_event)
             
+        elif action == 'find_earliest_slots':
+            if 'specialization' not in event:
+                return create_error_response(400, "specialization required for find_earliest_slots action")
+            
+            search_data = {
+                field: event[field]
+                for field in ['specialization', 'exam_id', 'date_from', 'date_to', 'limit']
+                if field in event
+            }
+            
+            mock_event = {'body': json.dumps(search_data)}
+            return find_earliest_slots(mock_event)
+            
+        elif action in ('bulk_cancel', 'bulk_reschedule'):
+            for field in ['medic_id', 'date_from']:
+                if field not in event:
+                    return create_error_response(400, f"{field} required for {action} action")
+            
+            bulk_data = {
+                field: event[field]
+                for field in ['medic_id', 'date_from', 'date_to', 'time_from', 'time_to', 'reason', 'target_medic_id', 'shift_days']
+                if field in event
+            }
+            
+            mock_event = {'body': json.dumps(bulk_data)}
+            if action == 'bulk_cancel':
+                return bulk_cancel_reservations(mock_event)
+            return bulk_reschedule_reservations(mock_event)
+            
         else:
             return create_error_response(400, f"Unknown action: {action}")
             
@@ -203,88 +352,59 @@ def list_reservations(event: Dict[str, Any]) -> Dict[str, Any]:
     
     Query parameters:
     - limit: Number of reservations to return (default: 50, max: 1000)
-    - offset: Number of reservations to skip (default: 0)
+    - cursor: next_cursor of the previous page (optional)
+    - offset: Number of reservations to skip (default: 0; use cursor for deep pages)
+    - include_total: Return the exact total count (default: false)
     - status: Filter by status (optional)
     - patient_id: Filter by patient ID (optional)
     - medic_id: Filter by medic ID (optional)
     - date_from: Filter reservations from date (YYYY-MM-DD) (optional)
     - date_to: Filter reservations to date (YYYY-MM-DD) (optional)
+    - view: compact or full (default: full)
+    - fields: Comma-separated fields to return (optional, overrides view)
     
     Returns:
         List of reservations with pagination info
     """
     try:
         query_params = extract_query_parameters(event)
-        pagination = validate_pagination_params(query_params)
-        
-        # Build filters
-        where_conditions = []
-        parameters = [
-            db_manager.create_parameter('limit', pagination['limit'], 'long'),
-            db_manager.create_parameter('offset', pagination['offset'], 'long')
-        ]
-        
-        if query_params.get('status'):
-            where_conditions.append("r.status = :status")
-            parameters.append(db_manager.create_parameter('status', query_params['status'], 'string'))
-        
-        if query_params.get('patient_id'):
-            where_conditions.append("r.patient_id = :patient_id")
-            parameters.append(db_manager.create_parameter('patient_id', query_params['patient_id'], 'string'))
-        
-        if query_params.get('medic_id'):
-            where_conditions.append("r.medic_id = :medic_id")
-            parameters.append(db_manager.create_parameter('medic_id', query_params['medic_id'], 'string'))
-        
-        if query_params.get('date_from'):
-            where_conditions.append("DATE(r.reservation_date) >= :date_from")
-            parameters.append(db_manager.create_parameter('date_from', query_params['date_from'], 'string'))
-        
-        if query_params.get('date_to'):
-            where_conditions.append("DATE(r.reservation_date) <= :date_to")
-            parameters.append(db_manager.create_parameter('date_to', query_params['date_to'], 'string'))
-        
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        try:
+            pagination = validate_pagination_params(query_params, cursor_keys=3)
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_PAGINATION")
         
-        sql = f"""
-        SELECT 
-            r.reservation_id, r.patient_id, r.medic_id, r.exam_id,
-            (r.reservation_date || ' ' || COALESCE(r.reservation_time::text, '00:00:00')) as appointment_date,
-            r.status, r.notes, r.created_at, r.updated_at,
-            p.full_name as patient_name,
-            m.first_name as medic_name,
-            e.exam_name
-        FROM reservations r
-        LEFT JOIN patients p ON r.patient_id = p.patient_id
-        LEFT JOIN medics m ON r.medic_id = m.medic_id
-        LEFT JOIN exams e ON r.exam_id = e.exam_id
-        {where_clause}
-        ORDER BY r.reservation_date DESC, r.reservation_time DESC
-        LIMIT :limit OFFSET :offset
-        """
+        try:
+            # appointment_date and reservation_id carry the sort key for next_cursor
+            fields = select_fields(
+                query_params, RESERVATION_LIST_FIELDS, RESERVATION_COMPACT_FIELDS,
+                required=['reservation_id', 'appointment_date']
+            )
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
         
-        response = db_manager.execute_sql(sql, parameters)
-        reservations = db_manager.parse_records(
-            response.get('records', []),
-            response.get('columnMetadata', [])
+        try:
+            filter_conditions, filter_parameters = build_reservation_filters(query_params)
+        except ValueError as e:
+            return create_error_response(400, f"date_from/date_to must be YYYY-MM-DD: {str(e)}", "INVALID_DATE_FORMAT")
+        
+        sql, parameters = build_reservation_page_query(filter_conditions, filter_parameters, pagination, fields)
+        reservations = db_manager.execute_query(sql, parameters, format='json')
+        # appointment_date is 'YYYY-MM-DD HH:MM:SS', the first two sort key columns
+        page_info = build_page_info(
+            reservations, pagination,
+            lambda row: row['appointment_date'].split(' ', 1) + [row['reservation_id']]
         )
         
-        # Get total count for pagination
-        count_sql = f"SELECT COUNT(*) as total FROM reservations r {where_clause}"
-        count_params = [p for p in parameters if p['name'] not in ['limit', 'offset']]
-        count_response = db_manager.execute_sql(count_sql, count_params)
-        total_count = 0
-        if count_response.get('records'):
-            total_count = count_response['records'][0][0].get('longValue', 0)
+        if pagination['include_total']:
+            filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+            count_rows = db_manager.execute_query(f"SELECT COUNT(*) as total FROM reservations r {filter_clause}", filter_parameters)
+            page_info['total'] = count_rows[0]['total'] if count_rows else 0
+        elif not filter_parameters and not pagination['cursor'] and not pagination['offset']:
+            page_info['estimated_total'] = db_manager.estimate_row_count('reservations')
         
         return create_response(200, {
             'reservations': reservations,
-            'pagination': {
-                'limit': pagination['limit'],
-                'offset': pagination['offset'],
-                'total': total_count,
-                'count': len(reservations)
-            },
+            'pagination': page_info,
             'filters': {k: v for k, v in query_params.items() 
                        if k in ['status', 'patient_id', 'medic_id', 'date_from', 'date_to'] and v}
         })
@@ -298,6 +418,95 @@ def list_reservations(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
+def build_reservation_filters(query_params: Dict[str, str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Build the WHERE conditions of a reservation listing.
+    
+    Every condition compares a bare reservations column with a typed
+    parameter, so it can be answered from the (filter, reservation_date,
+    reservation_time, reservation_id) indexes of migration 0008.
+    
+    Returns:
+        Tuple of conditions on alias r and their parameters
+        
+    Raises:
+        ValueError: If date_from or date_to is not a YYYY-MM-DD date
+    """
+    conditions = []
+    parameters = []
+    
+    for column in ['status', 'patient_id', 'medic_id']:
+        if query_params.get(column):
+            conditions.append(f"r.{column} = :{column}")
+            parameters.append(db_manager.create_parameter(column, query_params[column], 'string'))
+    
+    # Date objects are sent as DATE-typed parameters
+    if query_params.get('date_from'):
+        conditions.append("r.reservation_date >= :date_from")
+        parameters.append(db_manager.create_parameter('date_from', parse_date(query_params['date_from'])))
+    
+    if query_params.get('date_to'):
+        conditions.append("r.reservation_date <= :date_to")
+        parameters.append(db_manager.create_parameter('date_to', parse_date(query_params['date_to'])))
+    
+    return conditions, parameters
+
+
+def build_reservation_page_query(
+    conditions: List[str],
+    parameters: List[Dict[str, Any]],
+    pagination: Dict[str, Any],
+    fields: List[str] = RESERVATION_LIST_FIELDS
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Build the query for one page of a reservation listing.
+    
+    With the filter and sort key indexes the plan reads reservations in sort
+    order and joins the names row by row (nested loops), stopping after
+    limit + 1 rows instead of joining and sorting the whole filtered set.
+    
+    Args:
+        conditions: Filter conditions from build_reservation_filters
+        parameters: Their parameters
+        pagination: Result of validate_pagination_params (cursor of 3 values)
+        fields: Fields to select (default: every list field)
+        
+    Returns:
+        Tuple of SQL and parameters
+    """
+    conditions = list(conditions)
+    parameters = parameters + [
+        db_manager.create_parameter('limit', pagination['limit'] + 1, 'long'),
+        db_manager.create_parameter('offset', pagination['offset'], 'long')
+    ]
+    
+    if pagination['cursor']:
+        conditions.append(
+            "(r.reservation_date, r.reservation_time, r.reservation_id) < "
+            "(CAST(:cursor_date AS date), CAST(:cursor_time AS time), :cursor_id)"
+        )
+        parameters.extend([
+            db_manager.create_parameter('cursor_date', pagination['cursor'][0], 'string'),
+            db_manager.create_parameter('cursor_time', pagination['cursor'][1], 'string'),
+            db_manager.create_parameter('cursor_id', pagination['cursor'][2], 'string')
+        ])
+    
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    sql = f"""
+    SELECT {', '.join(RESERVATION_FIELDS[field] for field in fields)}
+    FROM reservations r
+    LEFT JOIN patients p ON r.patient_id = p.patient_id
+    LEFT JOIN medics m ON r.medic_id = m.medic_id
+    LEFT JOIN exams e ON r.exam_id = e.exam_id
+    {where_clause}
+    ORDER BY r.reservation_date DESC, r.reservation_time DESC, r.reservation_id DESC
+    LIMIT :limit OFFSET :offset
+    """
+    
+    return sql, parameters
+
+
 def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle POST /reservations - Create new reservation.
@@ -312,9 +521,6 @@ def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
         Created reservation data
     """
     try:
-        # Ensure required tables exist
-        ensure_tables_exist()
-        
         body = parse_event_body(event)
         
         # Validate required fields - frontend sends appointment_date, we need to split it
@@ -331,34 +537,12 @@ def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
         except (ValueError, AttributeError) as e:
             return create_error_response(400, f"Invalid appointment_date format: {str(e)}", "INVALID_DATE_FORMAT")
         
-        # Validate that referenced entities exist
-        validation_result = validate_reservation_entities(body['patient_id'], body['medic_id'], body['exam_id'])
-        if validation_result:
-            return validation_result
-        
-        # Check availability using the parsed date
-        availability_result = check_medic_availability(body['medic_id'], str(reservation_date))
-        if not availability_result['available']:
-            return create_error_response(400, "Medic not available at requested time", "MEDIC_NOT_AVAILABLE")
-        
+        # Verify the schema version once per container
+        ensure_schema_version(db_manager)
+
         # Generate reservation ID
         reservation_id = generate_uuid()
         
-        sql = """
-        INSERT INTO reservations (
-            reservation_id, patient_id, medic_id, exam_id, 
-            reservation_date, reservation_time, status, notes, created_at, updated_at
-        )
-        VALUES (
-            :reservation_id, :patient_id, :medic_id, :exam_id,
-            :reservation_date::date, :reservation_time::time, 'scheduled', :notes, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-        )
-        RETURNING 
-            reservation_id, patient_id, medic_id, exam_id,
-            (reservation_date || ' ' || COALESCE(reservation_time::text, '00:00:00')) as appointment_date,
-            status, notes, created_at, updated_at
-        """
-        
         parameters = [
             db_manager.create_parameter('reservation_id', reservation_id, 'string'),
             db_manager.create_parameter('patient_id', body['patient_id'], 'string'),
@@ -369,15 +553,19 @@ def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
             db_manager.create_parameter('notes', body.get('notes', ''), 'string')
         ]
         
-        response = db_manager.execute_sql(sql, parameters)
+        # Entity checks, availability and the insert run as one statement
+        outcome = db_manager.execute_query(CREATE_RESERVATION_SQL, parameters)[0]
         
-        if not response.get('records'):
-            return create_error_response(500, "Failed to create reservation")
+        if not outcome.pop('patient_found'):
+            return create_error_response(400, "Patient not found", "PATIENT_NOT_FOUND")
+        if not outcome.pop('medic_found'):
+            return create_error_response(400, "Medic not found", "MEDIC_NOT_FOUND")
+        if not outcome.pop('exam_found'):
+            return create_error_response(400, "Exam not found", "EXAM_NOT_FOUND")
+        if not outcome.get('reservation_id'):
+            return create_error_response(400, "Medic not available at requested time", "MEDIC_NOT_AVAILABLE")
         
-        reservation = db_manager.parse_records(
-            response['records'],
-            response.get('columnMetadata', [])
-        )[0]
+        reservation = outcome
         
         logger.info(f"Created reservation: {reservation_id}")
         
@@ -387,6 +575,8 @@ def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
         })
         
     except DatabaseError as e:
+        if is_medic_overlap_error(e):
+            return create_error_response(400, "Medic not available at requested time", "MEDIC_NOT_AVAILABLE")
         logger.error(f"Database error in create_reservation: {str(e)}")
         logger.error(f"Request body: {body}")
         logger.error(f"Parsed date: {reservation_date}, time: {reservation_time}")
@@ -397,25 +587,28 @@ def create_reservation(event: Dict[str, Any]) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def get_reservation(reservation_id: str) -> Dict[str, Any]:
+def get_reservation(reservation_id: str, query_params: Dict[str, str] = None) -> Dict[str, Any]:
     """
     Handle GET /reservations/{id} - Get reservation by ID.
     
     Args:
         reservation_id: Reservation ID
+        query_params: view and fields parameters (optional, default: full view)
         
     Returns:
         Reservation data with related entity details or 404 if not found
     """
     try:
-        sql = """
-        SELECT 
-            r.reservation_id, r.patient_id, r.medic_id, r.exam_id,
-            (r.reservation_date || ' ' || COALESCE(r.reservation_time::text, '00:00:00')) as appointment_date,
-            r.status, r.notes, r.created_at, r.updated_at,
-            p.full_name as patient_name,
-            m.first_name as medic_name, m.specialization as medic_specialty,
-            e.exam_name, e.exam_type
+        try:
+            fields = select_fields(
+                query_params or {}, list(RESERVATION_FIELDS), RESERVATION_COMPACT_FIELDS,
+                required=['reservation_id']
+            )
+        except ValueError as e:
+            return create_error_response(400, str(e), "INVALID_FIELDS")
+        
+        sql = f"""
+        SELECT {', '.join(RESERVATION_FIELDS[field] for field in fields)}
         FROM reservations r
         LEFT JOIN patients p ON r.patient_id = p.patient_id
         LEFT JOIN medics m ON r.medic_id = m.medic_id
@@ -477,20 +670,7 @@ def update_reservation(reservation_id: str, event: Dict[str, Any]) -> Dict[str,
             except (ValueError, AttributeError) as e:
                 return create_error_response(400, f"Invalid appointment_date format: {str(e)}", "INVALID_DATE_FORMAT")
             
-            # Get current reservation to check medic
-            current_sql = "SELECT medic_id FROM reservations WHERE reservation_id = :reservation_id"
-            current_response = db_manager.execute_sql(current_sql, parameters)
-            
-            if not current_response.get('records'):
-                return create_error_response(404, "Reservation not found", "RESERVATION_NOT_FOUND")
-            
-            current_medic_id = current_response['records'][0][0].get('stringValue')
-            
-            # Check availability for new date
-            availability_result = check_medic_availability(current_medic_id, str(reservation_date), reservation_id)
-            if not availability_result['available']:
-                return create_error_response(400, "Medic not available at requested time", "MEDIC_NOT_AVAILABLE")
-            
+            # Overlaps with the medic's other reservations are rejected by MEDIC_OVERLAP_CONSTRAINT
             update_fields.append('reservation_date = :reservation_date::date')
             update_fields.append('reservation_time = :reservation_time::time')
             parameters.append(db_manager.create_parameter('reservation_date', str(reservation_date), 'string'))
@@ -522,7 +702,7 @@ def update_reservation(reservation_id: str, event: Dict[str, Any]) -> Dict[str,
         RETURNING 
             reservation_id, patient_id, medic_id, exam_id,
             (reservation_date || ' ' || COALESCE(reservation_time::text, '00:00:00')) as appointment_date,
-            status, notes, created_at, updated_at
+            duration_minutes, status, notes, created_at, updated_at
         """
         
         response = db_manager.execute_sql(sql, parameters)
@@ -544,6 +724,8 @@ def update_reservation(reservation_id: str, event: Dict[str, Any]) -> Dict[str,
         })
         
     except DatabaseError as e:
+        if is_medic_overlap_error(e):
+            return create_error_response(400, "Medic not available at requested time", "MEDIC_NOT_AVAILABLE")
         logger.error(f"Database error in update_reservation: {str(e)}")
         return create_error_response(500, "Database error", e.error_code)
     
@@ -596,210 +778,521 @@ def cancel_reservation(reservation_id: str) -> Dict[str, Any]:
         return create_error_response(500, "Internal server error")
 
 
-def check_availability(event: Dict[str, Any]) -> Dict[str, Any]:
+def parse_bulk_scope(body: Dict[str, Any]) -> Tuple[List[str], List[Dict[str, Any]]]:
     """
-    Handle POST /reservations/availability - Check medic availability.
+    Build the WHERE conditions selecting the active reservations of a bulk operation.
+    
+    Fields: medic_id, date_from, date_to (default: date_from, at most
+    MAX_BULK_DAYS days), and optionally time_from/time_to (HH:MM) to limit the
+    operation to part of each day.
+    
+    Returns:
+        Tuple of conditions on alias r and their parameters
+        
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    if not body.get('medic_id'):
+        raise ValueError("medic_id is required")
+    
+    date_from = parse_date(body.get('date_from'))
+    date_to = parse_date(body.get('date_to') or body.get('date_from'))
+    if date_to < date_from or (date_to - date_from).days >= MAX_BULK_DAYS:
+        raise ValueError(f"date_to must be on or after date_from and within {MAX_BULK_DAYS} days")
+    
+    conditions = [
+        "r.medic_id = :medic_id",
+        "r.reservation_date BETWEEN :date_from AND :date_to",
+        "r.status IN ('scheduled', 'confirmed')"
+    ]
+    parameters = [
+        db_manager.create_parameter('medic_id', body['medic_id'], 'string'),
+        db_manager.create_parameter('date_from', date_from),
+        db_manager.create_parameter('date_to', date_to)
+    ]
+    
+    if body.get('time_from'):
+        conditions.append("r.reservation_time >= :time_from")
+        parameters.append(db_manager.create_parameter('time_from', dt_time.fromisoformat(body['time_from'])))
+    if body.get('time_to'):
+        conditions.append("r.reservation_time < :time_to")
+        parameters.append(db_manager.create_parameter('time_to', dt_time.fromisoformat(body['time_to'])))
+    
+    return conditions, parameters
+
+
+def bulk_cancel_reservations(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /reservations/bulk-cancel - Cancel a medic's reservations in a date range.
     
     Required fields:
-    - medic_id: Medic ID
-    - date: Date to check (YYYY-MM-DD format)
+    - medic_id: Medic whose reservations are cancelled
+    - date_from: First day (YYYY-MM-DD)
     
     Optional fields:
-    - duration_hours: Duration in hours (default: 1)
+    - date_to: Last day (default: date_from, at most 31 days)
+    - time_from, time_to: Only reservations starting in [time_from, time_to) (HH:MM)
+    - reason: Appended to the notes of every cancelled reservation
     
     Returns:
-        Availability information
+        One outcome per cancelled reservation
     """
     try:
         body = parse_event_body(event)
         
-        # Validate required fields
-        validation_error = validate_required_fields(body, ['medic_id', 'date'])
-        if validation_error:
-            return create_error_response(400, validation_error, "VALIDATION_ERROR")
+        try:
+            conditions, parameters = parse_bulk_scope(body)
+        except (TypeError, ValueError) as e:
+            return create_error_response(400, str(e), "VALIDATION_ERROR")
+        
+        parameters.append(db_manager.create_parameter('reason', body.get('reason'), 'string'))
+        
+        # One statement: scheduled and confirmed reservations only, so repeating the call is harmless
+        sql = f"""
+        UPDATE reservations r
+        SET status = 'cancelled',
+            notes = CASE WHEN CAST(:reason AS text) IS NULL THEN r.notes
+                         ELSE concat_ws(E'\n', NULLIF(r.notes, ''), CAST(:reason AS text)) END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE {' AND '.join(conditions)}
+        RETURNING
+            r.reservation_id, r.patient_id, r.medic_id,
+            r.reservation_date::text AS reservation_date,
+            to_char(r.reservation_time, 'HH24:MI') AS reservation_time,
+            'cancelled' AS outcome
+        """
         
-        medic_id = body['medic_id']
-        date = body['date']
-        duration_hours = body.get('duration_hours', 1)
+        results = sorted(
+            db_manager.execute_query(sql, parameters),
+            key=lambda row: (row['reservation_date'], row['reservation_time'])
+        )
         
-        availability_result = check_medic_availability(medic_id, date)
+        logger.info(f"Bulk cancelled {len(results)} reservation(s) of medic {body['medic_id']}")
         
         return create_response(200, {
-            'medic_id': medic_id,
-            'date': date,
-            'duration_hours': duration_hours,
-            'available': availability_result['available'],
-            'conflicts': availability_result.get('conflicts', 0),
-            'message': availability_result.get('message', '')
+            'message': f"{len(results)} reservation(s) cancelled",
+            'summary': {'cancelled': len(results)},
+            'results': results
         })
         
     except DatabaseError as e:
-        logger.error(f"Database error in check_availability: {str(e)}")
+        logger.error(f"Database error in bulk_cancel_reservations: {str(e)}")
         return create_error_response(500, "Database error", e.error_code)
     
     except Exception as e:
-        logger.error(f"Error in check_availability: {str(e)}")
+        logger.error(f"Error in bulk_cancel_reservations: {str(e)}")
         return create_error_response(500, "Internal server error")
 
 
-def validate_reservation_entities(patient_id: str, medic_id: str, exam_id: str) -> Dict[str, Any]:
+def bulk_reschedule_reservations(event: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Validate that patient, medic, and exam exist.
+    Handle POST /reservations/bulk-reschedule - Move a medic's reservations.
+    
+    Required fields:
+    - medic_id: Medic whose reservations are moved
+    - date_from: First day (YYYY-MM-DD)
+    - target_medic_id and/or shift_days: Move to another medic at the same
+      time, and/or the same number of days later (negative: earlier)
+    
+    Optional fields:
+    - date_to: Last day (default: date_from, at most 31 days)
+    - time_from, time_to: Only reservations starting in [time_from, time_to) (HH:MM)
+    
+    Each reservation is moved only if its new slot is on a working day and
+    free; otherwise it stays untouched and is reported as 'not_working_day' or
+    'conflict'. A slot held by another reservation of the same batch counts
+    as taken, whether or not that one moves.
     
     Returns:
-        Error response if validation fails, None if successful
+        One outcome per selected reservation
     """
     try:
-        # Check patient exists
-        patient_sql = "SELECT COUNT(*) as count FROM patients WHERE patient_id = :patient_id"
-        patient_params = [db_manager.create_parameter('patient_id', patient_id, 'string')]
-        patient_response = db_manager.execute_sql(patient_sql, patient_params)
+        body = parse_event_body(event)
         
-        if not patient_response.get('records') or patient_response['records'][0][0].get('longValue', 0) == 0:
-            return create_error_response(400, "Patient not found", "PATIENT_NOT_FOUND")
+        try:
+            conditions, parameters = parse_bulk_scope(body)
+            shift_days = int(body.get('shift_days') or 0)
+        except (TypeError, ValueError) as e:
+            return create_error_response(400, str(e), "VALIDATION_ERROR")
+        
+        target_medic_id = body.get('target_medic_id') or body['medic_id']
+        if target_medic_id == body['medic_id'] and shift_days == 0:
+            return create_error_response(400, "target_medic_id or a non-zero shift_days is required", "VALIDATION_ERROR")
+        
+        parameters.extend([
+            db_manager.create_parameter('target_medic_id', target_medic_id, 'string'),
+            db_manager.create_parameter('shift_days', shift_days, 'long'),
+            db_manager.create_parameter('working_days', WORKING_DAYS, 'string')
+        ])
+        
+        # One statement: lock the batch, test every new slot against the target
+        # medic's other active reservations, move the free ones (the moved CTE
+        # always runs to completion) and report all.
+        # Only free slots are written, so MEDIC_OVERLAP_CONSTRAINT fails the
+        # statement only if a conflicting booking commits concurrently.
+        sql = f"""
+        WITH target AS (
+            SELECT medic_id FROM medics WHERE medic_id = :target_medic_id
+        ),
+        batch AS (
+            SELECT r.reservation_id, r.patient_id, r.medic_id, r.reservation_date, r.reservation_time,
+                   r.duration_minutes, r.reservation_date + CAST(:shift_days AS integer) AS new_date
+            FROM reservations r
+            WHERE {' AND '.join(conditions)}
+              AND EXISTS (SELECT 1 FROM target)
+            FOR UPDATE OF r
+        ),
+        checked AS (
+            SELECT b.*,
+                CASE
+                    WHEN EXTRACT(ISODOW FROM b.new_date)::int <> ALL(string_to_array(:working_days, ',')::int[])
+                        THEN 'not_working_day'
+                    WHEN EXISTS (
+                        SELECT 1 FROM reservations o
+                        WHERE o.medic_id = :target_medic_id
+                          AND o.reservation_id <> b.reservation_id
+                          AND o.status IN ('scheduled', 'confirmed')
+                          AND o.reservation_date BETWEEN b.new_date - 1 AND b.new_date + 1
+                          AND reservation_period(o.reservation_date, o.reservation_time, o.duration_minutes)
+                              && reservation_period(b.new_date, b.reservation_time, b.duration_minutes)
+                    ) THEN 'conflict'
+                    ELSE 'rescheduled'
+                END AS outcome
+            FROM batch b
+        ),
+        moved AS (
+            UPDATE reservations r
+            SET medic_id = :target_medic_id, reservation_date = c.new_date, updated_at = CURRENT_TIMESTAMP
+            FROM checked c
+            WHERE r.reservation_id = c.reservation_id AND c.outcome = 'rescheduled'
+        )
+        SELECT
+            c.reservation_id, c.patient_id,
+            c.medic_id, c.reservation_date::text AS reservation_date,
+            to_char(c.reservation_time, 'HH24:MI') AS reservation_time,
+            CAST(:target_medic_id AS text) AS new_medic_id, c.new_date::text AS new_date,
+            c.outcome
+        FROM checked c
+        UNION ALL
+        SELECT NULL, NULL, NULL, NULL, NULL, CAST(:target_medic_id AS text), NULL, 'medic_not_found'
+        WHERE NOT EXISTS (SELECT 1 FROM target)
+        ORDER BY reservation_date, reservation_time
+        """
         
-        # Check medic exists
-        medic_sql = "SELECT COUNT(*) as count FROM medics WHERE medic_id = :medic_id"
-        medic_params = [db_manager.create_parameter('medic_id', medic_id, 'string')]
-        medic_response = db_manager.execute_sql(medic_sql, medic_params)
+        results = db_manager.execute_query(sql, parameters)
         
-        if not medic_response.get('records') or medic_response['records'][0][0].get('longValue', 0) == 0:
-            return create_error_response(400, "Medic not found", "MEDIC_NOT_FOUND")
+        if results and results[0]['outcome'] == 'medic_not_found':
+            return create_error_response(400, "Target medic not found", "MEDIC_NOT_FOUND")
         
-        # Check exam exists
-        exam_sql = "SELECT COUNT(*) as count FROM exams WHERE exam_id = :exam_id"
-        exam_params = [db_manager.create_parameter('exam_id', exam_id, 'string')]
-        exam_response = db_manager.execute_sql(exam_sql, exam_params)
+        summary = {}
+        for row in results:
+            summary[row['outcome']] = summary.get(row['outcome'], 0) + 1
         
-        if not exam_response.get('records') or exam_response['records'][0][0].get('longValue', 0) == 0:
-            return create_error_response(400, "Exam not found", "EXAM_NOT_FOUND")
+        logger.info(f"Bulk rescheduled reservations of medic {body['medic_id']}: {summary}")
         
-        return None  # All validations passed
+        return create_response(200, {
+            'message': f"{summary.get('rescheduled', 0)} of {len(results)} reservation(s) rescheduled",
+            'summary': summary,
+            'results': results
+        })
         
     except DatabaseError as e:
-        logger.error(f"Database error in validate_reservation_entities: {str(e)}")
+        if is_medic_overlap_error(e):
+            return create_error_response(
+                400, "A slot was booked concurrently; nothing was moved, retry the request", "MEDIC_NOT_AVAILABLE"
+            )
+        logger.error(f"Database error in bulk_reschedule_reservations: {str(e)}")
         return create_error_response(500, "Database error", e.error_code)
+    
+    except Exception as e:
+        logger.error(f"Error in bulk_reschedule_reservations: {str(e)}")
+        return create_error_response(500, "Internal server error")
 
 
-def ensure_tables_exist() -> None:
-    """Ensure required tables exist by creating them if necessary."""
+def check_availability(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /reservations/availability - Find free slots.
+    
+    Required fields:
+    - medic_id or specialization: One medic, or every medic whose specialization matches
+    - date, or date_from and date_to: Day or range of days to search (YYYY-MM-DD, at most 31 days)
+    
+    Optional fields:
+    - exam_id: Exam to book; slots last its duration_minutes (default: 30 minutes)
+    - max_slots: Maximum number of slots to return (default: 50, max: 500)
+    
+    Returns:
+        Free slots in chronological order
+    """
     try:
-        # Create patients table
-        patients_sql = """
-        CREATE TABLE IF NOT EXISTS patients (
-            patient_id VARCHAR(255) PRIMARY KEY,
-            full_name VARCHAR(200) NOT NULL,
-            email VARCHAR(255) UNIQUE NOT NULL,
-            date_of_birth DATE,
-            phone VARCHAR(20),
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-        )
-        """
+        body = parse_event_body(event)
         
-        # Create medics table
-        medics_sql = """
-        CREATE TABLE IF NOT EXISTS medics (
-            medic_id VARCHAR(255) PRIMARY KEY,
-            first_name VARCHAR(200) NOT NULL,
-            email VARCHAR(255) UNIQUE NOT NULL,
-            specialization VARCHAR(100),
-            license_number VARCHAR(50) UNIQUE,
-            phone VARCHAR(20),
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-        )
-        """
+        if not body.get('medic_id') and not body.get('specialization'):
+            return create_error_response(400, "medic_id or specialization is required", "VALIDATION_ERROR")
         
-        # Create exams table
-        exams_sql = """
-        CREATE TABLE IF NOT EXISTS exams (
-            exam_id VARCHAR(255) PRIMARY KEY,
-            exam_name VARCHAR(200) NOT NULL UNIQUE,
-            exam_type VARCHAR(100) NOT NULL,
-            description TEXT,
-            duration_minutes INTEGER DEFAULT 30,
-            preparation_instructions TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-        )
-        """
+        try:
+            date_from = parse_date(body.get('date_from') or body.get('date'))
+            date_to = parse_date(body.get('date_to') or body.get('date') or body.get('date_from'))
+        except (TypeError, ValueError) as e:
+            return create_error_response(400, f"date or date_from/date_to (YYYY-MM-DD) required: {str(e)}", "INVALID_DATE_FORMAT")
+        
+        if date_to < date_from or (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+            return create_error_response(
+                400, f"date_to must be on or after date_from and within {MAX_AVAILABILITY_DAYS} days", "INVALID_DATE_RANGE"
+            )
         
-        # Create reservations table
-        reservations_sql = """
-        CREATE TABLE IF NOT EXISTS reservations (
-            reservation_id VARCHAR(255) PRIMARY KEY,
-            patient_id VARCHAR(255) NOT NULL,
-            medic_id VARCHAR(255) NOT NULL,
-            exam_id VARCHAR(255) NOT NULL,
-            reservation_date DATE NOT NULL,
-            reservation_time TIME NOT NULL,
-            status VARCHAR(20) DEFAULT 'scheduled' CHECK (status IN ('scheduled', 'confirmed', 'completed', 'cancelled', 'no_show')),
-            notes TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        try:
+            max_slots = min(max(int(body.get('max_slots', DEFAULT_MAX_SLOTS)), 1), MAX_SLOTS)
+        except (TypeError, ValueError):
+            return create_error_response(400, "max_slots must be an integer", "VALIDATION_ERROR")
+        
+        duration_minutes = get_slot_duration(body.get('exam_id'))
+        if duration_minutes is None:
+            return create_error_response(400, "Exam not found", "EXAM_NOT_FOUND")
+        
+        slots = find_available_slots(
+            date_from, date_to, duration_minutes,
+            medic_id=body.get('medic_id'),
+            specialization=body.get('specialization'),
+            max_slots=max_slots
         )
-        """
         
-        # Execute table creation
-        for sql in [patients_sql, medics_sql, exams_sql, reservations_sql]:
-            db_manager.execute_sql(sql, [])
-            
-        logger.info("Ensured all required tables exist")
+        return create_response(200, {
+            'medic_id': body.get('medic_id'),
+            'specialization': body.get('specialization'),
+            'exam_id': body.get('exam_id'),
+            'date_from': str(date_from),
+            'date_to': str(date_to),
+            'duration_minutes': duration_minutes,
+            'available': bool(slots),
+            'available_slots': slots,
+            'truncated': len(slots) == max_slots,
+            'message': f"{len(slots)} available slot(s) found" if slots else "No available slots in the requested range"
+        })
         
+    except DatabaseError as e:
+        logger.error(f"Database error in check_availability: {str(e)}")
+        return create_error_response(500, "Database error", e.error_code)
+    
     except Exception as e:
-        logger.warning(f"Could not ensure tables exist: {e}")
+        logger.error(f"Error in check_availability: {str(e)}")
+        return create_error_response(500, "Internal server error")
 
 
-def check_medic_availability(medic_id: str, date: str, exclude_reservation_id: str = None) -> Dict[str, Any]:
+def find_earliest_slots(event: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Check if medic is available at the specified date/time.
+    Handle POST /reservations/earliest - First free slot of each medic of a specialization.
+    
+    Required fields:
+    - specialization: Specialization to search (partial, case-insensitive)
+    
+    Optional fields:
+    - exam_id: Exam to book; slots last its duration_minutes (default: 30 minutes)
+    - date_from: First day to search (YYYY-MM-DD, default: today in CLINIC_TIMEZONE)
+    - date_to: Last day to search (default: EARLIEST_SLOTS_DEFAULT_DAYS after date_from, at most 31 days)
+    - limit: Number of medics to return (default: 5, max: 20)
     
-    Args:
-        medic_id: Medic ID
-        date: Date/time to check
-        exclude_reservation_id: Reservation ID to exclude from conflict check (for updates)
-        
     Returns:
-        Dictionary with availability information
+        One slot per medic, the earliest medics first
     """
     try:
-        # Check for conflicts on the same date
-        sql = """
-        SELECT COUNT(*) as conflict_count
-        FROM reservations
-        WHERE medic_id = :medic_id
-          AND DATE(reservation_date) = DATE(:date)
-          AND status IN ('scheduled', 'confirmed')
-        """
+        body = parse_event_body(event)
         
-        parameters = [
-            db_manager.create_parameter('medic_id', medic_id, 'string'),
-            db_manager.create_parameter('date', date, 'string')
-        ]
+        specialization = body.get('specialization')
+        if not specialization:
+            return create_error_response(400, "specialization is required", "VALIDATION_ERROR")
         
-        if exclude_reservation_id:
-            sql += " AND reservation_id != :exclude_reservation_id"
-            parameters.append(db_manager.create_parameter('exclude_reservation_id', exclude_reservation_id, 'string'))
+        try:
+            date_from = parse_date(body['date_from']) if body.get('date_from') else clinic_today()
+            date_to = (
+                parse_date(body['date_to']) if body.get('date_to')
+                else date_from + timedelta(days=EARLIEST_SLOTS_DEFAULT_DAYS - 1)
+            )
+        except (TypeError, ValueError) as e:
+            return create_error_response(400, f"date_from/date_to must be YYYY-MM-DD: {str(e)}", "INVALID_DATE_FORMAT")
+        
+        if date_to < date_from or (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+            return create_error_response(
+                400, f"date_to must be on or after date_from and within {MAX_AVAILABILITY_DAYS} days", "INVALID_DATE_RANGE"
+            )
         
-        response = db_manager.execute_sql(sql, parameters)
+        try:
+            limit = min(max(int(body.get('limit', DEFAULT_EARLIEST_SLOTS)), 1), MAX_EARLIEST_SLOTS)
+        except (TypeError, ValueError):
+            return create_error_response(400, "limit must be an integer", "VALIDATION_ERROR")
         
-        conflict_count = 0
-        if response.get('records'):
-            conflict_count = response['records'][0][0].get('longValue', 0)
+        duration_minutes = get_slot_duration(body.get('exam_id'))
+        if duration_minutes is None:
+            return create_error_response(400, "Exam not found", "EXAM_NOT_FOUND")
         
-        available = conflict_count == 0
+        slots = find_available_slots(
+            date_from, date_to, duration_minutes,
+            specialization=specialization,
+            max_slots=limit,
+            earliest_per_medic=True
+        )
         
-        return {
-            'available': available,
-            'conflicts': conflict_count,
-            'message': 'Available' if available else f'{conflict_count} conflicting reservations found'
-        }
+        return create_response(200, {
+            'specialization': specialization,
+            'exam_id': body.get('exam_id'),
+            'date_from': str(date_from),
+            'date_to': str(date_to),
+            'duration_minutes': duration_minutes,
+            'available': bool(slots),
+            'available_slots': slots,
+            'message': f"Earliest slot of {len(slots)} medic(s) found" if slots else "No available slots in the requested range"
+        })
         
     except DatabaseError as e:
-        logger.error(f"Database error in check_medic_availability: {str(e)}")
-        return {
-            'available': False,
-            'conflicts': 0,
-            'message': 'Error checking availability'
-        }
+        logger.error(f"Database error in find_earliest_slots: {str(e)}")
+        return create_error_response(500, "Database error", e.error_code)
+    
+    except Exception as e:
+        logger.error(f"Error in find_earliest_slots: {str(e)}")
+        return create_error_response(500, "Internal server error")
+
+
+def is_medic_overlap_error(error: DatabaseError) -> bool:
+    """
+    Check whether a database error is a violation of MEDIC_OVERLAP_CONSTRAINT.
+    
+    Both the Data API and the native driver include the constraint name in the message.
+    """
+    return MEDIC_OVERLAP_CONSTRAINT in str(error)
+
+
+def parse_date(value: Any) -> date:
+    """Parse a YYYY-MM-DD date; a time part, as in appointment datetimes, is ignored."""
+    return date.fromisoformat(str(value)[:10])
+
+
+def clinic_today() -> date:
+    """Current date in CLINIC_TIMEZONE."""
+    return datetime.now(ZoneInfo(CLINIC_TIMEZONE)).date()
+
+
+def get_slot_duration(exam_id: Optional[str]) -> Optional[int]:
+    """
+    Return the slot length for an exam, or DEFAULT_SLOT_MINUTES when no exam is given.
+    
+    Durations are read through the exams reference cache.
+    
+    Returns:
+        Duration in minutes, or None if the exam does not exist
+    """
+    if not exam_id:
+        return DEFAULT_SLOT_MINUTES
+    
+    rows = exams_cache.get(db_manager, ('slot_duration', exam_id), lambda: db_manager.execute_query(
+        "SELECT COALESCE(duration_minutes, :default_minutes) AS duration_minutes FROM exams WHERE exam_id = :exam_id",
+        [
+            db_manager.create_parameter('exam_id', exam_id, 'string'),
+            db_manager.create_parameter('default_minutes', DEFAULT_SLOT_MINUTES, 'long')
+        ]
+    ))
+    return rows[0]['duration_minutes'] if rows else None
+
+
+def find_available_slots(
+    date_from: date,
+    date_to: date,
+    duration_minutes: int,
+    medic_id: str = None,
+    specialization: str = None,
+    max_slots: int = DEFAULT_MAX_SLOTS,
+    earliest_per_medic: bool = False
+) -> list:
+    """
+    Compute free slots of one medic, or of every medic of a specialization.
+    
+    Candidate slots start every SLOT_STEP_MINUTES within the working hours of
+    each working day; a slot is free when it does not overlap an active
+    reservation of the medic and has not started yet in CLINIC_TIMEZONE.
+    Everything runs as one query: the medics' reservations in the range are
+    read once (through idx_reservations_medic_active) and anti-joined against
+    the generated slots per medic and day.
+    
+    Args:
+        earliest_per_medic: Keep only the first free slot of each medic
+    
+    Returns:
+        Slots ordered by start, each with medic_id, medic_name, specialization,
+        date, start_time and end_time
+        
+    Raises:
+        DatabaseError: If the query fails
+    """
+    if medic_id:
+        medic_filter = "medic_id = :medic_id"
+        parameters = [db_manager.create_parameter('medic_id', medic_id, 'string')]
+    else:
+        medic_filter = "LOWER(specialization) LIKE LOWER(:specialty)"
+        parameters = [db_manager.create_parameter('specialty', f'%{specialization}%', 'string')]
+    
+    earliest_source = "(SELECT DISTINCT ON (medic_id) * FROM free_slots ORDER BY medic_id, slot_start)"
+    
+    sql = f"""
+    WITH candidate_medics AS (
+        SELECT medic_id, first_name, specialization FROM medics WHERE {medic_filter}
+    ),
+    -- Active reservations of those medics in the range, read once and keyed by
+    -- every day they touch (a reservation running past midnight also blocks the next day)
+    busy AS MATERIALIZED (
+        SELECT r.medic_id, touched.day, period.starts_at, period.ends_at
+        FROM reservations r
+        JOIN candidate_medics m ON m.medic_id = r.medic_id
+        CROSS JOIN LATERAL (
+            SELECT r.reservation_date + r.reservation_time AS starts_at,
+                   r.reservation_date + r.reservation_time + make_interval(mins => r.duration_minutes) AS ends_at
+        ) AS period
+        CROSS JOIN LATERAL (VALUES (r.reservation_date), (r.reservation_date + 1)) AS touched (day)
+        WHERE r.status IN ('scheduled', 'confirmed')
+          AND r.reservation_date BETWEEN :date_from::date - 1 AND :date_to::date
+          AND (touched.day = r.reservation_date OR period.ends_at > touched.day)
+    ),
+    slots AS (
+        SELECT medic_id, first_name, specialization, days.day::date AS day, slot_start
+        FROM generate_series(:date_from::timestamp, :date_to::timestamp, interval '1 day') AS days (day)
+        CROSS JOIN LATERAL generate_series(
+            days.day::date + :work_start::time,
+            days.day::date + :work_end::time - make_interval(mins => CAST(:duration_minutes AS integer)),
+            make_interval(mins => CAST(:step_minutes AS integer))
+        ) AS slot_start
+        CROSS JOIN candidate_medics
+        WHERE EXTRACT(ISODOW FROM days.day)::int = ANY(string_to_array(:working_days, ',')::int[])
+          AND slot_start >= (now() AT TIME ZONE :timezone)
+    ),
+    free_slots AS (
+        SELECT s.* FROM slots s
+        WHERE NOT EXISTS (
+            -- hash anti-join on (medic, day); the same overlap test as reservation_period() &&
+            SELECT 1 FROM busy b
+            WHERE b.medic_id = s.medic_id
+              AND b.day = s.day
+              AND b.starts_at < s.slot_start + make_interval(mins => CAST(:duration_minutes AS integer))
+              AND b.ends_at > s.slot_start
+        )
+    )
+    SELECT
+        f.medic_id, f.first_name AS medic_name, f.specialization,
+        f.day::text AS date,
+        to_char(f.slot_start, 'HH24:MI') AS start_time,
+        to_char(f.slot_start + make_interval(mins => CAST(:duration_minutes AS integer)), 'HH24:MI') AS end_time
+    FROM {earliest_source if earliest_per_medic else 'free_slots'} f
+    ORDER BY f.slot_start, f.first_name, f.medic_id
+    LIMIT :max_slots
+    """
+    
+    parameters.extend([
+        db_manager.create_parameter('date_from', str(date_from), 'string'),
+        db_manager.create_parameter('date_to', str(date_to), 'string'),
+        db_manager.create_parameter('work_start', WORKING_HOURS_START, 'string'),
+        db_manager.create_parameter('work_end', WORKING_HOURS_END, 'string'),
+        db_manager.create_parameter('duration_minutes', duration_minutes, 'long'),
+        db_manager.create_parameter('step_minutes', SLOT_STEP_MINUTES, 'long'),
+        db_manager.create_parameter('working_days', WORKING_DAYS, 'string'),
+        db_manager.create_parameter('timezone', CLINIC_TIMEZONE, 'string'),
+        db_manager.create_parameter('max_slots', max_slots, 'long')
+    ])
+    
+    return db_manager.execute_query(sql, parameters)
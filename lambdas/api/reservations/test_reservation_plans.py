@@ -0,0 +1,83 @@
+"""
+Query plan regression tests for reservation listing at 1M rows.
+
+Uses the postgres_db fixture (btree_gist, pg_trgm and unaccent must be
+available); skipped unless TEST_DATABASE_DSN is set. Loading the rows takes
+about a minute:
+
+    TEST_DATABASE_DSN=postgresql://postgres@localhost/healthcare_test \
+        python -m pytest lambdas/api/reservations/test_reservation_plans.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from shared.utils import encode_cursor, validate_pagination_params
+from api.reservations import handler
+
+RESERVATION_COUNT = 1000000
+MEDIC_COUNT = 200
+
+DB_MANAGER_MODULES = [handler]
+
+
+def seed_database(db):
+    db.execute_sql("""
+        INSERT INTO patients (patient_id, full_name, email)
+        SELECT 'p-' || i, 'Paciente ' || i, 'p' || i || '@example.com' FROM generate_series(1, 5000) AS i
+    """)
+    db.execute_sql("""
+        INSERT INTO medics (medic_id, first_name, email)
+        SELECT 'm-' || i, 'Médico ' || i, 'm' || i || '@example.com' FROM generate_series(0, :medics - 1) AS i
+    """, [db.create_parameter('medics', MEDIC_COUNT, 'long')])
+    db.execute_sql("INSERT INTO exams (exam_id, exam_name, exam_type) VALUES ('e-1', 'Hemograma', 'lab')")
+
+    # 16 half-hour slots per medic and day, so no two active reservations overlap
+    db.execute_sql("""
+        INSERT INTO reservations (reservation_id, patient_id, medic_id, exam_id, reservation_date, reservation_time, status)
+        SELECT 'r-' || i, 'p-' || (1 + i % 5000), 'm-' || (i % :medics), 'e-1',
+               DATE '2027-01-01' + (i / :medics) / 16,
+               TIME '08:00' + ((i / :medics) % 16) * interval '30 minutes',
+               (ARRAY['scheduled', 'confirmed', 'completed', 'cancelled', 'no_show'])[1 + i % 5]
+        FROM generate_series(0, :count - 1) AS i
+    """, [
+        db.create_parameter('medics', MEDIC_COUNT, 'long'),
+        db.create_parameter('count', RESERVATION_COUNT, 'long')
+    ])
+    db.execute_sql("ANALYZE")
+
+
+def reservation_scans(node, found=None):
+    """Collect (node type, index name) of every scan on reservations in an EXPLAIN plan."""
+    found = [] if found is None else found
+    if node.get('Relation Name') == 'reservations':
+        found.append((node['Node Type'], node.get('Index Name')))
+    for child in node.get('Plans', []):
+        reservation_scans(child, found)
+    return found
+
+
+@pytest.mark.parametrize('query_params', [
+    {},
+    {'patient_id': 'p-42'},
+    {'patient_id': 'p-42', 'date_from': '2027-03-01', 'date_to': '2027-06-30'},
+    {'medic_id': 'm-7', 'date_from': '2027-02-01'},
+    {'status': 'scheduled', 'date_from': '2027-05-01', 'date_to': '2027-05-31'},
+    {'date_from': '2027-04-01', 'date_to': '2027-04-02'},
+    {'medic_id': 'm-7', 'cursor': encode_cursor(['2027-06-01', '10:00:00', 'r-5'])},
+])
+def test_list_reservations_uses_indexes(postgres_db, query_params):
+    """No filter combination falls back to a sequential scan of reservations."""
+    pagination = validate_pagination_params(dict(query_params, limit='50'), cursor_keys=3)
+    conditions, parameters = handler.build_reservation_filters(query_params)
+    sql, parameters = handler.build_reservation_page_query(conditions, parameters, pagination)
+
+    plan = postgres_db.execute_query(f"EXPLAIN (FORMAT JSON) {sql}", parameters)[0]['QUERY PLAN'][0]['Plan']
+    scans = reservation_scans(plan)
+
+    assert scans, plan
+    assert all(node_type != 'Seq Scan' for node_type, _ in scans), scans
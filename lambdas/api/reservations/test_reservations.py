@@ -0,0 +1,202 @@
+"""
+Tests for reservation creation against a throwaway local PostgreSQL database.
+
+The tests use the postgres_db fixture (btree_gist, pg_trgm and unaccent must
+be available) and are skipped unless TEST_DATABASE_DSN is set:
+
+    TEST_DATABASE_DSN=postgresql://postgres@localhost/healthcare_test \
+        python -m pytest lambdas/api/reservations/test_reservations.py -v
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from api.reservations import handler
+
+DB_MANAGER_MODULES = [handler]
+
+
+def seed_database(db):
+    db.execute_sql("INSERT INTO patients (patient_id, full_name, email) VALUES ('p-1', 'Ana Gómez', 'ana@example.com')")
+    db.execute_sql("INSERT INTO medics (medic_id, first_name, email) VALUES ('m-1', 'Carlos', 'carlos@example.com')")
+    db.execute_sql("""
+        INSERT INTO exams (exam_id, exam_name, exam_type, duration_minutes)
+        VALUES ('e-1', 'Ecografía', 'imaging', 45)
+    """)
+
+
+def create(appointment_date, patient_id='p-1', medic_id='m-1', exam_id='e-1'):
+    body = {'patient_id': patient_id, 'medic_id': medic_id, 'exam_id': exam_id, 'appointment_date': appointment_date}
+    result = handler.create_reservation({'body': json.dumps(body)})
+    return result['statusCode'], json.loads(result['body'])
+
+
+def error_code(body):
+    return body['error']['code']
+
+
+def test_missing_entities_are_reported(postgres_db):
+    """Each unknown reference maps to its own error code."""
+    assert error_code(create('2031-01-01T09:00:00', patient_id='missing')[1]) == 'PATIENT_NOT_FOUND'
+    assert error_code(create('2031-01-01T09:00:00', medic_id='missing')[1]) == 'MEDIC_NOT_FOUND'
+    assert error_code(create('2031-01-01T09:00:00', exam_id='missing')[1]) == 'EXAM_NOT_FOUND'
+
+
+def test_overlapping_reservations_are_rejected(postgres_db):
+    """A slot is blocked for the exam's duration; the next free minute can be booked."""
+    status, body = create('2031-01-02T09:00:00')
+    assert status == 201
+    assert body['reservation']['duration_minutes'] == 45
+
+    status, body = create('2031-01-02T09:30:00')
+    assert status == 400 and error_code(body) == 'MEDIC_NOT_AVAILABLE'
+
+    assert create('2031-01-02T09:45:00')[0] == 201
+
+
+def test_update_into_a_booked_slot_is_rejected(postgres_db):
+    """Moving a reservation onto another one fails; cancelled reservations free their slot."""
+    first = create('2031-01-03T09:00:00')[1]['reservation']['reservation_id']
+    second = create('2031-01-03T11:00:00')[1]['reservation']['reservation_id']
+
+    result = handler.update_reservation(second, {'body': json.dumps({'appointment_date': '2031-01-03T09:15:00'})})
+    assert result['statusCode'] == 400
+    assert error_code(json.loads(result['body'])) == 'MEDIC_NOT_AVAILABLE'
+
+    assert handler.cancel_reservation(first)['statusCode'] == 200
+    result = handler.update_reservation(second, {'body': json.dumps({'appointment_date': '2031-01-03T09:15:00'})})
+    assert result['statusCode'] == 200
+
+
+def test_concurrent_bookings_of_overlapping_slots(postgres_db):
+    """Of several simultaneous requests for overlapping times exactly one succeeds."""
+    start_times = [f'2031-02-{day:02d}T10:{minute:02d}:00' for day in range(1, 11) for minute in (0, 10, 20, 30)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        statuses = list(executor.map(lambda appointment: create(appointment)[0], start_times))
+
+    for day in range(10):
+        assert sorted(statuses[day * 4:day * 4 + 4]) == [201, 400, 400, 400]
+
+    booked = postgres_db.execute_query("""
+        SELECT reservation_date, COUNT(*) AS n FROM reservations
+        WHERE reservation_date BETWEEN '2031-02-01' AND '2031-02-10'
+        GROUP BY reservation_date
+    """)
+    assert len(booked) == 10 and all(row['n'] == 1 for row in booked)
+
+
+def test_earliest_slots_skip_booked_time(postgres_db):
+    """Each medic of the specialization is listed once, at its first free slot."""
+    postgres_db.execute_sql("""
+        INSERT INTO medics (medic_id, first_name, email, specialization) VALUES
+        ('c-1', 'Beatriz', 'beatriz@example.com', 'Cardiología'),
+        ('c-2', 'Andrea', 'andrea@example.com', 'Cardiología')
+    """)
+    assert create('2031-03-03T08:00:00', medic_id='c-2')[0] == 201
+
+    body = {'specialization': 'cardio', 'exam_id': 'e-1', 'date_from': '2031-03-03'}
+    result = handler.find_earliest_slots({'body': json.dumps(body)})
+    assert result['statusCode'] == 200
+    body = json.loads(result['body'])
+
+    assert body['date_to'] == '2031-03-16'
+    assert [(slot['medic_id'], slot['date'], slot['start_time'], slot['end_time']) for slot in body['available_slots']] == [
+        ('c-1', '2031-03-03', '08:00', '08:45'),
+        ('c-2', '2031-03-03', '08:45', '09:30'),
+    ]
+
+
+def test_bulk_reschedule_reports_each_reservation(postgres_db):
+    """Free slots move to the target medic; taken ones stay and are reported."""
+    postgres_db.execute_sql("INSERT INTO medics (medic_id, first_name, email) VALUES ('m-sub', 'Diana', 'diana@example.com')")
+    for appointment in ['2031-04-07T09:00:00', '2031-04-07T10:00:00']:
+        assert create(appointment)[0] == 201
+    assert create('2031-04-07T10:15:00', medic_id='m-sub')[0] == 201
+
+    body = {'medic_id': 'm-1', 'date_from': '2031-04-07', 'target_medic_id': 'm-sub'}
+    result = handler.bulk_reschedule_reservations({'body': json.dumps(body)})
+    assert result['statusCode'] == 200
+    body = json.loads(result['body'])
+
+    assert [(row['reservation_time'], row['outcome']) for row in body['results']] == [
+        ('09:00', 'rescheduled'), ('10:00', 'conflict')
+    ]
+    assert body['summary'] == {'rescheduled': 1, 'conflict': 1}
+
+    result = handler.bulk_cancel_reservations({'body': json.dumps({'medic_id': 'm-1', 'date_from': '2031-04-07'})})
+    assert [row['reservation_time'] for row in json.loads(result['body'])['results']] == ['10:00']
+
+
+def availability(medic_id, date_from, date_to=None, exam_id=None, max_slots=500):
+    body = {'medic_id': medic_id, 'date_from': date_from, 'date_to': date_to or date_from, 'max_slots': max_slots}
+    if exam_id:
+        body['exam_id'] = exam_id
+    result = handler.check_availability({'body': json.dumps(body)})
+    assert result['statusCode'] == 200
+    return json.loads(result['body'])
+
+
+def start_times(body):
+    return [slot['start_time'] for slot in body['available_slots']]
+
+
+@pytest.fixture
+def slot_medic(postgres_db):
+    """A medic with no other reservations, removed after the test."""
+    postgres_db.execute_sql("INSERT INTO medics (medic_id, first_name, email) VALUES ('s-1', 'Elena', 'elena@example.com')")
+    yield 's-1'
+    postgres_db.execute_sql("DELETE FROM reservations WHERE medic_id = 's-1'")
+    postgres_db.execute_sql("DELETE FROM medics WHERE medic_id = 's-1'")
+
+
+def test_reservation_across_midnight_blocks_the_next_day(postgres_db, slot_medic, monkeypatch):
+    """A reservation ending after midnight removes the first slots of the following day."""
+    monkeypatch.setattr(handler, 'WORKING_HOURS_START', '00:00')
+    postgres_db.execute_sql("""
+        INSERT INTO reservations (reservation_id, patient_id, medic_id, exam_id, reservation_date, reservation_time, duration_minutes)
+        VALUES ('r-midnight', 'p-1', 's-1', 'e-1', '2031-05-05', '23:30', 60)
+    """)
+
+    body = availability(slot_medic, '2031-05-06')
+
+    assert start_times(body)[:2] == ['00:30', '00:45']
+
+
+def test_non_working_days_are_excluded(postgres_db, slot_medic):
+    """A Friday to Monday range only returns slots on Friday and Monday."""
+    body = availability(slot_medic, '2031-05-09', '2031-05-12')
+
+    assert {slot['date'] for slot in body['available_slots']} == {'2031-05-09', '2031-05-12'}
+
+
+def test_slots_last_the_exam_duration(postgres_db, slot_medic):
+    """Slots use the exam's duration_minutes and end by the close of working hours."""
+    body = availability(slot_medic, '2031-05-12', exam_id='e-1')
+    assert body['duration_minutes'] == 45
+    first, last = body['available_slots'][0], body['available_slots'][-1]
+    assert (first['start_time'], first['end_time']) == ('08:00', '08:45')
+    assert (last['start_time'], last['end_time']) == ('16:15', '17:00')
+
+    body = availability(slot_medic, '2031-05-12')
+    assert body['duration_minutes'] == handler.DEFAULT_SLOT_MINUTES
+    assert body['available_slots'][-1]['end_time'] == '17:00'
+
+    assert handler.check_availability({'body': json.dumps(
+        {'medic_id': slot_medic, 'date': '2031-05-12', 'exam_id': 'missing'})})['statusCode'] == 400
+
+
+def test_booked_slot_is_excluded_and_adjacent_slots_stay_free(postgres_db, slot_medic):
+    """Slots overlapping a reservation disappear; those ending or starting at its edges remain."""
+    assert create('2031-05-13T09:00:00', medic_id=slot_medic)[0] == 201
+
+    starts = start_times(availability(slot_medic, '2031-05-13', exam_id='e-1'))
+
+    assert '08:15' in starts and '09:45' in starts
+    assert not {'08:30', '08:45', '09:00', '09:15', '09:30'} & set(starts)
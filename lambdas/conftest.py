@@ -0,0 +1,76 @@
+"""
+Shared fixtures for the Lambda function tests.
+
+The postgres_db fixture needs a throwaway local PostgreSQL database (its
+application tables are dropped and recreated through the migrations); tests
+using it are skipped unless TEST_DATABASE_DSN is set.
+"""
+
+import os
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from shared.database import DatabaseManager
+from db_initialization.handler import run_migrations
+
+TEST_DSN = os.environ.get('TEST_DATABASE_DSN')
+SCHEMA_TABLES = ['schema_migrations', 'processed_documents', 'reservations', 'exams', 'medics', 'patients']
+
+
+class StubDatabase:
+    """DatabaseManager stand-in recording each query and serving fixed rows."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.queries = []
+
+    def create_parameter(self, name, value, type_hint=None):
+        return {'name': name, 'value': value}
+
+    def execute_query(self, sql, parameters=None, format='records', json_columns=None):
+        params = {param['name']: param['value'] for param in parameters or []}
+        self.queries.append((sql, params))
+        return [dict(row) for row in self.rows[:params.get('limit')]]
+
+
+@pytest.fixture
+def stub_database():
+    return StubDatabase()
+
+
+def recreate_schema(db_manager, target_version=None):
+    """Drop the application tables and migrate them again (up to target_version)."""
+    db_manager.execute_sql(f"DROP TABLE IF EXISTS {', '.join(SCHEMA_TABLES)} CASCADE")
+    run_migrations(db_manager, target_version)
+
+
+@pytest.fixture(scope='module')
+def postgres_db(request):
+    """
+    DatabaseManager on the TEST_DATABASE_DSN database with a fresh schema.
+
+    The requesting test module can define seed_database(db), called once with
+    the manager, and DB_MANAGER_MODULES, the modules whose db_manager is
+    replaced by it while the module's tests run.
+    """
+    if not TEST_DSN:
+        pytest.skip("TEST_DATABASE_DSN is not set")
+
+    os.environ['DATABASE_DSN'] = TEST_DSN
+    manager = DatabaseManager(backend='postgres')
+    recreate_schema(manager)
+    seed_database = getattr(request.module, 'seed_database', None)
+    if seed_database:
+        seed_database(manager)
+
+    replaced = [(module, module.db_manager) for module in getattr(request.module, 'DB_MANAGER_MODULES', [])]
+    for module, _ in replaced:
+        module.db_manager = manager
+    yield manager
+    for module, original in replaced:
+        module.db_manager = original
+
+    from shared.postgres_backend import close_pool
+    close_pool()
+    os.environ.pop('DATABASE_DSN', None)
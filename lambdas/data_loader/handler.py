@@ -5,9 +5,72 @@ import os
 import uuid
 from typing import Dict, List, Any, Optional
 
+from shared.database import DatabaseManager
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+PATIENT_UPSERT_SQL = """
+INSERT INTO patients (
+    patient_id, first_name, last_name, full_name, email, cedula, date_of_birth, phone,
+    age, gender, document_type, document_number,
+    address, medical_history, lab_results, source_scan, created_at, updated_at
+) VALUES (
+    :patient_id, :first_name, :last_name, :full_name, :email, :cedula, :date_of_birth::date, :phone,
+    :age, :gender, :document_type, :document_number,
+    :address::jsonb, :medical_history::jsonb, :lab_results::jsonb, :source_scan,
+    CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+)
+ON CONFLICT (patient_id) 
+DO UPDATE SET
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    full_name = EXCLUDED.full_name,
+    email = EXCLUDED.email,
+    cedula = COALESCE(EXCLUDED.cedula, patients.cedula),
+    date_of_birth = EXCLUDED.date_of_birth,
+    phone = EXCLUDED.phone,
+    age = EXCLUDED.age,
+    gender = EXCLUDED.gender,
+    document_type = EXCLUDED.document_type,
+    document_number = EXCLUDED.document_number,
+    address = EXCLUDED.address,
+    medical_history = EXCLUDED.medical_history,
+    lab_results = EXCLUDED.lab_results,
+    source_scan = EXCLUDED.source_scan,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+PATIENT_UPSERT_NO_CEDULA_SQL = """
+INSERT INTO patients (
+    patient_id, first_name, last_name, full_name, email, date_of_birth, phone,
+    age, gender, document_type, document_number,
+    address, medical_history, lab_results, source_scan, created_at, updated_at
+) VALUES (
+    :patient_id, :first_name, :last_name, :full_name, :email, :date_of_birth::date, :phone,
+    :age, :gender, :document_type, :document_number,
+    :address::jsonb, :medical_history::jsonb, :lab_results::jsonb, :source_scan,
+    CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+)
+ON CONFLICT (patient_id) 
+DO UPDATE SET
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    full_name = EXCLUDED.full_name,
+    email = EXCLUDED.email,
+    date_of_birth = EXCLUDED.date_of_birth,
+    phone = EXCLUDED.phone,
+    age = EXCLUDED.age,
+    gender = EXCLUDED.gender,
+    document_type = EXCLUDED.document_type,
+    document_number = EXCLUDED.document_number,
+    address = EXCLUDED.address,
+    medical_history = EXCLUDED.medical_history,
+    lab_results = EXCLUDED.lab_results,
+    source_scan = EXCLUDED.source_scan,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
 
 def lambda_handler(event, context):
     """
@@ -31,7 +94,7 @@ def lambda_handler(event, context):
             raise ValueError("Missing required environment variables")
         
         # Initialize AWS clients
-        rds_data = boto3.client('rds-data')
+        db_manager = DatabaseManager(cluster_arn, secret_arn, database_name)
         s3 = boto3.client('s3')
         
         # Check if patient profiles are provided in the payload
@@ -40,19 +103,13 @@ def lambda_handler(event, context):
         if patient_profiles:
             # Load from payload
             logger.info(f"Loading {len(patient_profiles)} patient profiles from payload")
-            patients_loaded = load_from_payload(
-                rds_data, patient_profiles,
-                cluster_arn, secret_arn, database_name
-            )
+            patients_loaded = load_from_payload(db_manager, patient_profiles)
         else:
             # Load from S3 (legacy behavior)
             logger.info("No patient profiles in payload, loading from S3")
             if not sample_bucket:
                 raise ValueError("SAMPLE_DATA_BUCKET environment variable required when loading from S3")
-            patients_loaded = load_and_process_sample_data(
-                s3, rds_data, sample_bucket, 
-                cluster_arn, secret_arn, database_name
-            )
+            patients_loaded = load_and_process_sample_data(s3, db_manager, sample_bucket)
         
         logger.info(f"Data loading completed successfully. Processed {patients_loaded} patients.")
         
@@ -74,37 +131,20 @@ def lambda_handler(event, context):
         }
 
 
-def load_from_payload(rds_data, patient_profiles: List[Dict[str, Any]],
-                     cluster_arn: str, secret_arn: str, database_name: str) -> int:
+def load_from_payload(db_manager: DatabaseManager, patient_profiles: List[Dict[str, Any]]) -> int:
     """Load patient profiles directly from the Lambda payload."""
     
     logger.info(f"Processing {len(patient_profiles)} patient profiles from payload")
     
-    patients_processed = 0
-    
-    for i, profile_data in enumerate(patient_profiles, 1):
-        try:
-            # Upsert patient in database
-            upsert_patient_to_database(
-                rds_data, cluster_arn, secret_arn, database_name, profile_data
-            )
-            
-            patients_processed += 1
-            patient_name = profile_data.get('personal_info', {}).get('nombre_completo', 'Unknown')
-            patient_id = profile_data.get('patient_id', 'Unknown')
-            logger.info(f"Successfully processed patient {patients_processed}/{len(patient_profiles)}: {patient_name} (ID: {patient_id})")
-            
-        except Exception as e:
-            logger.error(f"Failed to process patient profile {i}: {e}")
-            continue
+    patients_processed = upsert_patients_to_database(db_manager, patient_profiles)
     
     if patients_processed == 0:
         logger.warning("No patient profiles were successfully processed")
     
     # Also load basic sample data (medics and exams) if not already present
     try:
-        insert_sample_medics(rds_data, cluster_arn, secret_arn, database_name)
-        insert_sample_exams(rds_data, cluster_arn, secret_arn, database_name)
+        insert_sample_medics(db_manager)
+        insert_sample_exams(db_manager)
         logger.info("Sample medics and exams loaded successfully")
     except Exception as e:
         logger.warning(f"Failed to load sample medics/exams: {e}")
@@ -112,8 +152,7 @@ def load_from_payload(rds_data, patient_profiles: List[Dict[str, Any]],
     return patients_processed
 
 
-def load_and_process_sample_data(s3, rds_data, sample_bucket: str, 
-                               cluster_arn: str, secret_arn: str, database_name: str) -> int:
+def load_and_process_sample_data(s3, db_manager: DatabaseManager, sample_bucket: str) -> int:
     """Load all sample patient profiles from S3 and insert into database."""
     
     logger.info(f"Loading sample data from bucket: {sample_bucket}")
@@ -128,8 +167,6 @@ def load_and_process_sample_data(s3, rds_data, sample_bucket: str,
     total_objects = len(response['Contents'])
     logger.info(f"Found {total_objects} objects in S3 bucket")
     
-    patients_processed = 0
-    
     # Find JSON profile files only (PDFs and images are excluded from S3 deployment)
     patient_profiles = []
     
@@ -147,33 +184,22 @@ def load_and_process_sample_data(s3, rds_data, sample_bucket: str,
     
     logger.info(f"Found {len(patient_profiles)} patient profiles to process")
     
-    # Process ALL patients
+    # Load ALL patient profiles, then write them in batches
+    profiles = []
     for profile_key in patient_profiles:
-        try:
-            # Load patient profile
-            profile_data = load_patient_profile(s3, sample_bucket, profile_key)
-            if profile_data:
-                # Upsert patient in database
-                upsert_patient_to_database(
-                    rds_data, cluster_arn, secret_arn, database_name, profile_data
-                )
-                
-                patients_processed += 1
-                patient_name = profile_data.get('personal_info', {}).get('nombre_completo', 'Unknown')
-                patient_id = profile_data.get('patient_id', 'Unknown')
-                logger.info(f"Successfully processed patient {patients_processed}/{len(patient_profiles)}: {patient_name} (ID: {patient_id})")
-                
-        except Exception as e:
-            logger.error(f"Failed to process patient profile {profile_key}: {e}")
-            continue
+        profile_data = load_patient_profile(s3, sample_bucket, profile_key)
+        if profile_data:
+            profiles.append(profile_data)
+    
+    patients_processed = upsert_patients_to_database(db_manager, profiles)
     
     if patients_processed == 0:
         logger.warning("No patient profiles were successfully processed")
     
     # Also load basic sample data (medics and exams) if not already present
     try:
-        insert_sample_medics(rds_data, cluster_arn, secret_arn, database_name)
-        insert_sample_exams(rds_data, cluster_arn, secret_arn, database_name)
+        insert_sample_medics(db_manager)
+        insert_sample_exams(db_manager)
         logger.info("Sample medics and exams loaded successfully")
     except Exception as e:
         logger.warning(f"Failed to load sample medics/exams: {e}")
@@ -193,121 +219,70 @@ def load_patient_profile(s3, bucket: str, key: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def upsert_patient_to_database(rds_data, cluster_arn: str, secret_arn: str, 
-                             database_name: str, profile: Dict[str, Any]):
-    """Upsert patient data using PostgreSQL's INSERT ... ON CONFLICT ... DO UPDATE."""
+def upsert_patients_to_database(db_manager: DatabaseManager, profiles: List[Dict[str, Any]]) -> int:
+    """
+    Upsert patient profiles in batches using PostgreSQL's INSERT ... ON CONFLICT ... DO UPDATE.
     
-    patient_data = convert_patient_profile_to_db_format(profile)
+    Rows rejected because their cedula already belongs to another patient are
+    retried without the cedula, matching the previous per-row behavior.
     
-    # Use PostgreSQL UPSERT with ON CONFLICT
-    upsert_sql = """
-    INSERT INTO patients (
-        patient_id, first_name, last_name, full_name, email, cedula, date_of_birth, phone,
-        age, gender, document_type, document_number,
-        address, medical_history, lab_results, source_scan, created_at, updated_at
-    ) VALUES (
-        :patient_id, :first_name, :last_name, :full_name, :email, :cedula, :date_of_birth::date, :phone,
-        :age, :gender, :document_type, :document_number,
-        :address::jsonb, :medical_history::jsonb, :lab_results::jsonb, :source_scan,
-        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-    )
-    ON CONFLICT (patient_id) 
-    DO UPDATE SET
-        first_name = EXCLUDED.first_name,
-        last_name = EXCLUDED.last_name,
-        full_name = EXCLUDED.full_name,
-        email = EXCLUDED.email,
-        cedula = COALESCE(EXCLUDED.cedula, patients.cedula),
-        date_of_birth = EXCLUDED.date_of_birth,
-        phone = EXCLUDED.phone,
-        age = EXCLUDED.age,
-        gender = EXCLUDED.gender,
-        document_type = EXCLUDED.document_type,
-        document_number = EXCLUDED.document_number,
-        address = EXCLUDED.address,
-        medical_history = EXCLUDED.medical_history,
-        lab_results = EXCLUDED.lab_results,
-        source_scan = EXCLUDED.source_scan,
-        updated_at = CURRENT_TIMESTAMP
+    Returns:
+        Number of patients upserted
     """
+    patients = []
+    for i, profile in enumerate(profiles, 1):
+        try:
+            patients.append(convert_patient_profile_to_db_format(profile))
+        except Exception as e:
+            logger.error(f"Failed to convert patient profile {i}: {e}")
     
-    parameters = []
-    for key, value in patient_data.items():
-        if value is None:
-            param_value = {'isNull': True}
-        elif key == 'date_of_birth' and value is not None:
-            param_value = {'stringValue': str(value)}
-        elif key == 'age' and value is not None:
-            param_value = {'longValue': int(value)}
-        else:
-            param_value = {'stringValue': str(value) if value is not None else None}
-        
-        parameters.append({'name': key, 'value': param_value})
+    if not patients:
+        return 0
     
-    try:
-        rds_data.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=upsert_sql,
-            parameters=parameters
-        )
-        
-        cedula_info = f" (cedula: {patient_data.get('cedula', 'None')})" if patient_data.get('cedula') else " (no cedula)"
-        logger.info(f"Upserted patient: {patient_data['full_name']}{cedula_info}")
+    parameter_sets = [build_patient_parameters(db_manager, patient) for patient in patients]
+    result = db_manager.execute_batch(PATIENT_UPSERT_SQL, parameter_sets)
+    upserted = result['succeeded']
+    
+    cedula_conflicts = []
+    for failure in result['failures']:
+        patient = patients[failure['index']]
+        error_text = failure['error'].lower()
         
-    except Exception as e:
-        if "duplicate key value violates unique constraint" in str(e).lower():
-            if "cedula" in str(e).lower():
-                logger.warning(f"Cedula conflict for patient {patient_data['full_name']}: {patient_data.get('cedula', 'None')} - trying without cedula")
-                # Retry without cedula
-                upsert_sql_no_cedula = """
-                INSERT INTO patients (
-                    patient_id, first_name, last_name, full_name, email, date_of_birth, phone,
-                    age, gender, document_type, document_number,
-                    address, medical_history, lab_results, source_scan, created_at, updated_at
-                ) VALUES (
-                    :patient_id, :first_name, :last_name, :full_name, :email, :date_of_birth::date, :phone,
-                    :age, :gender, :document_type, :document_number,
-                    :address::jsonb, :medical_history::jsonb, :lab_results::jsonb, :source_scan,
-                    CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-                )
-                ON CONFLICT (patient_id) 
-                DO UPDATE SET
-                    first_name = EXCLUDED.first_name,
-                    last_name = EXCLUDED.last_name,
-                    full_name = EXCLUDED.full_name,
-                    email = EXCLUDED.email,
-                    date_of_birth = EXCLUDED.date_of_birth,
-                    phone = EXCLUDED.phone,
-                    age = EXCLUDED.age,
-                    gender = EXCLUDED.gender,
-                    document_type = EXCLUDED.document_type,
-                    document_number = EXCLUDED.document_number,
-                    address = EXCLUDED.address,
-                    medical_history = EXCLUDED.medical_history,
-                    lab_results = EXCLUDED.lab_results,
-                    source_scan = EXCLUDED.source_scan,
-                    updated_at = CURRENT_TIMESTAMP
-                """
-                
-                # Remove cedula from parameters
-                params_no_cedula = [p for p in parameters if p['name'] != 'cedula']
-                
-                rds_data.execute_statement(
-                    resourceArn=cluster_arn,
-                    secretArn=secret_arn,
-                    database=database_name,
-                    sql=upsert_sql_no_cedula,
-                    parameters=params_no_cedula
-                )
-                
-                logger.info(f"Upserted patient without cedula: {patient_data['full_name']}")
+        if "duplicate key value violates unique constraint" in error_text:
+            if "cedula" in error_text:
+                logger.warning(f"Cedula conflict for patient {patient['full_name']}: {patient.get('cedula', 'None')} - trying without cedula")
+                cedula_conflicts.append(failure['index'])
             else:
-                logger.warning(f"Duplicate key conflict for patient {patient_data['full_name']} - {e}")
+                logger.warning(f"Duplicate key conflict for patient {patient['full_name']} - {failure['error']}")
         else:
-            logger.error(f"Failed to upsert patient {patient_data['full_name']}: {e}")
-            raise
+            logger.error(f"Failed to upsert patient {patient['full_name']}: {failure['error']}")
+    
+    if cedula_conflicts:
+        # Retry without cedula
+        retry_sets = [
+            [p for p in parameter_sets[index] if p['name'] != 'cedula']
+            for index in cedula_conflicts
+        ]
+        retry_result = db_manager.execute_batch(PATIENT_UPSERT_NO_CEDULA_SQL, retry_sets)
+        upserted += retry_result['succeeded']
+        
+        for failure in retry_result['failures']:
+            patient = patients[cedula_conflicts[failure['index']]]
+            logger.error(f"Failed to upsert patient without cedula {patient['full_name']}: {failure['error']}")
+    
+    logger.info(f"Upserted {upserted}/{len(patients)} patients")
+    return upserted
+
+
+def build_patient_parameters(db_manager: DatabaseManager, patient_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build Data API parameters for a converted patient row."""
+    parameters = []
+    for key, value in patient_data.items():
+        if key == 'age' and value is not None:
+            parameters.append(db_manager.create_parameter(key, int(value), 'long'))
+        else:
+            parameters.append(db_manager.create_parameter(key, value, 'string'))
+    return parameters
 
 
 def convert_patient_profile_to_db_format(profile: Dict[str, Any]) -> Dict[str, Any]:
@@ -398,7 +373,7 @@ def convert_patient_profile_to_db_format(profile: Dict[str, Any]) -> Dict[str, A
     }
 
 
-def insert_sample_medics(rds_data, cluster_arn: str, secret_arn: str, database_name: str):
+def insert_sample_medics(db_manager: DatabaseManager):
     """Insert sample medics data."""
 
     sample_medics = [
@@ -431,47 +406,39 @@ def insert_sample_medics(rds_data, cluster_arn: str, secret_arn: str, database_n
         }
     ]
 
-    for medic in sample_medics:
-        try:
-            # Use UPSERT for medics
-            upsert_sql = """
-            INSERT INTO medics (
-                medic_id, first_name, email, phone,
-                specialization, license_number, department, created_at, updated_at
-            ) VALUES (
-                :medic_id, :first_name, :email, :phone,
-                :specialization, :license_number, :department, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-            )
-            ON CONFLICT (email) 
-            DO UPDATE SET
-                first_name = EXCLUDED.first_name,
-                phone = EXCLUDED.phone,
-                specialization = EXCLUDED.specialization,
-                license_number = EXCLUDED.license_number,
-                department = EXCLUDED.department,
-                updated_at = CURRENT_TIMESTAMP
-            """
-
-            parameters = []
-            for key, value in medic.items():
-                parameters.append(
-                    {'name': key, 'value': {'stringValue': value}})
-
-            rds_data.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql=upsert_sql,
-                parameters=parameters
-            )
-
-            logger.info(f"Upserted medic: {medic['first_name']}")
+    # Use UPSERT for medics
+    upsert_sql = """
+    INSERT INTO medics (
+        medic_id, first_name, email, phone,
+        specialization, license_number, department, created_at, updated_at
+    ) VALUES (
+        :medic_id, :first_name, :email, :phone,
+        :specialization, :license_number, :department, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (email) 
+    DO UPDATE SET
+        first_name = EXCLUDED.first_name,
+        phone = EXCLUDED.phone,
+        specialization = EXCLUDED.specialization,
+        license_number = EXCLUDED.license_number,
+        department = EXCLUDED.department,
+        updated_at = CURRENT_TIMESTAMP
+    """
 
-        except Exception as e:
-            logger.error(f"Failed to insert medic {medic['first_name']}: {e}")
+    parameter_sets = [
+        [db_manager.create_parameter(key, value, 'string') for key, value in medic.items()]
+        for medic in sample_medics
+    ]
+
+    result = db_manager.execute_batch(upsert_sql, parameter_sets)
+
+    for failure in result['failures']:
+        logger.error(f"Failed to insert medic {sample_medics[failure['index']]['first_name']}: {failure['error']}")
+
+    logger.info(f"Upserted {result['succeeded']} medics")
 
 
-def insert_sample_exams(rds_data, cluster_arn: str, secret_arn: str, database_name: str):
+def insert_sample_exams(db_manager: DatabaseManager):
     """Insert sample exams data."""
 
     sample_exams = [
@@ -509,42 +476,33 @@ def insert_sample_exams(rds_data, cluster_arn: str, secret_arn: str, database_na
         }
     ]
 
-    for exam in sample_exams:
-        try:
-            # Use UPSERT for exams
-            upsert_sql = """
-            INSERT INTO exams (
-                exam_id, exam_name, exam_type, description, duration_minutes, preparation_instructions, created_at, updated_at
-            ) VALUES (
-                :exam_id, :exam_name, :exam_type, :description, :duration_minutes, :preparation_instructions, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-            )
-            ON CONFLICT (exam_name) 
-            DO UPDATE SET
-                exam_type = EXCLUDED.exam_type,
-                description = EXCLUDED.description,
-                duration_minutes = EXCLUDED.duration_minutes,
-                preparation_instructions = EXCLUDED.preparation_instructions,
-                updated_at = CURRENT_TIMESTAMP
-            """
-
-            parameters = []
-            for key, value in exam.items():
-                if key == 'duration_minutes':
-                    parameters.append(
-                        {'name': key, 'value': {'longValue': value}})
-                else:
-                    parameters.append(
-                        {'name': key, 'value': {'stringValue': str(value)}})
-
-            rds_data.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql=upsert_sql,
-                parameters=parameters
-            )
-
-            logger.info(f"Upserted exam: {exam['exam_name']}")
+    # Use UPSERT for exams
+    upsert_sql = """
+    INSERT INTO exams (
+        exam_id, exam_name, exam_type, description, duration_minutes, preparation_instructions, created_at, updated_at
+    ) VALUES (
+        :exam_id, :exam_name, :exam_type, :description, :duration_minutes, :preparation_instructions, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (exam_name) 
+    DO UPDATE SET
+        exam_type = EXCLUDED.exam_type,
+        description = EXCLUDED.description,
+        duration_minutes = EXCLUDED.duration_minutes,
+        preparation_instructions = EXCLUDED.preparation_instructions,
+        updated_at = CURRENT_TIMESTAMP
+    """
 
-        except Exception as e:
-            logger.error(f"Failed to insert exam {exam['exam_name']}: {e}")
+    parameter_sets = [
+        [
+            db_manager.create_parameter(key, value, 'long' if key == 'duration_minutes' else 'string')
+            for key, value in exam.items()
+        ]
+        for exam in sample_exams
+    ]
+
+    result = db_manager.execute_batch(upsert_sql, parameter_sets)
+
+    for failure in result['failures']:
+        logger.error(f"Failed to insert exam {sample_exams[failure['index']]['exam_name']}: {failure['error']}")
+
+    logger.info(f"Upserted {result['succeeded']} exams")
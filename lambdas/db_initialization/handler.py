@@ -7,6 +7,9 @@ import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+from shared.database import DatabaseManager
+from shared.schema import load_migrations, split_sql_statements
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -94,8 +97,9 @@ def lambda_handler(event, context):
         except Exception as e:
             logger.warning(f"pgvector extension may already exist: {e}")
 
-        # Create all healthcare system tables
-        create_healthcare_tables(rds_data, cluster_arn, secret_arn, database_name)
+        # Apply pending schema migrations
+        db_manager = DatabaseManager(cluster_arn, secret_arn, database_name)
+        applied_migrations = run_migrations(db_manager)
 
         # Create Bedrock integration schema and user
         setup_bedrock_integration(rds_data, cluster_arn, secret_arn, database_name)
@@ -103,13 +107,14 @@ def lambda_handler(event, context):
         # Create the knowledge base table
         create_knowledge_base_table(rds_data, cluster_arn, secret_arn, database_name, table_name)
 
-        logger.info(f"Successfully initialized database with tables and indexes")
+        logger.info(f"Successfully initialized database schema and knowledge base")
 
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Database initialization completed successfully',
-                'table_name': table_name
+                'table_name': table_name,
+                'applied_migrations': applied_migrations
             })
         }
 
@@ -376,347 +381,86 @@ def create_knowledge_base_table(rds_data, cluster_arn: str, secret_arn: str, dat
             logger.warning(f"Knowledge base table creation failed: {e}")
 
 
-def create_healthcare_tables(rds_data, cluster_arn: str, secret_arn: str, database_name: str):
-    """Create all healthcare system tables by reading and parsing the schema.sql file."""
-
-    try:
-        # Read the schema.sql file from the shared module
-        schema_content = None
-
-        # Try different possible paths for the schema file in Lambda environment
-        possible_paths = [
-            "/var/task/shared/schema.sql",    # Lambda function package
-            "shared/schema.sql",              # Relative path
-            "/opt/python/shared/schema.sql"   # Lambda layer (if used)
-        ]
-
-        for path in possible_paths:
-            try:
-                with open(path, 'r') as f:
-                    schema_content = f.read()
-                logger.info(f"Successfully read schema from: {path}")
-                break
-            except FileNotFoundError:
-                logger.debug(f"Schema file not found at: {path}")
-                continue
-
-        if not schema_content:
-            logger.error(
-                "Could not find schema.sql file in any expected location")
-            raise FileNotFoundError("schema.sql not found")
-
-        # Run schema migrations first (before creating new tables)
-        run_schema_migrations(rds_data, cluster_arn, secret_arn, database_name)
-
-        # Parse the schema content into individual SQL statements
-        statements = parse_sql_statements(schema_content)
-
-        logger.info(f"Parsed {len(statements)} SQL statements from schema.sql")
-
-        # Separate CREATE TABLE and CREATE INDEX statements
-        table_statements = []
-        index_statements = []
-
-        for statement in statements:
-            if not statement.strip() or statement.strip().startswith('--'):
-                continue
-
-            statement_upper = statement.strip().upper()
-            if statement_upper.startswith('CREATE TABLE'):
-                table_statements.append(statement)
-            elif statement_upper.startswith('CREATE INDEX'):
-                index_statements.append(statement)
-            else:
-                # Other statements like extensions
-                table_statements.append(statement)
-
-        # Execute table creation first
-        executed_count = 0
-        logger.info(f"Creating {len(table_statements)} tables...")
-
-        for i, statement in enumerate(table_statements, 1):
-            try:
-                logger.debug(
-                    f"Executing table statement {i}: {statement[:100]}...")
-
-                rds_data.execute_statement(
-                    resourceArn=cluster_arn,
-                    secretArn=secret_arn,
-                    database=database_name,
-                    sql=statement
-                )
-
-                executed_count += 1
-                logger.info(f"Successfully executed table statement {i}")
-
-            except Exception as e:
-                error_msg = str(e).lower()
-                if any(phrase in error_msg for phrase in ["already exists", "duplicate"]):
-                    logger.info(
-                        f"Table statement {i} - object already exists, skipping")
-                elif "type \"vector\" does not exist" in error_msg:
-                    logger.warning(
-                        f"Vector type not available, skipping knowledge base table")
-                else:
-                    logger.error(f"Failed to execute table statement {i}: {e}")
-                    logger.error(f"Statement was: {statement}")
-                    # Continue with other statements
-                    continue
-
-        # Execute index creation after tables
-        logger.info(f"Creating {len(index_statements)} indexes...")
-
-        for i, statement in enumerate(index_statements, 1):
-            try:
-                logger.debug(
-                    f"Executing index statement {i}: {statement[:100]}...")
-
-                rds_data.execute_statement(
-                    resourceArn=cluster_arn,
-                    secretArn=secret_arn,
-                    database=database_name,
-                    sql=statement
-                )
-
-                executed_count += 1
-                logger.info(f"Successfully executed index statement {i}")
-
-            except Exception as e:
-                error_msg = str(e).lower()
-                if any(phrase in error_msg for phrase in ["already exists", "duplicate"]):
-                    logger.info(
-                        f"Index statement {i} - object already exists, skipping")
-                elif "does not exist" in error_msg:
-                    logger.warning(
-                        f"Index statement {i} - table doesn't exist yet, skipping")
-                else:
-                    logger.error(f"Failed to execute index statement {i}: {e}")
-                    logger.error(f"Statement was: {statement}")
-                    # Continue with other statements
-                    continue
-
-        logger.info(
-            f"Healthcare tables creation completed - executed {executed_count} statements")
-
-        # Run migrations again after table creation (for new deployments)
-        # This ensures that if tables were just created, they get the latest schema
-        run_post_creation_migrations(rds_data, cluster_arn, secret_arn, database_name)
+def run_migrations(db_manager: DatabaseManager, target_version: Optional[int] = None) -> List[int]:
+    """
+    Apply pending schema migrations from shared/migrations.
 
-    except Exception as e:
-        logger.error(f"Failed to create healthcare tables: {e}")
-        raise
+    Each migration runs in its own transaction together with its
+    schema_migrations row, under an advisory lock so concurrent initializations
+    (custom resource and RDS event) cannot apply the same version twice.
+    Applied migrations whose file has changed abort the run.
 
+    Args:
+        db_manager: Database to migrate
+        target_version: Last version to apply (default: all)
 
-def run_post_creation_migrations(rds_data, cluster_arn: str, secret_arn: str, database_name: str):
-    """Run migrations after table creation for new deployments."""
-    
-    logger.info("Running post-creation schema migrations...")
-    
-    try:
-        # Check if patients table exists and add cedula if missing
-        check_table_sql = """
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_name = 'patients';
-        """
-        
-        response = rds_data.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=check_table_sql
-        )
-        
-        if response.get('records'):
-            # Table exists, check for cedula field
-            check_cedula_sql = """
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'patients' 
-            AND column_name = 'cedula';
-            """
-            
-            cedula_response = rds_data.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql=check_cedula_sql
-            )
-            
-            if not cedula_response.get('records'):
-                logger.info("Adding cedula field to existing patients table...")
-                
-                add_cedula_sql = """
-                ALTER TABLE patients 
-                ADD COLUMN cedula VARCHAR(50) UNIQUE;
-                """
-                
-                rds_data.execute_statement(
-                    resourceArn=cluster_arn,
-                    secretArn=secret_arn,
-                    database=database_name,
-                    sql=add_cedula_sql
-                )
-                
-                # Add index
-                add_cedula_index_sql = """
-                CREATE INDEX IF NOT EXISTS idx_patients_cedula ON patients(cedula);
-                """
-                
-                rds_data.execute_statement(
-                    resourceArn=cluster_arn,
-                    secretArn=secret_arn,
-                    database=database_name,
-                    sql=add_cedula_index_sql
+    Returns:
+        List of versions applied by this run
+    """
+    db_manager.execute_sql("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum VARCHAR(64) NOT NULL,
+        applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    applied = {
+        row['version']: row
+        for row in db_manager.execute_query("SELECT version, name, checksum FROM schema_migrations")
+    }
+
+    applied_now = []
+    for migration in load_migrations():
+        version = migration['version']
+        if target_version is not None and version > target_version:
+            break
+
+        if version in applied:
+            if applied[version]['checksum'] != migration['checksum']:
+                raise ValueError(
+                    f"Migration {version:04d}_{migration['name']} was modified after being applied; "
+                    "add a new migration instead"
                 )
-                
-                logger.info("Successfully added cedula field and index")
-            else:
-                logger.info("Cedula field already exists")
-        
-        logger.info("Post-creation migrations completed")
-        
-    except Exception as e:
-        logger.warning(f"Post-creation migration failed (non-critical): {e}")
-        # Don't raise - this is non-critical
-
+            continue
 
-def run_schema_migrations(rds_data, cluster_arn: str, secret_arn: str, database_name: str):
-    """Run schema migrations to update existing tables with new fields."""
-    
-    logger.info("Running schema migrations...")
-    
-    try:
-        # Migration 1: Add cedula field to patients table if it doesn't exist
-        check_cedula_sql = """
-        SELECT column_name 
-        FROM information_schema.columns 
-        WHERE table_name = 'patients' 
-        AND column_name = 'cedula';
-        """
-        
-        response = rds_data.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=check_cedula_sql
-        )
-        
-        if not response.get('records'):
-            # Cedula column doesn't exist, add it
-            logger.info("Adding cedula field to patients table...")
-            
-            add_cedula_sql = """
-            ALTER TABLE patients 
-            ADD COLUMN cedula VARCHAR(50) UNIQUE;
-            """
-            
-            rds_data.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql=add_cedula_sql
+        logger.info(f"Applying migration {version:04d}_{migration['name']}")
+        transaction_id = db_manager.begin_transaction()
+        try:
+            db_manager.execute_sql(
+                "SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))",
+                transaction_id=transaction_id
             )
-            
-            logger.info("Successfully added cedula field to patients table")
-            
-            # Add index for the new field
-            add_cedula_index_sql = """
-            CREATE INDEX IF NOT EXISTS idx_patients_cedula ON patients(cedula);
-            """
-            
-            rds_data.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql=add_cedula_index_sql
+            already_applied = db_manager.execute_sql(
+                "SELECT 1 FROM schema_migrations WHERE version = :version",
+                [db_manager.create_parameter('version', version, 'long')],
+                transaction_id
             )
-            
-            logger.info("Successfully created index on cedula field")
-        else:
-            logger.info("Cedula field already exists in patients table")
-            
-        # Add more migrations here as needed in the future
-        # Migration 2: Example for future use
-        # check_future_field_sql = "SELECT ..."
-        # if not response.get('records'):
-        #     logger.info("Adding future field...")
-        #     # Add migration logic
-        
-        logger.info("Schema migrations completed successfully")
-        
-    except Exception as e:
-        # Check if the error is because the patients table doesn't exist yet
-        if "relation \"patients\" does not exist" in str(e).lower():
-            logger.info("Patients table doesn't exist yet, migrations will run after table creation")
-        else:
-            logger.error(f"Schema migration failed: {e}")
-            # Don't raise the exception - let table creation continue
-            # This ensures that new deployments still work even if migrations fail
-
-
-def parse_sql_statements(sql_content: str) -> list:
-    """Parse SQL content into individual executable statements."""
-
-    statements = []
-    current_statement = []
-    in_comment_block = False
-
-    for line in sql_content.split('\n'):
-        # Handle multi-line comments
-        if '/*' in line:
-            in_comment_block = True
-        if '*/' in line:
-            in_comment_block = False
-            continue
-        if in_comment_block:
-            continue
-
-        # Remove inline comments (-- comments after SQL code)
-        if '--' in line:
-            line = line.split('--')[0]
-        
-        line = line.strip()
-
-        # Skip empty lines
-        if not line:
-            continue
-
-        # Add line to current statement
-        current_statement.append(line)
-
-        # If line ends with semicolon, it's the end of a statement
-        if line.endswith(';'):
-            statement = ' '.join(current_statement)
-            if statement.strip():
-                statements.append(statement)
-            current_statement = []
-
-    # Handle any remaining statement without semicolon
-    if current_statement:
-        statement = ' '.join(current_statement)
-        if statement.strip():
-            statements.append(statement)
-
-    return statements
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+            if already_applied.get('records'):
+                logger.info(f"Migration {version} was applied concurrently, skipping")
+                db_manager.rollback_transaction(transaction_id)
+                continue
 
+            for statement in split_sql_statements(migration['sql']):
+                db_manager.execute_sql(statement, transaction_id=transaction_id)
+
+            db_manager.execute_sql(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (:version, :name, :checksum)",
+                [
+                    db_manager.create_parameter('version', version, 'long'),
+                    db_manager.create_parameter('name', migration['name'], 'string'),
+                    db_manager.create_parameter('checksum', migration['checksum'], 'string')
+                ],
+                transaction_id
+            )
+            db_manager.commit_transaction(transaction_id)
+        except Exception:
+            logger.error(f"Migration {version:04d}_{migration['name']} failed, rolling back")
+            db_manager.rollback_transaction(transaction_id)
+            raise
 
+        applied_now.append(version)
 
+    logger.info(f"Schema migrations complete: applied {applied_now or 'none'}")
+    return applied_now
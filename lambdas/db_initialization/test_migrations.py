@@ -0,0 +1,91 @@
+"""
+Tests for migrations applied to databases that already hold data.
+
+They use the postgres_db fixture (btree_gist, pg_trgm and unaccent must be
+available) and are skipped unless TEST_DATABASE_DSN is set:
+
+    TEST_DATABASE_DSN=postgresql://postgres@localhost/healthcare_test \
+        python -m pytest lambdas/db_initialization/test_migrations.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from conftest import recreate_schema
+from shared.database import DatabaseError
+from shared.schema import REQUIRED_SCHEMA_VERSION
+from db_initialization.handler import run_migrations
+
+
+@pytest.fixture
+def legacy_db(postgres_db):
+    """Database migrated up to version 4, before reservations had a duration."""
+    recreate_schema(postgres_db, target_version=4)
+    postgres_db.execute_sql("INSERT INTO patients (patient_id, full_name, email) VALUES ('p-1', 'Ana Gómez', 'ana@example.com')")
+    postgres_db.execute_sql("""
+        INSERT INTO medics (medic_id, first_name, email) VALUES
+            ('m-1', 'Carlos', 'carlos@example.com'),
+            ('m-2', 'Lucía', 'lucia@example.com')
+    """)
+    postgres_db.execute_sql("""
+        INSERT INTO exams (exam_id, exam_name, exam_type, duration_minutes) VALUES
+            ('e-60', 'Ecografía', 'imaging', 60),
+            ('e-30', 'Consulta', 'general', 30)
+    """)
+    return postgres_db
+
+
+def insert_reservations(db, rows):
+    values = ', '.join(
+        f"('{reservation_id}', 'p-1', '{medic_id}', '{exam_id}', '{day}', '{time}', '{status}')"
+        for reservation_id, medic_id, exam_id, day, time, status in rows
+    )
+    db.execute_sql(f"""
+        INSERT INTO reservations (reservation_id, patient_id, medic_id, exam_id, reservation_date, reservation_time, status)
+        VALUES {values}
+    """)
+
+
+def durations(db):
+    rows = db.execute_query("SELECT reservation_id, duration_minutes FROM reservations ORDER BY reservation_id")
+    return {row['reservation_id']: row['duration_minutes'] for row in rows}
+
+
+def test_overlapping_legacy_reservations_are_shortened(legacy_db):
+    """Bookings that overlap once they take the exam duration end when the next one starts."""
+    insert_reservations(legacy_db, [
+        ('r-1', 'm-1', 'e-60', '2031-05-05', '08:00', 'scheduled'),
+        ('r-2', 'm-1', 'e-30', '2031-05-05', '08:30', 'confirmed'),
+        ('r-3', 'm-1', 'e-60', '2031-05-05', '09:00', 'cancelled'),
+        ('r-4', 'm-1', 'e-60', '2031-05-05', '10:00', 'scheduled'),
+        ('r-5', 'm-1', 'e-30', '2031-05-05', '10:45', 'scheduled'),
+        ('r-6', 'm-2', 'e-60', '2031-05-05', '23:30', 'scheduled'),
+        ('r-7', 'm-2', 'e-30', '2031-05-06', '00:00', 'scheduled'),
+    ])
+
+    assert run_migrations(legacy_db) == list(range(5, REQUIRED_SCHEMA_VERSION + 1))
+
+    # Cancelled bookings keep their duration; the last booking of a day runs
+    # into the first one after midnight
+    assert durations(legacy_db) == {'r-1': 30, 'r-2': 30, 'r-3': 60, 'r-4': 45, 'r-5': 30, 'r-6': 30, 'r-7': 30}
+    with pytest.raises(DatabaseError):
+        insert_reservations(legacy_db, [('r-8', 'm-1', 'e-30', '2031-05-05', '08:15', 'scheduled')])
+
+
+def test_unresolvable_overlap_is_reported(legacy_db):
+    """Bookings less than a minute apart stop the migration with both IDs in the error."""
+    insert_reservations(legacy_db, [
+        ('r-1', 'm-1', 'e-30', '2031-05-05', '08:00:00', 'scheduled'),
+        ('r-2', 'm-1', 'e-30', '2031-05-05', '08:00:30', 'scheduled'),
+    ])
+
+    with pytest.raises(DatabaseError, match='Overlapping active reservations: r-1 and r-2'):
+        run_migrations(legacy_db)
+
+    # The failed migration is rolled back and can be rerun once the data is fixed
+    legacy_db.execute_sql("UPDATE reservations SET status = 'cancelled' WHERE reservation_id = 'r-2'")
+    assert run_migrations(legacy_db) == list(range(5, REQUIRED_SCHEMA_VERSION + 1))
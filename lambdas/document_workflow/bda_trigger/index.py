@@ -1,21 +1,33 @@
 """
 Simplified BDA Trigger Lambda.
 Directly invokes Bedrock Data Automation when documents are uploaded to S3.
-Includes deduplication logic to prevent duplicate processing.
+Includes deduplication logic to prevent duplicate processing: a lock on
+(bucket, key, etag) in the processing lock store (see shared.processing_lock).
 """
 
 import json
 import logging
 import os
-from datetime import datetime
+import uuid
 from typing import Any, Dict, Optional
 import boto3
-from botocore.exceptions import ClientError
+
+from shared.processing_lock import (
+    ACQUIRED,
+    PROCESSED,
+    ProcessingLockStore,
+    create_processing_lock_store,
+    normalize_etag
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 s3_client = boto3.client('s3')
+processing_locks: Optional[ProcessingLockStore] = None
+
+# workflow-stage metadata values set on the original file once it is processed
+PROCESSED_WORKFLOW_STAGES = {'processed', 'classified'}
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -23,7 +35,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     try:
         # Extract S3 details from event
-        bucket, key = extract_s3_details(event)
+        bucket, key, etag = extract_s3_details(event)
         
         logger.info(f"Processing S3 event for {bucket}/{key}")
         
@@ -38,12 +50,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        # Check if file has already been processed or is currently being processed
-        # This also handles metadata-only updates since they would have processing metadata
-        processing_status = check_processing_status(bucket, key)
-        
-        if processing_status == 'already_processed':
-            logger.info(f"File {key} already processed successfully, skipping")
+        # Take the processing lock for this version of the object. Duplicate
+        # deliveries and metadata-only copies keep the ETag and are skipped here
+        etag = etag or get_object_etag(bucket, key)
+
+        # The extraction function re-copies the file to store its classification;
+        # for multipart uploads the copy has a new ETag that may not be marked
+        # processed yet, so the extraction's own copies are recognized by the
+        # source ETag they carry
+        if is_copy_event(event) and is_processed_metadata_copy(bucket, key):
+            get_processing_locks().mark_processed(bucket, key, etag)
+            logger.info(f"Skipping {key} (etag {etag}): metadata update of a processed file")
             return {
                 'statusCode': 200,
                 'body': json.dumps({
@@ -51,29 +68,28 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'reason': 'already_processed'
                 })
             }
-        elif processing_status == 'currently_processing':
-            logger.info(f"File {key} is currently being processed, skipping duplicate")
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'status': 'skipped',
-                    'reason': 'currently_processing'
-                })
-            }
-        
-        # Mark file as being processed (with race condition protection)
-        if not mark_file_processing(bucket, key):
-            logger.info(f"File {key} is being processed by another instance, skipping")
+
+        owner = getattr(context, 'aws_request_id', None) or str(uuid.uuid4())
+        lock_status = get_processing_locks().acquire(bucket, key, etag, owner)
+
+        if lock_status != ACQUIRED:
+            reason = 'already_processed' if lock_status == PROCESSED else 'currently_processing'
+            logger.info(f"Skipping {key} (etag {etag}): {reason}")
             return {
                 'statusCode': 200,
                 'body': json.dumps({
                     'status': 'skipped',
-                    'reason': 'race_condition_detected'
+                    'reason': reason
                 })
             }
         
-        # Call BDA API directly
-        invocation_arn = invoke_bda_processing(bucket, key)
+        # Call BDA API directly, releasing the lock if the job cannot be started
+        # so a retried event can take it again
+        try:
+            invocation_arn = invoke_bda_processing(bucket, key)
+        except Exception:
+            get_processing_locks().release(bucket, key, etag, owner)
+            raise
         
         logger.info(f"Successfully submitted BDA job for {key}: {invocation_arn}")
         
@@ -133,147 +149,60 @@ def should_skip_file(key: str) -> bool:
     return False
 
 
-def extract_s3_details(event: Dict[str, Any]) -> tuple[str, str]:
+def extract_s3_details(event: Dict[str, Any]) -> tuple[str, str, Optional[str]]:
     """
-    Extract bucket and key from S3 event (supports both direct S3 and EventBridge)
+    Extract bucket, key and ETag from S3 event (supports both direct S3 and EventBridge)
     """
     # Handle EventBridge S3 events
     if event.get('source') == 'aws.s3':
         detail = event['detail']
         bucket = detail['bucket']['name']
         key = detail['object']['key']
-        return bucket, key
+        return bucket, key, detail['object'].get('etag')
     
     # Handle direct S3 notifications
     record = event['Records'][0]
     bucket = record['s3']['bucket']['name']
     key = record['s3']['object']['key']
-    return bucket, key
+    return bucket, key, record['s3']['object'].get('eTag')
 
-def check_processing_status(bucket: str, key: str) -> str:
-    """
-    Check if file has already been processed or is currently being processed
-    Returns: 'not_processed', 'currently_processing', or 'already_processed'
-    """
-    try:
-        # Check file metadata for processing status
-        response = s3_client.head_object(Bucket=bucket, Key=key)
-        metadata = response.get('Metadata', {})
-        
-        workflow_stage = metadata.get('workflow-stage', '')
-        
-        # Check if already successfully processed
-        if workflow_stage in ['processed', 'classified']:
-            logger.info(f"File {key} already processed (stage: {workflow_stage})")
-            return 'already_processed'
-        
-        # Check if currently being processed
-        if workflow_stage == 'processing':
-            # Check if processing started recently (within last 10 minutes for faster recovery)
-            processing_timestamp = metadata.get('processing-timestamp', '')
-            if processing_timestamp:
-                from datetime import datetime, timezone
-                try:
-                    processing_time = datetime.fromisoformat(processing_timestamp.replace('Z', '+00:00'))
-                    current_time = datetime.now(timezone.utc)
-                    time_diff = (current_time - processing_time).total_seconds()
-                    
-                    # Reduced timeout to 10 minutes for faster recovery from stuck states
-                    if time_diff > 600:  # 10 minutes
-                        logger.warning(f"File {key} has been processing for {time_diff/60:.1f} minutes, allowing reprocessing")
-                        return 'not_processed'
-                    else:
-                        logger.info(f"File {key} is currently being processed (started {time_diff:.0f}s ago)")
-                        return 'currently_processing'
-                except Exception as e:
-                    logger.warning(f"Error parsing processing timestamp for {key}: {e}")
-                    return 'not_processed'
-            else:
-                logger.info(f"File {key} marked as processing but no timestamp, allowing reprocessing")
-                return 'not_processed'
-        
-        logger.info(f"File {key} not processed yet (stage: {workflow_stage or 'none'})")
-        return 'not_processed'
-        
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            logger.warning(f"File {key} not found in bucket {bucket}")
-            return 'not_processed'
-        else:
-            logger.error(f"Error checking processing status for {key}: {e}")
-            return 'not_processed'
-    except Exception as e:
-        logger.error(f"Unexpected error checking processing status for {key}: {e}")
-        return 'not_processed'
+
+def is_copy_event(event: Dict[str, Any]) -> bool:
+    """Whether the object was created by CopyObject."""
+    if event.get('source') == 'aws.s3':
+        return event['detail'].get('reason') == 'CopyObject'
+    return event['Records'][0].get('eventName') == 'ObjectCreated:Copy'
 
 
-def mark_file_processing(bucket: str, key: str) -> bool:
+def is_processed_metadata_copy(bucket: str, key: str) -> bool:
     """
-    Mark file as currently being processed by updating its metadata
-    Returns True if successfully marked, False if already being processed by another instance
+    Whether the object is the extraction's metadata rewrite of a file processed at this key.
+
+    The rewrite stamps the ETag the file had before the copy into its
+    metadata. Only a lock for that ETag at the same (bucket, key) proves the
+    copy is the rewrite: a processed file copied to another key keeps the
+    metadata but has no lock there, so it is processed again.
     """
-    try:
-        from datetime import datetime
-        import uuid
-        
-        # Generate unique processing ID for this instance
-        processing_id = str(uuid.uuid4())[:8]
-        current_timestamp = datetime.utcnow().isoformat() + 'Z'
-        
-        # Get current metadata
-        try:
-            response = s3_client.head_object(Bucket=bucket, Key=key)
-            current_metadata = response.get('Metadata', {})
-            content_type = response.get('ContentType', 'application/octet-stream')
-            
-            # Check if another instance is already processing (race condition check)
-            existing_stage = current_metadata.get('workflow-stage', '')
-            if existing_stage == 'processing':
-                existing_timestamp = current_metadata.get('processing-timestamp', '')
-                if existing_timestamp:
-                    try:
-                        processing_time = datetime.fromisoformat(existing_timestamp.replace('Z', '+00:00'))
-                        current_time = datetime.now(datetime.timezone.utc)
-                        time_diff = (current_time - processing_time).total_seconds()
-                        
-                        # If processing started less than 2 minutes ago, don't override
-                        if time_diff < 120:  # 2 minutes
-                            logger.warning(f"File {key} is being processed by another instance (started {time_diff:.0f}s ago)")
-                            return False
-                    except Exception:
-                        pass  # If we can't parse timestamp, proceed with marking
-                        
-        except ClientError:
-            current_metadata = {}
-            content_type = 'application/octet-stream'
-        
-        # Update metadata with processing status and unique ID
-        updated_metadata = {
-            **current_metadata,
-            'workflow-stage': 'processing',
-            'processing-timestamp': current_timestamp,
-            'processing-id': processing_id,
-            'lambda-request-id': os.environ.get('AWS_REQUEST_ID', 'unknown')
-        }
-        
-        # Copy object with updated metadata
-        s3_client.copy_object(
-            CopySource={'Bucket': bucket, 'Key': key},
-            Bucket=bucket,
-            Key=key,
-            Metadata=updated_metadata,
-            MetadataDirective='REPLACE',
-            ContentType=content_type
-        )
-        
-        logger.info(f"Marked file {key} as processing (ID: {processing_id})")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error marking file {key} as processing: {e}")
-        # Don't fail the entire process if metadata update fails
-        return True  # Proceed anyway to avoid blocking
+    response = s3_client.head_object(Bucket=bucket, Key=key)
+    metadata = response.get('Metadata', {})
+    source_etag = metadata.get('source-etag')
+    if metadata.get('workflow-stage') not in PROCESSED_WORKFLOW_STAGES or not source_etag:
+        return False
+    return get_processing_locks().get_status(bucket, key, source_etag) is not None
+
+
+def get_processing_locks() -> ProcessingLockStore:
+    """Lock store, created on first use."""
+    global processing_locks
+    if processing_locks is None:
+        processing_locks = create_processing_lock_store()
+    return processing_locks
+
 
+def get_object_etag(bucket: str, key: str) -> str:
+    """ETag of the object, for events that do not carry it."""
+    response = s3_client.head_object(Bucket=bucket, Key=key)
+    return normalize_etag(response['ETag'])
 
 def invoke_bda_processing(bucket: str, key: str) -> str:
     """
@@ -0,0 +1,115 @@
+"""
+Tests for the deduplication of the BDA trigger.
+Run with: python -m pytest lambdas/document_workflow/bda_trigger/test_bda_trigger.py -v
+"""
+
+import json
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import document_workflow.bda_trigger.index as bda_trigger
+from shared.processing_lock import SQLiteProcessingLockStore
+
+
+class Context:
+    def __init__(self, request_id):
+        self.aws_request_id = request_id
+
+
+class StubS3:
+    """S3 client serving object metadata to head_object."""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.heads = 0
+
+    def head_object(self, Bucket, Key):
+        self.heads += 1
+        return {'Metadata': self.metadata}
+
+
+def upload_event(key, etag='abc', reason='PutObject'):
+    return {
+        'source': 'aws.s3',
+        'detail': {'bucket': {'name': 'raw'}, 'object': {'key': key, 'etag': etag}, 'reason': reason}
+    }
+
+
+def use_stores(monkeypatch, invoke):
+    store = SQLiteProcessingLockStore(':memory:')
+    monkeypatch.setattr(bda_trigger, 'processing_locks', store)
+    monkeypatch.setattr(bda_trigger, 'invoke_bda_processing', invoke)
+    return store
+
+
+def test_duplicate_events_start_one_job(monkeypatch):
+    """Redelivered and metadata-only events of the same content are skipped without touching S3."""
+    jobs = []
+    store = use_stores(monkeypatch, lambda bucket, key: jobs.append(key) or f'arn:job/{len(jobs)}')
+
+    first = bda_trigger.lambda_handler(upload_event('p-1/scan.pdf'), Context('req-1'))
+    second = bda_trigger.lambda_handler(upload_event('p-1/scan.pdf'), Context('req-2'))
+
+    assert json.loads(first['body'])['status'] == 'submitted'
+    assert json.loads(second['body']) == {'status': 'skipped', 'reason': 'currently_processing'}
+
+    store.mark_processed('raw', 'p-1/scan.pdf', 'abc')
+    third = bda_trigger.lambda_handler(upload_event('p-1/scan.pdf'), Context('req-3'))
+    assert json.loads(third['body'])['reason'] == 'already_processed'
+
+    bda_trigger.lambda_handler(upload_event('p-1/scan.pdf', etag='new-content'), Context('req-4'))
+    assert jobs == ['p-1/scan.pdf', 'p-1/scan.pdf']
+
+
+def test_lock_is_released_when_the_job_cannot_start(monkeypatch):
+    """A failed invocation does not leave the file locked for the retry."""
+    def fail(bucket, key):
+        raise RuntimeError('ThrottlingException')
+    store = use_stores(monkeypatch, fail)
+
+    response = bda_trigger.lambda_handler(upload_event('p-1/scan.pdf'), Context('req-1'))
+
+    assert response['statusCode'] == 500
+    assert store.get_status('raw', 'p-1/scan.pdf', 'abc') is None
+
+
+def test_metadata_copy_with_a_new_etag_is_not_reprocessed(monkeypatch):
+    """The extraction's metadata copy of a multipart upload arrives before its new ETag is marked."""
+    jobs = []
+    store = use_stores(monkeypatch, lambda bucket, key: jobs.append(key) or f'arn:job/{len(jobs)}')
+    s3 = StubS3({'workflow-stage': 'uploaded'})
+    monkeypatch.setattr(bda_trigger, 's3_client', s3)
+
+    bda_trigger.lambda_handler(upload_event('p-1/video.mp4', etag='abc-3', reason='CompleteMultipartUpload'),
+                               Context('req-1'))
+    assert s3.heads == 0
+
+    # Extraction stores the classification with copy_object: new ETag, Object Created (CopyObject)
+    s3.metadata = {'workflow-stage': 'classified', 'document-category': 'medical-history', 'source-etag': 'abc-3'}
+    copy = bda_trigger.lambda_handler(upload_event('p-1/video.mp4', etag='def', reason='CopyObject'), Context('req-2'))
+
+    assert json.loads(copy['body']) == {'status': 'skipped', 'reason': 'already_processed'}
+    assert store.get_status('raw', 'p-1/video.mp4', 'def') == 'processed'
+    assert jobs == ['p-1/video.mp4']
+
+    # A copy of a file that was never processed still starts a job
+    s3.metadata = {'workflow-stage': 'uploaded'}
+    bda_trigger.lambda_handler(upload_event('p-1/copy.mp4', etag='ghi', reason='CopyObject'), Context('req-3'))
+    assert jobs == ['p-1/video.mp4', 'p-1/copy.mp4']
+
+
+def test_processed_file_copied_to_another_key_is_processed(monkeypatch):
+    """A copy elsewhere keeps the processed metadata but has no lock at its own key."""
+    jobs = []
+    store = use_stores(monkeypatch, lambda bucket, key: jobs.append(key) or f'arn:job/{len(jobs)}')
+    store.mark_processed('raw', 'p-1/video.mp4', 'abc-3')
+    s3 = StubS3({'workflow-stage': 'classified', 'document-category': 'medical-history', 'source-etag': 'abc-3'})
+    monkeypatch.setattr(bda_trigger, 's3_client', s3)
+
+    moved = bda_trigger.lambda_handler(upload_event('p-2/video.mp4', etag='abc-3', reason='CopyObject'),
+                                       Context('req-1'))
+
+    assert json.loads(moved['body'])['status'] == 'submitted'
+    assert jobs == ['p-2/video.mp4']
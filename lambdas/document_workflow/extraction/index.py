@@ -3,20 +3,37 @@ Simplified Lambda function for processing BDA results and organizing extracted d
 Focuses only on essential file organization and cleanup tasks.
 """
 
+import gzip
 import json
 import logging
 import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import boto3
 from botocore.exceptions import ClientError
 
+from shared.database import DatabaseManager, DatabaseError
+from shared.ingestion_scheduler import IngestionScheduler, create_ingestion_scheduler
+from shared.processing_lock import (
+    ProcessingLockError,
+    ProcessingLockStore,
+    create_processing_lock_store,
+    normalize_etag
+)
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 s3_client = boto3.client('s3')
 bedrock_agent_client = boto3.client('bedrock-agent')
 ssm_client = boto3.client('ssm')
+db_manager = DatabaseManager()
+processing_locks: Optional[ProcessingLockStore] = None
+ingestion_scheduler: Optional[IngestionScheduler] = None
 
 # Environment variables
 PROCESSED_BUCKET = os.environ.get('PROCESSED_BUCKET_NAME', '')
@@ -24,6 +41,28 @@ SOURCE_BUCKET = os.environ.get('SOURCE_BUCKET_NAME', '')
 CLASSIFICATION_CONFIDENCE_THRESHOLD = float(
     os.environ.get('CLASSIFICATION_CONFIDENCE_THRESHOLD', '80'))
 
+# BDA output download: parallel fetches and the bytes held in memory at once
+BDA_DOWNLOAD_WORKERS = int(os.environ.get('BDA_DOWNLOAD_WORKERS', '8'))
+BDA_DOWNLOAD_MAX_IN_FLIGHT_BYTES = int(os.environ.get('BDA_DOWNLOAD_MAX_IN_FLIGHT_BYTES', str(32 * 1024 * 1024)))
+JSON_RESULT_SLOTS = {'job_metadata', 'custom_result', 'standard_result'}
+
+# Processed artifact uploads. The Knowledge Base data source reads the whole
+# processed bucket and does not decode Content-Encoding, so only artifacts
+# that repeat content it already gets from markdown_result/custom_result are
+# ever compressed. 0 (default) disables compression.
+PROCESSED_WRITE_WORKERS = int(os.environ.get('PROCESSED_WRITE_WORKERS', '6'))
+PROCESSED_GZIP_MIN_BYTES = int(os.environ.get('PROCESSED_GZIP_MIN_BYTES', '0'))
+GZIP_ELIGIBLE_SLOTS = {'standard_result', 'html_result', 'job_metadata'}
+
+# Blueprint fields (see infrastructure/constructs/blueprints) behind the
+# has* flags of processed_documents
+DOCUMENT_FLAG_FIELDS = {
+    'has_diagnoses': ('diagnoses', 'diagnosis_mentioned'),
+    'has_symptoms': ('symptoms', 'symptoms_mentioned', 'chief_complaint'),
+    'has_medications': ('medications', 'medications_discussed'),
+    'has_vital_signs': ('blood_pressure', 'heart_rate', 'temperature', 'weight', 'height'),
+}
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -78,7 +117,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Download and process BDA output
         bda_output_uri = f"s3://{output_bucket}/{output_key}"
-        extracted_data = download_and_process_bda_output(bda_output_uri)
+        extracted_data = download_and_process_bda_output(bda_output_uri, document_id)
 
         # Extract classification from BDA results
         classification = extract_classification(extracted_data)
@@ -88,7 +127,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             patient_id, document_id, extracted_data, classification)
 
         # Update original file metadata with classification
-        update_original_file_metadata(input_bucket, input_key, classification)
+        source_info = update_original_file_metadata(input_bucket, input_key, classification)
+
+        # Release the BDA trigger lock: this version of the file is processed
+        mark_source_processed(input_bucket, input_key, source_info.get('etags', []))
+
+        # Index the document for the files API listing
+        file_id = extract_file_id(input_bucket, input_key)
+        indexed = record_processed_document(
+            file_id, patient_id, document_id, input_key, source_info, organized_uri, extracted_data, classification)
 
         # Clean up BDA output completely
         cleanup_bda_output(bda_output_uri)
@@ -102,10 +149,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'statusCode': 200,
             'body': json.dumps({
                 'documentId': document_id,
+                'fileId': file_id,
                 'patientId': patient_id,
                 'organizedUri': organized_uri,
                 'classification': classification,
                 'ingestionJobId': ingestion_job_id,
+                'indexed': indexed,
                 'status': 'completed'
             })
         }
@@ -140,6 +189,23 @@ def extract_ids_from_input_key(input_key: str) -> tuple[Optional[str], str]:
     return None, input_key.replace('/', '_')
 
 
+def extract_file_id(bucket: str, key: str) -> str:
+    """
+    File ID of an upload, the processed_documents key.
+
+    Keys created by the files API ({patient_id}/{category}/{file_id}/{file_name})
+    carry it; any other object gets a UUID derived from its location, so files
+    with the same name under different prefixes never share a row.
+    """
+    key_parts = key.split('/')
+    if len(key_parts) == 4:
+        try:
+            return str(uuid.UUID(key_parts[2]))
+        except ValueError:
+            pass
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"s3://{bucket}/{key}"))
+
+
 def get_patient_id_from_metadata(bucket: str, key: str) -> Optional[str]:
     """Get patient ID from original file metadata."""
     try:
@@ -166,80 +232,133 @@ def is_binary_file(key: str) -> bool:
     return file_extension in binary_extensions
 
 
-def download_and_process_bda_output(bda_output_uri: str) -> Dict[str, Any]:
-    """Download and process BDA output files."""
+def classify_bda_output_key(key: str, size: int) -> Optional[str]:
+    """
+    Return the result slot a BDA output object is read into, or None to skip it.
+
+    Binary renditions, empty objects, access check markers and unrecognized
+    files are filtered out before anything is downloaded.
+    """
+    if size == 0 or '.s3_access_check' in key or is_binary_file(key):
+        return None
+    if key.endswith('job_metadata.json'):
+        return 'job_metadata'
+    if key.endswith('/result.json'):
+        if '/custom_output/' in key:
+            return 'custom_result'
+        if '/standard_output/' in key:
+            return 'standard_result'
+        return None
+    for suffix, slot in (('.html', 'html_result'), ('.md', 'markdown_result'), ('.txt', 'text_result')):
+        if key.endswith(suffix):
+            return slot
+    return None
+
+
+def list_bda_output_objects(bucket: str, prefix: str) -> List[Dict[str, Any]]:
+    """List every object under the BDA output prefix, following continuation tokens."""
+    objects = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        objects.extend(page.get('Contents', []))
+    return objects
+
+
+class ByteBudget:
+    """Bounds the bytes of objects being downloaded and parsed at the same time."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        with self.condition:
+            # An object larger than the budget runs alone
+            self.condition.wait_for(lambda: self.in_flight == 0 or self.in_flight + size <= self.max_bytes)
+            self.in_flight += size
+
+    def release(self, size: int) -> None:
+        with self.condition:
+            self.in_flight -= size
+            self.condition.notify_all()
+
+
+def fetch_bda_output_object(bucket: str, key: str, slot: str, size: int, budget: ByteBudget) -> Any:
+    """Download one BDA output object; JSON is parsed from bytes without an extra str copy."""
+    budget.acquire(size)
     try:
+        body = s3_client.get_object(Bucket=bucket, Key=key)['Body']
+        try:
+            if slot in JSON_RESULT_SLOTS:
+                return json.loads(body.read())
+            return body.read().decode('utf-8')
+        finally:
+            body.close()
+    finally:
+        budget.release(size)
+
+
+def download_and_process_bda_output(bda_output_uri: str, document_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Download and process BDA output files.
+
+    The whole output prefix is listed (any number of pages) and only one
+    object per result is fetched: the last one in key order when several map
+    to the same result (multi-segment documents). Objects that are not needed
+    are skipped up front, and the rest are fetched on a bounded thread pool
+    with at most BDA_DOWNLOAD_MAX_IN_FLIGHT_BYTES being downloaded at once.
+    """
+    try:
+        started = time.monotonic()
+
         # Parse S3 URI
         parts = bda_output_uri.replace('s3://', '').split('/', 1)
         bucket = parts[0]
         prefix = parts[1] if len(parts) > 1 else ''
 
-        # List all objects in the BDA output directory
-        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-
-        if 'Contents' not in response:
+        objects = list_bda_output_objects(bucket, prefix)
+        if not objects:
             logger.warning(f"No BDA output files found at {bda_output_uri}")
             return {}
 
+        # Later keys replace earlier ones, so superseded segments are never downloaded
+        selected = {}
+        for obj in sorted(objects, key=lambda item: item['Key']):
+            slot = classify_bda_output_key(obj['Key'], obj['Size'])
+            if slot:
+                selected[slot] = (obj['Key'], obj['Size'])
+            else:
+                logger.debug(f"Skipping BDA output file: {obj['Key']}")
+        wanted = [(key, slot, size) for slot, (key, size) in selected.items()]
+
         result_data = {}
         job_metadata = None
-
-        # Log all files found in BDA output for debugging
-        all_files = [obj['Key'] for obj in response['Contents']]
-        logger.info(f"Found {len(all_files)} files in BDA output: {all_files}")
-
-        for obj in response['Contents']:
-            key = obj['Key']
-            logger.info(f"Processing BDA output file: {key} (size: {obj['Size']})")
-            
-            if obj['Size'] == 0 or '.s3_access_check' in key:
-                logger.info(f"Skipping empty or access check file: {key}")
-                continue
-
-            try:
-                # Skip binary files that we don't need to process
-                if is_binary_file(key):
-                    logger.info(f"Skipping binary file: {key}")
+        budget = ByteBudget(BDA_DOWNLOAD_MAX_IN_FLIGHT_BYTES)
+
+        with ThreadPoolExecutor(max_workers=BDA_DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(fetch_bda_output_object, bucket, key, slot, size, budget): (key, slot)
+                for key, slot, size in wanted
+            }
+            for future in as_completed(futures):
+                key, slot = futures[future]
+                try:
+                    content = future.result()
+                except Exception as e:
+                    logger.warning(f"Error processing file {key}: {e}")
                     continue
-
-                logger.info(f"Reading content from file: {key}")
-                # Get the file content
-                file_response = s3_client.get_object(Bucket=bucket, Key=key)
-                content = file_response['Body'].read().decode('utf-8')
-
-                # Process different file types
-                if key.endswith('job_metadata.json'):
-                    logger.info(f"Processing job metadata: {key}")
-                    job_metadata = json.loads(content)
-                elif key.endswith('/result.json'):
-                    if '/custom_output/' in key:
-                        logger.info(f"Processing custom result: {key}")
-                        result_data['custom_result'] = json.loads(content)
-                    elif '/standard_output/' in key:
-                        logger.info(f"Processing standard result: {key}")
-                        result_data['standard_result'] = json.loads(content)
-                elif key.endswith('.html'):
-                    logger.info(f"Processing HTML file: {key}")
-                    result_data['html_result'] = content
-                elif key.endswith('.md'):
-                    logger.info(f"Processing markdown file: {key} (content length: {len(content)})")
-                    result_data['markdown_result'] = content
-                elif key.endswith('.txt'):
-                    logger.info(f"Processing text file: {key}")
-                    result_data['text_result'] = content
+                if slot == 'job_metadata':
+                    job_metadata = content
                 else:
-                    logger.info(f"Unrecognized file type, skipping: {key}")
-
-            except Exception as e:
-                logger.warning(f"Error processing file {key}: {e}")
+                    result_data[slot] = content
 
-        # Log what result files were collected
-        logger.info(f"Collected result files: {list(result_data.keys())}")
-        for file_type, content in result_data.items():
-            if isinstance(content, str):
-                logger.info(f"  {file_type}: {len(content)} characters")
-            else:
-                logger.info(f"  {file_type}: {type(content)} object")
+        logger.info(
+            f"Fetched BDA output for document {document_id or bda_output_uri}: "
+            f"{len(wanted)} of {len(objects)} objects, "
+            f"{sum(size for _, _, size in wanted)} bytes in {(time.monotonic() - started) * 1000:.0f}ms "
+            f"(collected: {sorted(result_data)})"
+        )
 
         return {
             'job_metadata': job_metadata,
@@ -312,13 +431,72 @@ def extract_classification(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def build_artifact(
+    key: str,
+    content: Any,
+    slot: str,
+    gzip_min_bytes: int = None
+) -> Dict[str, Any]:
+    """
+    Serialize one processed artifact.
+
+    JSON is written compact. When gzip_min_bytes is set, artifacts in
+    GZIP_ELIGIBLE_SLOTS of at least that size are stored gzip-compressed
+    with Content-Encoding: gzip.
+
+    Returns:
+        Dictionary with key, body, content_type and content_encoding (or None)
+    """
+    if isinstance(content, (dict, list)):
+        body = json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        content_type = 'application/json'
+    else:
+        body = str(content).encode('utf-8')
+        content_type = 'text/plain; charset=utf-8'
+
+    content_encoding = None
+    if gzip_min_bytes and slot in GZIP_ELIGIBLE_SLOTS and len(body) >= gzip_min_bytes:
+        body = gzip.compress(body, compresslevel=6)
+        content_encoding = 'gzip'
+
+    return {'key': key, 'body': body, 'content_type': content_type, 'content_encoding': content_encoding}
+
+
+def put_artifacts(artifacts: List[Dict[str, Any]], metadata: Dict[str, str]) -> None:
+    """Upload artifacts to the processed bucket concurrently."""
+    def put(artifact):
+        request = {
+            'Bucket': PROCESSED_BUCKET,
+            'Key': artifact['key'],
+            'Body': artifact['body'],
+            'ContentType': artifact['content_type'],
+            'Metadata': metadata
+        }
+        if artifact['content_encoding']:
+            request['ContentEncoding'] = artifact['content_encoding']
+        s3_client.put_object(**request)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(PROCESSED_WRITE_WORKERS, len(artifacts)))) as executor:
+        # list() re-raises the first failed upload
+        list(executor.map(put, artifacts))
+
+
 def organize_processed_data(patient_id: str, document_id: str, extracted_data: Dict[str, Any], classification: Dict[str, Any]) -> str:
-    """Organize processed data in the correct bucket structure."""
+    """
+    Organize processed data in the correct bucket structure.
+
+    Each result file is written once, as {slot}.json or {slot}.txt, and
+    extracted_data.json is a manifest holding the classification and a
+    reference (key, size, encoding) to every artifact instead of a copy of
+    their contents. All objects are uploaded concurrently.
+    """
     if not PROCESSED_BUCKET:
         logger.warning("PROCESSED_BUCKET not configured")
         return ""
 
     try:
+        started = time.monotonic()
+
         # Create structure: {patient_id}/{document_id}/
         key_prefix = f"{patient_id}/{document_id}"
 
@@ -333,53 +511,45 @@ def organize_processed_data(patient_id: str, document_id: str, extracted_data: D
             'processing-timestamp': extracted_data.get('processing_timestamp', datetime.utcnow().isoformat() + 'Z')
         }
 
-        # Store main extracted data
-        main_key = f"{key_prefix}/extracted_data.json"
-        clean_data = {k: v for k, v in extracted_data.items()
-                      if k != 'source_uri'}
-        clean_data['classification'] = classification
-
-        s3_client.put_object(
-            Bucket=PROCESSED_BUCKET,
-            Key=main_key,
-            Body=json.dumps(clean_data, indent=2, ensure_ascii=False),
-            ContentType='application/json',
-            Metadata=metadata
-        )
+        # Individual result files, plus the job metadata if available
+        contents = dict(extracted_data.get('result_files', {}))
+        if extracted_data.get('job_metadata'):
+            contents['job_metadata'] = extracted_data['job_metadata']
 
-        # Store individual result files
-        result_files = extracted_data.get('result_files', {})
-        for file_type, content in result_files.items():
+        artifacts_by_slot = {}
+        for slot, content in contents.items():
             if not content:
                 continue
+            extension = 'json' if isinstance(content, (dict, list)) else 'txt'
+            artifacts_by_slot[slot] = build_artifact(
+                f"{key_prefix}/{slot}.{extension}", content, slot, PROCESSED_GZIP_MIN_BYTES)
 
-            file_key = f"{key_prefix}/{file_type}.json" if isinstance(
-                content, dict) else f"{key_prefix}/{file_type}.txt"
-            content_type = 'application/json' if isinstance(
-                content, dict) else 'text/plain'
-            body = json.dumps(content, indent=2, ensure_ascii=False) if isinstance(
-                content, dict) else content
-
-            s3_client.put_object(
-                Bucket=PROCESSED_BUCKET,
-                Key=file_key,
-                Body=body,
-                ContentType=content_type,
-                Metadata=metadata
-            )
-
-        # Store job metadata if available
-        if extracted_data.get('job_metadata'):
-            metadata_key = f"{key_prefix}/job_metadata.json"
-            s3_client.put_object(
-                Bucket=PROCESSED_BUCKET,
-                Key=metadata_key,
-                Body=json.dumps(extracted_data['job_metadata'], indent=2),
-                ContentType='application/json',
-                Metadata=metadata
-            )
-
-        logger.info(f"Organized processed data at: {key_prefix}")
+        # Manifest referencing the artifacts
+        main_key = f"{key_prefix}/extracted_data.json"
+        manifest = {
+            'document_id': document_id,
+            'patient_id': patient_id,
+            'processing_timestamp': metadata['processing-timestamp'],
+            'classification': classification,
+            'artifacts': {
+                slot: {
+                    'key': artifact['key'],
+                    'content_type': artifact['content_type'],
+                    'content_encoding': artifact['content_encoding'],
+                    'bytes': len(artifact['body'])
+                }
+                for slot, artifact in artifacts_by_slot.items()
+            }
+        }
+        artifacts = list(artifacts_by_slot.values()) + [build_artifact(main_key, manifest, 'manifest')]
+
+        put_artifacts(artifacts, metadata)
+
+        logger.info(
+            f"Organized processed data at: {key_prefix} ({len(artifacts)} objects, "
+            f"{sum(len(artifact['body']) for artifact in artifacts)} bytes in "
+            f"{(time.monotonic() - started) * 1000:.0f}ms)"
+        )
         return f"s3://{PROCESSED_BUCKET}/{main_key}"
 
     except Exception as e:
@@ -387,12 +557,25 @@ def organize_processed_data(patient_id: str, document_id: str, extracted_data: D
         return ""
 
 
-def update_original_file_metadata(bucket: str, key: str, classification: Dict[str, Any]) -> None:
-    """Update original file metadata with classification results."""
+def update_original_file_metadata(bucket: str, key: str, classification: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Update original file metadata with classification results.
+
+    Returns:
+        Dictionary with the content_type, size_bytes and etags (before and
+        after the metadata copy) of the original file (empty if it could
+        not be read)
+    """
+    source_info = {}
     try:
         # Get current object metadata
         response = s3_client.head_object(Bucket=bucket, Key=key)
         current_metadata = response.get('Metadata', {})
+        source_info = {
+            'content_type': response.get('ContentType'),
+            'size_bytes': response.get('ContentLength'),
+            'etags': [normalize_etag(response.get('ETag'))]
+        }
 
         # Update metadata with classification
         updated_metadata = {
@@ -401,11 +584,13 @@ def update_original_file_metadata(bucket: str, key: str, classification: Dict[st
             'classification-confidence': str(classification.get('confidence', 0.0)),
             'auto-classified': str(classification.get('auto_classified', False)),
             'workflow-stage': 'classified',
-            'classification-timestamp': datetime.utcnow().isoformat() + 'Z'
+            'classification-timestamp': datetime.utcnow().isoformat() + 'Z',
+            # Lets the BDA trigger tell this copy from a copy to another key
+            'source-etag': source_info['etags'][0]
         }
 
         # Copy object with updated metadata
-        s3_client.copy_object(
+        copy_response = s3_client.copy_object(
             CopySource={'Bucket': bucket, 'Key': key},
             Bucket=bucket,
             Key=key,
@@ -414,11 +599,142 @@ def update_original_file_metadata(bucket: str, key: str, classification: Dict[st
             ContentType=response.get('ContentType', 'application/octet-stream')
         )
 
+        # Multipart uploads get a new ETag when copied; the copy's own event
+        # must be recognized as processed too
+        copied_etag = normalize_etag(copy_response.get('CopyObjectResult', {}).get('ETag'))
+        if copied_etag and copied_etag not in source_info['etags']:
+            source_info['etags'].append(copied_etag)
+
         logger.info(f"Updated metadata for original file: {key}")
 
     except Exception as e:
         logger.error(f"Error updating original file metadata: {e}")
 
+    return source_info
+
+
+def mark_source_processed(bucket: str, key: str, etags: List[str]) -> None:
+    """Move the processing locks of the original file to 'processed'."""
+    global processing_locks
+    try:
+        if processing_locks is None:
+            processing_locks = create_processing_lock_store()
+        for etag in filter(None, etags):
+            processing_locks.mark_processed(bucket, key, etag)
+    except ProcessingLockError as e:
+        # The results are stored; an expired lock only lets a duplicate event reprocess the file
+        logger.error(f"Error marking {key} as processed: {e}")
+
+
+def get_document_flags(extracted_data: Dict[str, Any]) -> Dict[str, bool]:
+    """Derive the has* flags from the fields the blueprint filled in."""
+    custom_result = extracted_data.get('result_files', {}).get('custom_result') or {}
+    inference_result = custom_result.get('inference_result') or {}
+
+    def filled(value: Any) -> bool:
+        if isinstance(value, str):
+            return bool(value.strip())
+        return value not in (None, [], {})
+
+    return {
+        flag: any(filled(inference_result.get(field)) for field in fields)
+        for flag, fields in DOCUMENT_FLAG_FIELDS.items()
+    }
+
+
+def record_processed_document(
+    file_id: str,
+    patient_id: str,
+    document_id: str,
+    input_key: str,
+    source_info: Dict[str, Any],
+    organized_uri: str,
+    extracted_data: Dict[str, Any],
+    classification: Dict[str, Any]
+) -> bool:
+    """
+    Upsert the processed_documents row listed by the files API.
+
+    Only the blueprint inference result is stored in extracted_data; the full
+    BDA output stays in the processed bucket. A file ID already recorded for
+    another patient is never reassigned.
+
+    Returns:
+        True if the row was written
+    """
+    custom_result = extracted_data.get('result_files', {}).get('custom_result') or {}
+    processing_date = extracted_data.get('processing_timestamp') or datetime.utcnow().isoformat() + 'Z'
+
+    sql = """
+    INSERT INTO processed_documents (
+        file_id, document_id, patient_id, file_name, content_type, size_bytes, extracted_data, s3_uri,
+        processing_date, category, original_classification, classification_confidence,
+        auto_classified, has_diagnoses, has_symptoms, has_medications, has_vital_signs
+    )
+    VALUES (
+        :file_id, :document_id, (SELECT patient_id FROM patients WHERE patient_id = :patient_id),
+        :file_name, :content_type, :size_bytes, CAST(:extracted_data AS jsonb), :s3_uri,
+        CAST(:processing_date AS timestamptz), :category, :original_classification,
+        :classification_confidence, :auto_classified, :has_diagnoses, :has_symptoms,
+        :has_medications, :has_vital_signs
+    )
+    ON CONFLICT (file_id) DO UPDATE SET
+        document_id = EXCLUDED.document_id,
+        patient_id = EXCLUDED.patient_id,
+        file_name = EXCLUDED.file_name,
+        content_type = EXCLUDED.content_type,
+        size_bytes = EXCLUDED.size_bytes,
+        extracted_data = EXCLUDED.extracted_data,
+        s3_uri = EXCLUDED.s3_uri,
+        processing_date = EXCLUDED.processing_date,
+        category = EXCLUDED.category,
+        original_classification = EXCLUDED.original_classification,
+        classification_confidence = EXCLUDED.classification_confidence,
+        auto_classified = EXCLUDED.auto_classified,
+        has_diagnoses = EXCLUDED.has_diagnoses,
+        has_symptoms = EXCLUDED.has_symptoms,
+        has_medications = EXCLUDED.has_medications,
+        has_vital_signs = EXCLUDED.has_vital_signs,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE processed_documents.patient_id IS NOT DISTINCT FROM EXCLUDED.patient_id
+    """
+
+    parameters = [
+        db_manager.create_parameter('file_id', file_id, 'string'),
+        db_manager.create_parameter('document_id', document_id, 'string'),
+        db_manager.create_parameter('patient_id', patient_id, 'string'),
+        db_manager.create_parameter('file_name', input_key.split('/')[-1], 'string'),
+        db_manager.create_parameter('content_type', source_info.get('content_type'), 'string'),
+        db_manager.create_parameter('size_bytes', source_info.get('size_bytes'), 'long'),
+        db_manager.create_parameter(
+            'extracted_data', json.dumps(custom_result.get('inference_result') or {}, ensure_ascii=False), 'string'),
+        db_manager.create_parameter('s3_uri', organized_uri or f"s3://{SOURCE_BUCKET}/{input_key}", 'string'),
+        db_manager.create_parameter('processing_date', processing_date, 'string'),
+        db_manager.create_parameter('category', classification.get('category', 'other'), 'string'),
+        db_manager.create_parameter(
+            'original_classification', classification.get('original_classification'), 'string'),
+        db_manager.create_parameter(
+            'classification_confidence', round(float(classification.get('confidence', 0.0)), 2), 'double'),
+        db_manager.create_parameter('auto_classified', bool(classification.get('auto_classified')), 'boolean'),
+    ]
+    parameters.extend(
+        db_manager.create_parameter(flag, value, 'boolean')
+        for flag, value in get_document_flags(extracted_data).items()
+    )
+
+    try:
+        recorded = db_manager.execute_update(sql, parameters)
+    except DatabaseError as e:
+        logger.error(f"Error recording processed document {file_id}: {e}")
+        return False
+
+    if not recorded:
+        logger.warning(f"File {file_id} is already recorded for another patient, not updated")
+        return False
+
+    logger.info(f"Recorded processed document {file_id} ({classification.get('category', 'other')})")
+    return True
+
 
 def cleanup_bda_output(bda_output_uri: str) -> None:
     """Completely clean up BDA output directory."""
@@ -467,101 +783,33 @@ def cleanup_bda_output(bda_output_uri: str) -> None:
         logger.error(f"Error cleaning up BDA output: {e}")
 
 
-def get_knowledge_base_config() -> Dict[str, Optional[str]]:
-    """Get Knowledge Base configuration from SSM parameters."""
-    try:
-        response = ssm_client.get_parameters(
-            Names=[
-                '/healthcare/knowledge-base/id',
-                '/healthcare/knowledge-base/data-source-id'
-            ]
-        )
+def get_ingestion_scheduler() -> Optional[IngestionScheduler]:
+    """Ingestion scheduler, created on first use once the Knowledge Base is configured."""
+    global ingestion_scheduler
+    if ingestion_scheduler is None:
+        ingestion_scheduler = create_ingestion_scheduler(bedrock_agent_client, ssm_client)
+    return ingestion_scheduler
 
-        params = {param['Name'].split('/')[-1]: param['Value']
-                  for param in response['Parameters']}
 
-        return {
-            'knowledge_base_id': params.get('id'),
-            'data_source_id': params.get('data-source-id')
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to get Knowledge Base configuration: {e}")
-        return {'knowledge_base_id': None, 'data_source_id': None}
-
-
-def check_running_ingestion_jobs(knowledge_base_id: str, data_source_id: str) -> Optional[str]:
-    """Check if there are any running ingestion jobs for the data source."""
-    try:
-        response = bedrock_agent_client.list_ingestion_jobs(
-            knowledgeBaseId=knowledge_base_id,
-            dataSourceId=data_source_id,
-            filters=[
-                {
-                    'attribute': 'STATUS',
-                    'operator': 'EQ',
-                    'values': ['STARTING', 'IN_PROGRESS']
-                }
-            ],
-            maxResults=10
-        )
-
-        ingestion_jobs = response.get('ingestionJobSummaries', [])
-
-        if ingestion_jobs:
-            running_job = ingestion_jobs[0]  # Get the first running job
-            job_id = running_job.get('ingestionJobId')
-            status = running_job.get('status')
-            logger.info(
-                f"Found running ingestion job: {job_id} with status: {status}")
-            return job_id
-
-        return None
-
-    except Exception as e:
-        logger.error(f"Error checking running ingestion jobs: {e}")
-        return None
+def start_knowledge_base_ingestion() -> Optional[str]:
+    """
+    Request a Knowledge Base ingestion for the new processed data.
 
+    The scheduler coalesces requests: the job may start now, after the
+    debounce window (picked up by the ingestion tick function), or after
+    the running job finishes.
 
-def start_knowledge_base_ingestion() -> Optional[str]:
-    """Start Knowledge Base ingestion job if none is currently running."""
+    Returns:
+        ID of the job started or already running, or None if deferred
+    """
     try:
-        # Get Knowledge Base configuration
-        config = get_knowledge_base_config()
-        knowledge_base_id = config.get('knowledge_base_id')
-        data_source_id = config.get('data_source_id')
-
-        if not knowledge_base_id or not data_source_id:
+        scheduler = get_ingestion_scheduler()
+        if not scheduler:
             logger.warning(
                 "Knowledge Base configuration not available, skipping ingestion")
             return None
 
-        logger.info(
-            f"Starting Knowledge Base ingestion for KB: {knowledge_base_id}, Data Source: {data_source_id}")
-
-        # Check if there's already a running ingestion job
-        running_job_id = check_running_ingestion_jobs(
-            knowledge_base_id, data_source_id)
-
-        if running_job_id:
-            logger.info(
-                f"Ingestion job already running: {running_job_id}, skipping new job")
-            return running_job_id
-
-        # Start new ingestion job
-        response = bedrock_agent_client.start_ingestion_job(
-            knowledgeBaseId=knowledge_base_id,
-            dataSourceId=data_source_id,
-            description='Ingesting processed healthcare documents after BDA completion'
-        )
-
-        ingestion_job = response.get('ingestionJob', {})
-        job_id = ingestion_job.get('ingestionJobId')
-        status = ingestion_job.get('status')
-
-        logger.info(
-            f"Started Knowledge Base ingestion job: {job_id} with status: {status}")
-        return job_id
+        return scheduler.request()
 
     except Exception as e:
         logger.error(f"Error starting Knowledge Base ingestion: {e}")
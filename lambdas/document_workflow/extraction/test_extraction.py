@@ -0,0 +1,214 @@
+"""
+Tests for the BDA output download and processed writes of the extraction function.
+Run with: python -m pytest lambdas/document_workflow/extraction/test_extraction.py -v
+
+The processed_documents tests use the postgres_db fixture and are skipped
+unless TEST_DATABASE_DSN is set.
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import api.files.handler as files_handler
+import document_workflow.extraction.index as extraction
+
+# Documents are recorded by the extraction function and listed by the files API
+DB_MANAGER_MODULES = [extraction, files_handler]
+
+
+class StubPaginator:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self, **kwargs):
+        return iter(self.pages)
+
+
+class StubS3:
+    """S3 client serving a listing split in pages and recording downloads."""
+
+    def __init__(self, objects, page_size=2):
+        self.objects = objects
+        self.page_size = page_size
+        self.downloaded = []
+
+    def get_paginator(self, name):
+        keys = list(self.objects)
+        return StubPaginator([
+            {'Contents': [{'Key': key, 'Size': len(self.objects[key])} for key in keys[i:i + self.page_size]]}
+            for i in range(0, len(keys), self.page_size)
+        ])
+
+    def get_object(self, Bucket, Key):
+        self.downloaded.append(Key)
+        return {'Body': io.BytesIO(self.objects[Key])}
+
+
+class RecordingS3:
+    """S3 client recording put_object requests by key."""
+
+    def __init__(self):
+        self.puts = {}
+
+    def put_object(self, **request):
+        self.puts[request['Key']] = request
+        return {}
+
+
+def processed_data(pages=40):
+    text = 'Diagnóstico: hipertensión arterial. ' * pages
+    return {
+        'job_metadata': {'job_id': 'job-1'},
+        'result_files': {
+            'custom_result': {'inference_result': {'diagnoses': 'HTA'}},
+            'standard_result': {'pages': [{'representation': {'markdown': text}}]},
+            'markdown_result': text,
+            'html_result': f'<p>{text}</p>',
+            'empty_result': None
+        },
+        'source_uri': 's3://bda-output/job-1',
+        'processing_timestamp': '2031-03-03T10:00:00Z'
+    }
+
+
+def test_download_reads_every_page_and_skips_unneeded_objects(monkeypatch):
+    """All listing pages are read; binaries, unknown files and superseded segments are never downloaded."""
+    prefix = 'bda/job-1/0'
+    stub = StubS3({
+        f'{prefix}/custom_output/0/result.json': json.dumps({'inference_result': {'segment': 0}}).encode(),
+        f'{prefix}/custom_output/1/result.json': json.dumps({'inference_result': {'segment': 1}}).encode(),
+        f'{prefix}/standard_output/0/assets/page-1.png': b'\x89PNG',
+        f'{prefix}/standard_output/0/result.json': b'{"pages": 2}',
+        f'{prefix}/standard_output/0/result.md': 'Diagnóstico: HTA'.encode('utf-8'),
+        f'{prefix}/.s3_access_check': b'',
+        f'{prefix}/notes.csv': b'a,b',
+        'bda/job-1/job_metadata.json': b'{"job_id": "job-1"}',
+    })
+    monkeypatch.setattr(extraction, 's3_client', stub)
+
+    data = extraction.download_and_process_bda_output('s3://bucket/bda/job-1', 'doc-1')
+
+    assert data['job_metadata'] == {'job_id': 'job-1'}
+    assert data['result_files']['custom_result'] == {'inference_result': {'segment': 1}}
+    assert data['result_files']['standard_result'] == {'pages': 2}
+    assert data['result_files']['markdown_result'] == 'Diagnóstico: HTA'
+    assert len(stub.downloaded) == 4
+    assert not any(key.endswith(('.png', '.csv', '.s3_access_check')) for key in stub.downloaded)
+    assert f'{prefix}/custom_output/0/result.json' not in stub.downloaded
+
+
+def test_byte_budget_bounds_objects_in_flight():
+    """Objects larger than the budget still run, one at a time."""
+    budget = extraction.ByteBudget(100)
+    budget.acquire(60)
+    budget.release(60)
+    budget.acquire(500)
+    assert budget.in_flight == 500
+    budget.release(500)
+    assert budget.in_flight == 0
+
+
+def test_processed_data_is_written_once_with_a_manifest(monkeypatch):
+    """extracted_data.json references the artifacts instead of embedding them."""
+    stub = RecordingS3()
+    monkeypatch.setattr(extraction, 's3_client', stub)
+    monkeypatch.setattr(extraction, 'PROCESSED_BUCKET', 'processed')
+    monkeypatch.setattr(extraction, 'PROCESSED_GZIP_MIN_BYTES', 0)
+
+    uri = extraction.organize_processed_data('p-1', 'doc-1', processed_data(), {'category': 'medical-history'})
+
+    assert uri == 's3://processed/p-1/doc-1/extracted_data.json'
+    assert sorted(stub.puts) == [
+        'p-1/doc-1/custom_result.json', 'p-1/doc-1/extracted_data.json', 'p-1/doc-1/html_result.txt',
+        'p-1/doc-1/job_metadata.json', 'p-1/doc-1/markdown_result.txt', 'p-1/doc-1/standard_result.json'
+    ]
+    assert not any('ContentEncoding' in request for request in stub.puts.values())
+
+    manifest_body = stub.puts['p-1/doc-1/extracted_data.json']['Body']
+    manifest = json.loads(manifest_body)
+    assert manifest['classification'] == {'category': 'medical-history'}
+    assert manifest['artifacts']['markdown_result']['key'] == 'p-1/doc-1/markdown_result.txt'
+    assert 'hipertensión' not in manifest_body.decode('utf-8')
+    assert b'\n' not in stub.puts['p-1/doc-1/standard_result.json']['Body']
+
+
+def test_gzip_is_limited_to_large_artifacts_of_eligible_slots(monkeypatch):
+    """Markdown and the blueprint result stay plain for the Knowledge Base."""
+    stub = RecordingS3()
+    monkeypatch.setattr(extraction, 's3_client', stub)
+    monkeypatch.setattr(extraction, 'PROCESSED_BUCKET', 'processed')
+    monkeypatch.setattr(extraction, 'PROCESSED_GZIP_MIN_BYTES', 1024)
+
+    extraction.organize_processed_data('p-1', 'doc-1', processed_data(), {'category': 'medical-history'})
+
+    encoded = {key for key, request in stub.puts.items() if request.get('ContentEncoding') == 'gzip'}
+    assert encoded == {'p-1/doc-1/standard_result.json', 'p-1/doc-1/html_result.txt'}
+    html = gzip.decompress(stub.puts['p-1/doc-1/html_result.txt']['Body']).decode('utf-8')
+    assert html.startswith('<p>Diagnóstico')
+
+    manifest = json.loads(stub.puts['p-1/doc-1/extracted_data.json']['Body'])
+    assert manifest['artifacts']['html_result']['content_encoding'] == 'gzip'
+    assert manifest['artifacts']['markdown_result']['content_encoding'] is None
+
+
+def test_file_id_comes_from_the_upload_key():
+    """Files API keys carry the file ID; other keys get a stable ID of their location."""
+    file_id = '2f1c7c3e-5b7a-4c55-9d1e-6f1c7f0e9a11'
+    assert extraction.extract_file_id('raw', f'p-1/exam-results/{file_id}/scan.pdf') == file_id
+
+    first = extraction.extract_file_id('raw', 'p-1/scan.pdf')
+    assert first == extraction.extract_file_id('raw', 'p-1/scan.pdf')
+    assert first != extraction.extract_file_id('raw', 'p-2/scan.pdf')
+
+
+def seed_database(db):
+    db.execute_sql("""
+        INSERT INTO patients (patient_id, full_name, email) VALUES
+        ('p-1', 'Ana Gómez', 'ana@example.com'),
+        ('p-2', 'Carlos Ruiz', 'carlos@example.com')
+    """)
+
+
+def record(patient_id, key, processing_date):
+    data = dict(processed_data(pages=1), processing_timestamp=processing_date)
+    file_id = extraction.extract_file_id('raw', key)
+    source_info = {'content_type': 'application/pdf', 'size_bytes': 2048}
+    recorded = extraction.record_processed_document(
+        file_id, patient_id, 'scan', key, source_info, f's3://processed/{patient_id}/scan', data,
+        {'category': 'exam-results', 'confidence': 91.5, 'auto_classified': True})
+    return file_id, recorded
+
+
+def list_files(**options):
+    return json.loads(files_handler.handle_list_files(**options)['body'])
+
+
+def test_same_file_name_for_two_patients_is_listed_twice(postgres_db):
+    """Rows are keyed by file ID, so equal file names never overwrite each other."""
+    first, recorded_first = record('p-1', 'p-1/exam-results/2f1c7c3e-5b7a-4c55-9d1e-6f1c7f0e9a11/scan.pdf',
+                                   '2031-03-03T10:00:00Z')
+    second, recorded_second = record('p-2', 'p-2/exam-results/8d4e1a2b-3c4d-4e5f-8a9b-0c1d2e3f4a5b/scan.pdf',
+                                     '2031-03-03T10:00:00Z')
+    assert recorded_first and recorded_second
+
+    files = list_files(pagination_params={'limit': '1'})
+    assert [file['id'] for file in files['files']] == [second]
+    files = list_files(pagination_params={'limit': '1', 'cursor': files['pagination']['next_cursor']})
+    assert [file['id'] for file in files['files']] == [first]
+    assert [file['patientId'] for file in list_files(patient_id='p-1')['files']] == ['p-1']
+
+    # Deleting one document leaves the other patient's file listed
+    assert files_handler.handle_file_deletion(first)['statusCode'] == 200
+    assert [file['id'] for file in list_files()['files']] == [second]
+    assert files_handler.handle_file_deletion(first)['statusCode'] == 404
+
+
+if __name__ == "__main__":
+    print("Testing BDA output download...")
+    test_byte_budget_bounds_objects_in_flight()
+    print("\n✅ All tests passed!")
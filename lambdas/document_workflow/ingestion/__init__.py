@@ -0,0 +1,3 @@
+"""
+Knowledge Base ingestion scheduling module for document workflow.
+"""
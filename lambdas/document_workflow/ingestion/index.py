@@ -0,0 +1,54 @@
+"""
+Knowledge Base ingestion tick.
+Runs every minute on an EventBridge schedule and lets the ingestion scheduler
+reap finished jobs and start the debounced or follow-up job
+(see shared.ingestion_scheduler).
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+import boto3
+
+from shared.ingestion_scheduler import IngestionScheduler, create_ingestion_scheduler
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+bedrock_agent_client = boto3.client('bedrock-agent')
+ssm_client = boto3.client('ssm')
+ingestion_scheduler: Optional[IngestionScheduler] = None
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Handle the scheduled tick.
+
+    Args:
+        event: EventBridge scheduled event
+        context: Lambda context
+
+    Returns:
+        ID of the running or started ingestion job, if any
+    """
+    global ingestion_scheduler
+
+    try:
+        if ingestion_scheduler is None:
+            ingestion_scheduler = create_ingestion_scheduler(bedrock_agent_client, ssm_client)
+        if ingestion_scheduler is None:
+            logger.warning("Knowledge Base configuration not available, skipping tick")
+            return {'statusCode': 200, 'body': json.dumps({'status': 'not_configured'})}
+
+        job_id = ingestion_scheduler.tick()
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'ingestionJobId': job_id,
+                'status': 'running' if job_id else 'idle'
+            })
+        }
+
+    except Exception as e:
+        logger.error(f"Ingestion tick failed: {str(e)}", exc_info=True)
+        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
@@ -6,14 +6,20 @@ Supports multi-criteria search across name, email, phone, and cedula.
 Enhanced with comprehensive error handling, input validation, and structured logging.
 """
 
+import heapq
 import json
 import logging
+import math
 import os
 import time
 import re
-from typing import Dict, Any, List, Optional
+import sys
+import unicodedata
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
 from shared.database import DatabaseManager, DatabaseError
-from shared.utils import create_response, create_error_response, StructuredLogger
+from shared.utils import (
+    create_response, create_error_response, select_fields, mcp_projection_params, StructuredLogger
+)
 
 # Configure structured logging
 logger = StructuredLogger(__name__)
@@ -23,12 +29,52 @@ base_logger.setLevel(logging.INFO)
 # Environment variables
 PATIENT_TABLE = os.getenv("PATIENT_TABLE", "patients")
 
+# Name search strategy: 'trigram' (accent-insensitive pg_trgm index, ranked by
+# similarity) or 'like' (legacy case-insensitive substring match, sequential scan)
+NAME_SEARCH_MODE = os.getenv("NAME_SEARCH_MODE", "trigram").lower()
+
+# In-memory search index for warm containers (see PatientSearchIndex). The
+# database stays the source of truth: searches the index cannot answer, or
+# answers with no match, run the SQL query. Budget about 2 KB of memory per
+# patient when sizing the function.
+PATIENT_INDEX_ENABLED = os.getenv("PATIENT_INDEX_ENABLED", "false").lower() == "true"
+PATIENT_INDEX_REFRESH_SECONDS = float(os.getenv("PATIENT_INDEX_REFRESH_SECONDS", "30"))
+PATIENT_INDEX_FULL_RELOAD_SECONDS = float(os.getenv("PATIENT_INDEX_FULL_RELOAD_SECONDS", "900"))
+PATIENT_INDEX_MAX_PATIENTS = int(os.getenv("PATIENT_INDEX_MAX_PATIENTS", "20000"))
+
 # Initialize database manager
 db_manager = DatabaseManager()
 
 # Constants
 DEFAULT_SEARCH_LIMIT = 3
 MAX_SEARCH_LIMIT = 10
+MAX_BATCH_SEARCHES = 20
+
+# patient_summary: rows returned per section (upcoming reservations, recent
+# reservations, documents) and the length reservation notes are cut to
+DEFAULT_SUMMARY_LIMIT = 5
+MAX_SUMMARY_LIMIT = 10
+SUMMARY_NOTES_MAX_LENGTH = 200
+
+# Upcoming reservations are those after the current time in this timezone
+CLINIC_TIMEZONE = os.getenv("CLINIC_TIMEZONE", "America/Bogota")
+
+# Columns returned for every matched patient
+PATIENT_RESULT_COLUMNS = "patient_id, full_name, email, phone, cedula, date_of_birth, created_at, updated_at"
+
+# Fields a request can pick with `fields` / `view` (compact by default, as for
+# the other MCP tools). These rows have no JSONB columns, so the projection is
+# applied to the response and the queries and in-memory index stay shared.
+PATIENT_FIELDS = [column.strip() for column in PATIENT_RESULT_COLUMNS.split(",")]
+PATIENT_COMPACT_FIELDS = ["patient_id", "full_name", "email", "phone", "cedula", "date_of_birth"]
+
+# Indexed expression each exact identifier is matched against (see migration 0004)
+BATCH_IDENTIFIER_EXPRESSIONS = {
+    "patient_id": "patient_id",
+    "cedula": "normalize_cedula(cedula)",
+    "email": "LOWER(email)",
+    "phone": "normalize_phone(phone)",
+}
 
 # Input validation patterns
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
@@ -41,6 +87,39 @@ MAX_EMAIL_LENGTH = 100
 MAX_PHONE_LENGTH = 20
 MAX_CEDULA_LENGTH = 20
 
+# Phone numbers are compared as E.164 digits without '+'; national numbers get
+# the default country code. Must match normalize_phone() in migration 0004.
+DEFAULT_PHONE_COUNTRY_CODE = "57"
+NATIONAL_PHONE_LENGTH = 10
+CEDULA_SEPARATORS_PATTERN = re.compile(r'[\s.\-]')
+
+# pg_trgm's default similarity threshold, used by the % operator
+TRIGRAM_SIMILARITY_THRESHOLD = 0.3
+
+# Incremental refreshes re-read rows updated this long before the watermark, so
+# updates committed late by a concurrent transaction are not missed
+PATIENT_INDEX_REFRESH_OVERLAP_SECONDS = 5
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email the way idx_patients_email_lower indexes it."""
+    return email.strip().lower()
+
+
+def normalize_phone(phone: str) -> str:
+    """Normalize a phone number to E.164 digits, mirroring normalize_phone() in SQL."""
+    digits = re.sub(r'\D', '', phone)
+    if digits.startswith('00'):
+        digits = digits[2:]
+    if len(digits) == NATIONAL_PHONE_LENGTH:
+        digits = DEFAULT_PHONE_COUNTRY_CODE + digits
+    return digits
+
+
+def normalize_cedula(cedula: str) -> str:
+    """Strip separators from a cedula, mirroring normalize_cedula() in SQL."""
+    return CEDULA_SEPARATORS_PATTERN.sub('', cedula).upper()
+
 
 def create_enhanced_error_response(
     status_code: int, 
@@ -162,7 +241,7 @@ def validate_search_input(
             validation_result["errors"].append("Email must be a string")
             validation_result["valid"] = False
         else:
-            email = email.strip().lower()
+            email = normalize_email(email)
             if len(email) == 0:
                 validation_result["errors"].append("Email cannot be empty")
                 validation_result["valid"] = False
@@ -188,11 +267,11 @@ def validate_search_input(
             elif len(phone) > MAX_PHONE_LENGTH:
                 validation_result["errors"].append(f"Phone exceeds maximum length of {MAX_PHONE_LENGTH} characters")
                 validation_result["valid"] = False
-            elif not PHONE_PATTERN.match(phone):
+            elif not PHONE_PATTERN.match(phone) or not normalize_phone(phone):
                 validation_result["errors"].append("Invalid phone format")
                 validation_result["valid"] = False
             else:
-                validation_result["sanitized"]["phone"] = phone
+                validation_result["sanitized"]["phone"] = normalize_phone(phone)
     
     # Validate and sanitize cedula
     if cedula is not None:
@@ -207,11 +286,11 @@ def validate_search_input(
             elif len(cedula) > MAX_CEDULA_LENGTH:
                 validation_result["errors"].append(f"Cedula exceeds maximum length of {MAX_CEDULA_LENGTH} characters")
                 validation_result["valid"] = False
-            elif not CEDULA_PATTERN.match(cedula):
+            elif not CEDULA_PATTERN.match(cedula) or not normalize_cedula(cedula):
                 validation_result["errors"].append("Invalid cedula format")
                 validation_result["valid"] = False
             else:
-                validation_result["sanitized"]["cedula"] = cedula
+                validation_result["sanitized"]["cedula"] = normalize_cedula(cedula)
     
     # Validate limit
     if limit is not None:
@@ -247,6 +326,281 @@ def validate_search_input(
     return validation_result
 
 
+def normalize_name(name: str) -> str:
+    """Normalize a name like normalize_name() in migration 0003 (trim, collapse spaces, unaccent, lower)."""
+    decomposed = unicodedata.normalize('NFKD', ' '.join(name.split()))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def name_trigrams(normalized_name: str) -> Set[str]:
+    """Trigrams of a normalized name, built the way pg_trgm builds them."""
+    trigrams = set()
+    for word in re.findall(r'[^\W_]+', normalized_name):
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class IndexedPatientKeys(NamedTuple):
+    """Normalized lookup keys of one patient held by PatientSearchIndex."""
+    cedula: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    name: str
+    trigrams: Tuple[str, ...]
+
+
+class PatientSearchIndex:
+    """
+    In-process index of the patients table for warm containers.
+    
+    Exact identifiers are held in hash maps keyed by the same normalized values
+    the SQL lookups compare (migration 0004), and names in a trigram inverted
+    index scored like pg_trgm similarity(). The index loads lazily on the first
+    search, then picks up changed rows with `updated_at >= watermark` every
+    PATIENT_INDEX_REFRESH_SECONDS. Deleted patients are only dropped by the
+    periodic full reload, so callers must treat results as a cache of the
+    database.
+    """
+    
+    def __init__(
+        self,
+        database: DatabaseManager,
+        refresh_seconds: float = PATIENT_INDEX_REFRESH_SECONDS,
+        full_reload_seconds: float = PATIENT_INDEX_FULL_RELOAD_SECONDS,
+        max_patients: int = PATIENT_INDEX_MAX_PATIENTS
+    ):
+        self.database = database
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_seconds = full_reload_seconds
+        self.max_patients = max_patients
+        self.disabled = False
+        self._reset()
+    
+    def _reset(self) -> None:
+        self.patients: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, IndexedPatientKeys] = {}
+        # Identifiers are nearly unique, so postings are tuples rather than sets
+        self._by_identifier: Dict[str, Dict[str, Tuple[str, ...]]] = {"cedula": {}, "email": {}, "phone": {}}
+        self._by_trigram: Dict[str, Set[str]] = {}
+        self.watermark: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+    
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+    
+    def _load_rows(self, watermark: Optional[float] = None) -> int:
+        """Read patients (all, or those updated since watermark) page by page into the index."""
+        sql = f"""
+        SELECT {PATIENT_RESULT_COLUMNS}, EXTRACT(EPOCH FROM updated_at)::float8 AS updated_epoch
+        FROM patients
+        """
+        parameters = []
+        if watermark is not None:
+            sql += " WHERE updated_at >= to_timestamp(:watermark)"
+            parameters.append(self.database.create_parameter(
+                'watermark', watermark - PATIENT_INDEX_REFRESH_OVERLAP_SECONDS, 'double'
+            ))
+        
+        count = 0
+        for row in self.database.iter_query(sql, parameters, key_column='patient_id', format='json'):
+            updated_epoch = row.pop('updated_epoch', None)
+            if updated_epoch is not None and (self.watermark is None or updated_epoch > self.watermark):
+                self.watermark = updated_epoch
+            self._add(row)
+            count += 1
+            if len(self.patients) > self.max_patients:
+                raise OverflowError(f"More than {self.max_patients} patients")
+        return count
+    
+    def _add(self, patient: Dict[str, Any]) -> None:
+        patient_id = patient['patient_id']
+        self._remove(patient_id)
+        
+        normalized = normalize_name(patient['full_name']) if patient.get('full_name') else ''
+        keys = IndexedPatientKeys(
+            cedula=normalize_cedula(patient['cedula']) if patient.get('cedula') else None,
+            email=normalize_email(patient['email']) if patient.get('email') else None,
+            phone=normalize_phone(patient['phone']) if patient.get('phone') else None,
+            name=normalized,
+            # Interned, so the index holds one copy of each distinct trigram
+            trigrams=tuple(sys.intern(trigram) for trigram in name_trigrams(normalized))
+        )
+        for identifier, postings in self._by_identifier.items():
+            value = getattr(keys, identifier)
+            if value:
+                postings[value] = postings.get(value, ()) + (patient_id,)
+        for trigram in keys.trigrams:
+            self._by_trigram.setdefault(trigram, set()).add(patient_id)
+        
+        self.patients[patient_id] = patient
+        self._keys[patient_id] = keys
+    
+    def _remove(self, patient_id: str) -> None:
+        keys = self._keys.pop(patient_id, None)
+        if keys is None:
+            return
+        self.patients.pop(patient_id, None)
+        for identifier, postings in self._by_identifier.items():
+            value = getattr(keys, identifier)
+            if value:
+                remaining = tuple(other for other in postings[value] if other != patient_id)
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    del postings[value]
+        for trigram in keys.trigrams:
+            self._by_trigram[trigram].discard(patient_id)
+    
+    def ensure_fresh(self, request_id: str = "unknown") -> bool:
+        """
+        Load or refresh the index as needed.
+        
+        Returns:
+            True if the index can serve searches
+        """
+        if self.disabled:
+            return False
+        
+        now = time.time()
+        try:
+            if not self.loaded or now - self.loaded_at >= self.full_reload_seconds:
+                self._reset()
+                count = self._load_rows()
+                self.loaded_at = self.refreshed_at = now
+                logger.info(
+                    "Patient search index loaded",
+                    request_id=request_id,
+                    patient_count=count,
+                    load_time_ms=int((time.time() - now) * 1000)
+                )
+            elif now - self.refreshed_at >= self.refresh_seconds:
+                count = self._load_rows(self.watermark)
+                self.refreshed_at = now
+                logger.debug(
+                    "Patient search index refreshed",
+                    request_id=request_id,
+                    changed_patients=count
+                )
+        except OverflowError as e:
+            logger.warning(
+                "Patient table too large for the in-memory index; using SQL searches",
+                request_id=request_id,
+                error_message=str(e)
+            )
+            self.disabled = True
+            self._reset()
+            return False
+        except DatabaseError as e:
+            logger.warning(
+                "Patient search index refresh failed; using SQL search",
+                request_id=request_id,
+                error_message=str(e),
+                error_code=e.error_code
+            )
+            if not self.loaded:
+                # Drop the rows of a partial load; an incremental failure keeps the last state
+                self._reset()
+            return False
+        
+        return True
+    
+    def _name_scores(self, name: str, candidates: Optional[Set[str]]) -> Dict[str, float]:
+        """Score candidates (or all patients) against a name like build_name_match() does."""
+        if NAME_SEARCH_MODE != 'trigram':
+            needle = name.lower()
+            scores = {}
+            for patient_id in (candidates if candidates is not None else self.patients):
+                full_name = (self.patients[patient_id].get('full_name') or '').lower()
+                if needle in full_name:
+                    scores[patient_id] = 1.0 if full_name == needle else 0.75 if full_name.startswith(needle) else 0.5
+            return scores
+        
+        normalized = normalize_name(name)
+        query_trigrams = name_trigrams(normalized)
+        
+        pool = candidates
+        if pool is None:
+            # similarity() <= shared / len(query_trigrams), so a similar name shares
+            # at least `required` trigrams and appears in one of the rarest lists
+            postings = sorted((self._by_trigram.get(trigram, set()) for trigram in query_trigrams), key=len)
+            required = max(1, math.ceil(TRIGRAM_SIMILARITY_THRESHOLD * len(query_trigrams) - 1e-9))
+            pool = set().union(*postings[:len(postings) - required + 1])
+            
+            # A substring match holds every in-word window of the query as a trigram
+            windows = [
+                self._by_trigram.get(normalized[i:i + 3], set())
+                for i in range(len(normalized) - 2)
+                if re.fullmatch(r'[^\W_]{3}', normalized[i:i + 3])
+            ]
+            if windows:
+                pool |= set.intersection(*sorted(windows, key=len))
+            else:
+                pool = self.patients
+        
+        scores = {}
+        for patient_id in pool:
+            keys = self._keys[patient_id]
+            shared = len(query_trigrams.intersection(keys.trigrams))
+            total = len(query_trigrams) + len(keys.trigrams) - shared
+            similarity = shared / total if total else 0.0
+            if similarity >= TRIGRAM_SIMILARITY_THRESHOLD or normalized in keys.name:
+                scores[patient_id] = similarity
+        return scores
+    
+    def search(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        cedula: Optional[str] = None,
+        limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index with the semantics of execute_multi_criteria_search.
+        
+        Returns:
+            Matching patients ordered by name relevance, then name length and
+            full name, like the SQL searches
+        """
+        candidates = None
+        for identifier, value in (
+            ("cedula", normalize_cedula(cedula) if cedula else None),
+            ("email", normalize_email(email) if email else None),
+            ("phone", normalize_phone(phone) if phone else None),
+        ):
+            if value:
+                matches = set(self._by_identifier[identifier].get(value, ()))
+                candidates = matches if candidates is None else candidates & matches
+        
+        if name:
+            scores = self._name_scores(name.strip(), candidates)
+        else:
+            scores = dict.fromkeys(candidates or (), 0.0)
+        
+        def rank(patient_id):
+            full_name = self.patients[patient_id].get('full_name') or ''
+            return -scores[patient_id], len(full_name), full_name
+        
+        ranked = heapq.nsmallest(limit, scores, key=rank)
+        return [dict(self.patients[patient_id]) for patient_id in ranked]
+
+
+_patient_index: Optional[PatientSearchIndex] = None
+
+
+def get_patient_index() -> Optional[PatientSearchIndex]:
+    """Return the container's patient index, or None when PATIENT_INDEX_ENABLED is off."""
+    global _patient_index
+    if not PATIENT_INDEX_ENABLED:
+        return None
+    if _patient_index is None:
+        _patient_index = PatientSearchIndex(db_manager)
+    return _patient_index
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for patient lookup requests with comprehensive error handling.
@@ -309,6 +663,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             action=action
         )
 
+        try:
+            fields = select_fields(
+                mcp_projection_params(event), PATIENT_FIELDS, PATIENT_COMPACT_FIELDS,
+                required=["patient_id", "full_name"]
+            )
+        except ValueError as e:
+            return create_enhanced_error_response(400, str(e), "INVALID_FIELDS", request_id, start_time)
+
         # Route to appropriate handler with enhanced error handling
         if action == "search_patient":
             search_criteria = event.get("search_criteria", {})
@@ -317,7 +679,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 request_id=request_id,
                 criteria_keys=list(search_criteria.keys()) if isinstance(search_criteria, dict) else "invalid"
             )
-            return handle_search_patient(search_criteria, request_id)
+            return handle_search_patient(search_criteria, request_id, fields)
             
         elif action == "list_recent_patients":
             limit = event.get("limit", 5)
@@ -326,7 +688,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 request_id=request_id,
                 limit=limit
             )
-            return handle_list_recent_patients(limit, request_id)
+            return handle_list_recent_patients(limit, request_id, fields)
             
         elif action == "get_patient_by_id":
             patient_id = event.get("patient_id")
@@ -335,17 +697,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 request_id=request_id,
                 patient_id_provided=bool(patient_id)
             )
-            return handle_get_patient_by_id(patient_id, request_id)
+            return handle_get_patient_by_id(patient_id, request_id, fields)
+            
+        elif action == "search_patients_batch":
+            searches = event.get("searches", [])
+            logger.debug(
+                "Routing to search_patients_batch handler",
+                request_id=request_id,
+                search_count=len(searches) if isinstance(searches, list) else "invalid"
+            )
+            return handle_search_patients_batch(searches, request_id, fields)
+            
+        elif action == "patient_summary":
+            patient_id = event.get("patient_id")
+            limit = event.get("limit", DEFAULT_SUMMARY_LIMIT)
+            logger.debug(
+                "Routing to patient_summary handler",
+                request_id=request_id,
+                patient_id_provided=bool(patient_id),
+                limit=limit
+            )
+            return handle_patient_summary(patient_id, limit, request_id, fields)
         else:
             logger.error(
                 "Invalid action requested",
                 request_id=request_id,
                 action=action,
-                valid_actions=["search_patient", "list_recent_patients", "get_patient_by_id"]
+                valid_actions=["search_patient", "search_patients_batch", "list_recent_patients", "get_patient_by_id", "patient_summary"]
             )
             return create_enhanced_error_response(
                 400, 
-                f"Invalid action: {action}. Valid actions are: search_patient, list_recent_patients, get_patient_by_id", 
+                f"Invalid action: {action}. Valid actions are: search_patient, search_patients_batch, list_recent_patients, get_patient_by_id, patient_summary", 
                 "INVALID_ACTION",
                 request_id,
                 start_time
@@ -382,7 +764,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
 
-def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "unknown") -> Dict[str, Any]:
+def handle_search_patient(
+    search_criteria: Dict[str, Any],
+    request_id: str = "unknown",
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Handle patient search based on various criteria with comprehensive error handling.
 
@@ -393,6 +779,7 @@ def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "un
                         - phone: Phone number for exact matching
                         - cedula: National ID for exact matching
                         - limit: Maximum results (default: 3, max: 10)
+        fields: Patient fields to return (default: all)
 
     Returns:
         Dict containing the response with patients array and search metadata
@@ -529,13 +916,23 @@ def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "un
                 active_criteria=active_criteria,
                 search_limit=limit
             )
-            patients = execute_multi_criteria_search(name, email, phone, cedula, limit, request_id)
+            patients = []
+            search_source = "database"
+            patient_index = get_patient_index()
+            if patient_index and patient_index.ensure_fresh(request_id):
+                patients = patient_index.search(name, email, phone, cedula, limit)
+                if patients:
+                    search_source = "memory"
+            
+            if not patients:
+                patients = execute_multi_criteria_search(name, email, phone, cedula, limit, request_id)
             
             logger.info(
                 "Patient search completed successfully",
                 request_id=request_id,
                 results_count=len(patients),
-                criteria_used=active_criteria
+                criteria_used=active_criteria,
+                search_source=search_source
             )
             
         except DatabaseError as e:
@@ -579,6 +976,7 @@ def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "un
             "execution_time_ms": execution_time_ms,
             "query_type": "multi_criteria" if len(active_criteria) > 1 else "single_criteria",
             "limit_applied": limit,
+            "search_source": search_source,
             "request_id": request_id
         }
 
@@ -606,7 +1004,7 @@ def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "un
             
             return create_response(200, {
                 "success": True,
-                "patients": patients,
+                "patients": project_patients(patients, fields),
                 "search_metadata": search_metadata,
                 "message": message
             })
@@ -660,12 +1058,371 @@ def handle_search_patient(search_criteria: Dict[str, Any], request_id: str = "un
         )
 
 
-def handle_list_recent_patients(limit: int = 5, request_id: str = "unknown") -> Dict[str, Any]:
+def handle_search_patients_batch(
+    searches: Any,
+    request_id: str = "unknown",
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Resolve several patient searches in one invocation.
+    
+    Exact identifiers (patient_id, cedula, email, phone) are resolved with one
+    indexed "= ANY" query per identifier type, and all name-only searches run in
+    a single set-based query. As in search_patient, the criteria of one
+    search are combined with AND: when a search has identifiers and a name,
+    the identifier matches are narrowed by the same name condition (one more
+    set-based query for the whole batch) and ranked by name relevance.
+    
+    Args:
+        searches: List of criteria objects (name, email, phone, cedula, patient_id, limit)
+        fields: Patient fields to return (default: all)
+        
+    Returns:
+        Dict containing per-search results keyed by input index
+    """
+    start_time = time.time()
+    
+    try:
+        if not isinstance(searches, list) or not searches:
+            return create_enhanced_error_response(
+                400,
+                "searches must be a non-empty list of search criteria",
+                "INVALID_BATCH",
+                request_id,
+                start_time
+            )
+        
+        if len(searches) > MAX_BATCH_SEARCHES:
+            return create_enhanced_error_response(
+                400,
+                f"A batch can contain at most {MAX_BATCH_SEARCHES} searches",
+                "BATCH_TOO_LARGE",
+                request_id,
+                start_time
+            )
+        
+        # Validate every search; invalid ones get an error entry and are not executed
+        results = {}
+        prepared = {}
+        for index, criteria in enumerate(searches):
+            errors = []
+            sanitized = {}
+            if not isinstance(criteria, dict) or not criteria:
+                errors.append("Search criteria must be a non-empty object")
+            else:
+                validation_result = validate_search_input(
+                    name=criteria.get("name"),
+                    email=criteria.get("email"),
+                    phone=criteria.get("phone"),
+                    cedula=criteria.get("cedula"),
+                    limit=criteria.get("limit"),
+                    request_id=request_id
+                )
+                errors.extend(validation_result["errors"])
+                sanitized = validation_result["sanitized"]
+                
+                patient_id = criteria.get("patient_id")
+                if patient_id is not None:
+                    if not isinstance(patient_id, str) or not patient_id.strip():
+                        errors.append("Patient ID must be a non-empty string")
+                    elif len(patient_id.strip()) > 50:
+                        errors.append("Patient ID is too long (max 50 characters)")
+                    else:
+                        sanitized["patient_id"] = patient_id.strip()
+                
+                if not errors and "name" not in sanitized and not any(
+                    identifier in sanitized for identifier in BATCH_IDENTIFIER_EXPRESSIONS
+                ):
+                    errors.append("At least one search criterion must be provided")
+            
+            if errors:
+                results[str(index)] = {"success": False, "patients": [], "errors": errors}
+            else:
+                prepared[index] = sanitized
+        
+        identifier_matches = resolve_identifiers_batch(prepared, request_id)
+        name_matches = search_names_batch(
+            {
+                index: criteria for index, criteria in prepared.items()
+                if not any(identifier in criteria for identifier in BATCH_IDENTIFIER_EXPRESSIONS)
+            },
+            request_id
+        )
+        
+        identifier_results = {}
+        for index, criteria in prepared.items():
+            identifiers = [identifier for identifier in BATCH_IDENTIFIER_EXPRESSIONS if identifier in criteria]
+            if not identifiers:
+                continue
+            patients = identifier_matches[identifiers[0]].get(criteria[identifiers[0]], [])
+            for identifier in identifiers[1:]:
+                matching_ids = {
+                    patient["patient_id"]
+                    for patient in identifier_matches[identifier].get(criteria[identifier], [])
+                }
+                patients = [patient for patient in patients if patient["patient_id"] in matching_ids]
+            identifier_results[index] = patients
+        
+        name_scores = match_names_batch(
+            {
+                index: (prepared[index]["name"], [patient["patient_id"] for patient in patients])
+                for index, patients in identifier_results.items()
+                if "name" in prepared[index] and patients
+            },
+            request_id
+        )
+        
+        for index, criteria in prepared.items():
+            limit = criteria.get("limit", DEFAULT_SEARCH_LIMIT)
+            
+            if index in identifier_results:
+                criteria_used = [identifier for identifier in BATCH_IDENTIFIER_EXPRESSIONS if identifier in criteria]
+                patients = identifier_results[index]
+                if "name" in criteria:
+                    criteria_used.append("name")
+                    scores = name_scores.get(index, {})
+                    patients = sorted(
+                        (patient for patient in patients if patient["patient_id"] in scores),
+                        key=lambda patient: (-scores[patient["patient_id"]], patient["full_name"])
+                    )
+            else:
+                criteria_used = ["name"]
+                patients = name_matches.get(index, [])
+            
+            results[str(index)] = {
+                "success": True,
+                "patients": project_patients(patients[:limit], fields),
+                "criteria_used": criteria_used
+            }
+        
+        results = {str(index): results[str(index)] for index in range(len(searches))}
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        found = sum(1 for result in results.values() if result["patients"])
+        
+        logger.info(
+            "Batch patient search completed",
+            request_id=request_id,
+            search_count=len(searches),
+            searches_with_matches=found,
+            invalid_searches=len(searches) - len(prepared),
+            execution_time_ms=execution_time_ms
+        )
+        
+        return create_response(200, {
+            "success": True,
+            "results": results,
+            "search_metadata": {
+                "criteria_used": sorted({
+                    criterion for result in results.values() for criterion in result.get("criteria_used", [])
+                }),
+                "total_results": sum(len(result["patients"]) for result in results.values()),
+                "search_timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "execution_time_ms": execution_time_ms,
+                "query_type": "batch",
+                "request_id": request_id
+            },
+            "message": f"Found matches for {found} of {len(searches)} searches"
+        })
+    
+    except DatabaseError as e:
+        logger.error(
+            "Database error in handle_search_patients_batch",
+            request_id=request_id,
+            error_message=str(e),
+            error_code=e.error_code
+        )
+        return create_enhanced_error_response(
+            500,
+            f"Database error: {str(e)}",
+            e.error_code or "DATABASE_ERROR",
+            request_id,
+            start_time,
+            {"error_type": "database_error"}
+        )
+    
+    except Exception as e:
+        logger.error(
+            "Unexpected error in handle_search_patients_batch",
+            request_id=request_id,
+            error_message=str(e),
+            error_type=type(e).__name__
+        )
+        return create_enhanced_error_response(
+            500,
+            f"Batch search failed: {str(e)}",
+            "SEARCH_ERROR",
+            request_id,
+            start_time,
+            {"error_type": "unexpected_error"}
+        )
+
+
+def resolve_identifiers_batch(
+    prepared: Dict[int, Dict[str, Any]],
+    request_id: str = "unknown"
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Look up all exact identifiers of a batch with one query per identifier type.
+    
+    Args:
+        prepared: Sanitized criteria keyed by input index
+        
+    Returns:
+        Matching patients per identifier type and normalized value
+        
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    matches = {}
+    for identifier, expression in BATCH_IDENTIFIER_EXPRESSIONS.items():
+        values = sorted({criteria[identifier] for criteria in prepared.values() if identifier in criteria})
+        if not values:
+            continue
+        
+        # The Data API has no array parameters: values travel as a JSON array
+        sql = f"""
+        SELECT {expression} AS lookup_key, {PATIENT_RESULT_COLUMNS}
+        FROM patients
+        WHERE {expression} = ANY(ARRAY(SELECT jsonb_array_elements_text(CAST(:lookup_values AS jsonb))))
+        ORDER BY full_name
+        """
+        parameters = [db_manager.create_parameter('lookup_values', json.dumps(values), 'string')]
+        
+        grouped = {}
+        for patient in db_manager.execute_query(sql, parameters, format='json'):
+            grouped.setdefault(patient.pop('lookup_key'), []).append(patient)
+        matches[identifier] = grouped
+        
+        logger.debug(
+            "Resolved batch identifiers",
+            request_id=request_id,
+            identifier=identifier,
+            value_count=len(values),
+            matched_values=len(grouped)
+        )
+    
+    return matches
+
+
+def search_names_batch(
+    name_searches: Dict[int, Dict[str, Any]],
+    request_id: str = "unknown"
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Run several name searches in one query, one LATERAL subquery per name.
+    
+    Args:
+        name_searches: Sanitized criteria with a name, keyed by input index
+        
+    Returns:
+        Matching patients per input index, ordered by relevance
+        
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    if not name_searches:
+        return {}
+    
+    name_condition, name_score = build_name_match('q.search_name')
+    sql = f"""
+    SELECT q.search_index, matches.*
+    FROM jsonb_to_recordset(CAST(:name_searches AS jsonb))
+        AS q(search_index INTEGER, search_name TEXT, search_limit INTEGER)
+    CROSS JOIN LATERAL (
+        SELECT {PATIENT_RESULT_COLUMNS}, {name_score} AS match_score
+        FROM patients
+        WHERE {name_condition}
+        ORDER BY match_score DESC, LENGTH(full_name), full_name
+        LIMIT q.search_limit
+    ) AS matches
+    ORDER BY q.search_index, matches.match_score DESC, LENGTH(matches.full_name), matches.full_name
+    """
+    payload = [
+        {
+            "search_index": index,
+            "search_name": criteria["name"],
+            "search_limit": criteria.get("limit", DEFAULT_SEARCH_LIMIT)
+        }
+        for index, criteria in name_searches.items()
+    ]
+    parameters = [db_manager.create_parameter('name_searches', json.dumps(payload), 'string')]
+    
+    matches = {}
+    for row in db_manager.execute_query(sql, parameters, format='json'):
+        index = row.pop('search_index')
+        row.pop('match_score', None)
+        matches.setdefault(index, []).append(row)
+    
+    logger.debug(
+        "Batch name search completed",
+        request_id=request_id,
+        name_count=len(name_searches),
+        names_with_matches=len(matches)
+    )
+    return matches
+
+
+def match_names_batch(
+    candidates: Dict[int, Tuple[str, List[str]]],
+    request_id: str = "unknown"
+) -> Dict[int, Dict[str, float]]:
+    """
+    Check the name of searches that also have identifiers, in one query.
+    
+    Applies the name condition of search_patient to the patients the
+    identifiers matched.
+    
+    Args:
+        candidates: (name, matched patient IDs) keyed by input index
+        
+    Returns:
+        Name relevance score per patient ID that matches the name, keyed by input index
+        
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    if not candidates:
+        return {}
+    
+    name_condition, name_score = build_name_match('q.search_name')
+    sql = f"""
+    SELECT q.search_index, patients.patient_id, {name_score} AS match_score
+    FROM jsonb_to_recordset(CAST(:candidates AS jsonb))
+        AS q(search_index INTEGER, candidate_id TEXT, search_name TEXT)
+    JOIN patients ON patients.patient_id = q.candidate_id
+    WHERE {name_condition}
+    """
+    payload = [
+        {"search_index": index, "candidate_id": patient_id, "search_name": name}
+        for index, (name, patient_ids) in candidates.items()
+        for patient_id in patient_ids
+    ]
+    parameters = [db_manager.create_parameter('candidates', json.dumps(payload), 'string')]
+    
+    scores = {}
+    for row in db_manager.execute_query(sql, parameters, format='json'):
+        scores.setdefault(row['search_index'], {})[row['patient_id']] = float(row['match_score'] or 0)
+    
+    logger.debug(
+        "Batch identifier name check completed",
+        request_id=request_id,
+        candidate_count=len(payload),
+        searches_with_matches=len(scores)
+    )
+    return scores
+
+
+def handle_list_recent_patients(
+    limit: int = 5,
+    request_id: str = "unknown",
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Handle listing recent patients.
 
     Args:
         limit: Maximum number of patients to return
+        fields: Patient fields to return (default: all)
 
     Returns:
         Dict containing the response with consistent format
@@ -715,7 +1472,7 @@ def handle_list_recent_patients(limit: int = 5, request_id: str = "unknown") ->
 
         return create_response(200, {
             "success": True,
-            "patients": patients,
+            "patients": project_patients(patients, fields),
             "search_metadata": search_metadata,
             "message": f"Found {len(patients)} recent patients"
         })
@@ -750,12 +1507,17 @@ def handle_list_recent_patients(limit: int = 5, request_id: str = "unknown") ->
         )
 
 
-def handle_get_patient_by_id(patient_id: str, request_id: str = "unknown") -> Dict[str, Any]:
+def handle_get_patient_by_id(
+    patient_id: str,
+    request_id: str = "unknown",
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Handle getting patient by exact ID.
 
     Args:
         patient_id: The patient ID
+        fields: Patient fields to return (default: all)
 
     Returns:
         Dict containing the response with consistent format
@@ -835,7 +1597,7 @@ def handle_get_patient_by_id(patient_id: str, request_id: str = "unknown") -> Di
             
             return create_response(200, {
                 "success": True,
-                "patients": [patient],
+                "patients": project_patients([patient], fields),
                 "search_metadata": search_metadata,
                 "message": f"Patient found: {patient['full_name']}"
             })
@@ -883,6 +1645,273 @@ def handle_get_patient_by_id(patient_id: str, request_id: str = "unknown") -> Di
         )
 
 
+def handle_patient_summary(
+    patient_id: str,
+    limit: Any = DEFAULT_SUMMARY_LIMIT,
+    request_id: str = "unknown",
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Handle the patient_summary action: the patient with their upcoming and
+    recent reservations and processed documents, in one database round trip.
+
+    Args:
+        patient_id: The patient ID
+        limit: Maximum rows per section (default 5, max 10)
+        fields: Patient fields to return (default: all)
+
+    Returns:
+        Dict containing the response with consistent format
+    """
+    start_time = time.time()
+    
+    try:
+        if not isinstance(patient_id, str) or not patient_id.strip():
+            return create_enhanced_error_response(
+                400,
+                "Patient ID is required",
+                "MISSING_PATIENT_ID",
+                request_id,
+                start_time
+            )
+        patient_id = patient_id.strip()
+        
+        try:
+            limit = min(max(1, int(limit)), MAX_SUMMARY_LIMIT)
+        except (ValueError, TypeError):
+            limit = DEFAULT_SUMMARY_LIMIT
+        
+        summary = get_patient_summary(patient_id, limit)
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        
+        search_metadata = {
+            "criteria_used": ["patient_id"],
+            "total_results": 1 if summary else 0,
+            "search_timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "execution_time_ms": execution_time_ms,
+            "request_id": request_id
+        }
+        
+        if not summary:
+            logger.info(
+                "No patient found for summary",
+                request_id=request_id,
+                execution_time_ms=execution_time_ms
+            )
+            return create_response(200, {
+                "success": True,
+                "patients": [],
+                "search_metadata": search_metadata,
+                "message": f"No patient found with ID: {patient_id}"
+            })
+        
+        logger.info(
+            "Patient summary built",
+            request_id=request_id,
+            upcoming_reservations=len(summary["upcoming_reservations"]),
+            recent_reservations=len(summary["recent_reservations"]),
+            documents=len(summary["documents"]),
+            execution_time_ms=execution_time_ms
+        )
+        
+        return create_response(200, {
+            "success": True,
+            "patients": project_patients([summary.pop("patient")], fields),
+            "summary": summary,
+            "search_metadata": search_metadata,
+            "message": f"Summary for patient {patient_id}"
+        })
+    
+    except DatabaseError as e:
+        logger.error(
+            "Database error in handle_patient_summary",
+            request_id=request_id,
+            error_message=str(e),
+            error_code=e.error_code
+        )
+        return create_enhanced_error_response(
+            500,
+            f"Database error: {str(e)}",
+            e.error_code or "DATABASE_ERROR",
+            request_id,
+            start_time
+        )
+    except Exception as e:
+        logger.error(
+            "Unexpected error in handle_patient_summary",
+            request_id=request_id,
+            error_message=str(e),
+            error_type=type(e).__name__
+        )
+        return create_enhanced_error_response(
+            500,
+            f"Patient summary error: {str(e)}",
+            "GET_ERROR",
+            request_id,
+            start_time
+        )
+
+
+def project_patients(patients: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Keep only the requested fields of each patient (all fields when fields is None)."""
+    if fields is None:
+        return patients
+    return [{field: patient[field] for field in fields if field in patient} for patient in patients]
+
+
+def get_patient_summary(patient_id: str, limit: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the patient summary as a single JSON document.
+    
+    Each section is capped at `limit` rows and only carries the fields an
+    agent needs: the patient's JSONB columns (medical_history, lab_results,
+    address) and the documents' extracted_data are left out, and reservation
+    notes are truncated. Upcoming reservations are scheduled or confirmed ones
+    from now on (soonest first); recent ones are any status before now (latest
+    first). The counts give the uncapped size of every section.
+
+    Args:
+        patient_id: The patient ID
+        limit: Maximum rows per section
+
+    Returns:
+        Dict with patient, upcoming_reservations, recent_reservations,
+        documents and counts, or None if the patient does not exist
+        
+    Raises:
+        DatabaseError: If the query fails
+    """
+    reservation_object = """json_build_object(
+            'reservation_id', r.reservation_id,
+            'appointment_date', r.reservation_date || ' ' || r.reservation_time::text,
+            'status', r.status,
+            'medic_id', r.medic_id,
+            'medic_name', m.first_name,
+            'specialization', m.specialization,
+            'exam_id', r.exam_id,
+            'exam_name', e.exam_name,
+            'notes', left(r.notes, :notes_length)
+        )"""
+    
+    sql = f"""
+    WITH patient AS (
+        SELECT {PATIENT_RESULT_COLUMNS}
+        FROM patients
+        WHERE patient_id = :patient_id
+    ),
+    patient_reservations AS (
+        SELECT
+            reservation_id, medic_id, exam_id, reservation_date, reservation_time, status, notes,
+            reservation_date + reservation_time >= (now() AT TIME ZONE :timezone) AS is_upcoming
+        FROM reservations
+        WHERE patient_id = :patient_id
+    ),
+    upcoming AS (
+        SELECT * FROM patient_reservations
+        WHERE is_upcoming AND status IN ('scheduled', 'confirmed')
+        ORDER BY reservation_date, reservation_time, reservation_id
+        LIMIT :section_limit
+    ),
+    recent AS (
+        SELECT * FROM patient_reservations
+        WHERE NOT is_upcoming
+        ORDER BY reservation_date DESC, reservation_time DESC, reservation_id DESC
+        LIMIT :section_limit
+    ),
+    documents AS (
+        SELECT document_id, s3_uri, processing_date
+        FROM processed_documents
+        WHERE patient_id = :patient_id
+        ORDER BY processing_date DESC
+        LIMIT :section_limit
+    )
+    SELECT json_build_object(
+        'patient', (SELECT row_to_json(p) FROM patient p),
+        'upcoming_reservations', COALESCE((
+            SELECT json_agg({reservation_object} ORDER BY r.reservation_date, r.reservation_time, r.reservation_id)
+            FROM upcoming r
+            LEFT JOIN medics m ON r.medic_id = m.medic_id
+            LEFT JOIN exams e ON r.exam_id = e.exam_id
+        ), '[]'::json),
+        'recent_reservations', COALESCE((
+            SELECT json_agg({reservation_object} ORDER BY r.reservation_date DESC, r.reservation_time DESC, r.reservation_id DESC)
+            FROM recent r
+            LEFT JOIN medics m ON r.medic_id = m.medic_id
+            LEFT JOIN exams e ON r.exam_id = e.exam_id
+        ), '[]'::json),
+        'documents', COALESCE((
+            SELECT json_agg(d ORDER BY d.processing_date DESC) FROM documents d
+        ), '[]'::json),
+        'counts', json_build_object(
+            'upcoming_reservations', (
+                SELECT COUNT(*) FROM patient_reservations
+                WHERE is_upcoming AND status IN ('scheduled', 'confirmed')
+            ),
+            'recent_reservations', (SELECT COUNT(*) FROM patient_reservations WHERE NOT is_upcoming),
+            'documents', (SELECT COUNT(*) FROM processed_documents WHERE patient_id = :patient_id)
+        )
+    ) AS summary
+    """
+    
+    parameters = [
+        db_manager.create_parameter('patient_id', patient_id, 'string'),
+        db_manager.create_parameter('timezone', CLINIC_TIMEZONE, 'string'),
+        db_manager.create_parameter('section_limit', limit, 'long'),
+        db_manager.create_parameter('notes_length', SUMMARY_NOTES_MAX_LENGTH, 'long')
+    ]
+    
+    rows = db_manager.execute_query(sql, parameters, format='json', json_columns=['summary'])
+    summary = rows[0]['summary'] if rows else None
+    if not summary or not summary.get('patient'):
+        return None
+    return summary
+
+
+def build_name_match(name_sql: str, mode: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Build the WHERE condition and relevance score comparing full_name to a name.
+    
+    Args:
+        name_sql: SQL expression holding the searched name (placeholder or column)
+        mode: 'trigram' or 'like'; defaults to NAME_SEARCH_MODE
+        
+    Returns:
+        Tuple of (condition SQL, relevance score SQL between 0 and 1)
+    """
+    if (mode or NAME_SEARCH_MODE) == 'trigram':
+        # normalize_name() and idx_patients_full_name_trgm come from migration 0003;
+        # both branches of the condition are served by the same GIN trigram index
+        condition = (
+            f"(normalize_name(full_name) % normalize_name({name_sql}) "
+            f"OR normalize_name(full_name) LIKE '%' || normalize_name({name_sql}) || '%')"
+        )
+        score = f"similarity(normalize_name(full_name), normalize_name({name_sql}))"
+        return condition, score
+
+    condition = f"LOWER(full_name) LIKE '%' || LOWER({name_sql}) || '%'"
+    score = (
+        f"CASE WHEN LOWER(full_name) = LOWER({name_sql}) THEN 1.0 "
+        f"WHEN LOWER(full_name) LIKE LOWER({name_sql}) || '%' THEN 0.75 "
+        "ELSE 0.5 END"
+    )
+    return condition, score
+
+
+def build_name_search(name: str, mode: Optional[str] = None) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """
+    Build the WHERE condition, relevance score and parameters for a name search.
+    
+    Args:
+        name: Name to search for (already stripped)
+        mode: 'trigram' or 'like'; defaults to NAME_SEARCH_MODE
+        
+    Returns:
+        Tuple of (condition SQL, relevance score SQL, parameters)
+    """
+    condition, score = build_name_match(':search_name', mode)
+    return condition, score, [db_manager.create_parameter('search_name', name, 'string')]
+
+
 def execute_multi_criteria_search(
     name: Optional[str] = None,
     email: Optional[str] = None,
@@ -921,25 +1950,33 @@ def execute_multi_criteria_search(
         where_conditions = []
         parameters = []
         
+        # Exact criteria compare normalized values against the expression
+        # indexes from migration 0004, so each one is a single index probe
+        cedula = normalize_cedula(cedula) if cedula else None
+        email = normalize_email(email) if email else None
+        phone = normalize_phone(phone) if phone else None
+        
         # 1. Cedula condition (most selective - unique identifier)
         if cedula:
-            where_conditions.append("cedula = :cedula")
-            parameters.append(db_manager.create_parameter('cedula', cedula.strip(), 'string'))
+            where_conditions.append("normalize_cedula(cedula) = :cedula")
+            parameters.append(db_manager.create_parameter('cedula', cedula, 'string'))
         
         # 2. Email condition (highly selective - should be unique)
         if email:
-            where_conditions.append("LOWER(email) = LOWER(:email)")
-            parameters.append(db_manager.create_parameter('email', email.strip(), 'string'))
+            where_conditions.append("LOWER(email) = :email")
+            parameters.append(db_manager.create_parameter('email', email, 'string'))
         
         # 3. Phone condition (moderately selective)
         if phone:
-            where_conditions.append("phone = :phone")
-            parameters.append(db_manager.create_parameter('phone', phone.strip(), 'string'))
+            where_conditions.append("normalize_phone(phone) = :phone")
+            parameters.append(db_manager.create_parameter('phone', phone, 'string'))
         
         # 4. Name condition (least selective - fuzzy matching)
+        name_score = "NULL::real"
         if name:
-            where_conditions.append("LOWER(full_name) LIKE LOWER(:name_pattern)")
-            parameters.append(db_manager.create_parameter('name_pattern', f"%{name.strip()}%", 'string'))
+            name_condition, name_score, name_parameters = build_name_search(name.strip())
+            where_conditions.append(name_condition)
+            parameters.extend(name_parameters)
         
         # Build the complete SQL query with optimized ordering
         sql = f"""
@@ -956,24 +1993,21 @@ def execute_multi_criteria_search(
         WHERE {' AND '.join(where_conditions)}
         ORDER BY 
             CASE 
-                WHEN cedula = :order_cedula THEN 1
-                WHEN LOWER(email) = LOWER(:order_email) THEN 2
-                WHEN phone = :order_phone THEN 3
-                WHEN LOWER(full_name) = LOWER(:order_exact_name) THEN 4
-                WHEN LOWER(full_name) LIKE LOWER(:order_name_starts) THEN 5
-                ELSE 6
+                WHEN normalize_cedula(cedula) = :order_cedula THEN 1
+                WHEN LOWER(email) = :order_email THEN 2
+                WHEN normalize_phone(phone) = :order_phone THEN 3
+                ELSE 4
             END,
+            {name_score} DESC,
             full_name ASC
         LIMIT :limit
         """
         
         # Add ordering parameters (use provided values or empty strings for non-provided criteria)
         parameters.extend([
-            db_manager.create_parameter('order_cedula', cedula.strip() if cedula else '', 'string'),
-            db_manager.create_parameter('order_email', email.strip() if email else '', 'string'),
-            db_manager.create_parameter('order_phone', phone.strip() if phone else '', 'string'),
-            db_manager.create_parameter('order_exact_name', name.strip() if name else '', 'string'),
-            db_manager.create_parameter('order_name_starts', f"{name.strip()}%" if name else '', 'string'),
+            db_manager.create_parameter('order_cedula', cedula or '', 'string'),
+            db_manager.create_parameter('order_email', email or '', 'string'),
+            db_manager.create_parameter('order_phone', phone or '', 'string'),
             db_manager.create_parameter('limit', limit, 'long')
         ])
         
@@ -986,7 +2020,7 @@ def execute_multi_criteria_search(
         
         # Execute query with comprehensive error handling
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             # Re-raise database errors with additional context
             logger.error(
@@ -1001,11 +2035,8 @@ def execute_multi_criteria_search(
                 e.original_error
             )
         
-        records = response.get('records', [])
-        
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 logger.info(
                     "Multi-criteria search found patients",
                     request_id=request_id,
@@ -1081,9 +2112,9 @@ def search_by_phone(phone: str, request_id: str = "unknown") -> Optional[Dict[st
             )
             return None
         
-        phone = phone.strip()
+        phone = normalize_phone(phone)
         
-        # Optimized query with index hint (assuming phone has an index)
+        # Single probe of idx_patients_phone_normalized
         sql = """
         SELECT 
             patient_id, 
@@ -1095,7 +2126,7 @@ def search_by_phone(phone: str, request_id: str = "unknown") -> Optional[Dict[st
             created_at, 
             updated_at
         FROM patients
-        WHERE phone = :phone
+        WHERE normalize_phone(phone) = :phone
         LIMIT 1
         """
 
@@ -1110,7 +2141,7 @@ def search_by_phone(phone: str, request_id: str = "unknown") -> Optional[Dict[st
         )
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(
                 "Database query failed for phone search",
@@ -1124,11 +2155,8 @@ def search_by_phone(phone: str, request_id: str = "unknown") -> Optional[Dict[st
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 if patients and patients[0]:
                     logger.info(
                         "Found patient by phone",
@@ -1191,10 +2219,10 @@ def search_by_cedula(cedula: str, request_id: str = "unknown") -> Optional[Dict[
             )
             return None
         
-        cedula = cedula.strip()
+        cedula = normalize_cedula(cedula)
         
         # Basic cedula format validation (assuming numeric format)
-        if not cedula.replace('-', '').replace('.', '').isdigit():
+        if not cedula.isdigit():
             logger.warning(
                 "Invalid cedula format provided",
                 request_id=request_id,
@@ -1214,7 +2242,7 @@ def search_by_cedula(cedula: str, request_id: str = "unknown") -> Optional[Dict[
             created_at, 
             updated_at
         FROM patients
-        WHERE cedula = :cedula
+        WHERE normalize_cedula(cedula) = :cedula
         LIMIT 1
         """
 
@@ -1229,7 +2257,7 @@ def search_by_cedula(cedula: str, request_id: str = "unknown") -> Optional[Dict[
         )
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(f"Database query failed for cedula search: {e}")
             raise DatabaseError(
@@ -1238,11 +2266,8 @@ def search_by_cedula(cedula: str, request_id: str = "unknown") -> Optional[Dict[
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 if patients and patients[0]:
                     logger.info(f"Found patient by cedula: {patients[0].get('full_name', 'Unknown')}")
                     return patients[0]
@@ -1309,7 +2334,7 @@ def search_by_patient_id(patient_id: str, request_id: str = "unknown") -> Option
         logger.debug(f"Searching patient by ID: {patient_id}")
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(f"Database query failed for patient ID search: {e}")
             raise DatabaseError(
@@ -1318,11 +2343,8 @@ def search_by_patient_id(patient_id: str, request_id: str = "unknown") -> Option
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 if patients and patients[0]:
                     logger.info(f"Found patient by ID: {patients[0].get('full_name', 'Unknown')}")
                     return patients[0]
@@ -1364,14 +2386,14 @@ def search_by_email(email: str, request_id: str = "unknown") -> Optional[Dict[st
             logger.warning("Empty email provided to search_by_email")
             return None
         
-        email = email.strip().lower()
+        email = normalize_email(email)
         
         # Basic email format validation
         if '@' not in email or '.' not in email.split('@')[-1]:
             logger.warning(f"Invalid email format: {email}")
             return None
         
-        # Optimized query (email should be unique and indexed)
+        # Single probe of idx_patients_email_lower
         sql = """
         SELECT 
             patient_id, 
@@ -1383,7 +2405,7 @@ def search_by_email(email: str, request_id: str = "unknown") -> Optional[Dict[st
             created_at, 
             updated_at
         FROM patients
-        WHERE LOWER(email) = LOWER(:email)
+        WHERE LOWER(email) = :email
         LIMIT 1
         """
 
@@ -1394,7 +2416,7 @@ def search_by_email(email: str, request_id: str = "unknown") -> Optional[Dict[st
         logger.debug(f"Searching patient by email: {email.split('@')[0][:3]}***@{email.split('@')[1]}")
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(f"Database query failed for email search: {e}")
             raise DatabaseError(
@@ -1403,11 +2425,8 @@ def search_by_email(email: str, request_id: str = "unknown") -> Optional[Dict[st
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 if patients and patients[0]:
                     logger.info(f"Found patient by email: {patients[0].get('full_name', 'Unknown')}")
                     return patients[0]
@@ -1456,8 +2475,9 @@ def search_by_name(full_name: str, limit: int = DEFAULT_SEARCH_LIMIT, request_id
         # Validate limit
         limit = min(max(1, limit), MAX_SEARCH_LIMIT)
         
-        # Single optimized query with comprehensive relevance scoring
-        sql = """
+        # Single query ranked by name relevance (similarity in trigram mode)
+        name_condition, name_score, parameters = build_name_search(full_name)
+        sql = f"""
         SELECT 
             patient_id, 
             full_name, 
@@ -1467,37 +2487,22 @@ def search_by_name(full_name: str, limit: int = DEFAULT_SEARCH_LIMIT, request_id
             date_of_birth, 
             created_at, 
             updated_at,
-            CASE 
-                WHEN LOWER(full_name) = LOWER(:exact_name) THEN 1
-                WHEN LOWER(full_name) LIKE LOWER(:starts_with) THEN 2
-                WHEN LOWER(full_name) LIKE LOWER(:name_pattern) THEN 3
-                ELSE 4
-            END as match_priority,
+            {name_score} as match_score,
             LENGTH(full_name) as name_length
         FROM patients
-        WHERE LOWER(full_name) LIKE LOWER(:name_pattern)
+        WHERE {name_condition}
         ORDER BY 
-            match_priority ASC,
+            match_score DESC,
             name_length ASC,
             full_name ASC
         LIMIT :limit
         """
-
-        # Prepare search patterns
-        name_pattern = f"%{full_name}%"
-        starts_with = f"{full_name}%"
-
-        parameters = [
-            db_manager.create_parameter('exact_name', full_name, 'string'),
-            db_manager.create_parameter('starts_with', starts_with, 'string'),
-            db_manager.create_parameter('name_pattern', name_pattern, 'string'),
-            db_manager.create_parameter('limit', limit, 'long')
-        ]
+        parameters.append(db_manager.create_parameter('limit', limit, 'long'))
 
         logger.debug(f"Searching patients by name: '{full_name}' (limit: {limit})")
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(f"Database query failed for name search: {e}")
             raise DatabaseError(
@@ -1506,22 +2511,19 @@ def search_by_name(full_name: str, limit: int = DEFAULT_SEARCH_LIMIT, request_id
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 
                 # Remove internal scoring fields from results
                 cleaned_patients = []
                 for patient in patients:
-                    # Remove match_priority and name_length fields if present
+                    # Remove match_score and name_length fields if present
                     cleaned_patient = {k: v for k, v in patient.items() 
-                                     if k not in ['match_priority', 'name_length']}
+                                     if k not in ['match_score', 'name_length']}
                     cleaned_patients.append(cleaned_patient)
                 
                 if cleaned_patients:
-                    match_type = "exact" if patients[0].get('match_priority') == 1 else "fuzzy"
+                    match_type = "exact" if float(patients[0].get('match_score') or 0) >= 1 else "fuzzy"
                     logger.info(f"Found {len(cleaned_patients)} {match_type} matches for '{full_name}'")
                     return cleaned_patients
                     
@@ -1586,7 +2588,7 @@ def get_recent_patients(limit: int = 5, request_id: str = "unknown") -> List[Dic
         logger.debug(f"Getting recent patients (limit: {limit})")
         
         try:
-            response = db_manager.execute_sql(sql, parameters)
+            patients = db_manager.execute_query(sql, parameters, format='json')
         except DatabaseError as e:
             logger.error(f"Database query failed for recent patients: {e}")
             raise DatabaseError(
@@ -1595,11 +2597,8 @@ def get_recent_patients(limit: int = 5, request_id: str = "unknown") -> List[Dic
                 e.original_error
             )
         
-        records = response.get('records', [])
-
-        if records:
+        if patients:
             try:
-                patients = db_manager.parse_records(records, response.get('columnMetadata', []))
                 logger.info(f"Retrieved {len(patients)} recent patients")
                 return patients
             except Exception as e:
@@ -0,0 +1,257 @@
+"""
+Tests for the in-memory patient search index, the patient summary and the
+SQL patient searches.
+
+The SQL search tests use the postgres_db fixture and are skipped unless
+TEST_DATABASE_DSN is set:
+
+    TEST_DATABASE_DSN=postgresql://postgres@localhost/healthcare_test \
+        python -m pytest lambdas/patient_lookup/test_index.py -v
+"""
+
+import json
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+import patient_lookup.index as patient_lookup
+from patient_lookup.index import PatientSearchIndex, name_trigrams, normalize_name
+from shared.database import DatabaseError
+
+# The SQL searches read the patient_lookup db_manager
+DB_MANAGER_MODULES = [patient_lookup]
+
+
+class StubDatabase:
+    """DatabaseManager stand-in serving patient rows to iter_query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.error = None
+
+    def create_parameter(self, name, value, type_hint=None):
+        return {'name': name, 'value': value}
+
+    def iter_query(self, sql, parameters=None, key_column='id', format='records'):
+        self.queries.append((sql, parameters))
+        if self.error:
+            raise self.error
+        watermark = parameters[0]['value'] if parameters else None
+        for row in self.rows:
+            if watermark is None or row['updated_epoch'] >= watermark:
+                yield dict(row)
+
+
+def patient(patient_id, full_name, updated_epoch=1000.0, **fields):
+    return {'patient_id': patient_id, 'full_name': full_name, 'updated_epoch': updated_epoch, **fields}
+
+
+def build_index(rows, **options):
+    database = StubDatabase(rows)
+    index = PatientSearchIndex(database, **options)
+    assert index.ensure_fresh()
+    return database, index
+
+
+def test_normalize_name_matches_sql_normalization():
+    """Accents, case and repeated whitespace are removed like normalize_name() in SQL."""
+    assert normalize_name('  José   Ñúñez ') == 'jose nunez'
+    assert name_trigrams('ana') == {'  a', ' an', 'ana', 'na '}
+
+
+def test_exact_identifiers_use_normalized_values():
+    """Formatted cedulas, phones and mixed-case emails match the stored values."""
+    _, index = build_index([
+        patient('p-1', 'Ana Gómez', cedula='1.020.304', email='Ana@Example.com', phone='+57 312 555 0101'),
+        patient('p-2', 'Ana Gómez', cedula='99999', email='otra@example.com', phone='3125550102'),
+    ])
+
+    assert [p['patient_id'] for p in index.search(cedula='1020304')] == ['p-1']
+    assert [p['patient_id'] for p in index.search(email='ana@example.com')] == ['p-1']
+    assert [p['patient_id'] for p in index.search(phone='312 555 0102')] == ['p-2']
+    # Criteria are combined with AND
+    assert index.search(cedula='1020304', email='otra@example.com') == []
+    assert 'updated_epoch' not in index.search(cedula='99999')[0]
+
+
+def test_name_search_ranks_by_trigram_similarity():
+    """Accent-less and partial names match; the closest name comes first."""
+    _, index = build_index([
+        patient('p-1', 'José Pérez Gómez'),
+        patient('p-2', 'José Pérez'),
+        patient('p-3', 'María López'),
+    ])
+
+    assert [p['patient_id'] for p in index.search(name='jose perez')] == ['p-2', 'p-1']
+    assert [p['patient_id'] for p in index.search(name='lop')] == ['p-3']
+    assert [p['patient_id'] for p in index.search(name='jose perez', limit=1)] == ['p-2']
+
+
+def test_tied_names_rank_shorter_names_first():
+    """Equal scores are ordered by name length, then name, as in the SQL searches."""
+    _, index = build_index([
+        patient('p-1', 'José Pérez Pérez'),
+        patient('p-2', 'Pérez José'),
+        patient('p-3', 'Perez Jose'),
+    ])
+
+    assert [p['patient_id'] for p in index.search(name='jose perez')] == ['p-3', 'p-2', 'p-1']
+    assert [p['patient_id'] for p in index.search(name='jose perez', limit=1)] == ['p-3']
+
+
+def test_incremental_refresh_applies_changes():
+    """Rows updated after the watermark replace their previous identifiers."""
+    database, index = build_index([patient('p-1', 'Ana Gómez', cedula='11111')], refresh_seconds=0)
+
+    database.rows = [patient('p-1', 'Ana Gómez', updated_epoch=2000.0, cedula='22222')]
+    assert index.ensure_fresh()
+
+    sql, parameters = database.queries[-1]
+    assert 'updated_at >=' in sql and parameters[0]['value'] < 2000.0
+    assert index.search(cedula='11111') == []
+    assert [p['patient_id'] for p in index.search(cedula='22222')] == ['p-1']
+    assert index.watermark == 2000.0
+
+
+def test_failures_and_oversized_tables_fall_back_to_sql():
+    """A failed load is not served, and too many patients disable the index."""
+    database = StubDatabase([patient('p-1', 'Ana')])
+    database.error = DatabaseError('connection refused', 'DATABASE_ERROR')
+    index = PatientSearchIndex(database)
+    assert not index.ensure_fresh()
+    assert not index.loaded
+
+    database.error = None
+    assert index.ensure_fresh()
+
+    database = StubDatabase([patient(f'p-{i}', 'Ana') for i in range(3)])
+    index = PatientSearchIndex(database, max_patients=2)
+    assert not index.ensure_fresh()
+    assert index.disabled and not index.patients
+    assert not index.ensure_fresh()
+    assert len(database.queries) == 1
+
+
+def test_patient_summary_is_one_capped_query(monkeypatch, stub_database):
+    """One query fetches every section; the limit is clamped and the patient goes in patients."""
+    summary = {
+        'patient': {'patient_id': 'p-1', 'full_name': 'Ana Gómez'},
+        'upcoming_reservations': [{'reservation_id': 'r-1', 'appointment_date': '2031-03-03 08:00:00'}],
+        'recent_reservations': [],
+        'documents': [],
+        'counts': {'upcoming_reservations': 1, 'recent_reservations': 0, 'documents': 0},
+    }
+    stub_database.rows = [{'summary': summary}]
+    monkeypatch.setattr(patient_lookup, 'db_manager', stub_database)
+
+    response = patient_lookup.lambda_handler({'action': 'patient_summary', 'patient_id': ' p-1 ', 'limit': 50}, None)
+    body = json.loads(response['body'])
+
+    assert response['statusCode'] == 200
+    assert body['patients'] == [{'patient_id': 'p-1', 'full_name': 'Ana Gómez'}]
+    assert body['summary']['upcoming_reservations'][0]['reservation_id'] == 'r-1'
+    assert 'patient' not in body['summary']
+    sql, params = stub_database.queries[0]
+    assert len(stub_database.queries) == 1 and 'extracted_data' not in sql
+    assert params['patient_id'] == 'p-1'
+    assert params['section_limit'] == patient_lookup.MAX_SUMMARY_LIMIT
+
+    stub_database.rows = [{'summary': {'patient': None}}]
+    body = json.loads(patient_lookup.handle_patient_summary('missing')['body'])
+    assert body['patients'] == [] and 'summary' not in body
+
+
+def seed_database(db):
+    db.execute_sql("""
+        INSERT INTO patients (patient_id, full_name, email, phone, cedula) VALUES
+        ('p-1', 'Ana Gómez', 'ana@example.com', '3125550101', '1020304'),
+        ('p-2', 'Ana María Gómez', 'ana.maria@example.com', '3125550102', '2030405'),
+        ('p-3', 'Carlos Ruiz', 'carlos@example.com', '3125550103', '3040506')
+    """)
+
+
+def search_batch(searches, **options):
+    response = patient_lookup.handle_search_patients_batch(searches, **options)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def patient_ids(result):
+    return [patient['patient_id'] for patient in result['patients']]
+
+
+def test_batch_applies_names_to_identifier_matches(postgres_db):
+    """Identifiers and names are ANDed like search_patient, keyed by input index."""
+    status, body = search_batch([
+        {'cedula': '1.020.304', 'name': 'Ana Gómez'},
+        {'cedula': '1020304', 'name': 'Carlos Ruiz'},
+        {'name': 'Gómez'},
+        {'email': 'CARLOS@example.com', 'phone': '312 555 0103'},
+        {'email': 'carlos@example.com', 'phone': '3125550101'},
+    ])
+
+    assert status == 200
+    results = body['results']
+    assert list(results) == ['0', '1', '2', '3', '4']
+    assert patient_ids(results['0']) == ['p-1'] and results['0']['criteria_used'] == ['cedula', 'name']
+    assert patient_ids(results['1']) == []
+    assert patient_ids(results['2']) == ['p-1', 'p-2'] and results['2']['criteria_used'] == ['name']
+    assert patient_ids(results['3']) == ['p-3']
+    assert patient_ids(results['4']) == []
+
+    # Same answers as the single search
+    for index in ('0', '1'):
+        single = patient_lookup.execute_multi_criteria_search(cedula='1020304', name=[
+            'Ana Gómez', 'Carlos Ruiz'][int(index)])
+        assert [patient['patient_id'] for patient in single] == patient_ids(results[index])
+
+
+def test_batch_resolves_duplicate_identifiers_once(postgres_db, monkeypatch):
+    """Repeated identifiers are looked up once and answered for every search."""
+    queries = []
+    execute_query = postgres_db.execute_query
+
+    def counting_execute_query(sql, *args, **kwargs):
+        queries.append(sql)
+        return execute_query(sql, *args, **kwargs)
+
+    monkeypatch.setattr(postgres_db, 'execute_query', counting_execute_query)
+    status, body = search_batch([{'cedula': '1020304'}, {'cedula': '1.020.304'}, {'cedula': '99999'}])
+
+    assert status == 200
+    assert [patient_ids(body['results'][index]) for index in '012'] == [['p-1'], ['p-1'], []]
+    assert len(queries) == 1
+
+
+def test_batch_rejects_empty_oversized_and_invalid_searches():
+    """Batch-level errors fail the call; invalid searches fail only their own entry."""
+    status, body = search_batch([])
+    assert status == 400 and body['error_code'] == 'INVALID_BATCH'
+
+    status, body = search_batch([{'name': 'Ana'}] * (patient_lookup.MAX_BATCH_SEARCHES + 1))
+    assert status == 400 and body['error_code'] == 'BATCH_TOO_LARGE'
+
+    status, body = search_batch([{}, {'email': 'not-an-email'}])
+    assert status == 200
+    assert [body['results'][index]['success'] for index in '01'] == [False, False]
+    assert body['results']['1']['errors']
+
+
+def test_multi_criteria_search_with_identifiers_only(postgres_db):
+    """Without a name the ORDER BY has no relevance score and the query still runs."""
+    patients = patient_lookup.execute_multi_criteria_search(cedula='1020304', email='ana@example.com')
+    assert [patient['patient_id'] for patient in patients] == ['p-1']
+
+    patients = patient_lookup.execute_multi_criteria_search(phone='+57 312 555 0103')
+    assert [patient['patient_id'] for patient in patients] == ['p-3']
+
+
+if __name__ == "__main__":
+    print("Testing patient search index...")
+    test_normalize_name_matches_sql_normalization()
+    test_exact_identifiers_use_normalized_values()
+    test_name_search_ranks_by_trigram_similarity()
+    print("\n✅ All tests passed!")
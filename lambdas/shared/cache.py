@@ -0,0 +1,135 @@
+"""
+Read-through cache for reference tables (exams, medics).
+
+Instances live at module level in the handlers, so cached results survive
+warm invocations of the same container. Entries expire after a TTL, the
+number of entries is bounded (least recently used first out), and every
+entry is stamped with the table version: COUNT(*) and MAX(updated_at), read
+by a cheap probe at most every version_check_seconds. Writes through this
+container call invalidate(); writes through other containers are noticed by
+the next probe.
+"""
+
+import copy
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from shared.database import DatabaseError
+from shared.utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv('REFERENCE_CACHE_TTL_SECONDS', '300'))
+REFERENCE_CACHE_MAX_ENTRIES = int(os.getenv('REFERENCE_CACHE_MAX_ENTRIES', '256'))
+# 0 probes the table version on every lookup
+REFERENCE_CACHE_VERSION_CHECK_SECONDS = float(os.getenv('REFERENCE_CACHE_VERSION_CHECK_SECONDS', '30'))
+
+
+def query_key(sql: str, parameters: List[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """Cache key for a query and its parameters."""
+    return sql, json.dumps(parameters or [], sort_keys=True, default=str)
+
+
+class ReferenceCache:
+    """Read-through cache of query results for one table."""
+
+    def __init__(
+        self,
+        table: str,
+        ttl_seconds: float = REFERENCE_CACHE_TTL_SECONDS,
+        max_entries: int = REFERENCE_CACHE_MAX_ENTRIES,
+        version_check_seconds: float = REFERENCE_CACHE_VERSION_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version_check_seconds = version_check_seconds
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (stored_at, value)
+        self.version = None
+        self.version_checked_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db_manager, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss.
+
+        Values are copied on the way in and out, so callers may modify them
+        (build_page_info trims pages in place).
+
+        Args:
+            db_manager: DatabaseManager used for the version probe
+            key: Hashable cache key (query name and parameters)
+            loader: Function running the query
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            DatabaseError: If the loader fails
+        """
+        self._check_version(db_manager)
+        now = self.clock()
+
+        entry = self.entries.get(key)
+        hit = entry is not None and now - entry[0] < self.ttl_seconds
+        if hit:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            value = entry[1]
+        else:
+            self.misses += 1
+            value = loader()
+            self.entries[key] = (now, copy.deepcopy(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        logger.info(
+            "Reference cache lookup",
+            table=self.table,
+            hit=hit,
+            cache_hits=self.hits,
+            cache_misses=self.misses,
+            cache_entries=len(self.entries)
+        )
+        return copy.deepcopy(value) if hit else value
+
+    def invalidate(self) -> None:
+        """Drop every entry, e.g. after a write to the table."""
+        self.entries.clear()
+        self.version = None
+        self.version_checked_at = None
+
+    def _check_version(self, db_manager) -> None:
+        """Clear the entries if the table changed since they were stored."""
+        now = self.clock()
+        if self.version_checked_at is not None and now - self.version_checked_at < self.version_check_seconds:
+            return
+
+        try:
+            rows = db_manager.execute_query(
+                f"SELECT COUNT(*) AS row_count, MAX(updated_at) AS updated_at FROM {self.table}"
+            )
+        except DatabaseError as e:
+            # Entries within their TTL stay usable while the database is unreachable
+            # (e.g. resuming from auto-pause); the next lookup probes again
+            logger.warning(
+                "Reference cache version probe failed",
+                table=self.table,
+                error_message=str(e),
+                error_code=e.error_code
+            )
+            return
+
+        version = (rows[0]['row_count'], str(rows[0]['updated_at'])) if rows else None
+        if version != self.version and self.entries:
+            logger.info("Reference cache invalidated", table=self.table, cache_entries=len(self.entries))
+            self.entries.clear()
+        self.version = version
+        self.version_checked_at = now
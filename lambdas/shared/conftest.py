@@ -0,0 +1,20 @@
+"""
+Shared fixtures for the tests of the shared modules.
+"""
+
+import pytest
+
+
+class Clock:
+    """Settable time source for classes that take a clock callable."""
+
+    def __init__(self, now=1_900_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
@@ -1,16 +1,128 @@
 """
-RDS Data API Database Manager for Healthcare System.
-Provides a clean interface for executing SQL queries using AWS RDS Data API.
+Database Manager for Healthcare System.
+Provides a clean interface for executing SQL queries against Aurora PostgreSQL,
+using the AWS RDS Data API by default or a pooled native PostgreSQL connection.
 """
 
 import boto3
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union
+import os
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from datetime import time as dt_time
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Union, Callable, Iterator
 from botocore.exceptions import ClientError
 
+try:
+    # Optional faster JSON decoder for JSON-formatted results and JSONB columns
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Batch execution settings. The Data API rejects requests larger than 4 MiB,
+# so chunks are also capped by an estimated payload size with some headroom.
+DEFAULT_BATCH_CHUNK_SIZE = 200
+MAX_BATCH_PAYLOAD_BYTES = 3 * 1024 * 1024
+BATCH_MAX_RETRIES = 4
+BATCH_RETRY_BASE_DELAY = 0.2
+
+# Keyset iteration settings (iter_query)
+DEFAULT_ITER_PAGE_SIZE = 500
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Data API error codes that are safe to retry with backoff
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableError',
+}
+
+# Aurora Serverless v2 auto-pause: statements sent while the cluster resumes
+# fail with these codes before running, so they are retried (outside
+# transactions) with jittered backoff until the resume budget is spent
+RESUMING_ERROR_CODES = {
+    'DatabaseResumingException',
+    'DatabaseUnavailableException',
+}
+RESUME_BUDGET_SECONDS = float(os.environ.get('DATABASE_RESUME_BUDGET_SECONDS', '20'))
+RESUME_RETRY_BASE_DELAY = 0.5
+RESUME_RETRY_MAX_DELAY = 4.0
+METRICS_NAMESPACE = os.environ.get('DATABASE_METRICS_NAMESPACE', 'Healthcare/Database')
+
+
+def _parse_timestamptz(value: str) -> datetime:
+    """Parse a Data API timestamptz value, which is returned in UTC without offset."""
+    return datetime.fromisoformat(value + '+00:00')
+
+
+# Data API value key used for each PostgreSQL type; NULLs carry 'isNull' instead
+_TYPE_VALUE_KEYS = {
+    **dict.fromkeys(
+        ('varchar', 'text', 'bpchar', 'char', 'name', 'uuid', 'citext',
+         'json', 'jsonb', 'date', 'time', 'timestamp', 'timestamptz', 'numeric', 'decimal'),
+        'stringValue'
+    ),
+    **dict.fromkeys(('int2', 'int4', 'int8', 'serial', 'bigserial', 'oid'), 'longValue'),
+    **dict.fromkeys(('float4', 'float8'), 'doubleValue'),
+    'bool': 'booleanValue',
+    'bytea': 'blobValue',
+}
+
+# Converters applied to non-null raw values, keyed by PostgreSQL type name
+_TYPE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'json': _json_loads,
+    'jsonb': _json_loads,
+    'date': date.fromisoformat,
+    'time': dt_time.fromisoformat,
+    'timestamp': datetime.fromisoformat,
+    'timestamptz': _parse_timestamptz,
+    'numeric': Decimal,
+    'decimal': Decimal,
+}
+
+
+def _decode_field(field: Dict[str, Any]) -> Any:
+    """Return the raw value of a Data API field of an unknown type."""
+    if 'isNull' in field:
+        return None
+    array_value = field.get('arrayValue')
+    if array_value is not None:
+        for values in array_value.values():
+            return values
+    for value in field.values():
+        return value
+
+
+def build_decoder_plan(column_metadata: List[Dict[str, Any]]):
+    """
+    Build a decoder plan from Data API column metadata.
+    
+    Args:
+        column_metadata: Column metadata from an RDS Data API response
+        
+    Returns:
+        Tuple of (column names, per-column Data API value keys with None for
+        types that need generic decoding, list of (column index, converter))
+    """
+    column_names = []
+    value_keys = []
+    converters = []
+    for index, column in enumerate(column_metadata):
+        type_name = (column.get('typeName') or '').lower()
+        column_names.append(column['name'])
+        value_keys.append(_TYPE_VALUE_KEYS.get(type_name))
+        if type_name in _TYPE_CONVERTERS:
+            converters.append((index, _TYPE_CONVERTERS[type_name]))
+    return column_names, value_keys, converters
+
 
 class DatabaseError(Exception):
     """Custom exception for database operations."""
@@ -21,52 +133,175 @@ class DatabaseError(Exception):
         self.original_error = original_error
 
 
-class DatabaseManager:
+def is_resuming_error(error: DatabaseError) -> bool:
+    """Whether a DatabaseError means the cluster is resuming and the statement did not run."""
+    if error.error_code in RESUMING_ERROR_CODES:
+        return True
+    # Transaction calls wrap the ClientError under TRANSACTION_ERROR
+    original = error.original_error
+    if isinstance(original, ClientError) and original.response.get('Error', {}).get('Code') in RESUMING_ERROR_CODES:
+        return True
+    # Older Data API versions report a paused cluster as a generic link failure
+    return error.error_code == 'BadRequestException' and 'Communications link failure' in str(error)
+
+
+def emit_resume_metrics(operation: str, backend: str, wait_seconds: float, retries: int, resumed: bool) -> None:
+    """
+    Emit resume wait metrics in CloudWatch Embedded Metric Format.
+    
+    The document is printed rather than logged: CloudWatch only extracts
+    metrics from log lines that are a bare JSON object.
+    """
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Operation']],
+                'Metrics': [
+                    {'Name': 'ResumeWaitMs', 'Unit': 'Milliseconds'},
+                    {'Name': 'ResumeRetries', 'Unit': 'Count'},
+                    {'Name': 'ResumeFailures', 'Unit': 'Count'},
+                ]
+            }]
+        },
+        'Operation': operation,
+        'Backend': backend,
+        'ResumeWaitMs': round(wait_seconds * 1000, 2),
+        'ResumeRetries': retries,
+        'ResumeFailures': 0 if resumed else 1,
+    }), flush=True)
+
+
+class DatabaseBackend:
+    """
+    Interface for the statement execution layer used by DatabaseManager.
+    
+    Backends return responses shaped like the RDS Data API (records,
+    columnMetadata, numberOfRecordsUpdated, formattedRecords, updateResults)
+    and raise DatabaseError using the Data API error codes, so everything
+    above this layer behaves the same regardless of the transport.
+    """
+    
+    name = 'base'
+    
+    def get_config(self) -> Dict[str, str]:
+        """Return the resolved connection configuration."""
+        raise NotImplementedError
+    
+    def execute_statement(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None,
+        transaction_id: str = None,
+        result_format: str = 'records'
+    ) -> Dict[str, Any]:
+        """Execute one statement and return a Data API shaped response."""
+        raise NotImplementedError
+    
+    def batch_execute_statement(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        transaction_id: str = None
+    ) -> Dict[str, Any]:
+        """Execute one statement for many parameter sets."""
+        raise NotImplementedError
+    
+    def begin_transaction(self) -> str:
+        """Begin a transaction and return its ID."""
+        raise NotImplementedError
+    
+    def commit_transaction(self, transaction_id: str) -> None:
+        """Commit the given transaction."""
+        raise NotImplementedError
+    
+    def rollback_transaction(self, transaction_id: str) -> None:
+        """Roll back the given transaction."""
+        raise NotImplementedError
+    
+    def fetch_rows(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Optionally run a SELECT and return typed rows directly.
+        
+        Backends with a native driver override this to skip the Data API
+        record encoding; returning None means "not supported".
+        """
+        return None
+
+
+def load_database_config(ssm_client) -> Dict[str, str]:
     """
-    Database manager using AWS RDS Data API for Aurora PostgreSQL.
-    Handles connection management, query execution, and result parsing.
+    Load the database configuration published under /healthcare/database/ in SSM.
+    
+    Returns:
+        Dictionary with cluster_arn, secret_arn and database_name
+        
+    Raises:
+        DatabaseError: If the parameters cannot be read or are incomplete
     """
+    try:
+        # Get all database parameters at once
+        response = ssm_client.get_parameters_by_path(
+            Path='/healthcare/database/',
+            Recursive=True
+        )
+    except ClientError as e:
+        logger.error(f"Failed to get database configuration: {e}")
+        raise DatabaseError(
+            "Failed to retrieve database configuration",
+            "CONFIG_ERROR",
+            e
+        )
     
-    def __init__(self):
-        """Initialize the database manager with RDS Data API client."""
+    params = {param['Name'].split('/')[-1]: param['Value'] 
+             for param in response['Parameters']}
+    
+    config = {
+        'cluster_arn': params.get('cluster-arn'),
+        'secret_arn': params.get('secret-arn'),
+        'database_name': params.get('name', 'healthcare')
+    }
+    
+    if not config['cluster_arn'] or not config['secret_arn']:
+        raise DatabaseError(
+            "Missing required database configuration in SSM",
+            "MISSING_CONFIG"
+        )
+    
+    return config
+
+
+class DataApiBackend(DatabaseBackend):
+    """Backend that sends every statement to Aurora through the RDS Data API."""
+    
+    name = 'data_api'
+    
+    def __init__(
+        self,
+        cluster_arn: str = None,
+        secret_arn: str = None,
+        database_name: str = None
+    ):
         self.rds_data = boto3.client('rds-data')
         self.ssm = boto3.client('ssm')
         
         # Cache for database configuration
-        self._cluster_arn = None
-        self._secret_arn = None
-        self._database_name = None
-        
-    def _get_database_config(self) -> Dict[str, str]:
+        self._cluster_arn = cluster_arn
+        self._secret_arn = secret_arn
+        self._database_name = database_name
+    
+    def get_config(self) -> Dict[str, str]:
         """Get database configuration from SSM parameters."""
         if not all([self._cluster_arn, self._secret_arn, self._database_name]):
-            try:
-                # Get all database parameters at once
-                response = self.ssm.get_parameters_by_path(
-                    Path='/healthcare/database/',
-                    Recursive=True
-                )
-                
-                params = {param['Name'].split('/')[-1]: param['Value'] 
-                         for param in response['Parameters']}
-                
-                self._cluster_arn = params.get('cluster-arn')
-                self._secret_arn = params.get('secret-arn')
-                self._database_name = params.get('name', 'healthcare')
-                
-                if not self._cluster_arn or not self._secret_arn:
-                    raise DatabaseError(
-                        "Missing required database configuration in SSM",
-                        "MISSING_CONFIG"
-                    )
-                    
-            except ClientError as e:
-                logger.error(f"Failed to get database configuration: {e}")
-                raise DatabaseError(
-                    "Failed to retrieve database configuration",
-                    "CONFIG_ERROR",
-                    e
-                )
+            config = load_database_config(self.ssm)
+            self._cluster_arn = config['cluster_arn']
+            self._secret_arn = config['secret_arn']
+            self._database_name = config['database_name']
         
         return {
             'cluster_arn': self._cluster_arn,
@@ -74,19 +309,266 @@ class DatabaseManager:
             'database_name': self._database_name
         }
     
+    def execute_statement(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None,
+        transaction_id: str = None,
+        result_format: str = 'records'
+    ) -> Dict[str, Any]:
+        """Execute one statement with ExecuteStatement."""
+        config = self.get_config()
+        
+        # Prepare the request
+        request_params = {
+            'resourceArn': config['cluster_arn'],
+            'secretArn': config['secret_arn'],
+            'database': config['database_name'],
+            'sql': sql,
+            'includeResultMetadata': True
+        }
+        
+        if result_format == 'json':
+            # Column metadata is not returned for JSON-formatted results
+            request_params['includeResultMetadata'] = False
+            request_params['formatRecordsAs'] = 'JSON'
+        
+        # Add parameters if provided
+        if parameters:
+            request_params['parameters'] = parameters
+            
+        # Add transaction ID if provided
+        if transaction_id:
+            request_params['transactionId'] = transaction_id
+        
+        try:
+            return self.rds_data.execute_statement(**request_params)
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'UNKNOWN')
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            raise DatabaseError(
+                f"Database query failed: {error_message}",
+                error_code,
+                e
+            )
+    
+    def batch_execute_statement(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        transaction_id: str = None
+    ) -> Dict[str, Any]:
+        """Execute one statement for many parameter sets with BatchExecuteStatement."""
+        config = self.get_config()
+        
+        request_params = {
+            'resourceArn': config['cluster_arn'],
+            'secretArn': config['secret_arn'],
+            'database': config['database_name'],
+            'sql': sql,
+            'parameterSets': parameter_sets
+        }
+        if transaction_id:
+            request_params['transactionId'] = transaction_id
+        
+        try:
+            return self.rds_data.batch_execute_statement(**request_params)
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'UNKNOWN')
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            raise DatabaseError(
+                f"Database batch failed: {error_message}",
+                error_code,
+                e
+            )
+    
+    def begin_transaction(self) -> str:
+        """Begin a transaction with BeginTransaction."""
+        config = self.get_config()
+        
+        try:
+            response = self.rds_data.begin_transaction(
+                resourceArn=config['cluster_arn'],
+                secretArn=config['secret_arn'],
+                database=config['database_name']
+            )
+            return response['transactionId']
+            
+        except ClientError as e:
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            raise DatabaseError(
+                f"Failed to begin transaction: {error_message}",
+                "TRANSACTION_ERROR",
+                e
+            )
+    
+    def commit_transaction(self, transaction_id: str) -> None:
+        """Commit a transaction with CommitTransaction."""
+        config = self.get_config()
+        
+        try:
+            self.rds_data.commit_transaction(
+                resourceArn=config['cluster_arn'],
+                secretArn=config['secret_arn'],
+                transactionId=transaction_id
+            )
+        except ClientError as e:
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            raise DatabaseError(
+                f"Failed to commit transaction: {error_message}",
+                "TRANSACTION_ERROR",
+                e
+            )
+    
+    def rollback_transaction(self, transaction_id: str) -> None:
+        """Roll back a transaction with RollbackTransaction."""
+        config = self.get_config()
+        
+        try:
+            self.rds_data.rollback_transaction(
+                resourceArn=config['cluster_arn'],
+                secretArn=config['secret_arn'],
+                transactionId=transaction_id
+            )
+        except ClientError as e:
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            raise DatabaseError(
+                f"Failed to rollback transaction: {error_message}",
+                "TRANSACTION_ERROR",
+                e
+            )
+
+
+def create_backend(
+    backend: str = None,
+    cluster_arn: str = None,
+    secret_arn: str = None,
+    database_name: str = None
+) -> DatabaseBackend:
+    """
+    Create the database backend selected by name or the DATABASE_BACKEND variable.
+    
+    Args:
+        backend: 'data_api' (default) or 'postgres'
+        cluster_arn: Optional cluster ARN (skips the SSM lookup when complete)
+        secret_arn: Optional database secret ARN
+        database_name: Optional database name
+        
+    Returns:
+        DatabaseBackend instance
+        
+    Raises:
+        DatabaseError: If the backend name is unknown
+    """
+    backend = (backend or os.environ.get('DATABASE_BACKEND') or DataApiBackend.name).lower()
+    
+    if backend == DataApiBackend.name:
+        return DataApiBackend(cluster_arn, secret_arn, database_name)
+    
+    if backend == 'postgres':
+        # Imported lazily so the Data API path does not need the driver
+        from shared.postgres_backend import PostgresBackend
+        return PostgresBackend(cluster_arn, secret_arn, database_name)
+    
+    raise DatabaseError(f"Unknown database backend: {backend}", "INVALID_BACKEND")
+
+
+class DatabaseManager:
+    """
+    Database manager for Aurora PostgreSQL.
+    Handles query execution, batching, transactions and result parsing on top of
+    a pluggable backend (RDS Data API by default, or a pooled native driver).
+    """
+    
+    def __init__(
+        self,
+        cluster_arn: str = None,
+        secret_arn: str = None,
+        database_name: str = None,
+        backend: Union[str, DatabaseBackend] = None,
+        resume_budget_seconds: float = RESUME_BUDGET_SECONDS
+    ):
+        """
+        Initialize the database manager and its backend.
+        
+        Args:
+            cluster_arn: Optional cluster ARN; when all values are given the
+                SSM lookup is skipped (e.g. for functions configured via environment)
+            secret_arn: Optional database secret ARN
+            database_name: Optional database name
+            backend: Backend instance or name ('data_api', 'postgres'); defaults
+                to the DATABASE_BACKEND environment variable, then 'data_api'
+            resume_budget_seconds: Total time spent retrying a statement while
+                the cluster resumes from auto-pause; 0 disables the retries
+        """
+        if isinstance(backend, DatabaseBackend):
+            self.backend = backend
+        else:
+            self.backend = create_backend(backend, cluster_arn, secret_arn, database_name)
+        self.resume_budget_seconds = resume_budget_seconds
+    
+    def _with_resume_retry(self, operation: str, call: Callable[[], Any]) -> Any:
+        """
+        Run call, retrying while the cluster resumes from auto-pause.
+        
+        Delays grow exponentially with jitter up to RESUME_RETRY_MAX_DELAY and
+        the total wait never exceeds the resume budget. Resume waits are
+        reported with emit_resume_metrics.
+        
+        Raises:
+            DatabaseError: DATABASE_RESUMING if the budget runs out, or the
+                original error if it is not resume related
+        """
+        started = time.monotonic()
+        retries = 0
+        while True:
+            try:
+                result = call()
+            except DatabaseError as e:
+                if not is_resuming_error(e):
+                    raise
+                waited = time.monotonic() - started
+                delay = min(RESUME_RETRY_MAX_DELAY, RESUME_RETRY_BASE_DELAY * (2 ** retries))
+                delay *= random.uniform(0.5, 1.0)
+                if waited + delay > self.resume_budget_seconds:
+                    emit_resume_metrics(operation, self.backend.name, waited, retries, resumed=False)
+                    logger.error(f"Database still resuming after {waited:.1f}s ({e.error_code}), giving up")
+                    raise DatabaseError(
+                        "Database is resuming from auto-pause, try again in a few seconds",
+                        "DATABASE_RESUMING",
+                        e
+                    )
+                logger.warning(f"Database resuming ({e.error_code}), retrying {operation} in {delay:.2f}s")
+                time.sleep(delay)
+                retries += 1
+                continue
+            
+            if retries:
+                waited = time.monotonic() - started
+                emit_resume_metrics(operation, self.backend.name, waited, retries, resumed=True)
+                logger.info(f"Database resumed after {waited:.1f}s and {retries} retries")
+            return result
+    
+    def _get_database_config(self) -> Dict[str, str]:
+        """Get the database configuration resolved by the backend."""
+        return self.backend.get_config()
+    
     def execute_sql(
         self, 
         sql: str, 
         parameters: List[Dict[str, Any]] = None,
-        transaction_id: str = None
+        transaction_id: str = None,
+        result_format: str = 'records'
     ) -> Dict[str, Any]:
         """
-        Execute SQL statement using RDS Data API.
+        Execute a SQL statement through the configured backend.
         
         Args:
             sql: SQL statement to execute
             parameters: List of parameter dictionaries for the SQL statement
             transaction_id: Optional transaction ID for multi-statement transactions
+            result_format: 'records' for typed field records with column metadata, or
+                'json' to have the rows returned in 'formattedRecords'
             
         Returns:
             Dictionary containing query results
@@ -95,48 +577,28 @@ class DatabaseManager:
             DatabaseError: If the query execution fails
         """
         try:
-            config = self._get_database_config()
-            
-            # Prepare the request
-            request_params = {
-                'resourceArn': config['cluster_arn'],
-                'secretArn': config['secret_arn'],
-                'database': config['database_name'],
-                'sql': sql,
-                'includeResultMetadata': True
-            }
-            
-            # Add parameters if provided
-            if parameters:
-                request_params['parameters'] = parameters
-                
-            # Add transaction ID if provided
-            if transaction_id:
-                request_params['transactionId'] = transaction_id
-            
             logger.debug(f"Executing SQL: {sql}")
             logger.debug(f"Parameters: {parameters}")
             
-            # Execute the statement
-            response = self.rds_data.execute_statement(**request_params)
+            # Execute the statement; statements inside a transaction never see a
+            # paused cluster, since begin_transaction already reached it
+            if transaction_id:
+                response = self.backend.execute_statement(sql, parameters, transaction_id, result_format)
+            else:
+                response = self._with_resume_retry(
+                    'execute_statement',
+                    lambda: self.backend.execute_statement(sql, parameters, None, result_format)
+                )
             
             logger.debug(f"Query executed successfully, affected rows: {response.get('numberOfRecordsUpdated', 0)}")
             
             return response
             
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'UNKNOWN')
-            error_message = e.response.get('Error', {}).get('Message', str(e))
-            
-            logger.error(f"Database query failed: {error_message}")
+        except DatabaseError as e:
+            logger.error(f"Database query failed: {e}")
             logger.error(f"SQL: {sql}")
             logger.error(f"Parameters: {parameters}")
-            
-            raise DatabaseError(
-                f"Database query failed: {error_message}",
-                error_code,
-                e
-            )
+            raise
         except Exception as e:
             logger.error(f"Unexpected error executing SQL: {e}")
             raise DatabaseError(
@@ -156,27 +618,14 @@ class DatabaseManager:
             DatabaseError: If transaction creation fails
         """
         try:
-            config = self._get_database_config()
-            
-            response = self.rds_data.begin_transaction(
-                resourceArn=config['cluster_arn'],
-                secretArn=config['secret_arn'],
-                database=config['database_name']
-            )
-            
-            transaction_id = response['transactionId']
+            transaction_id = self._with_resume_retry('begin_transaction', self.backend.begin_transaction)
             logger.debug(f"Transaction started: {transaction_id}")
             
             return transaction_id
             
-        except ClientError as e:
-            error_message = e.response.get('Error', {}).get('Message', str(e))
-            logger.error(f"Failed to begin transaction: {error_message}")
-            raise DatabaseError(
-                f"Failed to begin transaction: {error_message}",
-                "TRANSACTION_ERROR",
-                e
-            )
+        except DatabaseError as e:
+            logger.error(f"Failed to begin transaction: {e}")
+            raise
     
     def commit_transaction(self, transaction_id: str) -> None:
         """
@@ -189,24 +638,12 @@ class DatabaseManager:
             DatabaseError: If transaction commit fails
         """
         try:
-            config = self._get_database_config()
-            
-            self.rds_data.commit_transaction(
-                resourceArn=config['cluster_arn'],
-                secretArn=config['secret_arn'],
-                transactionId=transaction_id
-            )
-            
+            self.backend.commit_transaction(transaction_id)
             logger.debug(f"Transaction committed: {transaction_id}")
             
-        except ClientError as e:
-            error_message = e.response.get('Error', {}).get('Message', str(e))
-            logger.error(f"Failed to commit transaction: {error_message}")
-            raise DatabaseError(
-                f"Failed to commit transaction: {error_message}",
-                "TRANSACTION_ERROR",
-                e
-            )
+        except DatabaseError as e:
+            logger.error(f"Failed to commit transaction: {e}")
+            raise
     
     def rollback_transaction(self, transaction_id: str) -> None:
         """
@@ -219,24 +656,153 @@ class DatabaseManager:
             DatabaseError: If transaction rollback fails
         """
         try:
-            config = self._get_database_config()
+            self.backend.rollback_transaction(transaction_id)
+            logger.debug(f"Transaction rolled back: {transaction_id}")
             
-            self.rds_data.rollback_transaction(
-                resourceArn=config['cluster_arn'],
-                secretArn=config['secret_arn'],
-                transactionId=transaction_id
-            )
+        except DatabaseError as e:
+            logger.error(f"Failed to rollback transaction: {e}")
+            raise
+    
+    def execute_batch(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+        transaction_id: str = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the same SQL statement for many parameter sets using BatchExecuteStatement.
+        
+        Parameter sets are split into chunks that fit the Data API payload limits and
+        executed inside a single transaction. Each chunk is protected by a savepoint:
+        throttled chunks are retried with backoff, and a chunk that fails for any
+        other reason is rolled back and replayed row by row so that only the
+        offending rows are reported as failures.
+        
+        Args:
+            sql: SQL statement to execute for every parameter set
+            parameter_sets: List of parameter lists (same format as execute_sql)
+            chunk_size: Maximum number of parameter sets per BatchExecuteStatement call
+            transaction_id: Optional transaction ID; when omitted a transaction is
+                started and committed by this method
             
-            logger.debug(f"Transaction rolled back: {transaction_id}")
+        Returns:
+            Dictionary with 'total', 'succeeded', 'failed' and 'failures', where each
+            failure is {'index', 'error', 'error_code'} referencing parameter_sets
             
-        except ClientError as e:
-            error_message = e.response.get('Error', {}).get('Message', str(e))
-            logger.error(f"Failed to rollback transaction: {error_message}")
-            raise DatabaseError(
-                f"Failed to rollback transaction: {error_message}",
-                "TRANSACTION_ERROR",
-                e
-            )
+        Raises:
+            DatabaseError: If the transaction cannot be started or committed, or a
+                chunk keeps being throttled after all retries
+        """
+        result = {
+            'total': len(parameter_sets),
+            'succeeded': 0,
+            'failed': 0,
+            'failures': []
+        }
+        if not parameter_sets:
+            return result
+        
+        owns_transaction = transaction_id is None
+        if owns_transaction:
+            transaction_id = self.begin_transaction()
+        
+        try:
+            for start, chunk in self._chunk_parameter_sets(sql, parameter_sets, chunk_size):
+                self.execute_sql('SAVEPOINT batch_chunk', transaction_id=transaction_id)
+                try:
+                    self._batch_execute_with_retry(sql, chunk, transaction_id)
+                    result['succeeded'] += len(chunk)
+                    continue
+                except DatabaseError as e:
+                    if e.error_code in THROTTLING_ERROR_CODES:
+                        raise
+                    logger.warning(
+                        f"Batch chunk starting at row {start} failed ({e.error_code}), "
+                        f"replaying {len(chunk)} rows individually"
+                    )
+                    self.execute_sql('ROLLBACK TO SAVEPOINT batch_chunk', transaction_id=transaction_id)
+                
+                for offset, parameters in enumerate(chunk):
+                    self.execute_sql('SAVEPOINT batch_row', transaction_id=transaction_id)
+                    try:
+                        self.execute_sql(sql, parameters, transaction_id)
+                        result['succeeded'] += 1
+                    except DatabaseError as e:
+                        self.execute_sql('ROLLBACK TO SAVEPOINT batch_row', transaction_id=transaction_id)
+                        result['failures'].append({
+                            'index': start + offset,
+                            'error': str(e),
+                            'error_code': e.error_code
+                        })
+            
+            if owns_transaction:
+                self.commit_transaction(transaction_id)
+                
+        except Exception:
+            if owns_transaction:
+                try:
+                    self.rollback_transaction(transaction_id)
+                except DatabaseError:
+                    logger.error(f"Failed to rollback batch transaction: {transaction_id}")
+            raise
+        
+        result['failed'] = len(result['failures'])
+        logger.info(
+            f"Batch executed: {result['succeeded']}/{result['total']} rows succeeded, "
+            f"{result['failed']} failed"
+        )
+        return result
+    
+    def _chunk_parameter_sets(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        chunk_size: int
+    ):
+        """
+        Split parameter sets into chunks bounded by row count and estimated payload size.
+        
+        Yields:
+            Tuples of (index of the first row in the chunk, chunk)
+        """
+        chunk_size = max(1, chunk_size)
+        chunk = []
+        chunk_start = 0
+        chunk_bytes = len(sql.encode('utf-8'))
+        
+        for index, parameters in enumerate(parameter_sets):
+            row_bytes = len(json.dumps(parameters, default=str).encode('utf-8'))
+            if chunk and (len(chunk) >= chunk_size or chunk_bytes + row_bytes > MAX_BATCH_PAYLOAD_BYTES):
+                yield chunk_start, chunk
+                chunk = []
+                chunk_start = index
+                chunk_bytes = len(sql.encode('utf-8'))
+            chunk.append(parameters)
+            chunk_bytes += row_bytes
+        
+        if chunk:
+            yield chunk_start, chunk
+    
+    def _batch_execute_with_retry(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        transaction_id: str
+    ) -> Dict[str, Any]:
+        """Run one batch call, retrying throttled requests with backoff."""
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            try:
+                return self.backend.batch_execute_statement(sql, parameter_sets, transaction_id)
+            except DatabaseError as e:
+                if e.error_code in THROTTLING_ERROR_CODES and attempt < BATCH_MAX_RETRIES:
+                    delay = BATCH_RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random())
+                    logger.warning(f"Batch chunk throttled ({e.error_code}), retrying in {delay:.2f}s")
+                    time.sleep(delay)
+                    continue
+                
+                logger.error(f"Batch statement failed: {e}")
+                raise
     
     def create_parameter(self, name: str, value: Any, type_hint: str = None) -> Dict[str, Any]:
         """
@@ -245,7 +811,9 @@ class DatabaseManager:
         Args:
             name: Parameter name
             value: Parameter value
-            type_hint: Optional type hint ('string', 'long', 'double', 'boolean', 'blob')
+            type_hint: Optional type hint ('string', 'long', 'double', 'boolean', 'blob').
+                When omitted, date/time/datetime and Decimal values are sent as
+                strings with the matching Data API typeHint.
             
         Returns:
             Parameter dictionary formatted for RDS Data API
@@ -253,17 +821,36 @@ class DatabaseManager:
         param = {'name': name}
         
         # Auto-detect type if not provided
-        if type_hint is None:
+        if type_hint is None and value is not None:
             if isinstance(value, str):
                 type_hint = 'string'
+            elif isinstance(value, bool):
+                type_hint = 'boolean'
             elif isinstance(value, int):
                 type_hint = 'long'
             elif isinstance(value, float):
                 type_hint = 'double'
-            elif isinstance(value, bool):
-                type_hint = 'boolean'
             elif isinstance(value, bytes):
                 type_hint = 'blob'
+            elif isinstance(value, datetime):
+                # Data API TIMESTAMP values are 'YYYY-MM-DD HH:MM:SS[.FFFFFF]' in UTC
+                if value.tzinfo is not None:
+                    value = value.astimezone(timezone.utc).replace(tzinfo=None)
+                type_hint = 'string'
+                param['typeHint'] = 'TIMESTAMP'
+                value = value.isoformat(sep=' ')
+            elif isinstance(value, date):
+                type_hint = 'string'
+                param['typeHint'] = 'DATE'
+                value = value.isoformat()
+            elif isinstance(value, dt_time):
+                type_hint = 'string'
+                param['typeHint'] = 'TIME'
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                type_hint = 'string'
+                param['typeHint'] = 'DECIMAL'
+                value = str(value)
             else:
                 # Default to string for other types
                 type_hint = 'string'
@@ -298,6 +885,10 @@ class DatabaseManager:
         """
         Parse RDS Data API records into a list of dictionaries.
         
+        A decoder plan is built once from the column metadata, so JSON/JSONB
+        columns come back as dicts/lists, DATE/TIME/TIMESTAMP columns as
+        date/time/datetime objects and NUMERIC columns as Decimal.
+        
         Args:
             records: Raw records from RDS Data API response
             column_metadata: Column metadata from RDS Data API response
@@ -308,47 +899,56 @@ class DatabaseManager:
         if not records or not column_metadata:
             return []
         
-        # Extract column names
-        column_names = [col['name'] for col in column_metadata]
+        column_names, value_keys, converters = build_decoder_plan(column_metadata)
+        
+        # Records wider than the metadata (should not happen) get positional names
+        width = max(len(record) for record in records)
+        if width > len(column_names):
+            column_names = column_names + [f'column_{i}' for i in range(len(column_names), width)]
+            value_keys = value_keys + [None] * (width - len(value_keys))
+        
+        get = dict.get
+        generic = None in value_keys
         
         parsed_records = []
         for record in records:
-            row = {}
-            for i, field in enumerate(record):
-                column_name = column_names[i] if i < len(column_names) else f'column_{i}'
-                
-                # Extract the actual value from the field
-                if 'isNull' in field and field['isNull']:
-                    row[column_name] = None
-                elif 'stringValue' in field:
-                    row[column_name] = field['stringValue']
-                elif 'longValue' in field:
-                    row[column_name] = field['longValue']
-                elif 'doubleValue' in field:
-                    row[column_name] = field['doubleValue']
-                elif 'booleanValue' in field:
-                    row[column_name] = field['booleanValue']
-                elif 'blobValue' in field:
-                    row[column_name] = field['blobValue']
-                else:
-                    # Fallback for unknown field types
-                    row[column_name] = str(field)
-            
-            parsed_records.append(row)
+            if generic:
+                # Unknown column types need the (slower) generic field decoder
+                values = [
+                    field.get(key) if key else _decode_field(field)
+                    for field, key in zip(record, value_keys)
+                ]
+            else:
+                values = list(map(get, record, value_keys))
+            for index, convert in converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = convert(value)
+            parsed_records.append(dict(zip(column_names, values)))
         
         return parsed_records
     
     def execute_query(
         self, 
         sql: str, 
-        parameters: List[Dict[str, Any]] = None
+        parameters: List[Dict[str, Any]] = None,
+        format: str = 'records',
+        json_columns: List[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute a SELECT query and return parsed results.
         
+        With format='json' the Data API returns the rows as a single JSON document
+        (formatRecordsAs='JSON'), which is much smaller than per-field records for
+        wide rows. In that mode DATE/TIMESTAMP/NUMERIC values stay as the strings
+        the Data API produces, and JSON/JSONB columns are only decoded when listed
+        in json_columns. Binary (BLOB) columns are not supported in JSON mode.
+        
         Args:
             sql: SELECT SQL statement
             parameters: List of parameter dictionaries
+            format: 'records' (default) or 'json'
+            json_columns: Columns holding JSON/JSONB to decode in 'json' mode
             
         Returns:
             List of dictionaries representing the query results
@@ -356,13 +956,137 @@ class DatabaseManager:
         Raises:
             DatabaseError: If the query execution fails
         """
-        response = self.execute_sql(sql, parameters)
+        if format not in ('records', 'json'):
+            raise DatabaseError(f"Unsupported result format: {format}", "INVALID_FORMAT")
+        
+        rows = self._with_resume_retry('fetch_rows', lambda: self.backend.fetch_rows(sql, parameters))
+        if rows is not None:
+            # Native driver rows are already typed (dicts for JSONB, dates, ...)
+            return rows
+        
+        response = self.execute_sql(sql, parameters, result_format=format)
+        
+        if format == 'json':
+            rows = _json_loads(response.get('formattedRecords') or '[]')
+            for column in json_columns or ():
+                for row in rows:
+                    value = row.get(column)
+                    if isinstance(value, str):
+                        row[column] = _json_loads(value)
+            return rows
         
         records = response.get('records', [])
         column_metadata = response.get('columnMetadata', [])
         
         return self.parse_records(records, column_metadata)
     
+    def iter_query(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None,
+        key_column: str = 'id',
+        page_size: int = DEFAULT_ITER_PAGE_SIZE,
+        format: str = 'records',
+        json_columns: List[str] = None,
+        prefetch: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a query result of any size using keyset pagination.
+        
+        The query is wrapped as a subquery and read page by page with
+        `WHERE key_column > :last ORDER BY key_column LIMIT page_size`, so each
+        request stays well below the Data API response size limit and memory use
+        is bounded by the page size. Rows are yielded lazily, decoded as by
+        execute_query.
+        
+        Args:
+            sql: SELECT statement without ORDER BY/LIMIT; it must return key_column
+            parameters: List of parameter dictionaries for the SELECT statement
+            key_column: Unique, indexed column to paginate on
+            page_size: Number of rows fetched per request
+            format: 'records' (default) or 'json', as for execute_query
+            json_columns: Columns holding JSON/JSONB to decode in 'json' mode
+            prefetch: Fetch the next page on a background thread while the
+                current page is being consumed
+            
+        Yields:
+            Dictionaries representing the query results, ordered by key_column
+            
+        Raises:
+            DatabaseError: If key_column is not a plain identifier or a page query fails
+        """
+        if not _IDENTIFIER_PATTERN.match(key_column or ''):
+            raise DatabaseError(f"Invalid key column: {key_column}", "INVALID_KEY_COLUMN")
+        
+        page_size = max(1, int(page_size))
+        base_parameters = list(parameters or [])
+        first_page_sql = f"""
+        SELECT * FROM ({sql}) AS keyset_source
+        ORDER BY {key_column}
+        LIMIT :keyset_limit
+        """
+        next_page_sql = f"""
+        SELECT * FROM ({sql}) AS keyset_source
+        WHERE {key_column} > :keyset_last
+        ORDER BY {key_column}
+        LIMIT :keyset_limit
+        """
+        
+        def fetch_page(last_key):
+            page_parameters = base_parameters + [self.create_parameter('keyset_limit', page_size, 'long')]
+            if last_key is None:
+                page_sql = first_page_sql
+            else:
+                page_sql = next_page_sql
+                page_parameters.append(self.create_parameter('keyset_last', last_key))
+            return self.execute_query(page_sql, page_parameters, format=format, json_columns=json_columns)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = fetch_page(None)
+            while page:
+                next_page = None
+                if len(page) == page_size:
+                    last_key = page[-1][key_column]
+                    if executor:
+                        next_page = executor.submit(fetch_page, last_key)
+                    else:
+                        next_page = last_key
+                
+                yield from page
+                
+                if next_page is None:
+                    break
+                page = next_page.result() if executor else fetch_page(next_page)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def estimate_row_count(self, table: str) -> Optional[int]:
+        """
+        Approximate number of rows of a table from the planner statistics.
+        
+        Reads pg_class.reltuples, maintained by VACUUM/ANALYZE and autovacuum,
+        instead of scanning the table as COUNT(*) does.
+        
+        Args:
+            table: Table name
+            
+        Returns:
+            Estimated row count, or None if the table does not exist or has
+            never been analyzed
+            
+        Raises:
+            DatabaseError: If the query fails
+        """
+        rows = self.execute_query(
+            "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass(:table_name)",
+            [self.create_parameter('table_name', table, 'string')]
+        )
+        if not rows or rows[0]['estimate'] is None or rows[0]['estimate'] < 0:
+            return None
+        return rows[0]['estimate']
+    
     def execute_update(
         self, 
         sql: str, 
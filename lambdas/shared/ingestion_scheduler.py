@@ -0,0 +1,349 @@
+"""
+Coalescing scheduler for Knowledge Base ingestion jobs.
+
+Every processed document only marks the data source dirty. A job is started
+once completions have been quiet for INGESTION_DEBOUNCE_SECONDS, or once the
+oldest pending change is INGESTION_MAX_DELAY_SECONDS old during a continuous
+burst. At most one job runs at a time; changes recorded while it runs keep
+the data source dirty, so a follow-up job starts after it finishes. tick()
+is called after each completion and by a one-minute schedule, which is what
+picks up the follow-up job and the end of a burst.
+
+A document therefore becomes searchable within about
+INGESTION_MAX_DELAY_SECONDS + one tick + the duration of the running job and
+its follow-up.
+
+State lives in a store with compare-and-set updates (a DynamoDB item per
+data source, or memory for tests), so concurrent Lambda containers agree on
+the running job.
+
+Configuration (environment variables):
+- INGESTION_DEBOUNCE_SECONDS: quiet period before starting a job (default 30)
+- INGESTION_MAX_DELAY_SECONDS: maximum wait of a pending change (default 300)
+- INGESTION_STATE_BACKEND: 'dynamodb' (default) or 'memory'
+- INGESTION_STATE_TABLE_NAME: DynamoDB table (partition key data_source)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+INGESTION_DEBOUNCE_SECONDS = float(os.environ.get('INGESTION_DEBOUNCE_SECONDS', '30'))
+INGESTION_MAX_DELAY_SECONDS = float(os.environ.get('INGESTION_MAX_DELAY_SECONDS', '300'))
+
+RUNNING_JOB_STATUSES = {'STARTING', 'IN_PROGRESS', 'STOPPING'}
+# Placeholder job ID between claiming the start and StartIngestionJob returning;
+# a claim older than this is considered abandoned
+PENDING_JOB_ID = 'pending'
+PENDING_JOB_TIMEOUT_SECONDS = 60
+
+
+def load_knowledge_base_config(ssm_client) -> Dict[str, Optional[str]]:
+    """
+    Read the Knowledge Base and data source IDs published in SSM.
+
+    Returns:
+        Dictionary with knowledge_base_id and data_source_id (None if missing)
+    """
+    response = ssm_client.get_parameters(
+        Names=[
+            '/healthcare/knowledge-base/id',
+            '/healthcare/knowledge-base/data-source-id'
+        ]
+    )
+    params = {param['Name'].split('/')[-1]: param['Value'] for param in response['Parameters']}
+    return {
+        'knowledge_base_id': params.get('id'),
+        'data_source_id': params.get('data-source-id')
+    }
+
+
+class IngestionStateStore:
+    """
+    Interface of the scheduler state of one data source.
+
+    State fields: dirty_since, last_request_at, job_id, job_started_at and
+    version, which every write increments.
+    """
+
+    name = 'base'
+
+    def get(self) -> Dict[str, Any]:
+        """Current state ({'version': 0} when empty)."""
+        raise NotImplementedError
+
+    def mark_dirty(self, now: float) -> None:
+        """Record a change: keep the oldest dirty_since and move last_request_at."""
+        raise NotImplementedError
+
+    def update(self, changes: Dict[str, Any], expected_version: int = None) -> bool:
+        """
+        Apply changes (None removes a field).
+
+        Returns:
+            False if expected_version is given and the state moved on
+        """
+        raise NotImplementedError
+
+
+class MemoryIngestionStateStore(IngestionStateStore):
+    """State in process memory, for local runs and tests."""
+
+    name = 'memory'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.state = {'version': 0}
+
+    def get(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.state)
+
+    def mark_dirty(self, now: float) -> None:
+        with self.lock:
+            self.state.setdefault('dirty_since', now)
+            self.state['last_request_at'] = now
+            self.state['version'] += 1
+
+    def update(self, changes: Dict[str, Any], expected_version: int = None) -> bool:
+        with self.lock:
+            if expected_version is not None and self.state['version'] != expected_version:
+                return False
+            for field, value in changes.items():
+                if value is None:
+                    self.state.pop(field, None)
+                else:
+                    self.state[field] = value
+            self.state['version'] += 1
+            return True
+
+
+class DynamoDBIngestionStateStore(IngestionStateStore):
+    """State as one DynamoDB item per data source, updated conditionally."""
+
+    name = 'dynamodb'
+    NUMBER_FIELDS = {'dirty_since', 'last_request_at', 'job_started_at', 'version'}
+
+    def __init__(self, data_source: str, table_name: str = None, client=None):
+        self.table_name = table_name or os.environ.get('INGESTION_STATE_TABLE_NAME', '')
+        if not self.table_name:
+            raise ValueError("INGESTION_STATE_TABLE_NAME not configured")
+        self.key = {'data_source': {'S': data_source}}
+        self.client = client or boto3.client('dynamodb')
+
+    def get(self) -> Dict[str, Any]:
+        item = self.client.get_item(TableName=self.table_name, Key=self.key, ConsistentRead=True).get('Item', {})
+        state = {'version': 0}
+        for field, value in item.items():
+            if field in self.NUMBER_FIELDS:
+                state[field] = float(value['N']) if field != 'version' else int(value['N'])
+            elif field != 'data_source':
+                state[field] = value['S']
+        return state
+
+    def mark_dirty(self, now: float) -> None:
+        self.client.update_item(
+            TableName=self.table_name,
+            Key=self.key,
+            UpdateExpression=(
+                'SET dirty_since = if_not_exists(dirty_since, :now), last_request_at = :now '
+                'ADD version :one'
+            ),
+            ExpressionAttributeValues={':now': {'N': str(now)}, ':one': {'N': '1'}}
+        )
+
+    def update(self, changes: Dict[str, Any], expected_version: int = None) -> bool:
+        names, values, sets, removes = {}, {':one': {'N': '1'}}, [], []
+        for index, (field, value) in enumerate(changes.items()):
+            names[f'#f{index}'] = field
+            if value is None:
+                removes.append(f'#f{index}')
+            else:
+                values[f':v{index}'] = {'N': str(value)} if field in self.NUMBER_FIELDS else {'S': str(value)}
+                sets.append(f'#f{index} = :v{index}')
+
+        expression = 'ADD version :one'
+        if sets:
+            expression = f"SET {', '.join(sets)} {expression}"
+        if removes:
+            expression += f" REMOVE {', '.join(removes)}"
+
+        request = {
+            'TableName': self.table_name,
+            'Key': self.key,
+            'UpdateExpression': expression,
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+        if expected_version is not None:
+            values[':expected'] = {'N': str(expected_version)}
+            request['ConditionExpression'] = (
+                'attribute_not_exists(version) OR version = :expected' if expected_version == 0
+                else 'version = :expected'
+            )
+        try:
+            self.client.update_item(**request)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+
+class IngestionScheduler:
+    """Debounced, single-flight ingestion jobs for one Knowledge Base data source."""
+
+    def __init__(
+        self,
+        client,
+        knowledge_base_id: str,
+        data_source_id: str,
+        state: IngestionStateStore,
+        debounce_seconds: float = INGESTION_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = INGESTION_MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.client = client
+        self.knowledge_base_id = knowledge_base_id
+        self.data_source_id = data_source_id
+        self.state = state
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.clock = clock
+
+    def request(self) -> Optional[str]:
+        """
+        Record that the data source changed and start a job if one is due.
+
+        Returns:
+            ID of the job started or running, or None if the start is deferred
+        """
+        self.state.mark_dirty(self.clock())
+        return self.tick()
+
+    def tick(self) -> Optional[str]:
+        """
+        Reap a finished job and start the next one if changes are due.
+
+        Returns:
+            ID of the job started or running, or None
+        """
+        # Another container can move the state between our read and write;
+        # each conditional write that loses re-reads it
+        for _ in range(3):
+            state = self.state.get()
+            now = self.clock()
+            job_id = state.get('job_id')
+
+            if job_id:
+                if self._is_running(job_id, state, now):
+                    return job_id
+                if self.state.update({'job_id': None, 'job_started_at': None}, state['version']):
+                    logger.info(f"Ingestion job {job_id} finished")
+                continue
+
+            dirty_since = state.get('dirty_since')
+            if dirty_since is None:
+                return None
+
+            quiet = now - state.get('last_request_at', dirty_since) >= self.debounce_seconds
+            overdue = now - dirty_since >= self.max_delay_seconds
+            if not (quiet or overdue):
+                return None
+
+            # A job started outside the scheduler (console, older code) is adopted;
+            # the changes stay dirty for the follow-up job
+            running_job_id = self._find_running_job()
+            if running_job_id:
+                self.state.update({'job_id': running_job_id, 'job_started_at': now}, state['version'])
+                return running_job_id
+
+            # Claim the start; changes recorded from now on set dirty_since again
+            claim = {'job_id': PENDING_JOB_ID, 'job_started_at': now, 'dirty_since': None}
+            if not self.state.update(claim, state['version']):
+                continue
+            return self._start_job(dirty_since, now)
+
+        return None
+
+    def _start_job(self, dirty_since: float, now: float) -> Optional[str]:
+        try:
+            response = self.client.start_ingestion_job(
+                knowledgeBaseId=self.knowledge_base_id,
+                dataSourceId=self.data_source_id,
+                description='Ingesting processed healthcare documents after BDA completion'
+            )
+        except Exception as e:
+            logger.error(f"Error starting Knowledge Base ingestion: {e}")
+            # Keep the changes pending for the next tick
+            self.state.update({'job_id': None, 'job_started_at': None, 'dirty_since': dirty_since})
+            return None
+
+        job_id = response.get('ingestionJob', {}).get('ingestionJobId')
+        self.state.update({'job_id': job_id})
+        logger.info(
+            f"Started Knowledge Base ingestion job: {job_id} "
+            f"(changes pending for {now - dirty_since:.0f}s)"
+        )
+        return job_id
+
+    def _is_running(self, job_id: str, state: Dict[str, Any], now: float) -> bool:
+        if job_id == PENDING_JOB_ID:
+            return now - state.get('job_started_at', 0) < PENDING_JOB_TIMEOUT_SECONDS
+        try:
+            response = self.client.get_ingestion_job(
+                knowledgeBaseId=self.knowledge_base_id,
+                dataSourceId=self.data_source_id,
+                ingestionJobId=job_id
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                return False
+            raise
+        return response.get('ingestionJob', {}).get('status') in RUNNING_JOB_STATUSES
+
+    def _find_running_job(self) -> Optional[str]:
+        response = self.client.list_ingestion_jobs(
+            knowledgeBaseId=self.knowledge_base_id,
+            dataSourceId=self.data_source_id,
+            filters=[{'attribute': 'STATUS', 'operator': 'EQ', 'values': ['STARTING', 'IN_PROGRESS']}],
+            maxResults=10
+        )
+        jobs = response.get('ingestionJobSummaries', [])
+        return jobs[0].get('ingestionJobId') if jobs else None
+
+
+def create_ingestion_scheduler(client, ssm_client, backend: str = None) -> Optional[IngestionScheduler]:
+    """
+    Create the scheduler for the Knowledge Base configured in SSM.
+
+    Args:
+        client: bedrock-agent client
+        ssm_client: SSM client used to read the Knowledge Base configuration
+        backend: State store, 'dynamodb' (default) or 'memory'
+
+    Returns:
+        IngestionScheduler, or None when no Knowledge Base is configured
+    """
+    config = load_knowledge_base_config(ssm_client)
+    knowledge_base_id = config['knowledge_base_id']
+    data_source_id = config['data_source_id']
+    if not knowledge_base_id or not data_source_id:
+        return None
+
+    backend = (backend or os.environ.get('INGESTION_STATE_BACKEND') or DynamoDBIngestionStateStore.name).lower()
+    if backend == MemoryIngestionStateStore.name:
+        state = MemoryIngestionStateStore()
+    elif backend == DynamoDBIngestionStateStore.name:
+        state = DynamoDBIngestionStateStore(f"{knowledge_base_id}/{data_source_id}")
+    else:
+        raise ValueError(f"Unknown ingestion state backend: {backend}")
+
+    return IngestionScheduler(client, knowledge_base_id, data_source_id, state)
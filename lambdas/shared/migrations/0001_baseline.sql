@@ -1,16 +1,12 @@
--- Healthcare Management System Database Schema
--- This file documents the expected database schema for the healthcare system
--- Tables will be created automatically when first accessed by the application
+-- Baseline schema for the healthcare system.
+-- Idempotent so it can be recorded on databases created before migrations existed.
 
--- Patients table (simplified for demo)
--- cedula: National ID number (nullable for existing records)
 CREATE TABLE IF NOT EXISTS patients (
     patient_id VARCHAR(255) PRIMARY KEY,
     first_name VARCHAR(200),
     last_name VARCHAR(200),
     full_name VARCHAR(200) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
-    cedula VARCHAR(50) UNIQUE,
     date_of_birth DATE,
     phone VARCHAR(20),
     age INTEGER,
@@ -25,7 +21,6 @@ CREATE TABLE IF NOT EXISTS patients (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Medics table (simplified for demo)
 CREATE TABLE IF NOT EXISTS medics (
     medic_id VARCHAR(255) PRIMARY KEY,
     first_name VARCHAR(200) NOT NULL,
@@ -38,7 +33,6 @@ CREATE TABLE IF NOT EXISTS medics (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Exams table
 CREATE TABLE IF NOT EXISTS exams (
     exam_id VARCHAR(255) PRIMARY KEY,
     exam_name VARCHAR(200) NOT NULL UNIQUE,
@@ -50,7 +44,6 @@ CREATE TABLE IF NOT EXISTS exams (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Reservations table
 CREATE TABLE IF NOT EXISTS reservations (
     reservation_id VARCHAR(255) PRIMARY KEY,
     patient_id VARCHAR(255) NOT NULL REFERENCES patients(patient_id) ON DELETE CASCADE,
@@ -65,14 +58,20 @@ CREATE TABLE IF NOT EXISTS reservations (
     UNIQUE(medic_id, reservation_date, reservation_time)
 );
 
+CREATE TABLE IF NOT EXISTS processed_documents (
+    document_id VARCHAR(255) PRIMARY KEY,
+    patient_id VARCHAR(255) REFERENCES patients(patient_id) ON DELETE SET NULL,
+    extracted_data JSONB NOT NULL,
+    s3_uri VARCHAR(500) NOT NULL,
+    processing_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
 
-
--- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_patients_email ON patients(email);
 CREATE INDEX IF NOT EXISTS idx_patients_first_name ON patients(first_name);
 CREATE INDEX IF NOT EXISTS idx_patients_last_name ON patients(last_name);
 CREATE INDEX IF NOT EXISTS idx_patients_full_name ON patients(full_name);
-CREATE INDEX IF NOT EXISTS idx_patients_cedula ON patients(cedula);
 CREATE INDEX IF NOT EXISTS idx_medics_email ON medics(email);
 CREATE INDEX IF NOT EXISTS idx_medics_first_name ON medics(first_name);
 CREATE INDEX IF NOT EXISTS idx_medics_specialization ON medics(specialization);
@@ -83,33 +82,3 @@ CREATE INDEX IF NOT EXISTS idx_reservations_date ON reservations(reservation_dat
 CREATE INDEX IF NOT EXISTS idx_reservations_status ON reservations(status);
 CREATE INDEX IF NOT EXISTS idx_processed_documents_patient ON processed_documents(patient_id);
 CREATE INDEX IF NOT EXISTS idx_processed_documents_processing_date ON processed_documents(processing_date);
-
-
--- Processed documents table for document workflow
-CREATE TABLE IF NOT EXISTS processed_documents (
-    document_id VARCHAR(255) PRIMARY KEY,
-    patient_id VARCHAR(255) REFERENCES patients(patient_id) ON DELETE SET NULL,
-    extracted_data JSONB NOT NULL,
-    s3_uri VARCHAR(500) NOT NULL,
-    processing_date TIMESTAMP WITH TIME ZONE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
--- Knowledge base table for Bedrock Knowledge Base
--- This table must have the exact schema expected by Bedrock Knowledge Base
--- Enable the vector extension first
-CREATE EXTENSION IF NOT EXISTS vector;
-
--- Create the knowledge base table with the correct schema
-CREATE TABLE IF NOT EXISTS ab2_knowledge_base (
-    pk UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    text TEXT NOT NULL,
-    vector vector(1024) NOT NULL,
-    metadata JSONB,
-    custom_metadata JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
--- Create index for vector similarity search
-CREATE INDEX IF NOT EXISTS idx_ab2_knowledge_base_vector ON ab2_knowledge_base USING ivfflat (vector vector_cosine_ops) WITH (lists = 100);
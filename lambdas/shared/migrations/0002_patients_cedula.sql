@@ -0,0 +1,4 @@
+-- cedula: National ID number (nullable for existing records)
+ALTER TABLE patients ADD COLUMN IF NOT EXISTS cedula VARCHAR(50) UNIQUE;
+
+CREATE INDEX IF NOT EXISTS idx_patients_cedula ON patients(cedula);
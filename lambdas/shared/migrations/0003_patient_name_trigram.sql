@@ -0,0 +1,18 @@
+-- Accent- and case-insensitive fuzzy name search for patient lookup
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() is only STABLE because it resolves its dictionary through the
+-- search_path; pinning the dictionary makes the wrapper safe to index
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+-- Lower-cased, unaccented name with collapsed whitespace ("  José  Pérez" -> "jose perez")
+CREATE OR REPLACE FUNCTION normalize_name(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.f_unaccent(regexp_replace(btrim($1), '\s+', ' ', 'g'))) $$;
+
+CREATE INDEX IF NOT EXISTS idx_patients_full_name_trgm
+    ON patients USING gin (normalize_name(full_name) gin_trgm_ops);
@@ -0,0 +1,20 @@
+-- Normalized forms of the exact-match lookup keys, each backed by an expression index.
+-- patient_lookup normalizes its inputs the same way (see normalize_* in patient_lookup/index.py).
+
+-- E.164 digits without '+': separators dropped, '00' international prefix removed,
+-- 10-digit national numbers prefixed with the default country code (57)
+CREATE OR REPLACE FUNCTION normalize_phone(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$
+    SELECT CASE WHEN length(digits) = 10 THEN '57' || digits ELSE NULLIF(digits, '') END
+    FROM (SELECT regexp_replace(regexp_replace($1, '\D', '', 'g'), '^00', '') AS digits) AS normalized
+    $$;
+
+-- National ID without whitespace, dots or dashes
+CREATE OR REPLACE FUNCTION normalize_cedula(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT upper(regexp_replace($1, '[\s.\-]', '', 'g')) $$;
+
+CREATE INDEX IF NOT EXISTS idx_patients_email_lower ON patients (lower(email));
+CREATE INDEX IF NOT EXISTS idx_patients_phone_normalized ON patients (normalize_phone(phone));
+CREATE INDEX IF NOT EXISTS idx_patients_cedula_normalized ON patients (normalize_cedula(cedula));
@@ -0,0 +1,76 @@
+-- A medic cannot have two active reservations whose time ranges overlap. The
+-- exclusion constraint enforces this atomically, so concurrent bookings cannot
+-- both succeed; it replaces the exact-start-time UNIQUE constraint, which also
+-- blocked rebooking a cancelled slot.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Length of the booked slot, copied from the exam when the reservation is made
+ALTER TABLE reservations ADD COLUMN IF NOT EXISTS duration_minutes INTEGER;
+
+UPDATE reservations r
+SET duration_minutes = COALESCE(e.duration_minutes, 30)
+FROM exams e
+WHERE e.exam_id = r.exam_id AND r.duration_minutes IS NULL;
+
+UPDATE reservations SET duration_minutes = 30 WHERE duration_minutes IS NULL;
+
+ALTER TABLE reservations
+    ALTER COLUMN duration_minutes SET DEFAULT 30,
+    ALTER COLUMN duration_minutes SET NOT NULL,
+    ADD CONSTRAINT reservations_duration_positive CHECK (duration_minutes > 0);
+
+-- Half-open [start, end) range of a reservation
+CREATE OR REPLACE FUNCTION reservation_period(DATE, TIME, INTEGER) RETURNS tsrange
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT tsrange($1 + $2, $1 + $2 + make_interval(mins => $3)) $$;
+
+-- Bookings made under the exact-start-time constraint can overlap once they
+-- take their exam's duration. Keep every booking and shorten each one to end
+-- when the medic's next active booking starts; start times are still unique
+-- here, so the next booking is the only one it can run into.
+WITH active AS (
+    SELECT reservation_id,
+           reservation_date + reservation_time AS starts_at,
+           LEAD(reservation_date + reservation_time) OVER (
+               PARTITION BY medic_id ORDER BY reservation_date, reservation_time
+           ) AS next_starts_at
+    FROM reservations
+    WHERE status IN ('scheduled', 'confirmed')
+)
+UPDATE reservations r
+SET duration_minutes = GREATEST(FLOOR(EXTRACT(EPOCH FROM a.next_starts_at - a.starts_at) / 60)::integer, 1)
+FROM active a
+WHERE a.reservation_id = r.reservation_id
+  AND a.next_starts_at < a.starts_at + make_interval(mins => r.duration_minutes);
+
+-- Anything still overlapping (starts less than a minute apart) needs a person
+-- to cancel or move it; report it instead of failing on the constraint below
+DO $$
+DECLARE
+    conflicts TEXT;
+BEGIN
+    SELECT string_agg(format('%s and %s (medic %s)', a.reservation_id, b.reservation_id, a.medic_id), '; ')
+    INTO conflicts
+    FROM reservations a
+    JOIN reservations b
+      ON b.medic_id = a.medic_id
+     AND b.reservation_id > a.reservation_id
+     AND reservation_period(b.reservation_date, b.reservation_time, b.duration_minutes)
+         && reservation_period(a.reservation_date, a.reservation_time, a.duration_minutes)
+    WHERE a.status IN ('scheduled', 'confirmed') AND b.status IN ('scheduled', 'confirmed');
+
+    IF conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'Overlapping active reservations: %. Cancel or move them, then rerun the migration', conflicts;
+    END IF;
+END
+$$;
+
+ALTER TABLE reservations
+    ADD CONSTRAINT reservations_medic_no_overlap
+    EXCLUDE USING gist (
+        medic_id WITH =,
+        reservation_period(reservation_date, reservation_time, duration_minutes) WITH &&
+    )
+    WHERE (status IN ('scheduled', 'confirmed'));
+
+ALTER TABLE reservations DROP CONSTRAINT IF EXISTS reservations_medic_id_reservation_date_reservation_time_key;
@@ -0,0 +1,7 @@
+-- Active reservations of a medic by date and time. Serves the availability
+-- searches (find_available_slots reads each candidate medic's active bookings
+-- in a date range) and replaces the lookup path of the exact-start-time UNIQUE
+-- index dropped in 0005. Partial, so cancelled and completed rows stay out.
+CREATE INDEX IF NOT EXISTS idx_reservations_medic_active
+    ON reservations (medic_id, reservation_date, reservation_time)
+    WHERE status IN ('scheduled', 'confirmed');
@@ -0,0 +1,13 @@
+-- Sort keys of the list endpoints, which page with keyset conditions such as
+-- (full_name, patient_id) > (:cursor_name, :cursor_id). Each index matches the
+-- ORDER BY of its list query and supersedes the single-column index it replaces.
+-- exams is ordered by its UNIQUE exam_name and needs nothing new.
+CREATE INDEX IF NOT EXISTS idx_patients_full_name_keyset ON patients (full_name, patient_id);
+DROP INDEX IF EXISTS idx_patients_full_name;
+
+CREATE INDEX IF NOT EXISTS idx_medics_first_name_keyset ON medics (first_name, medic_id);
+DROP INDEX IF EXISTS idx_medics_first_name;
+
+-- Read backwards for ORDER BY reservation_date DESC, reservation_time DESC, reservation_id DESC
+CREATE INDEX IF NOT EXISTS idx_reservations_date_keyset ON reservations (reservation_date, reservation_time, reservation_id);
+DROP INDEX IF EXISTS idx_reservations_date;
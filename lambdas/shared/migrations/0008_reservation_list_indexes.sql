@@ -0,0 +1,16 @@
+-- Filtered reservation listings: an equality filter followed by the list sort
+-- key, so WHERE <filter> [AND reservation_date range] ORDER BY reservation_date
+-- DESC, reservation_time DESC, reservation_id DESC LIMIT n is one backward
+-- index range scan that stops after n rows. They supersede the single-column
+-- indexes on the same filter columns (foreign key lookups use the prefix).
+CREATE INDEX IF NOT EXISTS idx_reservations_patient_date
+    ON reservations (patient_id, reservation_date, reservation_time, reservation_id);
+DROP INDEX IF EXISTS idx_reservations_patient;
+
+CREATE INDEX IF NOT EXISTS idx_reservations_medic_date
+    ON reservations (medic_id, reservation_date, reservation_time, reservation_id);
+DROP INDEX IF EXISTS idx_reservations_medic;
+
+CREATE INDEX IF NOT EXISTS idx_reservations_status_date
+    ON reservations (status, reservation_date, reservation_time, reservation_id);
+DROP INDEX IF EXISTS idx_reservations_status;
@@ -0,0 +1,29 @@
+-- Document listing served from processed_documents instead of a vector
+-- retrieve on the knowledge base. The extraction function upserts one row per
+-- document; the files API lists them newest first with keyset pages on
+-- (processing_date, document_id), optionally filtered by patient and category.
+ALTER TABLE processed_documents
+    ADD COLUMN IF NOT EXISTS file_name VARCHAR(500),
+    ADD COLUMN IF NOT EXISTS content_type VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS size_bytes BIGINT,
+    ADD COLUMN IF NOT EXISTS category VARCHAR(50) NOT NULL DEFAULT 'other',
+    ADD COLUMN IF NOT EXISTS original_classification VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS classification_confidence NUMERIC(5, 2) NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS auto_classified BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS has_diagnoses BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS has_symptoms BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS has_medications BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS has_vital_signs BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Read backwards for ORDER BY processing_date DESC, document_id DESC. They
+-- supersede the single-column indexes (foreign key lookups use the prefix).
+CREATE INDEX IF NOT EXISTS idx_processed_documents_patient_date
+    ON processed_documents (patient_id, processing_date, document_id);
+DROP INDEX IF EXISTS idx_processed_documents_patient;
+
+CREATE INDEX IF NOT EXISTS idx_processed_documents_patient_category_date
+    ON processed_documents (patient_id, category, processing_date, document_id);
+
+CREATE INDEX IF NOT EXISTS idx_processed_documents_date_keyset
+    ON processed_documents (processing_date, document_id);
+DROP INDEX IF EXISTS idx_processed_documents_processing_date;
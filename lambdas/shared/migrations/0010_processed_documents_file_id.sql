@@ -0,0 +1,26 @@
+-- processed_documents was keyed by document_id, the uploaded file name without
+-- its extension, so two patients uploading scan.pdf shared one row and the
+-- second document was never listed. Rows are now keyed by the file ID of the
+-- upload; existing rows keep their document ID as file ID, so the IDs already
+-- returned by the files API stay valid.
+ALTER TABLE processed_documents ADD COLUMN IF NOT EXISTS file_id VARCHAR(255);
+
+UPDATE processed_documents SET file_id = document_id WHERE file_id IS NULL;
+
+ALTER TABLE processed_documents
+    ALTER COLUMN file_id SET NOT NULL,
+    DROP CONSTRAINT processed_documents_pkey,
+    ADD CONSTRAINT processed_documents_pkey PRIMARY KEY (file_id);
+
+-- Keyset pages break processing_date ties on file_id
+DROP INDEX IF EXISTS idx_processed_documents_patient_date;
+CREATE INDEX IF NOT EXISTS idx_processed_documents_patient_date
+    ON processed_documents (patient_id, processing_date, file_id);
+
+DROP INDEX IF EXISTS idx_processed_documents_patient_category_date;
+CREATE INDEX IF NOT EXISTS idx_processed_documents_patient_category_date
+    ON processed_documents (patient_id, category, processing_date, file_id);
+
+DROP INDEX IF EXISTS idx_processed_documents_date_keyset;
+CREATE INDEX IF NOT EXISTS idx_processed_documents_date_keyset
+    ON processed_documents (processing_date, file_id);
@@ -0,0 +1,464 @@
+"""
+Native PostgreSQL backend for the Healthcare System DatabaseManager.
+
+Executes statements over a pooled psycopg2 connection instead of one HTTPS
+call to the RDS Data API per statement. The pool lives at module level so it
+survives warm Lambda invocations. Responses and errors mimic the Data API
+(records/columnMetadata, BadRequestException, ...) so handlers behave the same
+on either backend.
+
+Configuration (environment variables):
+- DATABASE_BACKEND=postgres selects this backend (see shared.database.create_backend)
+- DATABASE_DSN: full libpq connection string; when unset, credentials are read
+  from the cluster secret published in SSM (/healthcare/database/secret-arn)
+- DATABASE_HOST: optional host override, e.g. an RDS Proxy endpoint
+- DATABASE_SSLMODE: libpq sslmode when connecting from the secret (default 'require')
+- DATABASE_POOL_MAX: maximum pooled connections per container (default 4)
+- DATABASE_CONNECT_TIMEOUT: connection timeout in seconds (default 5)
+- DATABASE_STATEMENT_TIMEOUT_MS: optional server-side statement timeout
+
+The function must be able to reach the cluster over the network (VPC-attached
+Lambda or RDS Proxy) and needs psycopg2 packaged, e.g. as a layer.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+import boto3
+
+from shared.database import DatabaseBackend, DatabaseError, load_database_config
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+    import psycopg2.pool
+except ImportError:  # pragma: no cover - depends on the deployment package
+    psycopg2 = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX = 4
+DEFAULT_CONNECT_TIMEOUT = 5
+
+# Module-level pool shared by every backend instance in this container
+_pool = None
+_pool_lock = threading.Lock()
+
+# PostgreSQL type OIDs mapped to the type names reported by the Data API
+_OID_TYPE_NAMES = {
+    16: 'bool', 17: 'bytea', 19: 'name', 20: 'int8', 21: 'int2', 23: 'int4',
+    25: 'text', 26: 'oid', 114: 'json', 700: 'float4', 701: 'float8',
+    1042: 'bpchar', 1043: 'varchar', 1082: 'date', 1083: 'time',
+    1114: 'timestamp', 1184: 'timestamptz', 1700: 'numeric', 2950: 'uuid',
+    3802: 'jsonb',
+}
+
+# String literals, '::' casts, ':name' placeholders and bare '%' signs
+_SQL_TOKEN_PATTERN = re.compile(r"('(?:[^']|'')*')|(::)|:([A-Za-z_][A-Za-z0-9_]*)|(%)")
+
+
+@lru_cache(maxsize=256)
+def translate_sql(sql: str) -> str:
+    """
+    Translate Data API style ':name' placeholders into psycopg2 '%(name)s' ones.
+
+    '::type' casts and the contents of string literals are left untouched, and
+    literal '%' signs are escaped for psycopg2's pyformat interpolation.
+    """
+    def replace(match):
+        literal, cast, name, percent = match.groups()
+        if literal is not None:
+            return literal.replace('%', '%%')
+        if cast is not None:
+            return cast
+        if name is not None:
+            return f'%({name})s'
+        return '%%'
+
+    return _SQL_TOKEN_PATTERN.sub(replace, sql)
+
+
+def _parameter_value(value: Dict[str, Any]) -> Any:
+    """Convert a Data API parameter value dictionary into a Python value."""
+    if value.get('isNull'):
+        return None
+    if 'blobValue' in value:
+        return psycopg2.Binary(value['blobValue'])
+    if 'arrayValue' in value:
+        for values in value['arrayValue'].values():
+            return values
+    for raw in value.values():
+        return raw
+
+
+def _to_field(value: Any) -> Dict[str, Any]:
+    """Encode a Python value as a Data API record field."""
+    if value is None:
+        return {'isNull': True}
+    if isinstance(value, bool):
+        return {'booleanValue': value}
+    if isinstance(value, int):
+        return {'longValue': value}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, str):
+        return {'stringValue': value}
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return {'stringValue': value.isoformat(sep=' ')}
+    if isinstance(value, (date, time)):
+        return {'stringValue': value.isoformat()}
+    if isinstance(value, (dict, list)):
+        return {'stringValue': json.dumps(value)}
+    if isinstance(value, (bytes, memoryview)):
+        return {'blobValue': bytes(value)}
+    # Decimal, UUID and anything else travel as strings, as with the Data API
+    return {'stringValue': str(value)}
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the way the Data API formats them in JSON results."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode('latin-1')
+    return str(value)
+
+
+def _database_error(
+    error: Exception,
+    action: str = "Database query failed",
+    connecting: bool = False
+) -> DatabaseError:
+    """Map a psycopg2 error to a DatabaseError carrying the Data API error code."""
+    if isinstance(error, psycopg2.pool.PoolError):
+        error_code = 'TooManyRequestsException'
+    elif isinstance(error, psycopg2.extensions.QueryCanceledError):
+        error_code = 'StatementTimeoutException'
+    elif isinstance(error, psycopg2.OperationalError) and not error.pgcode:
+        # Connection-level failure (network, server restart, resume in progress).
+        # Only a failed connect guarantees the statement was never sent, so only
+        # that case gets the retryable resume code.
+        error_code = 'DatabaseUnavailableException' if connecting else 'ServiceUnavailableError'
+    else:
+        error_code = 'BadRequestException'
+
+    message = (getattr(error, 'pgerror', None) or str(error)).strip()
+    return DatabaseError(f"{action}: {message}", error_code, error)
+
+
+class PostgresBackend(DatabaseBackend):
+    """Backend that runs statements over a pooled native PostgreSQL connection."""
+
+    name = 'postgres'
+
+    def __init__(
+        self,
+        cluster_arn: str = None,
+        secret_arn: str = None,
+        database_name: str = None
+    ):
+        if psycopg2 is None:
+            raise DatabaseError(
+                "The postgres backend requires psycopg2 to be installed",
+                "DRIVER_NOT_AVAILABLE"
+            )
+
+        self._cluster_arn = cluster_arn
+        self._secret_arn = secret_arn
+        self._database_name = database_name
+        self._connection_kwargs = None
+
+        # Connections checked out for open transactions, keyed by transaction ID
+        self._transactions = {}
+        self._transactions_lock = threading.Lock()
+
+    def _resolve_connection_kwargs(self) -> Dict[str, Any]:
+        """Build psycopg2 connection arguments from DATABASE_DSN or the cluster secret."""
+        if self._connection_kwargs is not None:
+            return self._connection_kwargs
+
+        options = '-c timezone=UTC'
+        statement_timeout = os.environ.get('DATABASE_STATEMENT_TIMEOUT_MS')
+        if statement_timeout:
+            options += f' -c statement_timeout={int(statement_timeout)}'
+
+        kwargs = {
+            'connect_timeout': int(os.environ.get('DATABASE_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)),
+            'options': options,
+            'application_name': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'healthcare'),
+        }
+
+        dsn = os.environ.get('DATABASE_DSN')
+        if dsn:
+            kwargs['dsn'] = dsn
+        else:
+            if not all([self._cluster_arn, self._secret_arn, self._database_name]):
+                config = load_database_config(boto3.client('ssm'))
+                self._cluster_arn = self._cluster_arn or config['cluster_arn']
+                self._secret_arn = self._secret_arn or config['secret_arn']
+                self._database_name = self._database_name or config['database_name']
+
+            try:
+                secret = json.loads(
+                    boto3.client('secretsmanager').get_secret_value(
+                        SecretId=self._secret_arn
+                    )['SecretString']
+                )
+            except Exception as e:
+                logger.error(f"Failed to read database credentials: {e}")
+                raise DatabaseError(
+                    "Failed to retrieve database credentials",
+                    "CONFIG_ERROR",
+                    e
+                )
+
+            kwargs.update({
+                'host': os.environ.get('DATABASE_HOST') or secret['host'],
+                'port': int(secret.get('port', 5432)),
+                'user': secret['username'],
+                'password': secret['password'],
+                'dbname': self._database_name,
+                'sslmode': os.environ.get('DATABASE_SSLMODE', 'require'),
+            })
+
+        self._connection_kwargs = kwargs
+        return kwargs
+
+    def _get_pool(self):
+        """Return the module-level connection pool, creating it on first use."""
+        global _pool
+        if _pool is None:
+            with _pool_lock:
+                if _pool is None:
+                    kwargs = self._resolve_connection_kwargs()
+                    max_connections = int(os.environ.get('DATABASE_POOL_MAX', DEFAULT_POOL_MAX))
+                    try:
+                        _pool = psycopg2.pool.ThreadedConnectionPool(1, max_connections, **kwargs)
+                    except psycopg2.Error as e:
+                        raise _database_error(e, "Failed to connect to database", connecting=True)
+                    logger.info(f"Created PostgreSQL connection pool (max {max_connections} connections)")
+        return _pool
+
+    def _checkout(self, autocommit: bool):
+        """Take a healthy connection from the pool."""
+        pool = self._get_pool()
+        try:
+            connection = pool.getconn()
+            if connection.closed:
+                pool.putconn(connection, close=True)
+                connection = pool.getconn()
+            connection.autocommit = autocommit
+            return connection
+        except psycopg2.Error as e:
+            raise _database_error(e, "Failed to connect to database", connecting=True)
+
+    def _release(self, connection, error: Exception = None) -> None:
+        """Return a connection to the pool, discarding it after connection-level errors."""
+        broken = connection.closed or (
+            isinstance(error, psycopg2.OperationalError) and not error.pgcode
+        )
+        try:
+            self._get_pool().putconn(connection, close=bool(broken))
+        except psycopg2.pool.PoolError:
+            connection.close()
+
+    def _transaction_connection(self, transaction_id: str):
+        with self._transactions_lock:
+            connection = self._transactions.get(transaction_id)
+        if connection is None:
+            raise DatabaseError(
+                f"Transaction {transaction_id} is not active",
+                "TRANSACTION_ERROR"
+            )
+        return connection
+
+    def _run(self, sql: str, parameters: List[Dict[str, Any]], transaction_id: str, handler):
+        """Execute one statement and pass the cursor to handler for result extraction."""
+        if parameters:
+            query = translate_sql(sql)
+            variables = {param['name']: _parameter_value(param['value']) for param in parameters}
+        else:
+            query, variables = sql, None
+
+        if transaction_id:
+            connection = self._transaction_connection(transaction_id)
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, variables)
+                    return handler(cursor)
+            except psycopg2.Error as e:
+                raise _database_error(e)
+
+        connection = self._checkout(autocommit=True)
+        error = None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(query, variables)
+                return handler(cursor)
+        except psycopg2.Error as e:
+            error = e
+            raise _database_error(e)
+        finally:
+            self._release(connection, error)
+
+    def get_config(self) -> Dict[str, str]:
+        """Return the resolved connection target (credentials are never included)."""
+        kwargs = self._resolve_connection_kwargs()
+        if 'dsn' in kwargs:
+            dsn = psycopg2.extensions.parse_dsn(kwargs['dsn'])
+            return {'host': dsn.get('host', 'localhost'), 'database_name': dsn.get('dbname', '')}
+        return {'host': kwargs['host'], 'database_name': kwargs['dbname']}
+
+    def execute_statement(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None,
+        transaction_id: str = None,
+        result_format: str = 'records'
+    ) -> Dict[str, Any]:
+        """Execute one statement and return a Data API shaped response."""
+        def build_response(cursor):
+            if cursor.description is None:
+                return {'numberOfRecordsUpdated': max(cursor.rowcount, 0)}
+
+            rows = cursor.fetchall()
+            names = [column.name for column in cursor.description]
+            is_select = (cursor.statusmessage or '').upper().startswith('SELECT')
+            response = {'numberOfRecordsUpdated': 0 if is_select else max(cursor.rowcount, 0)}
+
+            if result_format == 'json':
+                response['formattedRecords'] = json.dumps(
+                    [dict(zip(names, row)) for row in rows], default=_json_default
+                )
+            else:
+                response['columnMetadata'] = [
+                    {
+                        'name': column.name,
+                        'label': column.name,
+                        'typeName': _OID_TYPE_NAMES.get(column.type_code, 'unknown')
+                    }
+                    for column in cursor.description
+                ]
+                response['records'] = [[_to_field(value) for value in row] for row in rows]
+            return response
+
+        return self._run(sql, parameters, transaction_id, build_response)
+
+    def fetch_rows(
+        self,
+        sql: str,
+        parameters: List[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run a SELECT and return rows typed by psycopg2 (dict, date, datetime, Decimal)."""
+        def build_rows(cursor):
+            if cursor.description is None:
+                return []
+            names = [column.name for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+        return self._run(sql, parameters, None, build_rows)
+
+    def batch_execute_statement(
+        self,
+        sql: str,
+        parameter_sets: List[List[Dict[str, Any]]],
+        transaction_id: str = None
+    ) -> Dict[str, Any]:
+        """Execute one statement for many parameter sets on a single connection."""
+        query = translate_sql(sql)
+        variables = [
+            {param['name']: _parameter_value(param['value']) for param in parameters}
+            for parameters in parameter_sets
+        ]
+
+        def run(cursor):
+            cursor.executemany(query, variables)
+            return {'updateResults': [{} for _ in parameter_sets]}
+
+        if transaction_id:
+            connection = self._transaction_connection(transaction_id)
+            try:
+                with connection.cursor() as cursor:
+                    return run(cursor)
+            except psycopg2.Error as e:
+                raise _database_error(e, "Database batch failed")
+
+        # Without a transaction the batch is still applied atomically
+        connection = self._checkout(autocommit=False)
+        error = None
+        try:
+            with connection.cursor() as cursor:
+                response = run(cursor)
+            connection.commit()
+            return response
+        except psycopg2.Error as e:
+            error = e
+            connection.rollback()
+            raise _database_error(e, "Database batch failed")
+        finally:
+            self._release(connection, error)
+
+    def begin_transaction(self) -> str:
+        """Check out a connection dedicated to a new transaction."""
+        connection = self._checkout(autocommit=False)
+        transaction_id = str(uuid.uuid4())
+        with self._transactions_lock:
+            self._transactions[transaction_id] = connection
+        return transaction_id
+
+    def _finish_transaction(self, transaction_id: str, commit: bool) -> None:
+        with self._transactions_lock:
+            connection = self._transactions.pop(transaction_id, None)
+        if connection is None:
+            raise DatabaseError(
+                f"Transaction {transaction_id} is not active",
+                "TRANSACTION_ERROR"
+            )
+
+        error = None
+        try:
+            if commit:
+                connection.commit()
+            else:
+                connection.rollback()
+        except psycopg2.Error as e:
+            error = e
+            action = "commit" if commit else "rollback"
+            raise DatabaseError(
+                f"Failed to {action} transaction: {str(e).strip()}",
+                "TRANSACTION_ERROR",
+                e
+            )
+        finally:
+            self._release(connection, error)
+
+    def commit_transaction(self, transaction_id: str) -> None:
+        """Commit the transaction and return its connection to the pool."""
+        self._finish_transaction(transaction_id, commit=True)
+
+    def rollback_transaction(self, transaction_id: str) -> None:
+        """Roll back the transaction and return its connection to the pool."""
+        self._finish_transaction(transaction_id, commit=False)
+
+
+def close_pool() -> None:
+    """Close every pooled connection (used by tests and benchmarks)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
@@ -0,0 +1,295 @@
+"""
+Lock and idempotency store for the document workflow.
+
+The BDA trigger takes a lock on (bucket, key, etag) before starting a job and
+the extraction function moves it to 'processed' when the results are stored.
+The ETag identifies the uploaded content, so a re-upload of the same key is a
+new item while duplicate and metadata-only events for the same content are
+skipped. Locks are taken with a conditional write; a 'processing' lock older
+than its TTL (a stuck or lost job) can be taken over.
+
+Configuration (environment variables):
+- PROCESSING_LOCK_BACKEND: 'dynamodb' (default) or 'sqlite'
+- PROCESSING_LOCK_TABLE_NAME: DynamoDB table (partition key object_id, sort key etag)
+- PROCESSING_LOCK_SQLITE_PATH: database file for the sqlite backend (default ':memory:')
+- PROCESSING_LOCK_TTL_SECONDS: age after which a 'processing' lock can be taken over (default 1800)
+- PROCESSING_LOCK_RETENTION_DAYS: how long items are kept, through the table TTL (default 30)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+# Lock states
+PROCESSING = 'processing'
+PROCESSED = 'processed'
+ACQUIRED = 'acquired'
+
+PROCESSING_LOCK_TTL_SECONDS = int(os.environ.get('PROCESSING_LOCK_TTL_SECONDS', '1800'))
+PROCESSING_LOCK_RETENTION_DAYS = int(os.environ.get('PROCESSING_LOCK_RETENTION_DAYS', '30'))
+
+
+class ProcessingLockError(Exception):
+    """Custom exception for lock store errors."""
+
+    def __init__(self, message: str, error_code: str = None, original_error: Exception = None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.original_error = original_error
+
+
+def object_id(bucket: str, key: str) -> str:
+    """Item key for an S3 object."""
+    return f"s3://{bucket}/{key}"
+
+
+def normalize_etag(etag: str) -> str:
+    """ETags come quoted from head_object and unquoted in S3 events."""
+    return (etag or '').strip('"')
+
+
+class ProcessingLockStore:
+    """
+    Interface of the lock and idempotency store.
+
+    Status transitions: (none) -> processing -> processed. A 'processing'
+    lock can be released by its owner (the job could not be started) or
+    taken over by anyone once expired.
+    """
+
+    name = 'base'
+
+    def __init__(
+        self,
+        lock_ttl_seconds: int = PROCESSING_LOCK_TTL_SECONDS,
+        retention_days: int = PROCESSING_LOCK_RETENTION_DAYS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.retention_seconds = retention_days * 24 * 3600
+        self.clock = clock
+
+    def acquire(self, bucket: str, key: str, etag: str, owner: str) -> str:
+        """
+        Take the processing lock for an object version.
+
+        Returns:
+            ACQUIRED, or the current status (PROCESSING or PROCESSED) when
+            the lock is held or the object was already processed
+
+        Raises:
+            ProcessingLockError: If the store cannot be reached
+        """
+        raise NotImplementedError
+
+    def mark_processed(self, bucket: str, key: str, etag: str) -> None:
+        """Record that an object version was processed."""
+        raise NotImplementedError
+
+    def release(self, bucket: str, key: str, etag: str, owner: str) -> None:
+        """Drop a 'processing' lock held by owner so the object can be retried."""
+        raise NotImplementedError
+
+    def get_status(self, bucket: str, key: str, etag: str) -> Optional[str]:
+        """Current status of an object version, or None if unknown."""
+        raise NotImplementedError
+
+
+class DynamoDBProcessingLockStore(ProcessingLockStore):
+    """Lock store on a DynamoDB table with conditional writes."""
+
+    name = 'dynamodb'
+
+    def __init__(self, table_name: str = None, client=None, **options):
+        super().__init__(**options)
+        self.table_name = table_name or os.environ.get('PROCESSING_LOCK_TABLE_NAME', '')
+        if not self.table_name:
+            raise ProcessingLockError("PROCESSING_LOCK_TABLE_NAME not configured", "MISSING_CONFIGURATION")
+        self.client = client or boto3.client('dynamodb')
+
+    def _item_key(self, bucket: str, key: str, etag: str) -> Dict[str, Any]:
+        return {'object_id': {'S': object_id(bucket, key)}, 'etag': {'S': normalize_etag(etag)}}
+
+    def acquire(self, bucket: str, key: str, etag: str, owner: str) -> str:
+        now = int(self.clock())
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item={
+                    **self._item_key(bucket, key, etag),
+                    'status': {'S': PROCESSING},
+                    'owner': {'S': owner},
+                    'lock_expires_at': {'N': str(now + self.lock_ttl_seconds)},
+                    'updated_at': {'N': str(now)},
+                    'ttl': {'N': str(now + self.retention_seconds)}
+                },
+                ConditionExpression=(
+                    'attribute_not_exists(object_id) OR '
+                    '(#status = :processing AND lock_expires_at < :now)'
+                ),
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={':processing': {'S': PROCESSING}, ':now': {'N': str(now)}},
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+            return ACQUIRED
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                existing = e.response.get('Item') or {}
+                return existing.get('status', {}).get('S', PROCESSING)
+            raise ProcessingLockError(f"Could not acquire processing lock: {e}", e.response['Error']['Code'], e)
+
+    def mark_processed(self, bucket: str, key: str, etag: str) -> None:
+        now = int(self.clock())
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key=self._item_key(bucket, key, etag),
+                UpdateExpression='SET #status = :processed, updated_at = :now, #ttl = :ttl REMOVE lock_expires_at',
+                ExpressionAttributeNames={'#status': 'status', '#ttl': 'ttl'},
+                ExpressionAttributeValues={
+                    ':processed': {'S': PROCESSED},
+                    ':now': {'N': str(now)},
+                    ':ttl': {'N': str(now + self.retention_seconds)}
+                }
+            )
+        except ClientError as e:
+            raise ProcessingLockError(f"Could not mark object processed: {e}", e.response['Error']['Code'], e)
+
+    def release(self, bucket: str, key: str, etag: str, owner: str) -> None:
+        try:
+            self.client.delete_item(
+                TableName=self.table_name,
+                Key=self._item_key(bucket, key, etag),
+                ConditionExpression='#status = :processing AND #owner = :owner',
+                ExpressionAttributeNames={'#status': 'status', '#owner': 'owner'},
+                ExpressionAttributeValues={':processing': {'S': PROCESSING}, ':owner': {'S': owner}}
+            )
+        except ClientError as e:
+            # Someone else holds or finished the lock: nothing to release
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise ProcessingLockError(f"Could not release processing lock: {e}", e.response['Error']['Code'], e)
+
+    def get_status(self, bucket: str, key: str, etag: str) -> Optional[str]:
+        try:
+            response = self.client.get_item(
+                TableName=self.table_name,
+                Key=self._item_key(bucket, key, etag),
+                ConsistentRead=True
+            )
+        except ClientError as e:
+            raise ProcessingLockError(f"Could not read processing lock: {e}", e.response['Error']['Code'], e)
+        item = response.get('Item')
+        return item['status']['S'] if item else None
+
+
+class SQLiteProcessingLockStore(ProcessingLockStore):
+    """Lock store on SQLite, for local runs and tests."""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str = None, **options):
+        super().__init__(**options)
+        self.path = path or os.environ.get('PROCESSING_LOCK_SQLITE_PATH', ':memory:')
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processing_locks (
+                object_id TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                status TEXT NOT NULL,
+                owner TEXT,
+                lock_expires_at INTEGER,
+                updated_at INTEGER NOT NULL,
+                ttl INTEGER NOT NULL,
+                PRIMARY KEY (object_id, etag)
+            )
+            """
+        )
+
+    def acquire(self, bucket: str, key: str, etag: str, owner: str) -> str:
+        now = int(self.clock())
+        item = (object_id(bucket, key), normalize_etag(etag))
+        with self.lock:
+            # Expired items are gone from DynamoDB once its TTL sweep runs
+            self.connection.execute("DELETE FROM processing_locks WHERE ttl < ?", (now,))
+            cursor = self.connection.execute(
+                """
+                INSERT INTO processing_locks (object_id, etag, status, owner, lock_expires_at, updated_at, ttl)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (object_id, etag) DO UPDATE SET
+                    owner = excluded.owner,
+                    lock_expires_at = excluded.lock_expires_at,
+                    updated_at = excluded.updated_at,
+                    ttl = excluded.ttl
+                WHERE processing_locks.status = ? AND processing_locks.lock_expires_at < ?
+                """,
+                (*item, PROCESSING, owner, now + self.lock_ttl_seconds, now, now + self.retention_seconds,
+                 PROCESSING, now)
+            )
+            if cursor.rowcount:
+                return ACQUIRED
+            return self._status(item)
+
+    def mark_processed(self, bucket: str, key: str, etag: str) -> None:
+        now = int(self.clock())
+        with self.lock:
+            self.connection.execute(
+                """
+                INSERT INTO processing_locks (object_id, etag, status, updated_at, ttl)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (object_id, etag) DO UPDATE SET
+                    status = excluded.status,
+                    lock_expires_at = NULL,
+                    updated_at = excluded.updated_at,
+                    ttl = excluded.ttl
+                """,
+                (object_id(bucket, key), normalize_etag(etag), PROCESSED, now, now + self.retention_seconds)
+            )
+
+    def release(self, bucket: str, key: str, etag: str, owner: str) -> None:
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM processing_locks WHERE object_id = ? AND etag = ? AND status = ? AND owner = ?",
+                (object_id(bucket, key), normalize_etag(etag), PROCESSING, owner)
+            )
+
+    def get_status(self, bucket: str, key: str, etag: str) -> Optional[str]:
+        with self.lock:
+            return self._status((object_id(bucket, key), normalize_etag(etag)))
+
+    def _status(self, item) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT status FROM processing_locks WHERE object_id = ? AND etag = ?", item
+        ).fetchone()
+        return row[0] if row else None
+
+
+def create_processing_lock_store(backend: str = None, **options) -> ProcessingLockStore:
+    """
+    Create the lock store selected by name or the PROCESSING_LOCK_BACKEND variable.
+
+    Args:
+        backend: 'dynamodb' (default) or 'sqlite'
+        **options: Passed to the store (table_name, path, lock_ttl_seconds, ...)
+
+    Returns:
+        ProcessingLockStore instance
+
+    Raises:
+        ProcessingLockError: If the backend name is unknown or not configured
+    """
+    backend = (backend or os.environ.get('PROCESSING_LOCK_BACKEND') or DynamoDBProcessingLockStore.name).lower()
+
+    if backend == DynamoDBProcessingLockStore.name:
+        return DynamoDBProcessingLockStore(**options)
+
+    if backend == SQLiteProcessingLockStore.name:
+        return SQLiteProcessingLockStore(**options)
+
+    raise ProcessingLockError(f"Unknown processing lock backend: {backend}", "INVALID_BACKEND")
@@ -0,0 +1,131 @@
+"""
+Database schema versioning for the Healthcare System.
+
+The schema is defined by the numbered SQL files in shared/migrations
+(NNNN_description.sql). The db_initialization function applies pending
+migrations at deploy time and records them in the schema_migrations table;
+request handlers only verify, once per container, that the database is at
+least at REQUIRED_SCHEMA_VERSION.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Any
+
+from shared.database import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Bump together with every new file in shared/migrations
+REQUIRED_SCHEMA_VERSION = 10
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+
+_MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Quoted strings, dollar-quoted bodies, comments and statement separators
+_SQL_SPLIT_PATTERN = re.compile(
+    r"'(?:[^']|'')*'|\"[^\"]*\"|(\$\w*\$).*?\1|--[^\n]*|/\*.*?\*/|;",
+    re.DOTALL
+)
+
+# Version confirmed by ensure_schema_version for this container
+_verified_schema_version = None
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    Load migration files in version order.
+
+    Returns:
+        List of dictionaries with version, name, sql and checksum (SHA-256 of the file)
+
+    Raises:
+        ValueError: If two files share a version number
+    """
+    migrations = {}
+    for path in sorted(directory.glob('*.sql')):
+        match = _MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            logger.warning(f"Ignoring migration file with unexpected name: {path.name}")
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {path.name}")
+
+        sql = path.read_text(encoding='utf-8')
+        migrations[version] = {
+            'version': version,
+            'name': match.group(2),
+            'sql': sql,
+            'checksum': hashlib.sha256(sql.encode('utf-8')).hexdigest()
+        }
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_sql_statements(sql: str) -> List[str]:
+    """
+    Split a SQL script into individual statements for the Data API.
+
+    Semicolons inside string literals, quoted identifiers, dollar-quoted
+    function bodies and comments do not end a statement. Comments are dropped.
+    """
+    statements = []
+    current = []
+    position = 0
+
+    for match in _SQL_SPLIT_PATTERN.finditer(sql):
+        current.append(sql[position:match.start()])
+        token = match.group(0)
+        if token == ';':
+            statement = ''.join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        elif not token.startswith(('--', '/*')):
+            current.append(token)
+        position = match.end()
+
+    statement = (''.join(current) + sql[position:]).strip()
+    if statement:
+        statements.append(statement)
+
+    return statements
+
+
+def ensure_schema_version(db_manager, required_version: int = REQUIRED_SCHEMA_VERSION) -> None:
+    """
+    Verify the database schema is at least at the required version.
+
+    The check runs one query per container; only a successful result is cached
+    so a container started before a deployment finishes can recover.
+
+    Raises:
+        DatabaseError: SCHEMA_VERSION_MISMATCH if migrations are missing
+    """
+    global _verified_schema_version
+    if _verified_schema_version is not None and _verified_schema_version >= required_version:
+        return
+
+    try:
+        rows = db_manager.execute_query(
+            "SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations"
+        )
+        current_version = rows[0]['version'] if rows else 0
+    except DatabaseError as e:
+        if 'schema_migrations' not in str(e):
+            raise
+        current_version = 0
+
+    if current_version < required_version:
+        raise DatabaseError(
+            f"Database schema version {current_version} is older than required "
+            f"version {required_version}; run the database initialization function",
+            "SCHEMA_VERSION_MISMATCH"
+        )
+
+    _verified_schema_version = current_version
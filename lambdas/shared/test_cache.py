@@ -0,0 +1,108 @@
+"""
+Tests for the reference data cache.
+Run with: python -m pytest lambdas/shared/test_cache.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.cache import ReferenceCache, query_key
+from shared.database import DatabaseError
+
+
+class StubDatabase:
+    """DatabaseManager stand-in answering the version probe."""
+
+    def __init__(self):
+        self.row_count = 2
+        self.updated_at = '2031-01-01 00:00:00+00'
+        self.error = None
+        self.probes = 0
+
+    def execute_query(self, sql, parameters=None):
+        self.probes += 1
+        if self.error:
+            raise self.error
+        return [{'row_count': self.row_count, 'updated_at': self.updated_at}]
+
+
+def build_cache(clock, **options):
+    return ReferenceCache('exams', clock=clock, **options), StubDatabase()
+
+
+def counting_loader(values):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return [dict(value) for value in values]
+    return load, calls
+
+
+def test_hits_are_served_without_loading_and_are_copies(clock):
+    """A second lookup is a hit; callers can modify the returned rows safely."""
+    cache, db = build_cache(clock)
+    load, calls = counting_loader([{'exam_id': 'e-1'}, {'exam_id': 'e-2'}])
+    key = query_key("SELECT * FROM exams WHERE exam_type = :t", [{'name': 't', 'value': {'stringValue': 'lab'}}])
+
+    rows = cache.get(db, key, load)
+    del rows[1:]
+    rows = cache.get(db, key, load)
+
+    assert [row['exam_id'] for row in rows] == ['e-1', 'e-2']
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_and_size_bounds(clock):
+    """Expired entries are reloaded and the least recently used entry is evicted."""
+    cache, db = build_cache(clock, ttl_seconds=60, max_entries=2, version_check_seconds=1000)
+    load, calls = counting_loader([{'exam_id': 'e-1'}])
+
+    cache.get(db, 'a', load)
+    cache.get(db, 'b', load)
+    cache.get(db, 'a', load)
+    cache.get(db, 'c', load)
+    assert list(cache.entries) == ['a', 'c']
+
+    clock.now += 61
+    cache.get(db, 'a', load)
+    assert len(calls) == 4
+
+
+def test_version_probe_invalidates_changed_tables(clock):
+    """A new MAX(updated_at) or row count clears the entries; probes are rate limited."""
+    cache, db = build_cache(clock, version_check_seconds=30)
+    load, calls = counting_loader([{'exam_id': 'e-1'}])
+
+    cache.get(db, 'a', load)
+    db.updated_at = '2031-01-02 00:00:00+00'
+    cache.get(db, 'a', load)
+    assert len(calls) == 1 and db.probes == 1
+
+    clock.now += 30
+    cache.get(db, 'a', load)
+    assert len(calls) == 2
+
+    db.row_count = 1  # a delete does not move MAX(updated_at)
+    clock.now += 30
+    cache.get(db, 'a', load)
+    assert len(calls) == 3
+
+    cache.invalidate()
+    cache.get(db, 'a', load)
+    assert len(calls) == 4
+
+
+def test_failed_probe_keeps_serving_cached_entries(clock):
+    """While the database is unreachable, entries within their TTL are still served."""
+    cache, db = build_cache(clock, version_check_seconds=0)
+    load, calls = counting_loader([{'exam_id': 'e-1'}])
+    cache.get(db, 'a', load)
+
+    db.error = DatabaseError('Database is resuming', 'DatabaseResumingException')
+    clock.now += 10
+    assert cache.get(db, 'a', load) == [{'exam_id': 'e-1'}]
+    assert len(calls) == 1
@@ -0,0 +1,339 @@
+"""
+Tests for the shared DatabaseManager using a stubbed rds-data client.
+Run with: python -m pytest lambdas/shared/test_database.py -v
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+from botocore.exceptions import ClientError
+
+import shared.database as database
+from shared.database import DatabaseError, DatabaseManager
+
+
+def client_error(code, message='error'):
+    """Build a botocore ClientError with the given error code."""
+    return ClientError({'Error': {'Code': code, 'Message': message}}, 'BatchExecuteStatement')
+
+
+class StubRdsData:
+    """Minimal rds-data client that records calls and fails rows on demand."""
+
+    def __init__(self, failing_rows=(), throttles=0, response=None, resuming=0, begin_resuming=0):
+        self.failing_rows = set(failing_rows)
+        self.response = response
+        self.requests = []
+        self.throttles = throttles
+        self.resuming = resuming
+        self.begin_resuming = begin_resuming
+        self.begin_calls = 0
+        self.batch_sizes = []
+        self.statements = []
+        self.committed = False
+        self.rolled_back = False
+
+    def begin_transaction(self, **kwargs):
+        self.begin_calls += 1
+        if self.begin_resuming:
+            self.begin_resuming -= 1
+            raise client_error('DatabaseResumingException', 'The database is resuming')
+        return {'transactionId': 'tx-1'}
+
+    def commit_transaction(self, **kwargs):
+        self.committed = True
+        return {}
+
+    def rollback_transaction(self, **kwargs):
+        self.rolled_back = True
+        return {}
+
+    def batch_execute_statement(self, **kwargs):
+        if self.throttles:
+            self.throttles -= 1
+            raise client_error('ThrottlingException')
+        rows = [params[0]['value']['longValue'] for params in kwargs['parameterSets']]
+        if self.failing_rows.intersection(rows):
+            raise client_error('BadRequestException', 'duplicate key value violates unique constraint')
+        self.batch_sizes.append(len(rows))
+        return {'updateResults': [{} for _ in rows]}
+
+    def execute_statement(self, **kwargs):
+        self.statements.append(kwargs['sql'])
+        self.requests.append(kwargs)
+        if self.resuming:
+            self.resuming -= 1
+            raise client_error('DatabaseResumingException', 'The database is resuming')
+        if self.response is not None:
+            return self.response
+        parameters = kwargs.get('parameters') or []
+        if parameters and parameters[0]['value']['longValue'] in self.failing_rows:
+            raise client_error('BadRequestException', 'duplicate key value violates unique constraint')
+        return {'numberOfRecordsUpdated': 1}
+
+
+def make_manager(stub):
+    db = DatabaseManager('cluster-arn', 'secret-arn', 'healthcare')
+    db.backend.rds_data = stub
+    return db
+
+
+def make_parameter_sets(db, count):
+    return [[db.create_parameter('id', i, 'long')] for i in range(count)]
+
+
+def test_execute_batch_chunks_and_commits():
+    """Parameter sets are split into chunks inside one committed transaction."""
+    stub = StubRdsData()
+    db = make_manager(stub)
+
+    result = db.execute_batch('INSERT INTO t VALUES (:id)', make_parameter_sets(db, 25), chunk_size=10)
+
+    assert stub.batch_sizes == [10, 10, 5]
+    assert stub.committed and not stub.rolled_back
+    assert result['succeeded'] == 25
+    assert result['failed'] == 0
+
+
+def test_execute_batch_reports_failed_rows():
+    """A failing chunk is replayed row by row and only the bad rows are reported."""
+    stub = StubRdsData(failing_rows={7})
+    db = make_manager(stub)
+
+    result = db.execute_batch('INSERT INTO t VALUES (:id)', make_parameter_sets(db, 25), chunk_size=10)
+
+    assert result['succeeded'] == 24
+    assert [failure['index'] for failure in result['failures']] == [7]
+    assert result['failures'][0]['error_code'] == 'BadRequestException'
+    assert 'ROLLBACK TO SAVEPOINT batch_chunk' in stub.statements
+    assert stub.committed
+
+
+def test_execute_batch_retries_throttled_chunks(monkeypatch):
+    """Throttled chunks are retried instead of being reported as failures."""
+    monkeypatch.setattr(database.time, 'sleep', lambda seconds: None)
+    stub = StubRdsData(throttles=2)
+    db = make_manager(stub)
+
+    result = db.execute_batch('INSERT INTO t VALUES (:id)', make_parameter_sets(db, 5))
+
+    assert result['succeeded'] == 5
+    assert stub.batch_sizes == [5]
+    assert stub.committed
+
+
+def test_execute_batch_respects_payload_limit(monkeypatch):
+    """Chunks are also bounded by the estimated request payload size."""
+    monkeypatch.setattr(database, 'MAX_BATCH_PAYLOAD_BYTES', 200)
+    stub = StubRdsData()
+    db = make_manager(stub)
+
+    db.execute_batch('INSERT INTO t VALUES (:id)', make_parameter_sets(db, 6), chunk_size=100)
+
+    assert len(stub.batch_sizes) > 1
+    assert sum(stub.batch_sizes) == 6
+
+
+def test_parse_records_decodes_typed_columns():
+    """Columns are decoded according to their PostgreSQL type name."""
+    db = make_manager(StubRdsData())
+    column_metadata = [
+        {'name': 'patient_id', 'typeName': 'varchar'},
+        {'name': 'address', 'typeName': 'jsonb'},
+        {'name': 'date_of_birth', 'typeName': 'date'},
+        {'name': 'created_at', 'typeName': 'timestamptz'},
+        {'name': 'balance', 'typeName': 'numeric'},
+        {'name': 'age', 'typeName': 'int4'},
+        {'name': 'tags', 'typeName': '_text'},
+    ]
+    records = [
+        [
+            {'stringValue': 'p-1'},
+            {'stringValue': '{"city": "Bogotá"}'},
+            {'stringValue': '1990-05-01'},
+            {'stringValue': '2024-01-02 03:04:05.123'},
+            {'stringValue': '10.50'},
+            {'longValue': 34},
+            {'arrayValue': {'stringValues': ['a', 'b']}},
+        ],
+        [
+            {'stringValue': 'p-2'},
+            {'isNull': True},
+            {'isNull': True},
+            {'isNull': True},
+            {'isNull': True},
+            {'isNull': True},
+            {'isNull': True},
+        ],
+    ]
+
+    rows = db.parse_records(records, column_metadata)
+
+    assert rows[0] == {
+        'patient_id': 'p-1',
+        'address': {'city': 'Bogotá'},
+        'date_of_birth': date(1990, 5, 1),
+        'created_at': datetime(2024, 1, 2, 3, 4, 5, 123000, tzinfo=timezone.utc),
+        'balance': Decimal('10.50'),
+        'age': 34,
+        'tags': ['a', 'b'],
+    }
+    assert rows[1]['patient_id'] == 'p-2'
+    assert all(value is None for key, value in rows[1].items() if key != 'patient_id')
+
+
+def test_execute_query_json_format():
+    """JSON mode requests formatted records and decodes listed JSON columns."""
+    stub = StubRdsData(response={
+        'formattedRecords': '[{"patient_id": "p-1", "age": 34, "address": "{\\"city\\": \\"Cali\\"}"}]'
+    })
+    db = make_manager(stub)
+
+    rows = db.execute_query('SELECT * FROM patients', format='json', json_columns=['address'])
+
+    assert rows == [{'patient_id': 'p-1', 'age': 34, 'address': {'city': 'Cali'}}]
+    assert stub.requests[0]['formatRecordsAs'] == 'JSON'
+    assert stub.requests[0]['includeResultMetadata'] is False
+
+
+def test_create_parameter_typed_values():
+    """Typed values round-trip as strings with the matching Data API typeHint."""
+    db = make_manager(StubRdsData())
+
+    timestamp = db.create_parameter('ts', datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    day = db.create_parameter('day', date(2024, 1, 2))
+
+    assert timestamp == {'name': 'ts', 'typeHint': 'TIMESTAMP', 'value': {'stringValue': '2024-01-02 03:04:05'}}
+    assert day == {'name': 'day', 'typeHint': 'DATE', 'value': {'stringValue': '2024-01-02'}}
+    assert db.create_parameter('flag', True)['value'] == {'booleanValue': True}
+    assert db.create_parameter('missing', None)['value'] == {'isNull': True}
+
+
+class KeysetTableStub:
+    """rds-data stub serving keyset pages from an in-memory table of ids."""
+
+    def __init__(self, row_count):
+        self.ids = list(range(1, row_count + 1))
+        self.page_requests = 0
+
+    def execute_statement(self, **kwargs):
+        self.page_requests += 1
+        params = {p['name']: list(p['value'].values())[0] for p in kwargs.get('parameters', [])}
+        last = params.get('keyset_last', 0)
+        page = [i for i in self.ids if i > last][:params['keyset_limit']]
+        return {
+            'columnMetadata': [{'name': 'id', 'typeName': 'int4'}, {'name': 'name', 'typeName': 'varchar'}],
+            'records': [[{'longValue': i}, {'stringValue': f'row-{i}'}] for i in page],
+        }
+
+
+def test_iter_query_walks_all_pages():
+    """iter_query yields every row once, fetching one page per request."""
+    for prefetch in (False, True):
+        stub = KeysetTableStub(23)
+        db = make_manager(stub)
+
+        rows = list(db.iter_query('SELECT id, name FROM t', key_column='id', page_size=10, prefetch=prefetch))
+
+        assert [row['id'] for row in rows] == list(range(1, 24))
+        assert stub.page_requests == 3
+
+
+def test_iter_query_is_lazy():
+    """Only the pages needed by the consumer are requested."""
+    stub = KeysetTableStub(100)
+    db = make_manager(stub)
+
+    iterator = db.iter_query('SELECT id, name FROM t', key_column='id', page_size=10)
+    first_rows = [next(iterator) for _ in range(5)]
+
+    assert [row['id'] for row in first_rows] == [1, 2, 3, 4, 5]
+    assert stub.page_requests == 1
+
+
+class FakeClock:
+    """Replaces time.sleep/time.monotonic so resume backoff runs instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_resuming_database_is_retried_with_metrics(monkeypatch, capsys):
+    """Statements sent while the cluster resumes are retried and the wait is reported."""
+    clock = FakeClock()
+    monkeypatch.setattr(database.time, 'sleep', clock.sleep)
+    monkeypatch.setattr(database.time, 'monotonic', clock.monotonic)
+    stub = StubRdsData(resuming=3)
+    db = make_manager(stub)
+
+    assert db.execute_update('UPDATE t SET x = 1') == 1
+
+    assert len(stub.statements) == 4
+    assert len(clock.sleeps) == 3
+    assert all(0 < delay <= database.RESUME_RETRY_MAX_DELAY for delay in clock.sleeps)
+    metrics = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert metrics['ResumeRetries'] == 3 and metrics['ResumeFailures'] == 0
+    assert metrics['_aws']['CloudWatchMetrics'][0]['Namespace'] == database.METRICS_NAMESPACE
+
+
+def test_resume_retries_stop_at_budget(monkeypatch, capsys):
+    """The total wait stays inside the budget; statements in a transaction are not retried."""
+    clock = FakeClock()
+    monkeypatch.setattr(database.time, 'sleep', clock.sleep)
+    monkeypatch.setattr(database.time, 'monotonic', clock.monotonic)
+    stub = StubRdsData(resuming=100)
+    db = DatabaseManager('cluster-arn', 'secret-arn', 'healthcare', resume_budget_seconds=5)
+    db.backend.rds_data = stub
+
+    with pytest.raises(DatabaseError) as error:
+        db.execute_query('SELECT 1')
+    assert error.value.error_code == 'DATABASE_RESUMING'
+    assert clock.now <= 5
+    assert json.loads(capsys.readouterr().out.strip().splitlines()[-1])['ResumeFailures'] == 1
+
+    attempts = len(stub.statements)
+    with pytest.raises(DatabaseError) as error:
+        db.execute_sql('SELECT 1', transaction_id='tx-1')
+    assert error.value.error_code == 'DatabaseResumingException'
+    assert len(stub.statements) == attempts + 1
+
+
+def test_begin_transaction_is_retried_while_resuming(monkeypatch, capsys):
+    """A transaction started while the cluster resumes waits for it instead of failing."""
+    clock = FakeClock()
+    monkeypatch.setattr(database.time, 'sleep', clock.sleep)
+    monkeypatch.setattr(database.time, 'monotonic', clock.monotonic)
+    stub = StubRdsData(begin_resuming=1)
+    db = make_manager(stub)
+
+    result = db.execute_batch('INSERT INTO t (id) VALUES (:id)', make_parameter_sets(db, 3))
+
+    assert stub.begin_calls == 2
+    assert len(clock.sleeps) == 1
+    assert stub.committed
+    assert result['succeeded'] == 3
+    assert json.loads(capsys.readouterr().out.strip().splitlines()[-1])['ResumeRetries'] == 1
+
+
+if __name__ == "__main__":
+    print("Testing DatabaseManager...")
+    test_execute_batch_chunks_and_commits()
+    test_execute_batch_reports_failed_rows()
+    test_parse_records_decodes_typed_columns()
+    test_execute_query_json_format()
+    test_iter_query_walks_all_pages()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,106 @@
+"""
+Tests for the Knowledge Base ingestion scheduler.
+Run with: python -m pytest lambdas/shared/test_ingestion_scheduler.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.ingestion_scheduler import IngestionScheduler, MemoryIngestionStateStore
+
+
+class StubBedrockAgent:
+    """bedrock-agent client stand-in tracking ingestion jobs."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.fail_next_start = False
+
+    def start_ingestion_job(self, knowledgeBaseId, dataSourceId, description):
+        if self.fail_next_start:
+            self.fail_next_start = False
+            raise RuntimeError('ThrottlingException')
+        assert not self.running(), "only one job may run at a time"
+        job_id = f'job-{len(self.jobs) + 1}'
+        self.jobs[job_id] = 'STARTING'
+        return {'ingestionJob': {'ingestionJobId': job_id, 'status': 'STARTING'}}
+
+    def get_ingestion_job(self, knowledgeBaseId, dataSourceId, ingestionJobId):
+        return {'ingestionJob': {'ingestionJobId': ingestionJobId, 'status': self.jobs[ingestionJobId]}}
+
+    def list_ingestion_jobs(self, **kwargs):
+        return {'ingestionJobSummaries': [{'ingestionJobId': job_id} for job_id in self.running()]}
+
+    def running(self):
+        return [job_id for job_id, status in self.jobs.items() if status in ('STARTING', 'IN_PROGRESS')]
+
+    def finish_all(self):
+        for job_id in self.jobs:
+            self.jobs[job_id] = 'COMPLETE'
+
+
+def build_scheduler(clock):
+    client = StubBedrockAgent()
+    scheduler = IngestionScheduler(
+        client, 'kb-1', 'ds-1', MemoryIngestionStateStore(),
+        debounce_seconds=30, max_delay_seconds=120, clock=clock
+    )
+    return scheduler, client
+
+
+def test_burst_is_coalesced_into_one_job(clock):
+    """Completions within the debounce window start a single job once quiet."""
+    scheduler, client = build_scheduler(clock)
+
+    for _ in range(5):
+        assert scheduler.request() is None
+        clock.now += 10
+
+    clock.now += 20
+    assert scheduler.tick() == 'job-1'
+    assert scheduler.tick() == 'job-1'
+    assert list(client.jobs) == ['job-1']
+
+
+def test_changes_during_a_job_run_a_follow_up(clock):
+    """A completion while a job runs is not lost: the next job starts once it finishes."""
+    scheduler, client = build_scheduler(clock)
+    scheduler.request()
+    clock.now += 30
+    scheduler.tick()
+
+    clock.now += 5
+    assert scheduler.request() == 'job-1'
+    clock.now += 60
+    assert scheduler.tick() == 'job-1'
+
+    client.finish_all()
+    assert scheduler.tick() == 'job-2'
+    client.finish_all()
+    assert scheduler.tick() is None
+    assert list(client.jobs) == ['job-1', 'job-2']
+
+
+def test_continuous_burst_is_bounded_by_max_delay(clock):
+    """A steady stream of completions still gets a job after max_delay_seconds."""
+    scheduler, client = build_scheduler(clock)
+
+    started = []
+    for _ in range(20):
+        started.append(scheduler.request())
+        clock.now += 10
+
+    assert started.index('job-1') == 12  # 120s after the first completion
+    assert list(client.jobs) == ['job-1']
+
+
+def test_failed_start_keeps_changes_pending(clock):
+    scheduler, client = build_scheduler(clock)
+    scheduler.request()
+    clock.now += 30
+    client.fail_next_start = True
+
+    assert scheduler.tick() is None
+    assert scheduler.tick() == 'job-1'
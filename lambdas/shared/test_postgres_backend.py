@@ -0,0 +1,139 @@
+"""
+Tests for the native PostgreSQL backend.
+
+The SQL translation tests always run. The remaining tests use the
+postgres_db fixture and are skipped unless TEST_DATABASE_DSN is set:
+
+    TEST_DATABASE_DSN=postgresql://postgres@localhost/healthcare_test \
+        python -m pytest lambdas/shared/test_postgres_backend.py -v
+"""
+
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from shared.database import DatabaseError
+from shared.postgres_backend import translate_sql
+from shared.schema import load_migrations
+from db_initialization.handler import run_migrations
+
+
+def test_translate_sql_placeholders():
+    """Named placeholders become pyformat ones; casts stay untouched."""
+    sql = "SELECT * FROM t WHERE a = :a AND b = :b_2::date"
+    assert translate_sql(sql) == "SELECT * FROM t WHERE a = %(a)s AND b = %(b_2)s::date"
+
+
+def test_translate_sql_literals_and_percent():
+    """String literals are not scanned for placeholders and '%' is escaped."""
+    sql = "SELECT ':skip', name FROM t WHERE name ILIKE '%' || :name || '%' AND x::text = 'it''s :no'"
+    assert translate_sql(sql) == (
+        "SELECT ':skip', name FROM t WHERE name ILIKE '%%' || %(name)s || '%%' AND x::text = 'it''s :no'"
+    )
+
+
+def seed_database(db):
+    db.execute_sql("""
+        INSERT INTO patients (patient_id, full_name, email, cedula, date_of_birth, address)
+        VALUES ('p-1', 'Ana Gómez', 'ana@example.com', '1001', '1990-05-01', '{"city": "Bogotá"}')
+    """)
+    db.execute_sql("""
+        INSERT INTO medics (medic_id, first_name, email, specialization)
+        VALUES ('m-1', 'Carlos', 'carlos@example.com', 'Cardiología')
+    """)
+    db.execute_sql("""
+        INSERT INTO exams (exam_id, exam_name, exam_type)
+        VALUES ('e-1', 'Electrocardiograma', 'cardiology')
+    """)
+
+
+def test_query_paths_return_the_same_rows(postgres_db):
+    """Native rows, decoded records and JSON results agree."""
+    sql = "SELECT patient_id, address, date_of_birth, created_at, 1.5::numeric AS score FROM patients WHERE cedula = :cedula"
+    params = [postgres_db.create_parameter('cedula', '1001')]
+
+    native = postgres_db.execute_query(sql, params)
+    response = postgres_db.execute_sql(sql, params)
+    decoded = postgres_db.parse_records(response['records'], response['columnMetadata'])
+
+    assert native == decoded
+    assert native[0]['address'] == {'city': 'Bogotá'}
+    assert native[0]['date_of_birth'] == date(1990, 5, 1)
+    assert isinstance(native[0]['created_at'], datetime)
+    assert native[0]['score'] == Decimal('1.5')
+
+    rows = postgres_db.execute_query(sql, params, format='json', json_columns=['address'])
+    assert rows[0]['address'] == {'city': 'Bogotá'}
+
+
+def test_errors_use_data_api_codes(postgres_db):
+    """Constraint violations surface as BadRequestException with the PostgreSQL message."""
+    with pytest.raises(DatabaseError) as error:
+        postgres_db.execute_sql(
+            "INSERT INTO patients (patient_id, full_name, email) VALUES (:id, 'Dup', 'dup@example.com')",
+            [postgres_db.create_parameter('id', 'p-1')]
+        )
+    assert error.value.error_code == 'BadRequestException'
+    assert 'duplicate key value violates unique constraint' in str(error.value)
+
+    # The pooled connection is still usable afterwards
+    assert postgres_db.execute_query("SELECT 1 AS ok") == [{'ok': 1}]
+
+
+def test_transactions_commit_and_rollback(postgres_db):
+    """Statements inside a transaction share one connection until commit or rollback."""
+    insert = "INSERT INTO exams (exam_id, exam_name, exam_type) VALUES (:id, :id, 'lab')"
+
+    transaction_id = postgres_db.begin_transaction()
+    postgres_db.execute_sql(insert, [postgres_db.create_parameter('id', 'e-rolled-back')], transaction_id)
+    postgres_db.rollback_transaction(transaction_id)
+
+    transaction_id = postgres_db.begin_transaction()
+    postgres_db.execute_sql(insert, [postgres_db.create_parameter('id', 'e-committed')], transaction_id)
+    postgres_db.commit_transaction(transaction_id)
+
+    rows = postgres_db.execute_query("SELECT exam_id FROM exams WHERE exam_id LIKE 'e-%' ORDER BY exam_id")
+    assert [row['exam_id'] for row in rows] == ['e-1', 'e-committed']
+
+    with pytest.raises(DatabaseError) as error:
+        postgres_db.commit_transaction(transaction_id)
+    assert error.value.error_code == 'TRANSACTION_ERROR'
+
+
+def test_execute_batch_reports_failed_rows(postgres_db):
+    """Savepoint-based row replay works the same as on the Data API."""
+    sql = "INSERT INTO medics (medic_id, first_name, email) VALUES (:id, 'Batch', :email)"
+    parameter_sets = [
+        [postgres_db.create_parameter('id', f'm-batch-{i}'), postgres_db.create_parameter('email', f'batch{i}@example.com')]
+        for i in range(5)
+    ]
+    parameter_sets[3][1] = postgres_db.create_parameter('email', 'carlos@example.com')
+
+    result = postgres_db.execute_batch(sql, parameter_sets, chunk_size=2)
+
+    assert result['succeeded'] == 4
+    assert [failure['index'] for failure in result['failures']] == [3]
+    count = postgres_db.execute_query("SELECT COUNT(*) AS n FROM medics WHERE medic_id LIKE 'm-batch-%'")
+    assert count == [{'n': 4}]
+
+
+def test_migrations_are_applied_once(postgres_db):
+    """A second run finds nothing pending and every version is recorded with its checksum."""
+    assert run_migrations(postgres_db) == []
+
+    recorded = postgres_db.execute_query("SELECT version, checksum FROM schema_migrations ORDER BY version")
+    assert [(row['version'], row['checksum']) for row in recorded] == [
+        (migration['version'], migration['checksum']) for migration in load_migrations()
+    ]
+
+
+if __name__ == "__main__":
+    print("Testing PostgresBackend...")
+    test_translate_sql_placeholders()
+    test_translate_sql_literals_and_percent()
+    print("\n✅ All tests passed!")
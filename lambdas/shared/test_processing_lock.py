@@ -0,0 +1,58 @@
+"""
+Tests for the processing lock store.
+Run with: python -m pytest lambdas/shared/test_processing_lock.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from shared.processing_lock import (
+    ACQUIRED,
+    PROCESSED,
+    PROCESSING,
+    ProcessingLockError,
+    SQLiteProcessingLockStore,
+    create_processing_lock_store
+)
+
+
+def build_store(clock, **options):
+    return SQLiteProcessingLockStore(':memory:', clock=clock, **options)
+
+
+def test_lock_is_exclusive_until_processed(clock):
+    """Only the first event takes the lock; the processed status sticks for that ETag only."""
+    store = build_store(clock)
+
+    assert store.acquire('raw', 'p-1/scan.pdf', '"abc"', 'req-1') == ACQUIRED
+    assert store.acquire('raw', 'p-1/scan.pdf', 'abc', 'req-2') == PROCESSING
+
+    store.mark_processed('raw', 'p-1/scan.pdf', 'abc')
+    assert store.acquire('raw', 'p-1/scan.pdf', 'abc', 'req-3') == PROCESSED
+    assert store.acquire('raw', 'p-1/scan.pdf', 'def', 'req-4') == ACQUIRED
+
+
+def test_stuck_lock_expires_and_owner_can_release(clock):
+    """A lock past its TTL is taken over; release only drops the owner's lock."""
+    store = build_store(clock, lock_ttl_seconds=600)
+    store.acquire('raw', 'p-1/video.mp4', 'abc', 'req-1')
+
+    clock.now += 599
+    assert store.acquire('raw', 'p-1/video.mp4', 'abc', 'req-2') == PROCESSING
+    clock.now += 2
+    assert store.acquire('raw', 'p-1/video.mp4', 'abc', 'req-2') == ACQUIRED
+
+    store.release('raw', 'p-1/video.mp4', 'abc', 'req-1')
+    assert store.get_status('raw', 'p-1/video.mp4', 'abc') == PROCESSING
+    store.release('raw', 'p-1/video.mp4', 'abc', 'req-2')
+    assert store.get_status('raw', 'p-1/video.mp4', 'abc') is None
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ProcessingLockError) as error:
+        create_processing_lock_store('redis')
+    assert error.value.error_code == 'INVALID_BACKEND'
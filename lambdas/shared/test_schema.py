@@ -0,0 +1,95 @@
+"""
+Tests for schema migrations and the cached schema version check.
+Run with: python -m pytest lambdas/shared/test_schema.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+import shared.schema as schema
+from shared.database import DatabaseError
+from shared.schema import REQUIRED_SCHEMA_VERSION, ensure_schema_version, load_migrations, split_sql_statements
+
+
+class StubDatabase:
+    """DatabaseManager stand-in answering the schema version query."""
+
+    def __init__(self, version=None, error=None):
+        self.version = version
+        self.error = error
+        self.queries = 0
+
+    def execute_query(self, sql, parameters=None):
+        self.queries += 1
+        if self.error:
+            raise self.error
+        return [{'version': self.version}]
+
+
+@pytest.fixture(autouse=True)
+def reset_schema_cache(monkeypatch):
+    monkeypatch.setattr(schema, '_verified_schema_version', None)
+
+
+def test_required_version_matches_latest_migration():
+    """REQUIRED_SCHEMA_VERSION must be bumped with every new migration file."""
+    versions = [migration['version'] for migration in load_migrations()]
+
+    assert versions == list(range(1, len(versions) + 1))
+    assert REQUIRED_SCHEMA_VERSION == versions[-1]
+
+
+def test_split_sql_statements():
+    """Semicolons in literals, dollar-quoted bodies and comments do not split statements."""
+    sql = """
+    -- leading comment; not a statement
+    CREATE TABLE t (note TEXT DEFAULT 'a;b');
+    CREATE FUNCTION f() RETURNS int AS $$ SELECT 1; $$ LANGUAGE sql;
+    /* block; comment */ CREATE INDEX i ON t(note)
+    """
+
+    assert split_sql_statements(sql) == [
+        "CREATE TABLE t (note TEXT DEFAULT 'a;b')",
+        "CREATE FUNCTION f() RETURNS int AS $$ SELECT 1; $$ LANGUAGE sql",
+        "CREATE INDEX i ON t(note)",
+    ]
+
+
+def test_ensure_schema_version_is_cached():
+    """Only the first call per container queries the database."""
+    db = StubDatabase(version=REQUIRED_SCHEMA_VERSION)
+
+    ensure_schema_version(db)
+    ensure_schema_version(db)
+
+    assert db.queries == 1
+
+
+def test_ensure_schema_version_mismatch_is_not_cached():
+    """An outdated or missing schema raises every time until migrations are applied."""
+    db = StubDatabase(version=REQUIRED_SCHEMA_VERSION - 1)
+
+    for _ in range(2):
+        with pytest.raises(DatabaseError) as error:
+            ensure_schema_version(db)
+        assert error.value.error_code == 'SCHEMA_VERSION_MISMATCH'
+    assert db.queries == 2
+
+    missing = StubDatabase(error=DatabaseError(
+        'Database query failed: ERROR: relation "schema_migrations" does not exist',
+        'BadRequestException'
+    ))
+    with pytest.raises(DatabaseError) as error:
+        ensure_schema_version(missing)
+    assert error.value.error_code == 'SCHEMA_VERSION_MISMATCH'
+
+
+if __name__ == "__main__":
+    print("Testing schema migrations...")
+    test_required_version_matches_latest_migration()
+    test_split_sql_statements()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,86 @@
+"""
+Tests for the pagination and field projection helpers in shared.utils.
+Run with: python -m pytest lambdas/shared/test_utils.py -v
+"""
+
+import os
+import sys
+sys.path.append('lambdas')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import pytest
+
+from shared.utils import (
+    build_page_info, decode_cursor, encode_cursor, mcp_projection_params, select_fields, validate_pagination_params
+)
+
+
+def test_cursor_round_trip():
+    """Cursors are URL-safe and decode to the encoded sort key."""
+    values = ['José Pérez/Gómez?', '2031-01-01', 42]
+    cursor = encode_cursor(values)
+
+    assert all(char.isalnum() or char in '-_' for char in cursor)
+    assert decode_cursor(cursor, 3) == values
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor(['only-one']), 'eyJhIjogMX0'])
+def test_invalid_cursors_are_rejected(cursor):
+    """Malformed tokens, wrong key counts and non-list payloads raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_validate_pagination_params_accepts_both_styles():
+    """Offset and cursor requests are normalized to the same shape."""
+    assert validate_pagination_params({'limit': '5000', 'offset': '20'}) == {
+        'limit': 1000, 'offset': 20, 'cursor': None, 'include_total': False
+    }
+
+    cursor = encode_cursor(['Ana', 'p-1'])
+    assert validate_pagination_params({'cursor': cursor, 'include_total': 'true'}, cursor_keys=2) == {
+        'limit': 50, 'offset': 0, 'cursor': ['Ana', 'p-1'], 'include_total': True
+    }
+
+    with pytest.raises(ValueError):
+        validate_pagination_params({'cursor': cursor, 'offset': '10'})
+
+
+def test_build_page_info_trims_the_probe_row():
+    """The extra row fetched beyond the limit only signals a next page."""
+    pagination = validate_pagination_params({'limit': '2'})
+    rows = [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+
+    info = build_page_info(rows, pagination, lambda row: [row['id']])
+
+    assert rows == [{'id': 'a'}, {'id': 'b'}]
+    assert info['has_more'] and info['count'] == 2
+    assert decode_cursor(info['next_cursor']) == ['b']
+
+    last_rows = [{'id': 'c'}]
+    info = build_page_info(last_rows, pagination, lambda row: [row['id']])
+    assert not info['has_more'] and info['next_cursor'] is None
+
+
+def test_select_fields_views_and_explicit_fields():
+    """fields overrides view; required fields are added and the available order is kept."""
+    available = ['id', 'name', 'email', 'history']
+    compact = ['id', 'name']
+
+    assert select_fields({}, available, compact) == available
+    assert select_fields({'view': 'compact'}, available, compact) == ['id', 'name']
+    assert select_fields({'view': 'compact', 'fields': 'history, email'}, available, compact, ['id']) == [
+        'id', 'email', 'history'
+    ]
+
+    for params in ({'view': 'tiny'}, {'fields': ['email', 'ssn']}):
+        with pytest.raises(ValueError):
+            select_fields(params, available, compact)
+
+
+def test_mcp_events_default_to_the_compact_view():
+    """Tool calls get compact results unless they ask for a view or fields."""
+    assert mcp_projection_params({'action': 'list'}) == {'view': 'compact'}
+    assert mcp_projection_params({'action': 'get', 'view': 'full', 'fields': ['id', 'email']}) == {
+        'view': 'full', 'fields': 'id,email'
+    }
@@ -3,11 +3,12 @@ Shared utilities for Lambda functions.
 Common functions for request/response handling, validation, and error management.
 """
 
+import base64
 import json
 import logging
 import uuid
 import traceback
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timezone
 from typing import Dict, Any, List, Optional, Union
 from functools import wraps
 
@@ -81,6 +82,18 @@ def create_request_logger(request_id: str = None) -> StructuredLogger:
     return RequestLogger(request_id)
 
 
+def json_default(value: Any) -> Any:
+    """
+    JSON serializer for values returned by typed database decoding.
+    
+    Dates and times are rendered in ISO 8601 format; anything else (Decimal,
+    UUID, ...) falls back to its string representation.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
 def create_response(
     status_code: int, 
     body: Dict[str, Any], 
@@ -110,7 +123,7 @@ def create_response(
     return {
         'statusCode': status_code,
         'headers': default_headers,
-        'body': json.dumps(body, default=str)  # default=str handles datetime serialization
+        'body': json.dumps(body, default=json_default)
     }
 
 
@@ -227,21 +240,69 @@ def validate_required_fields(
     return None
 
 
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor token.
+    
+    Args:
+        values: Sort key values, in ORDER BY order
+        
+    Returns:
+        URL-safe token
+    """
+    payload = json.dumps(values, default=json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, key_count: int = None) -> List[Any]:
+    """
+    Decode a cursor token created by encode_cursor.
+    
+    Args:
+        cursor: Cursor token
+        key_count: Expected number of sort key values (optional)
+        
+    Returns:
+        Sort key values
+        
+    Raises:
+        ValueError: If the token is malformed or has the wrong number of values
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+    
+    if not isinstance(values, list) or (key_count is not None and len(values) != key_count):
+        raise ValueError("Invalid pagination cursor")
+    
+    return values
+
+
 def validate_pagination_params(
     query_params: Dict[str, str],
     default_limit: int = 50,
-    max_limit: int = 1000
-) -> Dict[str, int]:
+    max_limit: int = 1000,
+    cursor_keys: int = None
+) -> Dict[str, Any]:
     """
     Validate and normalize pagination parameters.
     
+    Two styles are accepted: `limit` + `offset`, or `limit` + `cursor`, where
+    cursor is the `next_cursor` token of the previous page. Cursor pages are
+    read with a keyset condition on the sort key, so deep pages cost the same
+    as the first one.
+    
     Args:
         query_params: Query parameters dictionary
         default_limit: Default limit if not provided
         max_limit: Maximum allowed limit
+        cursor_keys: Number of sort key values a cursor must carry (optional)
         
     Returns:
-        Dictionary with validated limit and offset
+        Dictionary with validated limit, offset, cursor (decoded sort key or
+        None) and include_total
         
     Raises:
         ValueError: If pagination parameters are invalid
@@ -259,14 +320,116 @@ def validate_pagination_params(
         if offset < 0:
             offset = 0
         
-        return {
-            'limit': limit,
-            'offset': offset
-        }
-        
     except ValueError as e:
         logger.error(f"Invalid pagination parameters: {e}")
         raise ValueError("Invalid pagination parameters. Limit and offset must be integers.")
+    
+    cursor = None
+    if query_params.get('cursor'):
+        if offset:
+            raise ValueError("Invalid pagination parameters. Use either offset or cursor, not both.")
+        cursor = decode_cursor(str(query_params['cursor']), cursor_keys)
+    
+    return {
+        'limit': limit,
+        'offset': offset,
+        'cursor': cursor,
+        'include_total': str(query_params.get('include_total', '')).lower() in ('true', '1', 'yes')
+    }
+
+
+def build_page_info(
+    rows: List[Dict[str, Any]],
+    pagination: Dict[str, Any],
+    sort_key
+) -> Dict[str, Any]:
+    """
+    Trim a page fetched with LIMIT limit + 1 and describe it.
+    
+    The extra row only tells whether another page exists; it is removed from
+    rows in place.
+    
+    Args:
+        rows: Rows of the page, fetched with one row more than the limit
+        pagination: Result of validate_pagination_params
+        sort_key: Function returning the sort key values of a row, in ORDER BY order
+        
+    Returns:
+        Pagination dictionary with limit, offset, count, has_more and next_cursor
+    """
+    has_more = len(rows) > pagination['limit']
+    del rows[pagination['limit']:]
+    
+    return {
+        'limit': pagination['limit'],
+        'offset': pagination['offset'],
+        'count': len(rows),
+        'has_more': has_more,
+        'next_cursor': encode_cursor(sort_key(rows[-1])) if has_more else None
+    }
+
+
+def select_fields(
+    query_params: Dict[str, Any],
+    available: List[str],
+    compact: List[str],
+    required: List[str] = ()
+) -> List[str]:
+    """
+    Resolve the `fields` / `view` parameters to the fields a response includes.
+    
+    `fields` (comma-separated names, or a list) takes precedence over `view`,
+    which is 'full' (default, every available field) or 'compact'. Handlers
+    select only the resolved columns in SQL.
+    
+    Args:
+        query_params: Query parameters dictionary
+        available: Every field the endpoint can return, in response order
+        compact: Fields of the compact view
+        required: Fields always included (identifiers and sort keys)
+        
+    Returns:
+        Field names in the order of `available`
+        
+    Raises:
+        ValueError: If the view or a field name is unknown
+    """
+    requested = query_params.get('fields')
+    if requested:
+        if isinstance(requested, str):
+            requested = requested.split(',')
+        names = {str(name).strip() for name in requested if str(name).strip()}
+        unknown = sorted(names - set(available))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(available)}")
+    else:
+        view = str(query_params.get('view') or 'full').lower()
+        if view not in ('full', 'compact'):
+            raise ValueError(f"Invalid view: {view}. Use 'compact' or 'full'")
+        names = set(available if view == 'full' else compact)
+    
+    names.update(required)
+    return [name for name in available if name in names]
+
+
+def mcp_projection_params(event: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Projection query parameters for an MCP Gateway event.
+    
+    Tool results go straight into the agent's context, so MCP requests get the
+    compact view unless they ask for `view` or `fields` explicitly.
+    
+    Args:
+        event: MCP Gateway event
+        
+    Returns:
+        Query parameters with view and, when given, fields
+    """
+    params = {'view': str(event.get('view') or 'compact')}
+    fields = event.get('fields')
+    if fields:
+        params['fields'] = ','.join(fields) if isinstance(fields, list) else str(fields)
+    return params
 
 
 def generate_uuid() -> str:
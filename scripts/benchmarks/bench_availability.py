@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Latency of the slot availability engine for 50 medics x 30 days.
+
+Seeds a throwaway PostgreSQL database (schema created through the migrations)
+with medics of a few specializations and random reservations, then calls the
+reservations API's check_availability for one medic and for a whole
+specialization over 30 days, and find_earliest_slots for a specialization
+over 14 days. As a baseline it runs what an agent had to do before: one
+day-level conflict count per medic and day.
+
+Usage:
+    python scripts/benchmarks/bench_availability.py --dsn postgresql://postgres@localhost/bench
+    python scripts/benchmarks/bench_availability.py --dsn ... --keep-schema   # only reload rows
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+from conftest import recreate_schema
+
+SPECIALIZATIONS = ['Cardiología', 'Dermatología', 'Pediatría', 'Neurología', 'Ortopedia']
+FIRST_DAY = date(2031, 3, 3)  # a Monday
+
+
+def load_module(name, relative_path):
+    """Import a Lambda entry module by file path."""
+    spec = importlib.util.spec_from_file_location(name, LAMBDAS_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(db, medics, days, reservations_per_day, keep_schema):
+    """Load medics, one exam and random non-overlapping reservations."""
+    if keep_schema:
+        db.execute_sql("TRUNCATE reservations, exams, medics, patients CASCADE")
+    else:
+        recreate_schema(db)
+
+    db.execute_sql("INSERT INTO patients (patient_id, full_name, email) VALUES ('patient-1', 'Ana Gómez', 'ana@example.com')")
+    db.execute_sql("INSERT INTO exams (exam_id, exam_name, exam_type, duration_minutes) VALUES ('exam-1', 'Ecografía', 'imaging', 30)")
+    db.execute_batch(
+        "INSERT INTO medics (medic_id, first_name, email, specialization) VALUES (:id, :name, :email, :specialization)",
+        [
+            [
+                db.create_parameter('id', f'medic-{i:03d}'),
+                db.create_parameter('name', f'Médico {i}'),
+                db.create_parameter('email', f'medico{i}@example.com'),
+                db.create_parameter('specialization', SPECIALIZATIONS[i % len(SPECIALIZATIONS)]),
+            ]
+            for i in range(medics)
+        ]
+    )
+
+    rng = random.Random(42)
+    rows = []
+    for medic in range(medics):
+        for day in range(days):
+            # Distinct half-hour starts between 08:00 and 16:30 never overlap
+            for half_hour in rng.sample(range(18), reservations_per_day):
+                rows.append([
+                    db.create_parameter('id', f'res-{medic}-{day}-{half_hour}'),
+                    db.create_parameter('medic_id', f'medic-{medic:03d}'),
+                    db.create_parameter('day', str(FIRST_DAY + timedelta(days=day))),
+                    db.create_parameter('time', f'{8 + half_hour // 2:02d}:{30 * (half_hour % 2):02d}'),
+                ])
+    db.execute_batch(
+        "INSERT INTO reservations (reservation_id, patient_id, medic_id, exam_id, reservation_date, reservation_time, duration_minutes) "
+        "VALUES (:id, 'patient-1', :medic_id, 'exam-1', :day::date, :time::time, 30)",
+        rows
+    )
+    db.execute_sql("ANALYZE")
+    return len(rows)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(func, count):
+    """Call func(i) count times and return the latencies in milliseconds."""
+    func(count)  # warm-up
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dsn', default=os.environ.get('TEST_DATABASE_DSN'))
+    parser.add_argument('--medics', type=int, default=50)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--reservations-per-day', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--keep-schema', action='store_true', help="reuse the existing schema, only reload rows")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or TEST_DATABASE_DSN is required")
+
+    logging.disable(logging.CRITICAL)
+    os.environ['DATABASE_DSN'] = args.dsn
+    db = DatabaseManager(backend='postgres')
+    reservation_count = seed(db, args.medics, args.days, args.reservations_per_day, args.keep_schema)
+
+    reservations = load_module('reservations_handler', 'api/reservations/handler.py')
+    reservations.db_manager = db
+    date_to = FIRST_DAY + timedelta(days=args.days - 1)
+
+    def availability(body):
+        result = reservations.check_availability({'body': json.dumps(body)})
+        assert result['statusCode'] == 200, result
+        return json.loads(result['body'])
+
+    def one_medic(i):
+        availability({
+            'medic_id': f'medic-{i % args.medics:03d}', 'exam_id': 'exam-1',
+            'date_from': str(FIRST_DAY), 'date_to': str(date_to), 'max_slots': 500,
+        })
+
+    def specialization(i):
+        availability({
+            'specialization': SPECIALIZATIONS[i % len(SPECIALIZATIONS)], 'exam_id': 'exam-1',
+            'date_from': str(FIRST_DAY), 'date_to': str(date_to), 'max_slots': 500,
+        })
+
+    def earliest(i):
+        result = reservations.find_earliest_slots({'body': json.dumps({
+            'specialization': SPECIALIZATIONS[i % len(SPECIALIZATIONS)], 'exam_id': 'exam-1',
+            'date_from': str(FIRST_DAY), 'limit': 5,
+        })})
+        assert result['statusCode'] == 200, result
+
+    def legacy_day_probes(i):
+        # Previous check_medic_availability: one query per day, any reservation blocks the whole day
+        for day in range(args.days):
+            db.execute_query(
+                "SELECT COUNT(*) AS conflict_count FROM reservations WHERE medic_id = :medic_id "
+                "AND DATE(reservation_date) = DATE(:date) AND status IN ('scheduled', 'confirmed')",
+                [
+                    db.create_parameter('medic_id', f'medic-{i % args.medics:03d}'),
+                    db.create_parameter('date', str(FIRST_DAY + timedelta(days=day))),
+                ]
+            )
+
+    print(f"\n{args.medics} medics x {args.days} days, {reservation_count} reservations, {args.requests} requests")
+    print(f"{'scenario':<34} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, func in [
+        ('slots, one medic, 30 days', one_medic),
+        ('slots, specialization, 30 days', specialization),
+        ('earliest per medic, 14 days', earliest),
+        ('legacy day counts, one medic', legacy_day_probes),
+    ]:
+        samples = measure(func, args.requests)
+        print(f"{name:<34} {statistics.median(samples):>8.2f} {percentile(samples, 0.95):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
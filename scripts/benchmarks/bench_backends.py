@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Per-request latency of the database backends for real handler code paths.
+
+Seeds a throwaway PostgreSQL database, then runs patient_lookup's
+handle_search_patient (cedula and name searches) and the reservations API's
+create_reservation against each configured backend and prints p50/p95/max
+latency in milliseconds.
+
+Backends:
+- postgres: always measured, using --dsn (or TEST_DATABASE_DSN)
+- data_api: measured when DATABASE_CLUSTER_ARN, DATABASE_SECRET_ARN and
+  DATABASE_NAME point at the same database. Locally this works with a Data API
+  emulator such as koxudaxi/local-data-api by also setting
+  AWS_ENDPOINT_URL_RDS_DATA=http://localhost:8080
+
+Usage:
+    python scripts/benchmarks/bench_backends.py --dsn postgresql://postgres@localhost/bench [--requests 200]
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+from conftest import recreate_schema
+
+
+def load_module(name, relative_path):
+    """Import a Lambda entry module by file path (handler names collide across functions)."""
+    spec = importlib.util.spec_from_file_location(name, LAMBDAS_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(db, patient_count):
+    """Recreate the schema through the migrations and load sample rows."""
+    recreate_schema(db)
+
+    db.execute_batch(
+        "INSERT INTO patients (patient_id, full_name, email, cedula, phone, date_of_birth) "
+        "VALUES (:id, :name, :email, :cedula, :phone, CAST(:dob AS date))",
+        [
+            [
+                db.create_parameter('id', f'patient-{i:06d}'),
+                db.create_parameter('name', f'Paciente Prueba {i}'),
+                db.create_parameter('email', f'paciente{i}@example.com'),
+                db.create_parameter('cedula', str(10000000 + i)),
+                db.create_parameter('phone', f'+57 300 {i:07d}'),
+                db.create_parameter('dob', '1980-01-01'),
+            ]
+            for i in range(patient_count)
+        ]
+    )
+    db.execute_sql("INSERT INTO medics (medic_id, first_name, email) VALUES ('medic-1', 'Laura', 'laura@example.com')")
+    db.execute_sql("INSERT INTO exams (exam_id, exam_name, exam_type) VALUES ('exam-1', 'Hemograma', 'lab')")
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(func, count):
+    """Call func(i) count times and return the latencies in milliseconds."""
+    func(count)  # warm-up (connection pool, TLS session) on an index the loop does not use
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dsn', default=os.environ.get('TEST_DATABASE_DSN'))
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--patients', type=int, default=2000)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or TEST_DATABASE_DSN is required")
+
+    logging.disable(logging.CRITICAL)
+    os.environ['DATABASE_DSN'] = args.dsn
+
+    backends = {'postgres': lambda: DatabaseManager(backend='postgres')}
+    if all(os.environ.get(name) for name in ('DATABASE_CLUSTER_ARN', 'DATABASE_SECRET_ARN', 'DATABASE_NAME')):
+        backends['data_api'] = lambda: DatabaseManager(
+            os.environ['DATABASE_CLUSTER_ARN'], os.environ['DATABASE_SECRET_ARN'],
+            os.environ['DATABASE_NAME'], backend='data_api'
+        )
+    else:
+        print("DATABASE_CLUSTER_ARN/DATABASE_SECRET_ARN/DATABASE_NAME not set: skipping data_api")
+
+    seed(backends['postgres'](), args.patients)
+    patient_lookup = load_module('patient_lookup_index', 'patient_lookup/index.py')
+    reservations = load_module('reservations_handler', 'api/reservations/handler.py')
+
+    print(f"\n{args.requests} requests per scenario, {args.patients} patients")
+    print(f"{'backend':<10} {'scenario':<26} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for backend_name, factory in backends.items():
+        db_manager = factory()
+        patient_lookup.db_manager = db_manager
+        reservations.db_manager = db_manager
+        db_manager.execute_sql("DELETE FROM reservations")
+
+        def search_by_cedula(i):
+            result = patient_lookup.handle_search_patient({'cedula': str(10000000 + i % args.patients)})
+            assert result['statusCode'] == 200, result
+
+        def search_by_name(i):
+            patient_lookup.handle_search_patient({'name': f'Paciente Prueba {i % args.patients}'})
+
+        first_day = date(2030, 1, 1)
+
+        def create_reservation(i):
+            # One reservation per day so no booking overlaps an earlier one
+            body = {
+                'patient_id': f'patient-{i % args.patients:06d}', 'medic_id': 'medic-1', 'exam_id': 'exam-1',
+                'appointment_date': f'{first_day + timedelta(days=i + 1)}T09:00:00',
+            }
+            result = reservations.create_reservation({'body': json.dumps(body)})
+            assert result['statusCode'] == 201, result
+
+        scenarios = [
+            ('search_patient (cedula)', search_by_cedula),
+            ('search_patient (name)', search_by_name),
+            ('create_reservation', create_reservation),
+        ]
+        for scenario_name, func in scenarios:
+            samples = measure(func, args.requests)
+            print(
+                f"{backend_name:<10} {scenario_name:<26} {statistics.median(samples):>8.2f} "
+                f"{percentile(samples, 0.95):>8.2f} {max(samples):>8.2f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
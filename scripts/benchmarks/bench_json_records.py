@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Payload-size and latency comparison of Data API result formats.
+
+Runs the list_patients and patient lookup query shapes through
+DatabaseManager.execute_query with a stubbed rds-data client, once with the
+default typed records (includeResultMetadata=True) and once with
+formatRecordsAs='JSON'. The stub
+returns pre-serialized responses and parses them on every call, the way
+botocore does, so the timings include response deserialization plus decoding.
+
+Usage:
+    python scripts/benchmarks/bench_json_records.py [--rows 50 500 5000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'lambdas'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+
+
+PATIENT_COLUMNS = [
+    ('patient_id', 'varchar'), ('first_name', 'varchar'), ('last_name', 'varchar'),
+    ('full_name', 'varchar'), ('email', 'varchar'), ('phone', 'varchar'),
+    ('date_of_birth', 'date'), ('age', 'int4'), ('gender', 'varchar'),
+    ('document_type', 'varchar'), ('document_number', 'varchar'),
+    ('address', 'jsonb'), ('medical_history', 'jsonb'), ('lab_results', 'jsonb'),
+    ('source_scan', 'varchar'), ('cedula', 'varchar'),
+    ('created_at', 'timestamptz'), ('updated_at', 'timestamptz'),
+]
+JSON_COLUMNS = ['address', 'medical_history', 'lab_results']
+
+# Narrow projection used by the patient_lookup searches (no JSONB columns)
+LOOKUP_COLUMNS = [
+    ('patient_id', 'varchar'), ('full_name', 'varchar'), ('email', 'varchar'),
+    ('phone', 'varchar'), ('cedula', 'varchar'), ('date_of_birth', 'date'),
+    ('created_at', 'timestamptz'), ('updated_at', 'timestamptz'),
+]
+
+
+def build_row(i):
+    """Build one patients row as plain Python values."""
+    return {
+        'patient_id': f'patient-{i:06d}',
+        'first_name': 'María',
+        'last_name': f'González {i}',
+        'full_name': f'María González {i}',
+        'email': f'maria.gonzalez{i}@example.com',
+        'phone': '+57 312 555 0101',
+        'date_of_birth': '1980-03-14',
+        'age': 44,
+        'gender': 'F',
+        'document_type': 'CC',
+        'document_number': f'{52000000 + i}',
+        'address': json.dumps({'calle': 'Calle 100 # 15-20', 'ciudad': 'Bogotá', 'departamento': 'Cundinamarca'}),
+        'medical_history': json.dumps({
+            'conditions': [{'name': 'Hipertensión', 'since': '2015'}, {'name': 'Diabetes tipo 2', 'since': '2019'}],
+            'medications': [{'name': 'Losartán', 'dose': '50 mg'}, {'name': 'Metformina', 'dose': '850 mg'}],
+            'allergies': ['Penicilina'],
+        }),
+        'lab_results': json.dumps([
+            {'test': 'HbA1c', 'value': '7.1', 'unit': '%', 'date': '2024-02-01'},
+            {'test': 'Colesterol total', 'value': '210', 'unit': 'mg/dL', 'date': '2024-02-01'},
+        ]),
+        'source_scan': f'scans/patient-{i:06d}.pdf',
+        'cedula': f'{52000000 + i}',
+        'created_at': '2024-01-02 03:04:05.123456',
+        'updated_at': '2024-06-07 08:09:10.654321',
+    }
+
+
+def to_field(value, type_name):
+    """Encode a value as a Data API field."""
+    if value is None:
+        return {'isNull': True}
+    if type_name == 'int4':
+        return {'longValue': value}
+    return {'stringValue': value}
+
+
+def build_responses(count, columns):
+    """Return serialized (records, json) Data API responses for `count` rows."""
+    names = [name for name, _ in columns]
+    rows = [{name: row[name] for name in names} for row in (build_row(i) for i in range(count))]
+    records_response = {
+        'columnMetadata': [
+            {
+                'name': name, 'label': name, 'typeName': type_name, 'nullable': 1,
+                'isSigned': type_name == 'int4', 'precision': 2147483647, 'scale': 0,
+                'schemaName': '', 'tableName': 'patients', 'type': 12,
+                'isAutoIncrement': False, 'isCaseSensitive': True, 'isCurrency': False,
+            }
+            for name, type_name in columns
+        ],
+        'records': [[to_field(row[name], type_name) for name, type_name in columns] for row in rows],
+        'numberOfRecordsUpdated': 0,
+    }
+    json_response = {
+        'formattedRecords': json.dumps(rows, ensure_ascii=False),
+        'numberOfRecordsUpdated': 0,
+    }
+    return (
+        json.dumps(records_response, ensure_ascii=False).encode('utf-8'),
+        json.dumps(json_response, ensure_ascii=False).encode('utf-8'),
+    )
+
+
+class CannedRdsData:
+    """Stub rds-data client that parses a canned wire response per call."""
+
+    def __init__(self, records_payload, json_payload):
+        self.records_payload = records_payload
+        self.json_payload = json_payload
+
+    def execute_statement(self, **kwargs):
+        if kwargs.get('formatRecordsAs') == 'JSON':
+            return json.loads(self.json_payload)
+        return json.loads(self.records_payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager('cluster-arn', 'secret-arn', 'healthcare')
+    sql = 'SELECT * FROM patients ORDER BY full_name LIMIT :limit OFFSET :offset'
+
+    shapes = [
+        ('list_patients (with JSONB)', PATIENT_COLUMNS, JSON_COLUMNS),
+        ('patient lookup (narrow)', LOOKUP_COLUMNS, None),
+    ]
+    for shape_name, columns, json_columns in shapes:
+        print(f"\n{shape_name}: {len(columns)} columns, best of {args.repeat}")
+        print(f"{'rows':>6} {'records KB':>11} {'json KB':>9} {'size':>6} {'records ms':>11} {'json ms':>9} {'speedup':>8}")
+        for count in args.rows:
+            records_payload, json_payload = build_responses(count, columns)
+            db_manager.backend.rds_data = CannedRdsData(records_payload, json_payload)
+
+            records_ms = min(timeit.repeat(
+                lambda: db_manager.execute_query(sql), number=1, repeat=args.repeat)) * 1000
+            json_ms = min(timeit.repeat(
+                lambda: db_manager.execute_query(sql, format='json', json_columns=json_columns),
+                number=1, repeat=args.repeat)) * 1000
+
+            print(
+                f"{count:>6} {len(records_payload) / 1024:>11.1f} {len(json_payload) / 1024:>9.1f} "
+                f"{len(json_payload) / len(records_payload):>6.0%} {records_ms:>11.2f} {json_ms:>9.2f} "
+                f"{records_ms / json_ms:>7.1f}x"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Query plans and latency of patient name search: legacy LIKE vs trigram.
+
+Loads synthetic Spanish patient names into a throwaway PostgreSQL database
+(schema created through the migrations, so pg_trgm and unaccent must be
+available), then runs EXPLAIN ANALYZE for the name condition built by
+patient_lookup.build_name_search in both modes. The legacy mode shows a
+sequential scan over patients; the trigram mode a bitmap scan of
+idx_patients_full_name_trgm.
+
+Usage:
+    python scripts/benchmarks/bench_name_search.py --dsn postgresql://postgres@localhost/bench [--sizes 100000 1000000]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+from conftest import recreate_schema
+
+
+FIRST_NAMES = [
+    'José', 'María', 'Juan', 'Ana', 'Luis', 'Carmen', 'Andrés', 'Lucía', 'Sebastián', 'Valentina',
+    'Camilo', 'Mónica', 'Jesús', 'Sofía', 'Nicolás', 'Daniela', 'Julián', 'Paula', 'Ramón', 'Inés',
+]
+LAST_NAMES = [
+    'Pérez', 'Gómez', 'Rodríguez', 'Martínez', 'López', 'García', 'Hernández', 'Díaz', 'Muñoz',
+    'Álvarez', 'Ramírez', 'Castaño', 'Peña', 'Ordóñez', 'Suárez', 'Jiménez', 'Vásquez', 'Rincón',
+    'Cárdenas', 'Montaña',
+]
+
+# (label, search input) pairs; accents and case differ from the stored names on purpose
+QUERIES = [
+    ('accent-less full name', 'jose perez gomez'),
+    ('surname only', 'Ordonez'),
+    ('typo', 'Sebastian Rodrigez'),
+]
+
+
+def load_module(name, relative_path):
+    """Import a Lambda entry module by file path."""
+    spec = importlib.util.spec_from_file_location(name, LAMBDAS_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sql_array(values):
+    return "ARRAY[" + ", ".join("'" + value + "'" for value in values) + "]"
+
+
+def seed(db, count):
+    """Recreate the schema and insert `count` synthetic patients."""
+    recreate_schema(db)
+    db.execute_sql(f"""
+        INSERT INTO patients (patient_id, full_name, email)
+        SELECT
+            'patient-' || i,
+            ({sql_array(FIRST_NAMES)})[1 + abs(hashtext(i || 'f')) % {len(FIRST_NAMES)}] || ' ' ||
+            ({sql_array(LAST_NAMES)})[1 + abs(hashtext(i || 'l1')) % {len(LAST_NAMES)}] || ' ' ||
+            ({sql_array(LAST_NAMES)})[1 + abs(hashtext(i || 'l2')) % {len(LAST_NAMES)}],
+            'patient' || i || '@example.com'
+        FROM generate_series(1, :count) AS i
+    """, [db.create_parameter('count', count, 'long')])
+    db.execute_sql("ANALYZE patients")
+
+
+def summarize_plan(node, found=None):
+    """Collect the scan node types of an EXPLAIN (FORMAT JSON) plan."""
+    found = [] if found is None else found
+    if 'Scan' in node['Node Type']:
+        found.append(node['Node Type'] + (f" on {node['Index Name']}" if node.get('Index Name') else ''))
+    for child in node.get('Plans', []):
+        summarize_plan(child, found)
+    return found
+
+
+def explain(db, patient_lookup, name, mode):
+    condition, score, parameters = patient_lookup.build_name_search(name, mode)
+    sql = f"""
+        EXPLAIN (ANALYZE, FORMAT JSON)
+        SELECT patient_id, full_name, {score} AS match_score
+        FROM patients
+        WHERE {condition}
+        ORDER BY match_score DESC, LENGTH(full_name), full_name
+        LIMIT 3
+    """
+    plan = db.execute_query(sql, parameters)[0]['QUERY PLAN'][0]
+    return plan['Execution Time'], plan['Plan']['Actual Rows'], summarize_plan(plan['Plan'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dsn', default=os.environ.get('TEST_DATABASE_DSN'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or TEST_DATABASE_DSN is required")
+
+    logging.disable(logging.CRITICAL)
+    os.environ['DATABASE_DSN'] = args.dsn
+    db = DatabaseManager(backend='postgres')
+    patient_lookup = load_module('patient_lookup_index', 'patient_lookup/index.py')
+
+    for size in args.sizes:
+        seed(db, size)
+        print(f"\n{size} patients")
+        print(f"{'query':<24} {'mode':<8} {'ms':>9} {'rows':>5}  plan")
+        for label, name in QUERIES:
+            for mode in ('like', 'trigram'):
+                elapsed_ms, rows, scans = explain(db, patient_lookup, name, mode)
+                print(f"{label:<24} {mode:<8} {elapsed_ms:>9.2f} {rows:>5}  {', '.join(scans)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for DatabaseManager.parse_records.
+
+Compares the decoder-plan implementation against the previous per-field
+if/elif implementation on a synthetic 10k-row patients result set.
+
+Usage:
+    python scripts/benchmarks/bench_parse_records.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'lambdas'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+
+
+COLUMN_METADATA = [
+    {'name': 'patient_id', 'typeName': 'varchar'},
+    {'name': 'full_name', 'typeName': 'varchar'},
+    {'name': 'email', 'typeName': 'varchar'},
+    {'name': 'cedula', 'typeName': 'varchar'},
+    {'name': 'date_of_birth', 'typeName': 'date'},
+    {'name': 'phone', 'typeName': 'varchar'},
+    {'name': 'age', 'typeName': 'int4'},
+    {'name': 'address', 'typeName': 'jsonb'},
+    {'name': 'medical_history', 'typeName': 'jsonb'},
+    {'name': 'created_at', 'typeName': 'timestamptz'},
+    {'name': 'updated_at', 'typeName': 'timestamptz'},
+]
+
+
+def legacy_parse_records(records, column_metadata):
+    """Previous parse_records implementation, kept for comparison."""
+    if not records or not column_metadata:
+        return []
+
+    column_names = [col['name'] for col in column_metadata]
+
+    parsed_records = []
+    for record in records:
+        row = {}
+        for i, field in enumerate(record):
+            column_name = column_names[i] if i < len(column_names) else f'column_{i}'
+
+            if 'isNull' in field and field['isNull']:
+                row[column_name] = None
+            elif 'stringValue' in field:
+                row[column_name] = field['stringValue']
+            elif 'longValue' in field:
+                row[column_name] = field['longValue']
+            elif 'doubleValue' in field:
+                row[column_name] = field['doubleValue']
+            elif 'booleanValue' in field:
+                row[column_name] = field['booleanValue']
+            elif 'blobValue' in field:
+                row[column_name] = field['blobValue']
+            else:
+                row[column_name] = str(field)
+
+        parsed_records.append(row)
+
+    return parsed_records
+
+
+def legacy_parse_with_json_columns(records, column_metadata):
+    """Legacy parsing plus the json.loads callers had to do on JSONB columns."""
+    rows = legacy_parse_records(records, column_metadata)
+    for row in rows:
+        for column in ('address', 'medical_history'):
+            if row[column] is not None:
+                row[column] = json.loads(row[column])
+    return rows
+
+
+def build_records(count):
+    """Build Data API style records shaped like the patients table."""
+    address = json.dumps({'calle': 'Cra 7 # 45-10', 'ciudad': 'Bogotá', 'pais': 'Colombia'})
+    history = json.dumps({'conditions': ['hipertensión'], 'medications': ['losartán'], 'age': 54})
+    records = []
+    for i in range(count):
+        records.append([
+            {'stringValue': f'patient-{i:06d}'},
+            {'stringValue': f'Paciente Número {i}'},
+            {'stringValue': f'paciente{i}@example.com'},
+            {'stringValue': f'{10000000 + i}'},
+            {'stringValue': '1970-01-01'},
+            {'stringValue': '+57 312 555 0000'},
+            {'longValue': 54},
+            {'stringValue': address},
+            {'stringValue': history} if i % 5 else {'isNull': True},
+            {'stringValue': '2024-01-02 03:04:05.123456'},
+            {'stringValue': '2024-06-07 08:09:10.5'},
+        ])
+    return records
+
+
+def best_of(repeat, func, *args):
+    """Return the best wall-clock time in milliseconds over `repeat` runs (GC disabled)."""
+    return min(timeit.repeat(lambda: func(*args), number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    records = build_records(args.rows)
+    db_manager = DatabaseManager('cluster-arn', 'secret-arn', 'healthcare')
+
+    # Same records described as plain text columns, to isolate the row-building cost
+    untyped_metadata = [dict(column, typeName='varchar') for column in COLUMN_METADATA
+                        if column['typeName'] != 'int4']
+    untyped_metadata.insert(6, {'name': 'age', 'typeName': 'int4'})
+
+    results = {
+        'legacy (strings only)': best_of(args.repeat, legacy_parse_records, records, COLUMN_METADATA),
+        'decoder plan (no conversion)': best_of(args.repeat, db_manager.parse_records, records, untyped_metadata),
+        'legacy + caller json.loads': best_of(args.repeat, legacy_parse_with_json_columns, records, COLUMN_METADATA),
+        'decoder plan (typed)': best_of(args.repeat, db_manager.parse_records, records, COLUMN_METADATA),
+    }
+
+    print(f"parse_records benchmark: {args.rows} rows x {len(COLUMN_METADATA)} columns, best of {args.repeat}")
+    for name, elapsed_ms in results.items():
+        print(f"  {name:<28} {elapsed_ms:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Patient search latency: warm in-memory index vs the SQL path.
+
+Seeds a throwaway PostgreSQL database (schema created through the migrations,
+so pg_trgm and unaccent must be available), then calls patient_lookup's
+handle_search_patient with PATIENT_INDEX_ENABLED off and on and prints
+p50/p99 latency in milliseconds per search type. The index load itself is
+reported separately; it is paid once per container.
+
+Usage:
+    python scripts/benchmarks/bench_patient_index.py --dsn postgresql://postgres@localhost/bench [--patients 20000]
+    python scripts/benchmarks/bench_patient_index.py --dsn ... --no-seed   # use the patients already loaded
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+from conftest import recreate_schema
+from bench_name_search import FIRST_NAMES, LAST_NAMES, sql_array
+
+
+def load_module(name, relative_path):
+    """Import a Lambda entry module by file path."""
+    spec = importlib.util.spec_from_file_location(name, LAMBDAS_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(db, count):
+    """Recreate the schema and insert `count` patients with synthetic Spanish names."""
+    recreate_schema(db)
+    db.execute_sql(f"""
+        INSERT INTO patients (patient_id, full_name, email, cedula, phone)
+        SELECT
+            'patient-' || lpad(i::text, 7, '0'),
+            ({sql_array(FIRST_NAMES)})[1 + abs(hashtext(i || 'f')) % {len(FIRST_NAMES)}] || ' ' ||
+            ({sql_array(LAST_NAMES)})[1 + abs(hashtext(i || 'l1')) % {len(LAST_NAMES)}] || ' ' ||
+            ({sql_array(LAST_NAMES)})[1 + abs(hashtext(i || 'l2')) % {len(LAST_NAMES)}],
+            'paciente' || i || '@example.com',
+            (10000000 + i)::text,
+            '+57 300 ' || lpad(i::text, 7, '0')
+        FROM generate_series(1, :count) AS i
+    """, [db.create_parameter('count', count, 'long')])
+    db.execute_sql("ANALYZE patients")
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(func, count):
+    """Call func(i) count times and return the latencies in milliseconds."""
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dsn', default=os.environ.get('TEST_DATABASE_DSN'))
+    parser.add_argument('--patients', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--no-seed', action='store_true', help="search the patients already in the database")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or TEST_DATABASE_DSN is required")
+
+    logging.disable(logging.CRITICAL)
+    os.environ['DATABASE_DSN'] = args.dsn
+    os.environ['DATABASE_BACKEND'] = 'postgres'
+    db = DatabaseManager(backend='postgres')
+    if not args.no_seed:
+        seed(db, args.patients)
+
+    patient_lookup = load_module('patient_lookup_index', 'patient_lookup/index.py')
+    patient_lookup.db_manager = db
+    samples_by_criteria = db.execute_query(
+        "SELECT full_name, email, phone, cedula FROM patients ORDER BY random() LIMIT :count",
+        [db.create_parameter('count', args.requests, 'long')]
+    )
+    # Each search is issued with its own field only, as the agent does for identifier lookups
+    searches = {
+        field: [{field: row[field]} for row in samples_by_criteria if row.get(field)]
+        for field in ('cedula', 'email', 'phone', 'full_name')
+    }
+    searches['name'] = [{'name': criteria['full_name']} for criteria in searches.pop('full_name')]
+
+    index = patient_lookup.PatientSearchIndex(db, max_patients=10 ** 9)
+    start = time.perf_counter()
+    index.ensure_fresh()
+    print(f"\nindex load: {len(index.patients)} patients in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print(f"{'search':<8} {'path':<8} {'p50 ms':>8} {'p99 ms':>8}")
+    for field, criteria_list in searches.items():
+        if not criteria_list:
+            continue
+        for path, enabled in (('sql', False), ('memory', True)):
+            patient_lookup.PATIENT_INDEX_ENABLED = enabled
+            patient_lookup._patient_index = index if enabled else None
+
+            def search(i):
+                result = patient_lookup.handle_search_patient(criteria_list[i % len(criteria_list)])
+                assert result['statusCode'] == 200, result
+
+            search(0)  # warm-up (connection pool)
+            samples = measure(search, args.requests)
+            print(f"{field:<8} {path:<8} {statistics.median(samples):>8.3f} {percentile(samples, 0.99):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
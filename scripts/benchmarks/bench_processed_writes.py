@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Bytes written and wall time per document when storing processed BDA output.
+
+Builds synthetic BDA output for documents of several page counts (markdown,
+HTML, standard output with per-page elements, blueprint inference result and
+job metadata) and stores it with the extraction function's
+organize_processed_data, once with compression disabled and once with
+PROCESSED_GZIP_MIN_BYTES set. As a baseline it runs the previous writer:
+sequential put_object calls, pretty-printed JSON and an extracted_data.json
+that embedded every result file.
+
+S3 is simulated: each put_object sleeps for a fixed request latency plus the
+body size divided by the upload bandwidth, so wall times show the effect of
+concurrency, not real network numbers.
+
+Usage:
+    python scripts/benchmarks/bench_processed_writes.py [--latency-ms 40] [--mbps 40] [--pages 1 10 50]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import document_workflow.extraction.index as extraction
+
+PAGE_TEXT = (
+    "Paciente de 54 años con antecedente de hipertensión arterial y diabetes tipo 2, "
+    "en tratamiento con losartán 50 mg y metformina 850 mg. Consulta por cefalea "
+    "occipital de tres días de evolución. Presión arterial 150/95 mmHg, frecuencia "
+    "cardíaca 82 lpm, temperatura 36.8 °C. Se solicita perfil lipídico y HbA1c. "
+) * 8
+
+
+class SimulatedS3:
+    """put_object with request latency and bandwidth, counting bytes and objects."""
+
+    def __init__(self, latency_seconds, bytes_per_second):
+        self.latency_seconds = latency_seconds
+        self.bytes_per_second = bytes_per_second
+        self.lock = threading.Lock()
+        self.bytes_written = 0
+        self.objects = 0
+
+    def put_object(self, Body, **kwargs):
+        size = len(Body.encode('utf-8') if isinstance(Body, str) else Body)
+        time.sleep(self.latency_seconds + size / self.bytes_per_second)
+        with self.lock:
+            self.bytes_written += size
+            self.objects += 1
+        return {}
+
+
+def build_bda_output(pages):
+    """Synthetic BDA output for a document with the given number of pages."""
+    markdown = '\n\n'.join(f"## Página {page + 1}\n\n{PAGE_TEXT}" for page in range(pages))
+    html = ''.join(f"<section><h2>Página {page + 1}</h2><p>{PAGE_TEXT}</p></section>" for page in range(pages))
+    standard_result = {
+        'metadata': {'number_of_pages': pages},
+        'document': {'representation': {'markdown': markdown, 'html': html}},
+        'pages': [
+            {
+                'page_index': page,
+                'representation': {'markdown': PAGE_TEXT, 'html': f"<p>{PAGE_TEXT}</p>"},
+                'elements': [
+                    {'type': 'TEXT', 'representation': {'markdown': sentence}, 'bounding_box': [0.1, 0.2, 0.8, 0.05]}
+                    for sentence in PAGE_TEXT.split('. ')
+                ]
+            }
+            for page in range(pages)
+        ]
+    }
+    custom_result = {
+        'matched_blueprint': {'name': 'medical-record', 'confidence': 0.93},
+        'inference_result': {
+            'document_type': 'medical-history', 'diagnoses': 'Hipertensión arterial; Diabetes tipo 2',
+            'medications': 'Losartán 50 mg; Metformina 850 mg', 'blood_pressure': '150/95', 'heart_rate': 82
+        }
+    }
+    return {
+        'job_metadata': {'job_id': 'job-1', 'pages': pages, 'output': [{'segment': 0, 'status': 'SUCCESS'}]},
+        'result_files': {
+            'custom_result': custom_result,
+            'standard_result': standard_result,
+            'html_result': html,
+            'markdown_result': markdown
+        },
+        'source_uri': 's3://bda-output/job-1',
+        'processing_timestamp': '2031-03-03T10:00:00Z'
+    }
+
+
+def legacy_organize_processed_data(s3, patient_id, document_id, extracted_data, classification):
+    """The writer before the manifest: sequential uploads, indented JSON, embedded result files."""
+    key_prefix = f"{patient_id}/{document_id}"
+    clean_data = {k: v for k, v in extracted_data.items() if k != 'source_uri'}
+    clean_data['classification'] = classification
+    s3.put_object(Key=f"{key_prefix}/extracted_data.json", Body=json.dumps(clean_data, indent=2, ensure_ascii=False))
+
+    for file_type, content in extracted_data.get('result_files', {}).items():
+        if not content:
+            continue
+        body = json.dumps(content, indent=2, ensure_ascii=False) if isinstance(content, dict) else content
+        s3.put_object(Key=f"{key_prefix}/{file_type}", Body=body)
+
+    if extracted_data.get('job_metadata'):
+        s3.put_object(Key=f"{key_prefix}/job_metadata.json", Body=json.dumps(extracted_data['job_metadata'], indent=2))
+
+
+def measure(write, s3):
+    started = time.perf_counter()
+    write()
+    return s3.bytes_written, s3.objects, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--latency-ms', type=float, default=40)
+    parser.add_argument('--mbps', type=float, default=40, help="Simulated upload bandwidth in MB/s")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--gzip-min-bytes', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    extraction.PROCESSED_BUCKET = 'processed'
+    classification = {'category': 'medical-history', 'confidence': 93.0, 'auto_classified': True}
+
+    def simulated_s3():
+        return SimulatedS3(args.latency_ms / 1000, args.mbps * 1024 * 1024)
+
+    print(f"\n{'pages':>5} {'writer':<22} {'objects':>7} {'bytes':>10} {'wall ms':>8}")
+    for pages in args.pages:
+        data = build_bda_output(pages)
+
+        s3 = simulated_s3()
+        results = [('before', measure(
+            lambda: legacy_organize_processed_data(s3, 'patient-1', 'doc-1', data, classification), s3))]
+
+        for label, gzip_min_bytes in (('after', 0), (f'after + gzip>={args.gzip_min_bytes // 1024}KiB', args.gzip_min_bytes)):
+            s3 = simulated_s3()
+            extraction.s3_client = s3
+            extraction.PROCESSED_GZIP_MIN_BYTES = gzip_min_bytes
+            results.append((label, measure(
+                lambda: extraction.organize_processed_data('patient-1', 'doc-1', data, classification), s3)))
+
+        for label, (bytes_written, objects, wall_ms) in results:
+            print(f"{pages:>5} {label:<22} {objects:>7} {bytes_written:>10} {wall_ms:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Size of MCP tool results in the full and compact views.
+
+Seeds a throwaway PostgreSQL database with patients carrying realistic
+address, medical_history and lab_results documents, then invokes the
+patients, medics, exams, reservations and patient_lookup handlers with MCP
+Gateway events once with view='full' and once with view='compact', and prints
+the response body size in bytes and estimated tokens (characters / 4, a usual
+approximation for JSON sent to the model).
+
+Usage:
+    python scripts/benchmarks/bench_response_size.py --dsn postgresql://postgres@localhost/bench [--patients 200]
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[2] / 'lambdas'
+sys.path.append(str(LAMBDAS_DIR))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from shared.database import DatabaseManager
+from conftest import recreate_schema
+
+
+ADDRESS = {'calle': 'Calle 100 # 15-20', 'ciudad': 'Bogotá', 'departamento': 'Cundinamarca'}
+MEDICAL_HISTORY = {
+    'conditions': [{'name': 'Hipertensión', 'since': '2015'}, {'name': 'Diabetes tipo 2', 'since': '2019'}],
+    'medications': [{'name': 'Losartán', 'dose': '50 mg'}, {'name': 'Metformina', 'dose': '850 mg'}],
+    'allergies': ['Penicilina'],
+}
+LAB_RESULTS = [
+    {'test': 'HbA1c', 'value': '7.1', 'unit': '%', 'date': '2024-02-01'},
+    {'test': 'Colesterol total', 'value': '210', 'unit': 'mg/dL', 'date': '2024-02-01'},
+]
+
+
+def load_module(name, relative_path):
+    """Import a Lambda entry module by file path (handler names collide across functions)."""
+    spec = importlib.util.spec_from_file_location(name, LAMBDAS_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(db, patient_count):
+    """Recreate the schema through the migrations and load sample rows."""
+    recreate_schema(db)
+
+    db.execute_sql("""
+        INSERT INTO patients (patient_id, first_name, last_name, full_name, email, phone, cedula,
+                              date_of_birth, age, gender, document_type, document_number,
+                              address, medical_history, lab_results, source_scan)
+        SELECT 'patient-' || lpad(i::text, 6, '0'), 'María', 'González ' || i, 'María González ' || i,
+               'maria' || i || '@example.com', '+57 312 555 0101', (52000000 + i)::text,
+               DATE '1980-03-14', 44, 'F', 'CC', (52000000 + i)::text,
+               CAST(:address AS jsonb), CAST(:medical_history AS jsonb), CAST(:lab_results AS jsonb),
+               'scans/patient-' || i || '.pdf'
+        FROM generate_series(1, :count) AS i
+    """, [
+        db.create_parameter('address', json.dumps(ADDRESS)),
+        db.create_parameter('medical_history', json.dumps(MEDICAL_HISTORY)),
+        db.create_parameter('lab_results', json.dumps(LAB_RESULTS)),
+        db.create_parameter('count', patient_count, 'long'),
+    ])
+    db.execute_sql("""
+        INSERT INTO medics (medic_id, first_name, email, specialization, license_number)
+        SELECT 'medic-' || i, 'Médico ' || i, 'medico' || i || '@example.com', 'Cardiología', 'LIC-' || i
+        FROM generate_series(1, 20) AS i
+    """)
+    db.execute_sql("""
+        INSERT INTO exams (exam_id, exam_name, exam_type, description, duration_minutes)
+        SELECT 'exam-' || i, 'Examen ' || i, 'lab',
+               'Examen de laboratorio que requiere ayuno de 8 horas y llegar 15 minutos antes de la cita', 30
+        FROM generate_series(1, 20) AS i
+    """)
+    # Two reservations per patient on separate days, one hour apart per medic
+    db.execute_sql("""
+        INSERT INTO reservations (reservation_id, patient_id, medic_id, exam_id, reservation_date,
+                                  reservation_time, status, notes)
+        SELECT 'res-' || i || '-' || n, 'patient-' || lpad(i::text, 6, '0'), 'medic-' || (1 + i % 20),
+               'exam-' || (1 + i % 20), DATE '2031-03-03' + n * 7 + (i / 180),
+               TIME '08:00' + ((i / 20) % 9) * INTERVAL '1 hour', 'scheduled',
+               'Paciente solicita recordatorio por correo electrónico el día anterior'
+        FROM generate_series(1, :count) AS i, generate_series(0, 1) AS n
+    """, [db.create_parameter('count', patient_count, 'long')])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dsn', default=os.environ.get('TEST_DATABASE_DSN'))
+    parser.add_argument('--patients', type=int, default=200)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or TEST_DATABASE_DSN is required")
+
+    logging.disable(logging.CRITICAL)
+    os.environ['DATABASE_DSN'] = args.dsn
+    db = DatabaseManager(backend='postgres')
+    seed(db, args.patients)
+
+    modules = {
+        'patients_api': load_module('patients_handler', 'api/patients/handler.py'),
+        'medics_api': load_module('medics_handler', 'api/medics/handler.py'),
+        'exams_api': load_module('exams_handler', 'api/exams/handler.py'),
+        'reservations_api': load_module('reservations_handler', 'api/reservations/handler.py'),
+        'patient_lookup': load_module('patient_lookup_index', 'patient_lookup/index.py'),
+    }
+    for module in modules.values():
+        module.db_manager = db
+
+    scenarios = [
+        ('patients_api', {'action': 'list', 'pagination': {'limit': 50}}),
+        ('patients_api', {'action': 'get', 'patient_id': 'patient-000001'}),
+        ('medics_api', {'action': 'list', 'pagination': {'limit': 20}}),
+        ('exams_api', {'action': 'list', 'pagination': {'limit': 20}}),
+        ('reservations_api', {'action': 'list', 'pagination': {'limit': 50}}),
+        ('reservations_api', {'action': 'get', 'reservation_id': 'res-1-0'}),
+        ('patient_lookup', {'action': 'list_recent_patients', 'limit': 10}),
+        ('patient_lookup', {'action': 'patient_summary', 'patient_id': 'patient-000001'}),
+    ]
+
+    print(f"\n{'tool / action':<38} {'full B':>8} {'compact B':>10} {'full tok':>9} {'compact tok':>12} {'saved':>6}")
+    totals = [0, 0]
+    for tool, event in scenarios:
+        sizes = []
+        for view in ('full', 'compact'):
+            response = modules[tool].lambda_handler(dict(event, view=view), None)
+            assert response['statusCode'] == 200, response
+            sizes.append(len(response['body'].encode('utf-8')))
+        totals = [total + size for total, size in zip(totals, sizes)]
+        label = f"{tool} {event['action']}"
+        print(
+            f"{label:<38} {sizes[0]:>8} {sizes[1]:>10} {sizes[0] // 4:>9} {sizes[1] // 4:>12} "
+            f"{1 - sizes[1] / sizes[0]:>6.0%}"
+        )
+    print(
+        f"{'total':<38} {totals[0]:>8} {totals[1]:>10} {totals[0] // 4:>9} {totals[1] // 4:>12} "
+        f"{1 - totals[1] / totals[0]:>6.0%}"
+    )
+
+
+if __name__ == '__main__':
+    main()